@@ -42,6 +42,10 @@ from src.infraestructure.database.models.shooting_recommendation_model import (
 from src.infraestructure.database.models.password_reset_model import (
     PasswordResetTokenModel,
 )
+from src.infraestructure.database.models.shadow_inference_model import (
+    ShadowInferenceResultModel,
+)
+from src.infraestructure.database.models.analysis_job_model import AnalysisJobModel
 
 import os
 from dotenv import load_dotenv
@@ -0,0 +1,71 @@
+"""resultados de inferencia sombra
+
+Revision ID: 3d7a5c1e6f20
+Revises: 8c1f4e2a9b73
+Create Date: 2026-10-17 21:05:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "3d7a5c1e6f20"
+down_revision: Union[str, None] = "8c1f4e2a9b73"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "shadow_inference_results",
+        sa.Column("id", sa.UUID(), nullable=False),
+        sa.Column("target_image_id", sa.UUID(), nullable=False),
+        sa.Column("primary_model_version", sa.String(), nullable=False),
+        sa.Column("shadow_model_version", sa.String(), nullable=False),
+        sa.Column("confidence_threshold", sa.Float(), nullable=False),
+        sa.Column("primary_latency_ms", sa.Float(), nullable=True),
+        sa.Column("shadow_latency_ms", sa.Float(), nullable=True),
+        sa.Column("primary_detections", sa.Integer(), nullable=True),
+        sa.Column("shadow_detections", sa.Integer(), nullable=True),
+        sa.Column("matched_detections", sa.Integer(), nullable=True),
+        sa.Column("precision", sa.Float(), nullable=True),
+        sa.Column("recall", sa.Float(), nullable=True),
+        sa.Column("mean_iou", sa.Float(), nullable=True),
+        sa.Column("shadow_raw_detections", sa.JSON(), nullable=True),
+        sa.Column("error", sa.String(), nullable=True),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=True,
+        ),
+        sa.ForeignKeyConstraint(["target_image_id"], ["target_images.id"]),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        op.f("ix_shadow_inference_results_target_image_id"),
+        "shadow_inference_results",
+        ["target_image_id"],
+        unique=False,
+    )
+    op.create_index(
+        op.f("ix_shadow_inference_results_shadow_model_version"),
+        "shadow_inference_results",
+        ["shadow_model_version"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(
+        op.f("ix_shadow_inference_results_shadow_model_version"),
+        table_name="shadow_inference_results",
+    )
+    op.drop_index(
+        op.f("ix_shadow_inference_results_target_image_id"),
+        table_name="shadow_inference_results",
+    )
+    op.drop_table("shadow_inference_results")
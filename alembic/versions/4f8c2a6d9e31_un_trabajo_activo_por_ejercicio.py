@@ -0,0 +1,46 @@
+"""un trabajo de analisis activo por ejercicio
+
+Revision ID: 4f8c2a6d9e31
+Revises: 9a2f6c3e8d17
+Create Date: 2026-10-21 10:40:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "4f8c2a6d9e31"
+down_revision: Union[str, None] = "9a2f6c3e8d17"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Duplicados previos: se conserva el trabajo activo más reciente
+    op.execute("""
+        UPDATE analysis_jobs
+        SET status = 'failed',
+            error = 'DUPLICATE_JOB: otro trabajo activo para el ejercicio',
+            finished_at = now()
+        WHERE status IN ('queued', 'running')
+          AND id NOT IN (
+            SELECT DISTINCT ON (exercise_id) id
+            FROM analysis_jobs
+            WHERE status IN ('queued', 'running')
+            ORDER BY exercise_id, created_at DESC
+          )
+        """)
+    op.create_index(
+        "uq_analysis_jobs_active_exercise",
+        "analysis_jobs",
+        ["exercise_id"],
+        unique=True,
+        postgresql_where=sa.text("status IN ('queued', 'running')"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("uq_analysis_jobs_active_exercise", table_name="analysis_jobs")
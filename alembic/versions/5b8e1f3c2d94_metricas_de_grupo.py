@@ -0,0 +1,42 @@
+"""metricas adicionales del grupo de tiro
+
+Revision ID: 5b8e1f3c2d94
+Revises: a9e2d4b7c130
+Create Date: 2026-10-18 09:20:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "5b8e1f3c2d94"
+down_revision: Union[str, None] = "a9e2d4b7c130"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "target_analyses", sa.Column("group_mean_radius", sa.Float(), nullable=True)
+    )
+    op.add_column(
+        "target_analyses", sa.Column("group_cep50", sa.Float(), nullable=True)
+    )
+    op.add_column(
+        "target_analyses",
+        sa.Column("group_horizontal_dispersion", sa.Float(), nullable=True),
+    )
+    op.add_column(
+        "target_analyses",
+        sa.Column("group_vertical_dispersion", sa.Float(), nullable=True),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("target_analyses", "group_vertical_dispersion")
+    op.drop_column("target_analyses", "group_horizontal_dispersion")
+    op.drop_column("target_analyses", "group_cep50")
+    op.drop_column("target_analyses", "group_mean_radius")
@@ -0,0 +1,26 @@
+"""overlays renderizados en target_analyses
+
+Revision ID: 7c4e2b9a1f63
+Revises: d3a7c1e9b502
+Create Date: 2026-10-19 10:05:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "7c4e2b9a1f63"
+down_revision: Union[str, None] = "d3a7c1e9b502"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("target_analyses", sa.Column("overlays", sa.JSON(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("target_analyses", "overlays")
@@ -0,0 +1,29 @@
+"""guardando detecciones crudas en analisis
+
+Revision ID: 8c1f4e2a9b73
+Revises: 61d4f90fb0d3
+Create Date: 2026-10-17 18:20:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "8c1f4e2a9b73"
+down_revision: Union[str, None] = "61d4f90fb0d3"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Detecciones a umbral mínimo para re-filtrar sin volver a ejecutar el modelo
+    op.add_column(
+        "target_analyses", sa.Column("raw_detections", sa.JSON(), nullable=True)
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("target_analyses", "raw_detections")
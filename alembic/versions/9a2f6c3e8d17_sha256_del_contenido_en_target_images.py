@@ -0,0 +1,28 @@
+"""sha256 del contenido en target_images
+
+Revision ID: 9a2f6c3e8d17
+Revises: e5b1d7a4c826
+Create Date: 2026-10-20 11:05:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "9a2f6c3e8d17"
+down_revision: Union[str, None] = "e5b1d7a4c826"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "target_images", sa.Column("content_sha256", sa.String(64), nullable=True)
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("target_images", "content_sha256")
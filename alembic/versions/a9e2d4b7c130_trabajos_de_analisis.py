@@ -0,0 +1,60 @@
+"""trabajos de analisis asincronos
+
+Revision ID: a9e2d4b7c130
+Revises: 3d7a5c1e6f20
+Create Date: 2026-10-17 23:10:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "a9e2d4b7c130"
+down_revision: Union[str, None] = "3d7a5c1e6f20"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "analysis_jobs",
+        sa.Column("id", sa.UUID(), nullable=False),
+        sa.Column("exercise_id", sa.UUID(), nullable=False),
+        sa.Column("requested_by", sa.UUID(), nullable=True),
+        sa.Column("status", sa.String(), nullable=False),
+        sa.Column("confidence_threshold", sa.Float(), nullable=False),
+        sa.Column("force_reanalysis", sa.Boolean(), nullable=False),
+        sa.Column("enable_scoring", sa.Boolean(), nullable=False),
+        sa.Column("scoring_method", sa.String(), nullable=False),
+        sa.Column("model_version", sa.String(), nullable=True),
+        sa.Column("analysis_id", sa.UUID(), nullable=True),
+        sa.Column("error", sa.String(), nullable=True),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=True,
+        ),
+        sa.Column("started_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("finished_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("queue_ms", sa.Float(), nullable=True),
+        sa.Column("run_ms", sa.Float(), nullable=True),
+        sa.ForeignKeyConstraint(["exercise_id"], ["practice_exercises.id"]),
+        sa.ForeignKeyConstraint(["requested_by"], ["users.id"]),
+        sa.ForeignKeyConstraint(["analysis_id"], ["target_analyses.id"]),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        op.f("ix_analysis_jobs_exercise_id"),
+        "analysis_jobs",
+        ["exercise_id"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(op.f("ix_analysis_jobs_exercise_id"), table_name="analysis_jobs")
+    op.drop_table("analysis_jobs")
@@ -0,0 +1,26 @@
+"""tiempos por etapa en analysis_jobs
+
+Revision ID: d3a7c1e9b502
+Revises: 5b8e1f3c2d94
+Create Date: 2026-10-18 15:40:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "d3a7c1e9b502"
+down_revision: Union[str, None] = "5b8e1f3c2d94"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("analysis_jobs", sa.Column("timings", sa.JSON(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("analysis_jobs", "timings")
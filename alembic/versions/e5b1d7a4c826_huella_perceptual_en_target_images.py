@@ -0,0 +1,58 @@
+"""huella perceptual en target_images
+
+Revision ID: e5b1d7a4c826
+Revises: 7c4e2b9a1f63
+Create Date: 2026-10-19 16:20:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "e5b1d7a4c826"
+down_revision: Union[str, None] = "7c4e2b9a1f63"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "target_images", sa.Column("perceptual_hash", sa.BigInteger(), nullable=True)
+    )
+    op.add_column(
+        "target_images", sa.Column("image_width", sa.Integer(), nullable=True)
+    )
+    op.add_column(
+        "target_images", sa.Column("image_height", sa.Integer(), nullable=True)
+    )
+    op.add_column(
+        "target_images", sa.Column("duplicate_of_id", sa.UUID(), nullable=True)
+    )
+    op.create_index(
+        op.f("ix_target_images_perceptual_hash"),
+        "target_images",
+        ["perceptual_hash"],
+        unique=False,
+    )
+    op.create_foreign_key(
+        "fk_target_images_duplicate_of_id",
+        "target_images",
+        "target_images",
+        ["duplicate_of_id"],
+        ["id"],
+        ondelete="SET NULL",
+    )
+
+
+def downgrade() -> None:
+    op.drop_constraint(
+        "fk_target_images_duplicate_of_id", "target_images", type_="foreignkey"
+    )
+    op.drop_index(op.f("ix_target_images_perceptual_hash"), table_name="target_images")
+    op.drop_column("target_images", "duplicate_of_id")
+    op.drop_column("target_images", "image_height")
+    op.drop_column("target_images", "image_width")
+    op.drop_column("target_images", "perceptual_hash")
@@ -0,0 +1,53 @@
+"""
+Configuración de gunicorn para producción.
+
+    gunicorn -c gunicorn.conf.py src.main:app
+
+Con ML_PRELOAD_MODELS (default) el maestro importa la app y carga los
+modelos antes de crear los workers, que comparten los pesos copy-on-write.
+El número de workers sale de WEB_CONCURRENCY. Para que `/metrics` agregue
+los histogramas de todos los workers, definir PROMETHEUS_MULTIPROC_DIR con
+un directorio vacío y escribible.
+"""
+
+import os
+
+from src.infraestructure.config.settings import settings
+
+bind = f"{settings.HOST}:{settings.PORT}"
+workers = int(os.getenv("WEB_CONCURRENCY", "4"))
+worker_class = "uvicorn.workers.UvicornWorker"
+preload_app = settings.ML_PRELOAD_MODELS
+timeout = 120
+graceful_timeout = 30
+
+
+def when_ready(server):
+    # Corre en el maestro, después de importar la app y antes del primer fork
+    if not settings.ML_PRELOAD_MODELS:
+        return
+
+    from src.infraestructure.ml_models.preload import preload_models
+
+    try:
+        preload_models()
+    except Exception as e:
+        # Sin precarga cada worker cargará su modelo en la primera petición
+        server.log.error(f"No se pudieron precargar los modelos: {str(e)}")
+
+
+def post_fork(server, worker):
+    # La precarga calentó los modelos con un solo hilo de torch en el maestro
+    from src.infraestructure.ml_models.preload import restore_torch_threads
+
+    restore_torch_threads()
+
+
+def child_exit(server, worker):
+    # Descarta las métricas en vivo del worker que terminó
+    if not os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+        return
+
+    from prometheus_client import multiprocess
+
+    multiprocess.mark_process_dead(worker.pid)
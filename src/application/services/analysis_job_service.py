@@ -0,0 +1,292 @@
+import asyncio
+import logging
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, Optional, Tuple
+from uuid import UUID
+
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from src.application.services.enhanced_target_analysis_service import (
+    EnhancedTargetAnalysisService,
+)
+from src.infraestructure.config.settings import settings
+from src.infraestructure.database.models.analysis_job_model import (
+    AnalysisJobModel,
+    AnalysisJobStatus,
+)
+from src.infraestructure.database.repositories.analysis_job_repo import (
+    AnalysisJobRepository,
+)
+from src.infraestructure.database.repositories.practice_exercise_repo import (
+    PracticeExerciseRepository,
+)
+from src.infraestructure.database.session import SessionLocal
+from src.infraestructure.utils.tracing import collect_traces, timings_of
+from src.presentation.schemas.target_analysis_schema import (
+    AnalysisJobRequest,
+    AnalysisJobResponse,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class AnalysisJobService:
+    """
+    Análisis de ejercicios en segundo plano.
+
+    `submit` registra el trabajo en `analysis_jobs` y lo encola en un pool de
+    hilos del proceso; el cliente consulta el estado con el id (o espera un
+    momento con `wait_async`). Si el ejercicio ya tiene un trabajo activo se
+    retorna ese mismo, así los reintentos del cliente no duplican el análisis.
+    """
+
+    def __init__(
+        self,
+        workers: int = 2,
+        max_pending: int = 32,
+        timeout_seconds: float = 600,
+        session_factory: Callable[[], Session] = SessionLocal,
+        analysis_service_factory: Callable[
+            [Session], EnhancedTargetAnalysisService
+        ] = EnhancedTargetAnalysisService,
+    ):
+        self.workers = workers
+        self.max_pending = max_pending
+        self.timeout_seconds = timeout_seconds
+        self._session_factory = session_factory
+        self._analysis_service_factory = analysis_service_factory
+        self._slots = threading.BoundedSemaphore(workers + max_pending)
+        self._pool = ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="analysis-job"
+        )
+        # Trabajos en curso en este proceso
+        self._futures: Dict[UUID, Future] = {}
+        self._lock = threading.Lock()
+
+    def submit(
+        self,
+        db: Session,
+        exercise_id: UUID,
+        request: AnalysisJobRequest,
+        model_version: Optional[str] = None,
+        requested_by: Optional[UUID] = None,
+    ) -> Tuple[Optional[AnalysisJobModel], Optional[str]]:
+        """
+        Encola el análisis de un ejercicio.
+
+        Returns:
+            Tupla (trabajo, error). Si ya había uno activo para el ejercicio
+            se retorna ese.
+        """
+        try:
+            exercise = PracticeExerciseRepository.get_by_id(db, exercise_id)
+            if not exercise or not exercise.target_image:
+                return None, "EXERCISE_OR_IMAGE_NOT_FOUND"
+            if model_version and model_version not in settings.ML_MODEL_VERSIONS:
+                return None, f"MODEL_VERSION_NOT_FOUND: {model_version}"
+
+            active = AnalysisJobRepository.get_active_for_exercise(db, exercise_id)
+            if active and not self._expire_if_stale(db, active):
+                return active, None
+
+            if not self._slots.acquire(blocking=False):
+                return None, (
+                    f"ANALYSIS_JOBS_BUSY: {self.max_pending} trabajos pendientes, "
+                    "intente de nuevo en unos segundos"
+                )
+
+            try:
+                job = AnalysisJobRepository.create(
+                    db,
+                    {
+                        "exercise_id": exercise_id,
+                        "requested_by": requested_by,
+                        "status": AnalysisJobStatus.QUEUED,
+                        "confidence_threshold": request.confidence_threshold,
+                        "force_reanalysis": bool(request.force_reanalysis),
+                        "enable_scoring": bool(request.enable_scoring),
+                        "scoring_method": request.scoring_method or "linear",
+                        "model_version": model_version,
+                    },
+                )
+            except IntegrityError:
+                # Otra petición (u otro worker) encoló el ejercicio entre la
+                # consulta y el insert: el índice único parcial lo impide
+                self._slots.release()
+                db.rollback()
+                active = AnalysisJobRepository.get_active_for_exercise(db, exercise_id)
+                if active:
+                    return active, None
+                raise
+            except Exception:
+                self._slots.release()
+                raise
+
+            try:
+                future = self._pool.submit(self._run, job.id)
+            except Exception:
+                self._slots.release()
+                raise
+
+            with self._lock:
+                self._futures[job.id] = future
+            future.add_done_callback(lambda _, job_id=job.id: self._release(job_id))
+            return job, None
+
+        except Exception as e:
+            logger.error(f"Error encolando análisis: {str(e)}")
+            return None, f"ANALYSIS_JOB_ERROR: {str(e)}"
+
+    def _release(self, job_id: UUID):
+        with self._lock:
+            self._futures.pop(job_id, None)
+        self._slots.release()
+
+    def _run(self, job_id: UUID):
+        db = self._session_factory()
+        try:
+            job = AnalysisJobRepository.mark_running(db, job_id)
+            if not job:
+                return
+
+            service = self._analysis_service_factory(db)
+            with collect_traces() as traces:
+                result, error = service.analyze_exercise_image(
+                    exercise_id=job.exercise_id,
+                    confidence_threshold=job.confidence_threshold,
+                    force_reanalysis=job.force_reanalysis,
+                    enable_scoring=job.enable_scoring,
+                    scoring_method=job.scoring_method,
+                    model_version=job.model_version,
+                )
+            AnalysisJobRepository.mark_finished(
+                db,
+                job_id,
+                analysis_id=result.analysis_id if result else None,
+                error=error,
+                timings=timings_of(traces),
+            )
+        except Exception as e:
+            logger.error(f"Trabajo de análisis {job_id} falló: {str(e)}")
+            db.rollback()
+            AnalysisJobRepository.mark_finished(
+                db, job_id, error=f"ANALYSIS_JOB_ERROR: {str(e)}"
+            )
+        finally:
+            db.close()
+
+    def _expire_if_stale(self, db: Session, job: AnalysisJobModel) -> bool:
+        """
+        Un trabajo activo que no corre en este proceso y superó el timeout
+        quedó huérfano (p. ej. el worker se reinició): se marca fallido. En
+        ejecución el plazo cuenta desde el inicio (puede estar corriendo en
+        otro worker tras esperar en cola); en cola, desde la creación.
+        """
+        with self._lock:
+            if job.id in self._futures:
+                return False
+
+        since = job.created_at
+        if job.status == AnalysisJobStatus.RUNNING and job.started_at:
+            since = job.started_at
+        if since.tzinfo is None:
+            since = since.replace(tzinfo=timezone.utc)
+        deadline = since + timedelta(seconds=self.timeout_seconds)
+        if datetime.now(timezone.utc) < deadline:
+            return False
+
+        AnalysisJobRepository.mark_finished(
+            db, job.id, error="JOB_TIMEOUT: el trabajo no terminó a tiempo"
+        )
+        return True
+
+    async def wait_async(self, job_id: UUID, timeout: float):
+        """Espera a que termine un trabajo de este proceso, como máximo `timeout`"""
+        with self._lock:
+            future = self._futures.get(job_id)
+        if future is None or timeout <= 0:
+            return
+        # asyncio.wait no cancela el trabajo al vencer el plazo
+        await asyncio.wait([asyncio.wrap_future(future)], timeout=timeout)
+
+    def get_job(
+        self, db: Session, job_id: UUID
+    ) -> Tuple[Optional[AnalysisJobResponse], Optional[str]]:
+        """Estado del trabajo, con el análisis completo si terminó bien"""
+        try:
+            job = AnalysisJobRepository.get_by_id(db, job_id)
+            if not job:
+                return None, "JOB_NOT_FOUND"
+            if job.status in AnalysisJobStatus.ACTIVE and self._expire_if_stale(
+                db, job
+            ):
+                job = AnalysisJobRepository.get_by_id(db, job_id)
+
+            result = None
+            if job.status == AnalysisJobStatus.SUCCEEDED and job.analysis_id:
+                result, error = self._analysis_service_factory(db).get_analysis_by_id(
+                    job.analysis_id
+                )
+                if error:
+                    return None, error
+
+            return (
+                AnalysisJobResponse(
+                    job_id=job.id,
+                    exercise_id=job.exercise_id,
+                    status=job.status,
+                    created_at=job.created_at,
+                    started_at=job.started_at,
+                    finished_at=job.finished_at,
+                    queue_ms=job.queue_ms,
+                    run_ms=job.run_ms,
+                    timings=job.timings,
+                    error=job.error,
+                    analysis_id=job.analysis_id,
+                    result=result,
+                ),
+                None,
+            )
+        except Exception as e:
+            logger.error(f"Error obteniendo trabajo {job_id}: {str(e)}")
+            return None, f"ANALYSIS_JOB_ERROR: {str(e)}"
+
+    def stats(self) -> Dict:
+        with self._lock:
+            running = len(self._futures)
+        return {
+            "workers": self.workers,
+            "max_pending": self.max_pending,
+            "in_progress": running,
+        }
+
+    def shutdown(self, wait: bool = False):
+        self._pool.shutdown(wait=wait, cancel_futures=True)
+
+
+_job_service: Optional[AnalysisJobService] = None
+_job_service_lock = threading.Lock()
+
+
+def get_analysis_job_service() -> AnalysisJobService:
+    """Servicio compartido del proceso"""
+    global _job_service
+    with _job_service_lock:
+        if _job_service is None:
+            _job_service = AnalysisJobService(
+                workers=settings.ANALYSIS_JOB_WORKERS,
+                max_pending=settings.ANALYSIS_JOB_MAX_PENDING,
+                timeout_seconds=settings.ANALYSIS_JOB_TIMEOUT_SECONDS,
+            )
+        return _job_service
+
+
+def shutdown_analysis_job_service():
+    global _job_service
+    with _job_service_lock:
+        if _job_service is not None:
+            _job_service.shutdown()
+            _job_service = None
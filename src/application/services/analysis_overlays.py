@@ -0,0 +1,350 @@
+"""
+Imágenes derivadas de un análisis: la foto con los impactos marcados y el
+mapa de calor.
+
+Un análisis no cambia después de guardarse, así que cada imagen se renderiza
+una sola vez por versión del análisis (hash de sus impactos) y se guarda en
+S3 junto a la foto original; la URL queda en `target_analyses.overlays`.
+Las siguientes peticiones la sirven desde la caché en memoria del proceso o
+la descargan ya renderizada. Un re-análisis cambia la versión, con lo que las
+imágenes anteriores dejan de usarse y se borran al renderizar las nuevas.
+"""
+
+import hashlib
+import io
+import json
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+import cv2
+import numpy as np
+from PIL import Image
+from sqlalchemy.orm import Session
+
+from src.infraestructure.config.settings import settings
+from src.infraestructure.database.models.target_analysis_model import (
+    TargetAnalysisModel,
+)
+from src.infraestructure.database.repositories.target_analysis_repo import (
+    TargetAnalysisRepository,
+)
+from src.infraestructure.ml_models.decoded_image import DecodedImage
+from src.infraestructure.utils.s3_utils import (
+    delete_file_from_s3,
+    s3_key_from_url,
+    upload_bytes_to_s3,
+)
+from src.infraestructure.utils.storage_client import (
+    StorageDownloadError,
+    get_storage_client,
+)
+
+logger = logging.getLogger(__name__)
+
+OVERLAY_MODES = ("impacts", "heatmap")
+
+# La key lleva la versión: el objeto nunca cambia una vez escrito
+OVERLAY_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+# Cambiar al modificar el dibujo, para que las imágenes guardadas se renueven
+RENDER_REVISION = 2
+
+# Disco de 20 px suavizado con sigma 15 (el dibujo original): equivale a una
+# gaussiana de sigma ~18 px alrededor de cada impacto
+HEATMAP_SIGMA_PX = 18.0
+
+
+def overlay_version(impacts: Optional[List[Dict[str, Any]]]) -> str:
+    """
+    Versión del análisis para las imágenes: hash de los impactos y de los
+    parámetros de dibujo (una nueva revisión o tamaño también renueva).
+    """
+    render = [
+        RENDER_REVISION,
+        settings.OVERLAY_HEATMAP_MAX_SIDE,
+        settings.OVERLAY_HEATMAP_WORKING_SIDE,
+    ]
+    payload = json.dumps([impacts or [], render], sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+
+def _format_value(value: Any) -> str:
+    return str(value) if value not in [None, ""] else "-"
+
+
+def render_impacts(image_np: np.ndarray, impacts: List[Dict[str, Any]]) -> np.ndarray:
+    """Foto con cada impacto marcado (verde frescos, rojo tapados) y sus datos"""
+    for impact in impacts:
+        x = int(impact.get("centro_x", 0))
+        y = int(impact.get("centro_y", 0))
+        es_fresco = impact.get("es_fresco", False)
+        color = (0, 255, 0) if es_fresco else (255, 0, 0)
+        cv2.circle(image_np, (x, y), 15, color, thickness=3)
+
+        try:
+            dist_center = float(impact.get("distance_from_center", None))
+            dist_center_str = (
+                f"{dist_center:.1f}" if dist_center not in [None, 0] else "-"
+            )
+        except (ValueError, TypeError):
+            dist_center_str = "-"
+
+        info_text = (
+            f"Score: {_format_value(impact.get('scores'))} | "
+            f"Zone: {_format_value(impact.get('zone'))} | "
+            f"Dist: {dist_center_str}"
+        )
+        cv2.putText(
+            image_np,
+            info_text,
+            (x + 20, y - 20),
+            cv2.FONT_HERSHEY_SIMPLEX,
+            0.6,
+            (255, 255, 255),
+            1,
+            cv2.LINE_AA,
+        )
+    return image_np
+
+
+def heatmap_density(
+    impacts: List[Dict[str, Any]],
+    width: int,
+    height: int,
+    scale: float = 1.0,
+    working_side: int = 512,
+) -> np.ndarray:
+    """
+    Densidad de impactos (estimación de kernel gaussiano) en una grilla
+    reducida de `working_side` px de lado mayor, normalizada a 0-1.
+
+    Los impactos se cuentan con un histograma 2D vectorizado y la grilla se
+    suaviza con un kernel gaussiano de HEATMAP_SIGMA_PX (escalado a la
+    grilla); el costo ya no depende de la resolución de la foto.
+
+    Args:
+        impacts: Impactos con `centro_x`/`centro_y` en px de la foto original
+        width, height: Tamaño de la imagen de salida
+        scale: px de la imagen de salida / px de la foto original
+        working_side: Lado mayor de la grilla; 0 = resolución de salida
+    """
+    grid_scale = 1.0
+    if working_side > 0:
+        grid_scale = min(1.0, working_side / max(width, height))
+    grid_w = max(1, round(width * grid_scale))
+    grid_h = max(1, round(height * grid_scale))
+
+    xs = np.array([float(i.get("centro_x", 0)) for i in impacts], dtype=np.float64)
+    ys = np.array([float(i.get("centro_y", 0)) for i in impacts], dtype=np.float64)
+    # Los impactos fuera de la imagen quedan fuera del rango y no cuentan
+    counts, _, _ = np.histogram2d(
+        ys * scale,
+        xs * scale,
+        bins=(grid_h, grid_w),
+        range=((0, height), (0, width)),
+    )
+
+    sigma = HEATMAP_SIGMA_PX * scale * grid_scale
+    density = cv2.GaussianBlur(
+        counts.astype(np.float32), (0, 0), sigmaX=sigma, sigmaY=sigma
+    )
+    peak = float(density.max())
+    return density / peak if peak > 0 else density
+
+
+def render_heatmap(
+    image_np: np.ndarray,
+    impacts: List[Dict[str, Any]],
+    scale: float = 1.0,
+    working_side: int = 512,
+) -> np.ndarray:
+    """
+    Mapa de calor tipo "predator" de los impactos sobre la foto oscurecida.
+    La densidad se calcula en la grilla reducida y solo el coloreado y la
+    mezcla se hacen al tamaño de `image_np` (ya reducida a la salida).
+    """
+    h, w = image_np.shape[:2]
+    density = heatmap_density(impacts, w, h, scale, working_side)
+    density = cv2.resize(density, (w, h), interpolation=cv2.INTER_LINEAR)
+    heatmap_color = cv2.applyColorMap(
+        (density * 255).astype(np.uint8), cv2.COLORMAP_JET
+    )
+    return cv2.addWeighted(image_np, 0.3, heatmap_color, 0.7, 0)
+
+
+def decode_for_heatmap(image_bytes: bytes, max_side: int) -> Tuple[np.ndarray, float]:
+    """
+    Foto en RGB reducida a `max_side` px de lado mayor (0 = original) y su
+    escala. Los JPEG se decodifican ya reducidos (escala DCT) antes de ajustar
+    al tamaño exacto.
+    """
+    decoded = DecodedImage(image_bytes)
+    if max_side <= 0 or max(decoded.size) <= max_side:
+        return decoded.rgb_array()[0], 1.0
+
+    scale = max_side / max(decoded.size)
+    array, _ = decoded.rgb_array(max_side)
+    size = (max(1, round(decoded.width * scale)), max(1, round(decoded.height * scale)))
+    return cv2.resize(array, size, interpolation=cv2.INTER_AREA), scale
+
+
+def render_overlay(
+    image_bytes: bytes, impacts: List[Dict[str, Any]], mode: str = "impacts"
+) -> bytes:
+    """Renderiza la imagen del modo pedido y la codifica en JPEG"""
+    if mode == "heatmap":
+        image_np, scale = decode_for_heatmap(
+            image_bytes, settings.OVERLAY_HEATMAP_MAX_SIDE
+        )
+        result = render_heatmap(
+            image_np, impacts, scale, settings.OVERLAY_HEATMAP_WORKING_SIDE
+        )
+    else:
+        image_np = np.array(Image.open(io.BytesIO(image_bytes)).convert("RGB"))
+        result = render_impacts(image_np, impacts)
+
+    buf = io.BytesIO()
+    Image.fromarray(result).save(buf, format="JPEG")
+    return buf.getvalue()
+
+
+class OverlayCache:
+    """LRU en memoria de JPEG renderizados, por análisis, versión y modo"""
+
+    def __init__(self, max_entries: int = 32):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, bytes]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            data = self._entries.get(key)
+            if data is not None:
+                self._entries.move_to_end(key)
+            return data
+
+    def set(self, key: str, data: bytes):
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[key] = data
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+_cache: Optional[OverlayCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_overlay_cache() -> OverlayCache:
+    """Caché compartida del proceso"""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = OverlayCache(max_entries=settings.OVERLAY_CACHE_MAX_ENTRIES)
+        return _cache
+
+
+class AnalysisOverlayService:
+    def __init__(self, db: Session):
+        self.db = db
+        self.bucket_name = settings.OVERLAY_STORAGE_BUCKET
+
+    def get_overlay(
+        self, analysis: TargetAnalysisModel, image_url: str, mode: str = "impacts"
+    ) -> Tuple[Optional[bytes], Optional[str]]:
+        """
+        JPEG del modo pedido para el análisis: de la caché, de S3 si ya se
+        renderizó esta versión, o renderizado a partir de la foto original
+        (y guardado para las siguientes peticiones).
+        """
+        if mode not in OVERLAY_MODES:
+            return None, f"INVALID_OVERLAY_MODE: {mode}"
+
+        version = overlay_version(analysis.impact_coordinates)
+        cache_key = f"{analysis.id}:{version}:{mode}"
+        cache = get_overlay_cache()
+        data = cache.get(cache_key)
+        if data is not None:
+            return data, None
+
+        stored = self.stored_overlays(analysis, version)
+        if stored.get(mode):
+            try:
+                data = get_storage_client().get_bytes(stored[mode])
+                cache.set(cache_key, data)
+                return data, None
+            except StorageDownloadError as e:
+                logger.warning(f"Overlay guardado no disponible, se re-renderiza: {e}")
+
+        try:
+            image_bytes = get_storage_client().get_bytes(image_url)
+        except StorageDownloadError:
+            return None, "IMAGE_DOWNLOAD_ERROR"
+
+        data = render_overlay(image_bytes, analysis.impact_coordinates, mode)
+        cache.set(cache_key, data)
+        self._store(analysis, image_url, version, mode, data)
+        return data, None
+
+    @staticmethod
+    def stored_overlays(analysis: TargetAnalysisModel, version: str) -> Dict[str, Any]:
+        """URLs guardadas si corresponden a la versión actual del análisis"""
+        overlays = analysis.overlays or {}
+        if overlays.get("version") != version:
+            return {}
+        return overlays
+
+    def overlay_key(
+        self, analysis: TargetAnalysisModel, image_url: str, version: str, mode: str
+    ) -> str:
+        """Junto a la foto original si está en el bucket; si no, por análisis"""
+        original_key = s3_key_from_url(image_url, self.bucket_name)
+        if original_key:
+            base = original_key.rsplit(".", 1)[0]
+        else:
+            base = f"overlays/{analysis.id}"
+        return f"{base}.overlay-{version}-{mode}.jpg"
+
+    def _store(
+        self,
+        analysis: TargetAnalysisModel,
+        image_url: str,
+        version: str,
+        mode: str,
+        data: bytes,
+    ):
+        """Sube la imagen y guarda su URL; si falla, solo queda en caché"""
+        previous = analysis.overlays or {}
+        overlays = {**self.stored_overlays(analysis, version), "version": version}
+        try:
+            overlays[mode] = upload_bytes_to_s3(
+                data,
+                self.bucket_name,
+                self.overlay_key(analysis, image_url, version, mode),
+                cache_control=OVERLAY_CACHE_CONTROL,
+            )
+            TargetAnalysisRepository.save_overlays(self.db, analysis.id, overlays)
+        except Exception as e:
+            logger.warning(f"No se pudo guardar el overlay {mode}: {str(e)}")
+            return
+
+        if previous.get("version") != version:
+            self._delete_stale(previous)
+
+    def _delete_stale(self, overlays: Dict[str, Any]):
+        """Borra las imágenes de una versión anterior del análisis"""
+        for mode in OVERLAY_MODES:
+            if not overlays.get(mode):
+                continue
+            try:
+                delete_file_from_s3(overlays[mode], self.bucket_name)
+            except Exception as e:
+                logger.warning(f"No se pudo borrar el overlay anterior: {str(e)}")
@@ -0,0 +1,65 @@
+from typing import Any, Dict, List, Sequence
+
+from src.domain.entities.scoring import ShotScoreBatch
+from src.domain.services.group_geometry import group_statistics
+
+
+def scoring_data_from_batch(batch: ShotScoreBatch) -> Dict[str, Any]:
+    """Campos de puntuación y de grupo de `target_analyses` para los disparos"""
+    if not len(batch):
+        return empty_scoring_data()
+
+    group = group_statistics(batch.x, batch.y)
+    return {
+        "total_score": batch.total_score,
+        "average_score_per_shot": batch.total_score / len(batch),
+        "max_score_achieved": batch.max_score,
+        "score_distribution": batch.score_distribution(),
+        "shooting_group_diameter": group.diameter,
+        "group_center_x": group.center_x,
+        "group_center_y": group.center_y,
+        "group_mean_radius": group.mean_radius,
+        "group_cep50": group.cep50,
+        "group_horizontal_dispersion": group.horizontal_dispersion,
+        "group_vertical_dispersion": group.vertical_dispersion,
+    }
+
+
+def empty_scoring_data() -> Dict[str, Any]:
+    """Datos vacíos cuando no hay disparos frescos"""
+    return {
+        "total_score": 0,
+        "average_score_per_shot": 0.0,
+        "max_score_achieved": 0,
+        "score_distribution": {str(i): 0 for i in range(0, 11)},
+        "shooting_group_diameter": 0.0,
+        "group_center_x": 0.0,
+        "group_center_y": 0.0,
+        "group_mean_radius": 0.0,
+        "group_cep50": 0.0,
+        "group_horizontal_dispersion": 0.0,
+        "group_vertical_dispersion": 0.0,
+    }
+
+
+def annotate_detections(
+    detection_dicts: List[Dict[str, Any]],
+    scored_indices: Sequence[int],
+    batch: ShotScoreBatch,
+) -> None:
+    """Agrega puntuación y zona a cada impacto puntuado (i-ésimo del lote)"""
+    for index, score, zone, distance, ratio in zip(
+        scored_indices,
+        batch.scores.tolist(),
+        batch.zones.tolist(),
+        batch.distances_pixels.tolist(),
+        batch.distance_ratios.tolist(),
+    ):
+        detection_dicts[index].update(
+            {
+                "scores": score,
+                "zone": zone,
+                "distance_from_center": distance,
+                "distance_ratio": ratio,
+            }
+        )
@@ -1,5 +1,6 @@
 from typing import List, Dict, Any
 from src.domain.entities.scoring import ShotCoordinate
+from src.infraestructure.ml_models.detection_columns import DetectionColumns
 
 
 class DetectionConverter:
@@ -32,6 +33,26 @@ class DetectionConverter:
 
         return shot_coordinates
 
+    @staticmethod
+    def columns_to_shot_coordinates(
+        detections: DetectionColumns, only_fresh: bool = True
+    ) -> List[ShotCoordinate]:
+        """
+        Igual que detections_to_shot_coordinates, leyendo directamente de las
+        columnas sin pasar por un dict por detección.
+        """
+        if only_fresh:
+            detections = detections.select(detections.fresh_mask)
+
+        return [
+            ShotCoordinate(x=x, y=y, confidence=confidence)
+            for x, y, confidence in zip(
+                detections.centers_x.tolist(),
+                detections.centers_y.tolist(),
+                detections.confidences.tolist(),
+            )
+        ]
+
     @staticmethod
     def shot_scores_to_detection_format(shot_scores: List) -> List[Dict[str, Any]]:
         """
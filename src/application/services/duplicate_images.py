@@ -0,0 +1,106 @@
+"""
+Detección de fotos casi duplicadas al subir la imagen de un blanco.
+
+Al subir se calcula la huella (dHash de 64 bits y tamaño) y se compara con las
+imágenes recientes del mismo tirador por distancia de Hamming. La huella se
+guarda en `target_images` y, si hay un casi-duplicado, también su id: la
+respuesta de la subida avisa al cliente y el análisis puede reutilizar las
+detecciones del duplicado (`DUPLICATE_IMAGE_REUSE_ANALYSIS`).
+"""
+
+import logging
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+from uuid import UUID
+
+from fastapi import UploadFile
+from sqlalchemy.orm import Session
+
+from src.infraestructure.config.settings import settings
+from src.infraestructure.database.repositories.target_analysis_repo import (
+    TargetAnalysisRepository,
+)
+from src.infraestructure.database.repositories.target_images_repo import (
+    TargetImagesRepository,
+)
+from src.infraestructure.utils.image_hash import (
+    ImageFingerprint,
+    fingerprint_file,
+    hamming_distance,
+)
+from src.presentation.schemas.target_images_schema import DuplicateImageInfo
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class DuplicateMatch:
+    image_id: UUID
+    exercise_id: UUID
+    distance: int
+
+
+def read_upload_fingerprint(file: UploadFile) -> Optional[ImageFingerprint]:
+    """
+    Huella del archivo subido, leída del temporal sin copiarlo a memoria; lo
+    deja al inicio para subirlo a S3. None si no se puede decodificar (la
+    validación de tipo la hace la subida).
+    """
+    try:
+        return fingerprint_file(file.file)
+    except Exception as e:
+        logger.warning(f"No se pudo calcular la huella de la imagen: {str(e)}")
+        return None
+    finally:
+        file.file.seek(0)
+
+
+def find_near_duplicate(
+    db: Session, shooter_id: Optional[UUID], image: Optional[ImageFingerprint]
+) -> Optional[DuplicateMatch]:
+    """Imagen reciente del tirador más parecida, si está dentro del umbral"""
+    max_distance = settings.DUPLICATE_IMAGE_MAX_DISTANCE
+    if image is None or shooter_id is None or max_distance < 0:
+        return None
+
+    best = None
+    for row in TargetImagesRepository.get_shooter_fingerprints(
+        db, shooter_id, settings.DUPLICATE_IMAGE_LOOKBACK
+    ):
+        distance = hamming_distance(image.perceptual_hash, row.perceptual_hash)
+        if distance <= max_distance and (best is None or distance < best.distance):
+            best = DuplicateMatch(
+                image_id=row.id,
+                exercise_id=row.exercise_id,
+                distance=distance,
+            )
+    return best
+
+
+def fingerprint_columns(
+    image: Optional[ImageFingerprint], match: Optional[DuplicateMatch]
+) -> Dict[str, Any]:
+    """Campos de `target_images` con la huella y el duplicado encontrado"""
+    if image is None:
+        return {}
+    return {
+        "perceptual_hash": image.perceptual_hash,
+        "image_width": image.width,
+        "image_height": image.height,
+        "duplicate_of_id": match.image_id if match else None,
+    }
+
+
+def duplicate_info(
+    db: Session, match: Optional[DuplicateMatch]
+) -> Optional[DuplicateImageInfo]:
+    """Aviso para la respuesta de la subida"""
+    if match is None:
+        return None
+    analysis = TargetAnalysisRepository.get_by_image_id(db, match.image_id)
+    return DuplicateImageInfo(
+        image_id=match.image_id,
+        exercise_id=match.exercise_id,
+        hamming_distance=match.distance,
+        analysis_id=analysis.id if analysis else None,
+    )
@@ -2,20 +2,27 @@
 # src/application/services/enhanced_target_analysis_service.py
 
 import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from io import BytesIO
 from typing import Any, Dict, List, Optional, Tuple
 from uuid import UUID
 
 import numpy as np
-import requests
 from fastapi import Depends, HTTPException
-from PIL import Image
 from sqlalchemy.orm import Session
 
+from src.application.services.analysis_scoring import (
+    annotate_detections,
+    empty_scoring_data,
+    scoring_data_from_batch,
+)
 from src.application.services.detection_converter import DetectionConverter
 from src.application.services.exercise_consolidation import ExerciseConsolidationService
 from src.application.services.scoring_calculator import ScoringCalculatorService
+from src.application.services.shadow_inference_service import (
+    get_shadow_inference_service,
+)
 
 # Nuevas importaciones para puntuación
 from src.domain.entities.scoring import ShotCoordinate
@@ -28,14 +35,36 @@ from src.infraestructure.database.models.target_analysis_model import (
 from src.infraestructure.database.repositories.practice_exercise_repo import (
     PracticeExerciseRepository,
 )
+from src.infraestructure.database.repositories.practice_session_repo import (
+    PracticeSessionRepository,
+)
 from src.infraestructure.database.repositories.target_analysis_repo import (
     TargetAnalysisRepository,
 )
+from src.infraestructure.config.settings import settings
 from src.infraestructure.database.session import get_db
+from src.infraestructure.utils.storage_client import get_storage_client
+from src.infraestructure.utils.tracing import pipeline_trace, stage
 
 # Importaciones existentes (mantener)
-from src.infraestructure.ml_models import BulletDetectorError, get_bullet_detector
-from src.presentation.schemas.target_analysis_schema import ExerciseAnalysisResponse
+from src.infraestructure.ml_models import (
+    BulletDetectorError,
+    InferenceQueueFullError,
+    get_bullet_detector,
+    get_inference_executor,
+)
+from src.infraestructure.ml_models.bullet_detector import get_model_version_key
+from src.infraestructure.ml_models.decoded_image import DecodedImage
+from src.infraestructure.ml_models.detection_columns import DetectionColumns
+from src.infraestructure.ml_models.model_registry import (
+    ModelRegistry,
+    ModelVersionNotFoundError,
+)
+from src.presentation.schemas.target_analysis_schema import (
+    ExerciseAnalysisResponse,
+    SessionAnalysisResponse,
+    SessionExerciseAnalysisResult,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -49,6 +78,8 @@ class EnhancedTargetAnalysisService:
     def __init__(self, db: Session = Depends(get_db)):
         self.db = db
         self.detector = get_bullet_detector()
+        self.inference_executor = get_inference_executor()
+        self.shadow_inference = get_shadow_inference_service()
         self.consolidation_service = ExerciseConsolidationService(self.db)
 
         # ✅ NUEVOS: Servicios de puntuación
@@ -66,6 +97,7 @@ class EnhancedTargetAnalysisService:
         force_reanalysis: bool = False,
         enable_scoring: bool = True,  # NUEVO: Parámetro opcional para activar puntuación
         scoring_method: str = "linear",  # NUEVO: Método de puntuación ("linear", "exponential", "zones")
+        model_version: Optional[str] = None,
     ) -> Tuple[Optional[ExerciseAnalysisResponse], Optional[str]]:
         """
         Método mejorado que mantiene compatibilidad total con la versión existente
@@ -76,83 +108,121 @@ class EnhancedTargetAnalysisService:
             confidence_threshold: Umbral de confianza para detección
             force_reanalysis: Forzar nuevo análisis
             enable_scoring: Si calcular puntuación (nuevo parámetro opcional)
+            model_version: Versión del modelo; None = la del club o la default
+
+        Cada etapa queda medida en la traza "analysis" (ver `tracing`).
         """
-        try:
-            # 1. Obtener ejercicio con imagen (igual que antes)
-            exercise = PracticeExerciseRepository.get_by_id(
-                self.db, exercise_id=exercise_id
+        with pipeline_trace("analysis") as trace:
+            result, error = self._analyze_exercise_image(
+                exercise_id,
+                confidence_threshold,
+                force_reanalysis,
+                enable_scoring,
+                scoring_method,
+                model_version,
             )
-            if not exercise or not exercise.target_image:
-                return None, "EXERCISE_OR_IMAGE_NOT_FOUND"
+            if error:
+                trace.outcome = "error"
+        return result, error
 
-            # 2. Verificar si ya existe análisis (igual que antes)
-            existing_analysis = self._get_latest_analysis(exercise.target_image.id)
-            if existing_analysis and not force_reanalysis:
-                return self._build_enhanced_response_from_db(existing_analysis), None
-
-            # 3. Descargar imagen desde S3 (igual que antes)
-            image_bytes = self._download_image_from_s3(exercise.target_image.file_path)
+    def _analyze_exercise_image(
+        self,
+        exercise_id: UUID,
+        confidence_threshold: float,
+        force_reanalysis: bool,
+        enable_scoring: bool,
+        scoring_method: str,
+        model_version: Optional[str],
+    ) -> Tuple[Optional[ExerciseAnalysisResponse], Optional[str]]:
+        try:
+            # 1. Obtener ejercicio con imagen (igual que antes)
+            with stage("load_exercise"):
+                exercise = PracticeExerciseRepository.get_by_id(
+                    self.db, exercise_id=exercise_id
+                )
+                if not exercise or not exercise.target_image:
+                    return None, "EXERCISE_OR_IMAGE_NOT_FOUND"
 
-            # 4. Obtener dimensiones de imagen (NUEVO para validación)
-            image_width, image_height = self._get_image_dimensions(image_bytes)
+                model_version = ModelRegistry.resolve_version(
+                    model_version, self._get_club_id(exercise)
+                )
 
-            # 5. Validar formato de imagen si scoring está habilitado
-            if enable_scoring:
-                is_valid, error_msg = TargetAnalysisValidator.validate_image_format(
-                    image_width, image_height
+            # 2. Verificar si ya existe análisis (igual que antes)
+            with stage("lookup_analysis"):
+                existing_analysis = self._get_latest_analysis(exercise.target_image.id)
+                raw_detections = self._get_reusable_raw_detections(
+                    existing_analysis, model_version
                 )
-                if not is_valid:
-                    logger.warning(f"Imagen no óptima para puntuación: {error_msg}")
-                    # No fallar, solo registrar warning
 
-            # 6. Procesar con el modelo YOLO (igual que antes)
-            analysis_result = self.detector.analyze_with_stats(
-                image_data=image_bytes, confidence_threshold=confidence_threshold
+            # Con detecciones crudas guardadas, un cambio de umbral se sirve filtrando
+            threshold_changed = (
+                raw_detections is not None
+                and existing_analysis.confidence_threshold != confidence_threshold
             )
+            if existing_analysis and not force_reanalysis and not threshold_changed:
+                with stage("response"):
+                    response = self._build_enhanced_response_from_db(existing_analysis)
+                return response, None
+
+            if raw_detections is None and existing_analysis is None:
+                with stage("lookup_duplicate"):
+                    raw_detections = self._get_duplicate_raw_detections(
+                        exercise.target_image, model_version
+                    )
 
-            detections = analysis_result["detections"]
-            stats = analysis_result["statistics"]
-
-            # 7. Preparar datos básicos (con impactos enriquecidos si hay scoring)
-            scoring_data = None
-            enhanced_detections = detections  # Por defecto, usar detecciones originales
+            if raw_detections is None:
+                # 3-5. Descargar imagen y validar formato
+                image = self._load_target_image(
+                    exercise.target_image.file_path, enable_scoring
+                )
 
-            if enable_scoring:
-                try:
-                    scoring_data, enhanced_detections = self._calculate_scoring_data(
-                        detections, image_width, image_height, scoring_method
+                # 6. Procesar con el modelo YOLO al umbral mínimo, una sola vez
+                started_at = time.perf_counter()
+                with stage("inference"):
+                    raw_detections = self._run_inference_at_floor(
+                        image,
+                        image.size[0],
+                        image.size[1],
+                        confidence_threshold,
+                        model_version,
                     )
-                    logger.info(
-                        f"📄 Puntuación calculada: {scoring_data.get('total_score', 0)} puntos"
+                if self.shadow_inference is not None:
+                    # En segundo plano, no agrega latencia a la respuesta
+                    self.shadow_inference.maybe_submit(
+                        exercise.target_image.id,
+                        image,
+                        raw_detections,
+                        confidence_threshold,
+                        primary_latency_ms=(time.perf_counter() - started_at) * 1000,
                     )
-                except Exception as e:
-                    logger.error(f"❌ Error calculando puntuación: {str(e)}")
-                    # No fallar el análisis completo, continuar sin puntuación
-
-            # Usar los impactos enriquecidos para guardar en BD
-            basic_analysis_data = self._prepare_basic_analysis_data(
-                stats, enhanced_detections, confidence_threshold
-            )
-
-            # 9. Guardar o actualizar en BD
-            if existing_analysis:
-                db_analysis = self._update_analysis_with_scoring(
-                    existing_analysis.id, basic_analysis_data, scoring_data
-                )
             else:
-                db_analysis = self._create_analysis_with_scoring(
-                    exercise.target_image.id, basic_analysis_data, scoring_data
+                logger.info(
+                    f"Reutilizando detecciones crudas (umbral {confidence_threshold}) "
+                    f"sin ejecutar el modelo"
                 )
 
-            # 10. Consolidación (igual que antes)
-            consolidation_result = self._consolidate_exercise_after_analysis(
-                exercise_id
+            # 7-9. Filtrar, puntuar y guardar
+            db_analysis, enhanced_detections = self._save_analysis(
+                exercise,
+                existing_analysis,
+                raw_detections,
+                confidence_threshold,
+                enable_scoring,
+                scoring_method,
+                model_version,
             )
 
+            # 10. Consolidación en la misma transacción que el guardado
+            with stage("consolidation"):
+                consolidation_result = self._consolidate_exercise_after_analysis(
+                    exercise, db_analysis
+                )
+
             # 11. Construir respuesta mejorada
-            response = self._build_enhanced_response(
-                exercise_id, db_analysis, enhanced_detections
-            )
+            with stage("response"):
+                response = self._build_enhanced_response(
+                    exercise_id, db_analysis, enhanced_detections
+                )
 
             # 12. Agregar info de consolidación (igual que antes)
             if consolidation_result:
@@ -164,9 +234,14 @@ class EnhancedTargetAnalysisService:
 
             return response, None
 
+        except InferenceQueueFullError as e:
+            return None, f"INFERENCE_BUSY: {str(e)}"
+        except ModelVersionNotFoundError as e:
+            return None, f"MODEL_VERSION_NOT_FOUND: {str(e)}"
         except BulletDetectorError as e:
             return None, f"DETECTION_ERROR: {str(e)}"
         except Exception as e:
+            self.db.rollback()
             logger.error(f"Error en análisis mejorado: {str(e)}")
             return None, f"ENHANCED_ANALYSIS_ERROR: {str(e)}"
 
@@ -208,15 +283,394 @@ class EnhancedTargetAnalysisService:
             logger.error(f"Error obteniendo análisis: {str(e)}")
             return None, f"ANALYSIS_RETRIEVAL_ERROR: {str(e)}"
 
+    def get_analysis_by_id(
+        self, analysis_id: UUID
+    ) -> Tuple[Optional[ExerciseAnalysisResponse], Optional[str]]:
+        """Obtiene un análisis específico (p. ej. el producido por un trabajo)"""
+        try:
+            analysis = TargetAnalysisRepository.get_by_id(self.db, analysis_id)
+            if not analysis:
+                return None, "ANALYSIS_NOT_FOUND"
+
+            return self._build_enhanced_response_from_db(analysis), None
+        except Exception as e:
+            logger.error(f"Error obteniendo análisis: {str(e)}")
+            return None, f"ANALYSIS_RETRIEVAL_ERROR: {str(e)}"
+
+    def analyze_session_exercises(
+        self,
+        session_id: UUID,
+        confidence_threshold: float = 0.25,
+        force_reanalysis: bool = False,
+        enable_scoring: bool = True,
+        scoring_method: str = "linear",
+        model_version: Optional[str] = None,
+    ) -> Tuple[Optional[SessionAnalysisResponse], Optional[str]]:
+        """
+        Analiza todos los ejercicios de la sesión que tienen imagen y no
+        tienen un análisis vigente (mismo criterio que `analyze_exercise_image`).
+
+        Las imágenes se descargan en paralelo y se envían al detector en lotes
+        por versión de modelo; el guardado se hace en este hilo y los totales
+        de la sesión se recalculan una sola vez al final. Un ejercicio que
+        falla no impide guardar los demás. Las etapas quedan medidas en la
+        traza "session_analysis".
+        """
+        with pipeline_trace("session_analysis") as trace:
+            result, error = self._analyze_session_exercises(
+                session_id,
+                confidence_threshold,
+                force_reanalysis,
+                enable_scoring,
+                scoring_method,
+                model_version,
+            )
+            if error:
+                trace.outcome = "error"
+        return result, error
+
+    def _analyze_session_exercises(
+        self,
+        session_id: UUID,
+        confidence_threshold: float,
+        force_reanalysis: bool,
+        enable_scoring: bool,
+        scoring_method: str,
+        model_version: Optional[str],
+    ) -> Tuple[Optional[SessionAnalysisResponse], Optional[str]]:
+        started_at = time.perf_counter()
+        try:
+            if not PracticeSessionRepository.get_by_id(self.db, session_id):
+                return None, "SESSION_NOT_FOUND"
+
+            exercises = [
+                exercise
+                for exercise in PracticeExerciseRepository.get_exercises_with_images(
+                    self.db, session_id
+                )
+                if exercise.target_image
+            ]
+
+            results: Dict[UUID, SessionExerciseAnalysisResult] = {}
+            # (ejercicio, análisis existente, versión, detecciones crudas)
+            to_save: List[Tuple[Any, Any, Optional[str], Dict[str, Any]]] = []
+            to_infer: List[Tuple[Any, Any, Optional[str]]] = []
+
+            # 1. Clasificar: vigente, solo refiltrar o inferir
+            for exercise in exercises:
+                version = ModelRegistry.resolve_version(
+                    model_version, self._get_club_id(exercise)
+                )
+                existing = self._get_latest_analysis(exercise.target_image.id)
+                raw_detections = self._get_reusable_raw_detections(existing, version)
+                threshold_changed = (
+                    raw_detections is not None
+                    and existing.confidence_threshold != confidence_threshold
+                )
+                if existing and not force_reanalysis and not threshold_changed:
+                    results[exercise.id] = SessionExerciseAnalysisResult(
+                        exercise_id=exercise.id,
+                        status="up_to_date",
+                        analysis_id=existing.id,
+                        total_impactos_detectados=existing.total_impacts_detected,
+                        puntuacion_total=existing.total_score,
+                    )
+                elif raw_detections is not None:
+                    to_save.append((exercise, existing, version, raw_detections))
+                else:
+                    to_infer.append((exercise, existing, version))
+
+            # 2. Descargas concurrentes (I/O, no compiten con la inferencia)
+            with stage("download"):
+                images = self._download_target_images(
+                    [exercise.target_image.file_path for exercise, _, _ in to_infer],
+                    enable_scoring,
+                )
+
+            # 3. Inferencia en lotes, agrupada por versión de modelo
+            confidence_floor = min(settings.ML_CONFIDENCE_FLOOR, confidence_threshold)
+            batches: Dict[Optional[str], List[Tuple[Any, Any, DecodedImage]]] = {}
+            for (exercise, existing, version), image in zip(to_infer, images):
+                if isinstance(image, Exception):
+                    results[exercise.id] = self._failed_result(exercise, image)
+                    continue
+                is_valid, error_msg = self.detector.validate_image(image)
+                if not is_valid:
+                    results[exercise.id] = self._failed_result(exercise, error_msg)
+                    continue
+                batches.setdefault(version, []).append((exercise, existing, image))
+
+            for version, items in batches.items():
+                batch_started_at = time.perf_counter()
+                futures = self.inference_executor.submit_batch(
+                    [image for _, _, image in items], confidence_floor, version
+                )
+                for (exercise, existing, image), future in zip(items, futures):
+                    try:
+                        with stage("inference"):
+                            analysis_result = future.result()
+                    except Exception as e:
+                        results[exercise.id] = self._failed_result(exercise, e)
+                        continue
+                    raw_detections = self._package_raw_detections(
+                        analysis_result, *image.size, confidence_floor, version
+                    )
+                    if self.shadow_inference is not None:
+                        self.shadow_inference.maybe_submit(
+                            exercise.target_image.id,
+                            image,
+                            raw_detections,
+                            confidence_threshold,
+                            primary_latency_ms=(time.perf_counter() - batch_started_at)
+                            * 1000
+                            / len(items),
+                        )
+                    to_save.append((exercise, existing, version, raw_detections))
+
+            # 4. Guardar y consolidar cada ejercicio en una transacción, sin
+            # tocar aún la sesión
+            inferred_ids = {exercise.id for exercise, _, _ in to_infer}
+            for exercise, existing, version, raw_detections in to_save:
+                try:
+                    db_analysis, _ = self._save_analysis(
+                        exercise,
+                        existing,
+                        raw_detections,
+                        confidence_threshold,
+                        enable_scoring,
+                        scoring_method,
+                        version,
+                    )
+                    with stage("consolidation"):
+                        self._consolidate_exercise_after_analysis(
+                            exercise, db_analysis, update_session_totals=False
+                        )
+                except Exception as e:
+                    self.db.rollback()
+                    results[exercise.id] = self._failed_result(exercise, e)
+                    continue
+
+                results[exercise.id] = SessionExerciseAnalysisResult(
+                    exercise_id=exercise.id,
+                    status="analyzed" if exercise.id in inferred_ids else "refiltered",
+                    analysis_id=db_analysis.id,
+                    total_impactos_detectados=db_analysis.total_impacts_detected,
+                    puntuacion_total=db_analysis.total_score,
+                )
+
+            # 5. Totales de la sesión, una sola vez
+            with stage("session_totals"):
+                PracticeSessionRepository.update_totals_with_scoring(
+                    self.db, session_id
+                )
+
+            ordered = [results[exercise.id] for exercise in exercises]
+            counts = {
+                status: sum(1 for r in ordered if r.status == status)
+                for status in ("analyzed", "refiltered", "up_to_date", "failed")
+            }
+            return (
+                SessionAnalysisResponse(
+                    session_id=session_id,
+                    total_exercises=len(ordered),
+                    elapsed_ms=(time.perf_counter() - started_at) * 1000,
+                    exercises=ordered,
+                    **counts,
+                ),
+                None,
+            )
+
+        except InferenceQueueFullError as e:
+            return None, f"INFERENCE_BUSY: {str(e)}"
+        except ModelVersionNotFoundError as e:
+            return None, f"MODEL_VERSION_NOT_FOUND: {str(e)}"
+        except Exception as e:
+            self.db.rollback()
+            logger.error(f"Error en análisis de sesión {session_id}: {str(e)}")
+            return None, f"SESSION_ANALYSIS_ERROR: {str(e)}"
+
     # ✅ MÉTODOS AUXILIARES NUEVOS
-    def _get_image_dimensions(self, image_bytes: bytes) -> Tuple[int, int]:
-        """Obtiene dimensiones de la imagen"""
-        pil_image = Image.open(BytesIO(image_bytes))
-        return pil_image.size  # (width, height)
+    def _get_club_id(self, exercise) -> Optional[UUID]:
+        """Club del tirador, solo si hay modelos asignados por club"""
+        if not settings.ML_CLUB_MODEL_VERSIONS:
+            return None
+        session = getattr(exercise, "session", None)
+        shooter = getattr(session, "shooter", None)
+        return getattr(shooter, "club_id", None)
+
+    def _load_target_image(
+        self, file_path: str, enable_scoring: bool = True
+    ) -> DecodedImage:
+        """
+        Descarga la imagen del blanco. Solo lee el encabezado; la misma
+        imagen llega al detector.
+        """
+        with stage("download"):
+            image_data = self._download_image_from_s3(file_path)
+        with stage("decode"):
+            image = DecodedImage(image_data)
+
+        # Validar formato de imagen si scoring está habilitado
+        if enable_scoring:
+            is_valid, error_msg = TargetAnalysisValidator.validate_image_format(
+                *image.size
+            )
+            if not is_valid:
+                # No fallar, solo registrar warning
+                logger.warning(f"Imagen no óptima para puntuación: {error_msg}")
+        return image
+
+    def _run_inference_at_floor(
+        self,
+        image: DecodedImage,
+        image_width: int,
+        image_height: int,
+        confidence_threshold: float,
+        model_version: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """
+        Ejecuta el modelo al umbral mínimo configurado y empaqueta las
+        detecciones crudas para guardarlas junto al análisis.
+        """
+        confidence_floor = min(settings.ML_CONFIDENCE_FLOOR, confidence_threshold)
+        analysis_result = self.inference_executor.analyze_with_stats(
+            image_data=image,
+            confidence_threshold=confidence_floor,
+            model_version=model_version,
+        )
+        return self._package_raw_detections(
+            analysis_result, image_width, image_height, confidence_floor, model_version
+        )
+
+    def _package_raw_detections(
+        self,
+        analysis_result: Dict[str, Any],
+        image_width: int,
+        image_height: int,
+        confidence_floor: float,
+        model_version: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        return {
+            "confidence_floor": confidence_floor,
+            "model_version": get_model_version_key(model_version),
+            "image_width": image_width,
+            "image_height": image_height,
+            "detections": analysis_result["detections"],
+        }
+
+    def _save_analysis(
+        self,
+        exercise,
+        existing_analysis: Optional[TargetAnalysisModel],
+        raw_detections: Dict[str, Any],
+        confidence_threshold: float,
+        enable_scoring: bool,
+        scoring_method: str,
+        model_version: Optional[str] = None,
+    ) -> Tuple[TargetAnalysisModel, List[Dict[str, Any]]]:
+        """
+        Filtra las detecciones crudas al umbral pedido, calcula la puntuación
+        y crea o actualiza el análisis sin confirmar (el commit lo hace
+        `_consolidate_exercise_after_analysis`). Retorna el análisis guardado y
+        los impactos enriquecidos.
+        """
+        image_width = raw_detections["image_width"]
+        image_height = raw_detections["image_height"]
+
+        with stage("filter"):
+            analysis_result = self.detector.refilter(
+                raw_detections["detections"], confidence_threshold
+            )
+
+        detections: DetectionColumns = analysis_result["detections"]
+        stats = analysis_result["statistics"]
+
+        # Preparar datos básicos (con impactos enriquecidos si hay scoring)
+        scoring_data = None
+        enhanced_detections = None
+
+        if enable_scoring:
+            try:
+                with stage("scoring"):
+                    scoring_data, enhanced_detections = self._calculate_scoring_data(
+                        detections, image_width, image_height, scoring_method
+                    )
+                logger.info(
+                    f"📄 Puntuación calculada: {scoring_data.get('total_score', 0)} puntos"
+                )
+            except Exception as e:
+                logger.error(f"❌ Error calculando puntuación: {str(e)}")
+                # No fallar el análisis completo, continuar sin puntuación
+
+        if enhanced_detections is None:
+            # Por defecto, usar detecciones originales
+            enhanced_detections = detections.to_dicts()
+
+        # Usar los impactos enriquecidos para guardar en BD
+        basic_analysis_data = self._prepare_basic_analysis_data(
+            stats, enhanced_detections, confidence_threshold, model_version
+        )
+        basic_analysis_data["raw_detections"] = raw_detections
+
+        # Guardar o actualizar en BD
+        with stage("db_write"):
+            if existing_analysis:
+                db_analysis = self._update_analysis_with_scoring(
+                    existing_analysis.id, basic_analysis_data, scoring_data
+                )
+            else:
+                db_analysis = self._create_analysis_with_scoring(
+                    exercise.target_image.id, basic_analysis_data, scoring_data
+                )
+        return db_analysis, enhanced_detections
+
+    def _get_reusable_raw_detections(
+        self,
+        analysis: Optional[TargetAnalysisModel],
+        model_version: Optional[str] = None,
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Detecciones crudas del análisis existente, si se pueden reutilizar:
+        mismo modelo y un umbral mínimo que cubra cualquier umbral válido.
+        """
+        if not analysis or not analysis.raw_detections:
+            return None
+
+        raw = analysis.raw_detections
+        if raw.get("model_version") != get_model_version_key(model_version):
+            return None
+        if raw.get("confidence_floor", 1.0) > settings.ML_CONFIDENCE_FLOOR:
+            return None
+        return raw
+
+    def _get_duplicate_raw_detections(
+        self, image, model_version: Optional[str] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Detecciones crudas de la foto anterior de la que esta imagen es un
+        casi-duplicado (ver `duplicate_images`), si está habilitado y ambas
+        tienen el mismo tamaño: las coordenadas valen igual para las dos.
+        """
+        duplicate_of_id = getattr(image, "duplicate_of_id", None)
+        if not settings.DUPLICATE_IMAGE_REUSE_ANALYSIS or not duplicate_of_id:
+            return None
+
+        raw = self._get_reusable_raw_detections(
+            self._get_latest_analysis(duplicate_of_id), model_version
+        )
+        if raw is None:
+            return None
+        if (raw.get("image_width"), raw.get("image_height")) != (
+            image.image_width,
+            image.image_height,
+        ):
+            return None
+        logger.info(f"Imagen {image.id} casi duplicada de {duplicate_of_id}")
+        return raw
 
     def _calculate_scoring_data(
         self,
-        detections: List[Dict],
+        detections: DetectionColumns,
         image_width: int,
         image_height: int,
         scoring_method: str = "linear",
@@ -227,72 +681,41 @@ class EnhancedTargetAnalysisService:
         Returns:
             Tuple[scoring_data, enhanced_detections]
         """
-        # Convertir detecciones a coordenadas de disparo
-        shot_coordinates = self.detection_converter.detections_to_shot_coordinates(
-            detections, only_fresh=True
+        # Lista de dicts solo para la respuesta y la BD
+        detection_dicts = detections.to_dicts()
+
+        fresh = detections.select(detections.fresh_mask)
+        if not len(fresh):
+            return self._empty_scoring_data(), detection_dicts
+
+        # Todos los disparos frescos de una vez
+        batch = self.distance_scoring.score_shots(
+            fresh.centers_x,
+            fresh.centers_y,
+            image_width,
+            image_height,
+            scoring_method=scoring_method,
+            confidence=fresh.confidences,
         )
+        scoring_data = scoring_data_from_batch(batch)
 
-        if not shot_coordinates:
-            return self._empty_scoring_data(), detections
-
-        shot_scores = []
-        score_distribution = {str(i): 0 for i in range(0, 11)}
-        for coordinate in shot_coordinates:
-            shot_score = self.distance_scoring.calculate_shot_score_by_distance(
-                coordinate, image_width, image_height, scoring_method=scoring_method
-            )
-            shot_scores.append(shot_score)
-            score_distribution[str(shot_score.score)] += 1
-
-        gropu_stats = self.scoring_calculator.calculate_group_statistics(shot_scores)
-
-        # calcular metricas totales
-        total_score = sum(shot.score for shot in shot_scores)
-        avg_score = total_score / len(shot_scores) if shot_scores else 0
-        max_score = max((shot.score for shot in shot_scores), default=0)
-
-        # preparar datos de puntuacion
-        scoring_data = {
-            "total_score": total_score,
-            "average_score_per_shot": avg_score,
-            "max_score_achieved": max_score,
-            "score_distribution": score_distribution,
-            "shooting_group_diameter": gropu_stats.diameter,
-            "group_center_x": gropu_stats.center_x,
-            "group_center_y": gropu_stats.center_y,
-        }
-
-        enhanced_detections = []
-        for i, detection in enumerate(detections):
-            if detection.get("es_fresco", False) and i < len(shot_scores):
-                shot_score = shot_scores[i]
-                enhanced_detection = {
-                    **detection,
-                    "scores": shot_score.score,  #
-                    "zone": shot_score.zone,
-                    "distance_from_center": shot_score.distance_from_center_pixels,
-                    "distance_ratio": shot_score.distance_from_center_ratio,
-                }
-                enhanced_detections.append(enhanced_detection)
-            else:
-                enhanced_detections.append(detection)
+        # Cada puntuación corresponde a la i-ésima detección fresca
+        annotate_detections(
+            detection_dicts, np.flatnonzero(detections.fresh_mask).tolist(), batch
+        )
 
-        return scoring_data, enhanced_detections
+        return scoring_data, detection_dicts
 
     def _empty_scoring_data(self) -> Dict[str, Any]:
         """Datos vacíos cuando no hay disparos frescos"""
-        return {
-            "total_score": 0,
-            "average_score_per_shot": 0.0,
-            "max_score_achieved": 0,
-            "score_distribution": {str(i): 0 for i in range(0, 11)},
-            "shooting_group_diameter": 0.0,
-            "group_center_x": 0.0,
-            "group_center_y": 0.0,
-        }
+        return empty_scoring_data()
 
     def _prepare_basic_analysis_data(
-        self, stats: dict, detections: list, confidence_threshold: float
+        self,
+        stats: dict,
+        detections: list,
+        confidence_threshold: float,
+        model_version: Optional[str] = None,
     ) -> dict:
         """Prepara datos básicos del análisis (compatible con modelo v2)"""
         return {
@@ -311,34 +734,28 @@ class EnhancedTargetAnalysisService:
             "confidence_stats": stats["confidence_stats"],
             "confidence_threshold": confidence_threshold,
             "analysis_method": "YOLO_v8",
-            "model_version": "2.0",  # ← ACTUALIZAR versión
+            "model_version": model_version or settings.ML_MODEL_VERSION,
         }
 
     def _create_analysis_with_scoring(
         self, target_image_id: UUID, basic_data: dict, scoring_data: Optional[dict]
     ) -> TargetAnalysisModel:
-        """Crea nuevo análisis con datos de puntuación opcionales"""
+        """Crea nuevo análisis con datos de puntuación opcionales (sin commit)"""
         return TargetAnalysisRepository.create_with_scoring(
-            self.db, target_image_id, basic_data, scoring_data
+            self.db, target_image_id, basic_data, scoring_data, commit=False
         )
 
     def _update_analysis_with_scoring(
         self, analysis_id: UUID, basic_data: dict, scoring_data: Optional[dict]
     ) -> TargetAnalysisModel:
-        """Actualiza análisis existente con datos de puntuación"""
-        # Actualizar datos básicos
-        updated_analysis = TargetAnalysisRepository.update(
-            self.db, analysis_id, basic_data
+        """Actualiza análisis existente con datos de puntuación (sin commit)"""
+        update_data = dict(basic_data)
+        if scoring_data:
+            update_data.update(TargetAnalysisRepository.scoring_columns(scoring_data))
+        return TargetAnalysisRepository.update(
+            self.db, analysis_id, update_data, commit=False
         )
 
-        # Actualizar datos de puntuación si están disponibles
-        if scoring_data and updated_analysis:
-            updated_analysis = TargetAnalysisRepository.update_scoring_data(
-                self.db, analysis_id, scoring_data
-            )
-
-        return updated_analysis
-
     def _build_enhanced_response(
         self,
         exercise_id: UUID,
@@ -383,6 +800,10 @@ class EnhancedTargetAnalysisService:
             response.puntuacion_maxima = db_analysis.max_score_achieved
             response.distribucion_puntuacion = db_analysis.score_distribution or {}
             response.diametro_grupo = db_analysis.shooting_group_diameter
+            response.radio_medio_grupo = db_analysis.group_mean_radius
+            response.cep50_grupo = db_analysis.group_cep50
+            response.dispersion_horizontal = db_analysis.group_horizontal_dispersion
+            response.dispersion_vertical = db_analysis.group_vertical_dispersion
             response.eficiencia_puntuacion = db_analysis.score_efficiency_percentage
 
             if db_analysis.group_center:
@@ -406,12 +827,37 @@ class EnhancedTargetAnalysisService:
         """Método de compatibilidad con el servicio original"""
         return self.get_exercise_analysis_with_scoring(exercise_id)
 
+    def _download_target_images(
+        self, file_paths: List[str], enable_scoring: bool = True
+    ) -> List[Any]:
+        """
+        Descarga varias imágenes en paralelo. Retorna, en el mismo orden, la
+        imagen o la excepción de su descarga.
+        """
+        if not file_paths:
+            return []
+
+        def load(file_path: str):
+            try:
+                return self._load_target_image(file_path, enable_scoring)
+            except Exception as e:
+                return e
+
+        workers = min(settings.ANALYSIS_SESSION_DOWNLOAD_CONCURRENCY, len(file_paths))
+        with ThreadPoolExecutor(
+            max_workers=max(workers, 1), thread_name_prefix="target-image-download"
+        ) as pool:
+            return list(pool.map(load, file_paths))
+
+    def _failed_result(self, exercise, error: Any) -> SessionExerciseAnalysisResult:
+        logger.warning(f"Análisis del ejercicio {exercise.id} falló: {error}")
+        return SessionExerciseAnalysisResult(
+            exercise_id=exercise.id, status="failed", error=str(error)
+        )
+
     def _download_image_from_s3(self, s3_path: str) -> bytes:
         """Descarga imagen desde S3 (método existente)"""
-        s3_url = f"{s3_path}"
-        response = requests.get(s3_url)
-        response.raise_for_status()
-        return response.content
+        return get_storage_client().get_bytes(s3_path)
 
     def _get_latest_analysis(
         self, target_image_id: UUID
@@ -419,17 +865,27 @@ class EnhancedTargetAnalysisService:
         """Obtiene análisis más reciente (método existente)"""
         return TargetAnalysisRepository.get_by_image_id(self.db, target_image_id)
 
-    def _consolidate_exercise_after_analysis(self, exercise_id: UUID):
-        """Consolidación después del análisis (método existente)"""
+    def _consolidate_exercise_after_analysis(
+        self,
+        exercise,
+        db_analysis: TargetAnalysisModel,
+        update_session_totals: bool = True,
+    ):
+        """
+        Consolida el ejercicio con el análisis recién guardado y confirma todo
+        junto: el análisis, el ejercicio y los totales de la sesión quedan en
+        una sola transacción (o no queda ninguno).
+        """
         try:
-            result = self.consolidation_service.update_exercise_from_analysis(
-                exercise_id=exercise_id
+            result = self.consolidation_service.consolidate_analysis(
+                exercise, db_analysis, update_session_totals=update_session_totals
             )
-            if result and result.ammunition_validation.warning:
-                logger.warning(
-                    f"Consolidación con advertencia: {result.ammunition_validation.warning}"
-                )
-            return result
-        except Exception as e:
-            logger.error(f"Error en consolidación: {str(e)}")
-            return None
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+        if result.ammunition_validation.warning:
+            logger.warning(
+                f"Consolidación con advertencia: {result.ammunition_validation.warning}"
+            )
+        return result
@@ -31,8 +31,13 @@ class ExerciseConsolidationService:
         self.session_repo = PracticeSessionRepository()
 
     def update_exercise_from_analysis(
-        self, exercise_id: UUID
+        self, exercise_id: UUID, update_session_totals: bool = True
     ) -> ExerciseConsolidationResult:
+        """
+        Consolida el ejercicio con su análisis más reciente. Con
+        `update_session_totals=False` no recalcula los totales de la sesión
+        (el análisis por sesión los recalcula una sola vez al final).
+        """
         try:
             # Obtener ejercicio con sus relaciones
             exercise = self.exercise_repo.get_with_relations(
@@ -59,52 +64,63 @@ class ExerciseConsolidationService:
                     detail="No se encontró análisis para la imagen del ejercicio",
                 )
 
-            # Validar consistencia de munición
-            ammunition_validation = self.validate_ammunition_consistency(
-                exercise, analysis
-            )
-
-            # ✅ NUEVO: Calcular métricas con puntuación
-            exercise_updates = self.calculate_exercise_metrics_with_scoring(
-                exercise, analysis, ammunition_validation
-            )
-
-            # Actualizar ejercicio en base de datos
-            success = self.exercise_repo.update_metrics(
-                self.db, exercise_id, exercise_updates.model_dump()
-            )
-
-            if not success:
-                raise HTTPException(
-                    status_code=500, detail="Error actualizando ejercicio"
-                )
-
-            # ✅ NUEVO: Recalcular totales de la sesión con puntuación
-            self.session_repo.update_totals_with_scoring(self.db, exercise.session_id)
-
-            return ExerciseConsolidationResult(
-                exercise_id=exercise_id,
-                updated_successfully=True,
-                ammunition_used=exercise_updates.ammunition_used,
-                hits=exercise_updates.hits,
-                accuracy_percentage=exercise_updates.accuracy_percentage,
-                # ✅ NUEVOS campos en el resultado
-                total_score=exercise_updates.total_score,
-                average_score_per_shot=exercise_updates.average_score_per_shot,
-                ammunition_validation=ammunition_validation,
-                total_impacts_detected=analysis.total_impacts_detected,
-                message="Ejercicio actualizado exitosamente con puntuación",
+            result = self.consolidate_analysis(
+                exercise, analysis, update_session_totals=update_session_totals
             )
+            self.db.commit()
+            return result
 
         except HTTPException:
+            self.db.rollback()
             raise
         except Exception as e:
+            self.db.rollback()
             logger.error(f"❌ Error actualizando ejercicio {exercise_id}: {str(e)}")
             raise HTTPException(
                 status_code=500,
                 detail=f"❌ Error interno actualizando ejercicio: {str(e)}",
             )
 
+    def consolidate_analysis(
+        self, exercise, analysis, update_session_totals: bool = True
+    ) -> ExerciseConsolidationResult:
+        """
+        Consolida con el ejercicio y el análisis ya cargados, sin volver a
+        consultarlos: un UPDATE del ejercicio y, si corresponde, uno de la
+        sesión con agregados SQL. No confirma; el llamador hace commit junto
+        con el guardado del análisis.
+        """
+        # Validar consistencia de munición
+        ammunition_validation = self.validate_ammunition_consistency(exercise, analysis)
+
+        # ✅ NUEVO: Calcular métricas con puntuación
+        exercise_updates = self.calculate_exercise_metrics_with_scoring(
+            exercise, analysis, ammunition_validation
+        )
+
+        if not self.exercise_repo.apply_metrics(
+            self.db, exercise.id, exercise_updates.model_dump()
+        ):
+            raise HTTPException(status_code=500, detail="Error actualizando ejercicio")
+
+        # ✅ NUEVO: Recalcular totales de la sesión con puntuación
+        if update_session_totals:
+            self.session_repo.refresh_totals_with_scoring(self.db, exercise.session_id)
+
+        return ExerciseConsolidationResult(
+            exercise_id=exercise.id,
+            updated_successfully=True,
+            ammunition_used=exercise_updates.ammunition_used,
+            hits=exercise_updates.hits,
+            accuracy_percentage=exercise_updates.accuracy_percentage,
+            # ✅ NUEVOS campos en el resultado
+            total_score=exercise_updates.total_score,
+            average_score_per_shot=exercise_updates.average_score_per_shot,
+            ammunition_validation=ammunition_validation,
+            total_impacts_detected=analysis.total_impacts_detected,
+            message="Ejercicio actualizado exitosamente con puntuación",
+        )
+
     def validate_ammunition_consistency(
         self, exercise, analysis
     ) -> AmmunitionValidationResult:
@@ -26,6 +26,7 @@ from src.infraestructure.database.models.practice_session_model import (
 from src.infraestructure.database.models.practice_exercise_model import (
     PracticeExerciseModel,
 )
+from src.infraestructure.utils.tracing import stage, traced_pipeline
 
 logger = logging.getLogger(__name__)
 
@@ -37,6 +38,7 @@ class SessionFinalizationService:
         self.exercise_repo = ExerciseRepository()
         self.consolidation_service = ExerciseConsolidationService(self.db)
 
+    @traced_pipeline("session_finalization")
     def finish_session(
         self, session_id: UUID, shooter_id: UUID
     ) -> SessionFinalizationResult:
@@ -53,19 +55,24 @@ class SessionFinalizationService:
                 raise HTTPException(status_code=400, detail="Sesión ya finalizada")
 
             # 2. Validar que esté lista
-            validation = self.validate_session_for_completion(session_id)
+            with stage("validation"):
+                validation = self.validate_session_for_completion(session_id)
             if not validation.can_finish:
                 raise HTTPException(status_code=400, detail=validation.reason)
 
             # 3. ✅ CONSOLIDAR con puntuación
-            consolidation_result = (
-                self.consolidation_service.consolidate_all_session_exercises(session_id)
-            )
+            with stage("consolidation"):
+                consolidation_result = (
+                    self.consolidation_service.consolidate_all_session_exercises(
+                        session_id
+                    )
+                )
 
             # 4. ✅ CALCULAR totales finales CON puntuación
-            final_stats = self.session_repo.calculate_totals_with_scoring(
-                self.db, session_id
-            )
+            with stage("totals"):
+                final_stats = self.session_repo.calculate_totals_with_scoring(
+                    self.db, session_id
+                )
 
             if final_stats.get("error"):
                 raise HTTPException(
@@ -75,15 +82,17 @@ class SessionFinalizationService:
 
             # 5. Finalizar sesión
             evaluation_pending = session.instructor_id is not None
-            success = self.session_repo.finish_session_with_evaluation_status(
-                self.db, session_id, evaluation_pending
-            )
+            with stage("finish"):
+                success = self.session_repo.finish_session_with_evaluation_status(
+                    self.db, session_id, evaluation_pending
+                )
 
             if not success:
                 raise HTTPException(status_code=500, detail="Error finalizando")
 
             # 6. ✅ ACTUALIZAR estadísticas del tirador CON puntuación
-            self._update_shooter_stats_with_scoring(session_id, shooter_id)
+            with stage("shooter_stats"):
+                self._update_shooter_stats_with_scoring(session_id, shooter_id)
 
             # 7. Obtener sesión actualizada
             updated_session = self.session_repo.get_by_id(self.db, session_id)
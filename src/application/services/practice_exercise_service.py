@@ -1,4 +1,3 @@
-import io
 import json
 import logging
 import math
@@ -6,13 +5,16 @@ from datetime import datetime
 from typing import Any, Dict, List, Optional, Tuple
 from uuid import UUID
 
-import cv2
-import numpy as np
-import requests
 from fastapi import Depends, UploadFile
-from PIL import Image
 from sqlalchemy.orm import Session
 
+from src.application.services.analysis_overlays import AnalysisOverlayService
+from src.application.services.duplicate_images import (
+    duplicate_info,
+    find_near_duplicate,
+    fingerprint_columns,
+    read_upload_fingerprint,
+)
 from src.infraestructure.database.repositories.ammunition_repo import (
     AmmunitionRepository,
 )
@@ -32,7 +34,7 @@ from src.infraestructure.database.repositories.target_images_repo import (
 from src.infraestructure.database.repositories.target_repo import TargetRepository
 from src.infraestructure.database.repositories.weapon_repo import WeaponRepository
 from src.infraestructure.database.session import get_db
-from src.infraestructure.utils.s3_utils import upload_file_to_s3
+from src.infraestructure.utils.s3_utils import stream_upload_to_s3
 from src.presentation.schemas.practice_exercise_schema import (
     PerformanceAnalysis,
     PracticeExerciseCreate,
@@ -301,10 +303,25 @@ class PracticeExerciseService:
                 # Si no se pide reemplazo y ya hay imagen, retornar error
                 return None, "EXERCISE_ALREADY_HAS_IMAGE"
 
+            # Huella perceptual: detectar re-subidas de una foto anterior
+            image_fingerprint = read_upload_fingerprint(file)
+            duplicate = find_near_duplicate(
+                self.db,
+                exercise.session.shooter_id if exercise.session else None,
+                image_fingerprint,
+            )
+            if duplicate:
+                logger.info(
+                    "Near-duplicate upload | exercise_id=%s duplicate_of=%s distance=%d",
+                    str(exercise_id),
+                    str(duplicate.image_id),
+                    duplicate.distance,
+                )
+
             folder = f"target_images/{user_id}"
 
             logger.info("Preparing S3 upload | bucket=%s folder=%s", "proshooterdata", folder)
-            file_url = upload_file_to_s3(
+            stored = stream_upload_to_s3(
                 file,
                 file_name_prefix="exercise_image",
                 bucket_name="proshooterdata",
@@ -315,11 +332,13 @@ class PracticeExerciseService:
 
             logger.info("Intentando subir imagen")
             # Use logger formatting with placeholders to avoid TypeError when args are provided
-            logger.info("File Url: %s", file_url)
+            logger.info("File Url: %s", stored.url)
             image_dict = {
-                "file_path": file_url,
-                "file_size": file.size,
+                "file_path": stored.url,
+                "file_size": stored.size,
                 "content_type": file.content_type,
+                "content_sha256": stored.sha256,
+                **fingerprint_columns(image_fingerprint, duplicate),
             }
             new_image = TargetImagesRepository.create(self.db, image_dict)
             # Actualizar el ejercicio con el id de la imagen
@@ -332,7 +351,13 @@ class PracticeExerciseService:
                 file_size=new_image.file_size,
                 content_type=new_image.content_type,
                 upload_status="SUCCESS",
-                message="Image uploaded and associated successfully",
+                message=(
+                    "Image uploaded and associated successfully; it looks like a "
+                    "previous upload"
+                    if duplicate
+                    else "Image uploaded and associated successfully"
+                ),
+                duplicate_of=duplicate_info(self.db, duplicate),
             )
             return response, None
         except Exception as e:
@@ -480,87 +505,10 @@ class PracticeExerciseService:
             if not image.file_path or not image.file_path.startswith("http"):
                 return None, "IMAGE_FILE_PATH_INVALID"
 
-            response = requests.get(image.file_path)
-            if response.status_code != 200:
-                return None, "IMAGE_DOWNLOAD_ERROR"
-            image_bytes = response.content
-
-            pil_image = Image.open(io.BytesIO(image_bytes)).convert("RGB")
-            image_np = np.array(pil_image)
-            h, w = image_np.shape[:2]
-
-            if mode == "heatmap":
-                # Mapa de calor tipo "predator"
-                heatmap = np.zeros((h, w), dtype=np.float32)
-                for impact in analysis.impact_coordinates:
-                    x = int(impact.get("centro_x", 0))
-                    y = int(impact.get("centro_y", 0))
-                    if 0 <= x < w and 0 <= y < h:
-                        cv2.circle(heatmap, (x, y), 20, 1, thickness=-1)
-                heatmap = cv2.GaussianBlur(heatmap, (0, 0), sigmaX=15, sigmaY=15)
-                heatmap_norm = cv2.normalize(heatmap, None, 0, 255, cv2.NORM_MINMAX)
-                heatmap_color = cv2.applyColorMap(
-                    heatmap_norm.astype(np.uint8), cv2.COLORMAP_JET
-                )
-                alpha = 0.3
-                image_opaca = (image_np * alpha).astype(np.uint8)
-                result = cv2.addWeighted(image_opaca, 1, heatmap_color, 0.7, 0)
-            else:
-                # Imagen normal con impactos marcados
-                for impact in analysis.impact_coordinates:
-                    x = int(impact.get("centro_x", 0))
-                    y = int(impact.get("centro_y", 0))
-                    es_fresco = impact.get("es_fresco", False)
-                    color = (0, 255, 0) if es_fresco else (255, 0, 0)
-                    cv2.circle(image_np, (x, y), 15, color, thickness=3)
-
-                    # Corrección: obtener valores legibles y seguros
-                    score_val = impact.get("scores")
-                    score_str = str(score_val) if score_val not in [None, ""] else "-"
-
-                    zone_val = impact.get("zone")
-                    zone_str = str(zone_val) if zone_val not in [None, ""] else "-"
-
-                    confianza_val = impact.get("confianza")
-                    try:
-                        confianza_float = float(confianza_val)
-                        confianza_str = f"{confianza_float:.2f}"
-                    except (ValueError, TypeError):
-                        confianza_str = "-"
-
-                    try:
-                        dist_center = float(impact.get("distance_from_center", None))
-                        dist_center_str = (
-                            f"{dist_center:.1f}"
-                            if dist_center not in [None, 0]
-                            else "-"
-                        )
-                    except (ValueError, TypeError):
-                        dist_center_str = "-"
-
-                    info_text = (
-                        f"Score: {score_str} | "
-                        f"Zone: {zone_str} | "
-                        f"Dist: {dist_center_str}"
-                    )
-                    cv2.putText(
-                        image_np,
-                        info_text,
-                        (x + 20, y - 20),
-                        cv2.FONT_HERSHEY_SIMPLEX,
-                        0.6,
-                        (255, 255, 255),
-                        1,
-                        cv2.LINE_AA,
-                    )
-
-                result = image_np
-
-            result_image = Image.fromarray(result)
-            buf = io.BytesIO()
-            result_image.save(buf, format="JPEG")
-            buf.seek(0)
-            return buf.read(), None
+            # Se renderiza una vez por versión del análisis y se reutiliza
+            return AnalysisOverlayService(self.db).get_overlay(
+                analysis, image.file_path, mode
+            )
 
         except Exception as e:
             return None, f"ERROR_DRAWING_IMPACTS: {str(e)}"
@@ -1,12 +1,7 @@
 from datetime import datetime
 from sqlalchemy.orm import Session
 import logging
-import io
-import requests
-import cv2
 import base64
-import numpy as np
-from PIL import Image as PILImage
 
 # from PIL import Image
 from fastapi import HTTPException, Depends
@@ -34,6 +29,8 @@ import matplotlib.patches as patches
 
 from src.presentation.schemas.reports import ReportRequest, ReportData, ReportType
 from src.infraestructure.database.session import get_db
+from src.infraestructure.utils.tracing import stage, traced_pipeline
+from src.application.services.analysis_overlays import AnalysisOverlayService
 
 
 class ReportService:
@@ -44,6 +41,7 @@ class ReportService:
         self.pdf_generator = PDFReportGenerator()
         self.logger = logging.getLogger(__name__)
 
+    @traced_pipeline("report")
     async def generate_report(
         self, report_request: ReportRequest, current_user_id: str
     ) -> bytes:
@@ -65,14 +63,15 @@ class ReportService:
             self._validate_report_data(report_data)
 
             # Generar PDF según el tipo
-            if report_request.report_type == ReportType.INDIVIDUAL_SESSION:
-                pdf_bytes = self.pdf_generator.generate_session_report(report_data)
-            elif report_request.report_type == ReportType.MONTHLY_SUMMARY:
-                pdf_bytes = self.pdf_generator.generate_monthly_report(report_data)
-            else:
-                raise HTTPException(
-                    status_code=400, detail="Tipo de reporte no soportado"
-                )
+            with stage("render_pdf"):
+                if report_request.report_type == ReportType.INDIVIDUAL_SESSION:
+                    pdf_bytes = self.pdf_generator.generate_session_report(report_data)
+                elif report_request.report_type == ReportType.MONTHLY_SUMMARY:
+                    pdf_bytes = self.pdf_generator.generate_monthly_report(report_data)
+                else:
+                    raise HTTPException(
+                        status_code=400, detail="Tipo de reporte no soportado"
+                    )
 
             print(f"✅ PDF generado exitosamente, tamaño: {len(pdf_bytes)} bytes")
             return pdf_bytes
@@ -119,22 +118,26 @@ class ReportService:
         print(f"🔍 Recopilando datos para shooter_id: {request.shooter_id}")
 
         # Obtener información del tirador
-        shooter_info = self._get_shooter_info(request.shooter_id)
+        with stage("shooter_info"):
+            shooter_info = self._get_shooter_info(request.shooter_id)
         print(f"🔍 Shooter info obtenido: {bool(shooter_info)}")
 
         # Obtener sesiones de práctica
-        sessions = self._get_practice_sessions(request)
+        with stage("sessions"):
+            sessions = self._get_practice_sessions(request)
         print(f"🔍 Sesiones obtenidas: {len(sessions)}")
         self._debug_session_data(sessions)
 
         # Obtener estadísticas
-        statistics = self._get_shooter_statistics(request.shooter_id)
+        with stage("statistics"):
+            statistics = self._get_shooter_statistics(request.shooter_id)
         print(f"🔍 Estadísticas obtenidas: {bool(statistics)}")
 
         # Obtener evaluaciones
-        evaluations = self._get_evaluations(
-            request.shooter_id, request.start_date, request.end_date
-        )
+        with stage("evaluations"):
+            evaluations = self._get_evaluations(
+                request.shooter_id, request.start_date, request.end_date
+            )
         print(f"🔍 Evaluaciones obtenidas: {len(evaluations)}")
 
         # Obtener ejercicios
@@ -144,7 +147,8 @@ class ReportService:
         # Generar imágenes de análisis si se solicitan
         analysis_images = []
         if request.include_images:
-            analysis_images = self._generate_analysis_images(sessions)
+            with stage("analysis_images"):
+                analysis_images = self._generate_analysis_images(sessions)
 
         return ReportData(
             shooter_info=shooter_info,
@@ -739,48 +743,15 @@ class ReportService:
             if not image.file_path or not image.file_path.startswith("http"):
                 return None
 
-            response = requests.get(image.file_path)
-            if response.status_code != 200:
+            # Misma imagen que sirve la API, renderizada una vez por análisis
+            image_bytes, error = AnalysisOverlayService(self.db).get_overlay(
+                analysis, image.file_path, mode
+            )
+            if error:
+                self.logger.warning(f"⚠️ Imagen con impactos no disponible: {error}")
                 return None
 
-            # Procesar imagen
-            pil_image = PILImage.open(io.BytesIO(response.content)).convert("RGB")
-            image_np = np.array(pil_image)
-            h, w = image_np.shape[:2]
-
-            # Dibujar impactos
-            for impact in analysis.impact_coordinates:
-                x = int(impact.get("centro_x", 0))
-                y = int(impact.get("centro_y", 0))
-                es_fresco = impact.get("es_fresco", False)
-
-                # Color: verde para frescos, rojo para cubiertos
-                color = (0, 255, 0) if es_fresco else (255, 0, 0)
-                cv2.circle(image_np, (x, y), 15, color, thickness=3)
-
-                # Información del impacto
-                score = impact.get("scores", "-")
-                zone = impact.get("zone", "-")
-
-                info_text = f"Score: {score} | Zone: {zone}"
-                cv2.putText(
-                    image_np,
-                    info_text,
-                    (x + 20, y - 20),
-                    cv2.FONT_HERSHEY_SIMPLEX,
-                    0.5,
-                    (255, 255, 255),
-                    1,
-                    cv2.LINE_AA,
-                )
-
-            # Convertir a base64
-            result_image = PILImage.fromarray(image_np)
-            buf = io.BytesIO()
-            result_image.save(buf, format="JPEG", quality=85)
-            buf.seek(0)
-
-            return base64.b64encode(buf.getvalue()).decode("utf-8")
+            return base64.b64encode(image_bytes).decode("utf-8")
 
         except Exception as e:
             self.logger.error(f"❌ Error generando imagen con impactos: {e}")
@@ -0,0 +1,319 @@
+"""
+Re-puntúa en bloque los análisis guardados sin volver a correr el detector.
+
+Recorre `target_analyses` en bloques paginados por id, recalcula la puntuación
+y las métricas de grupo desde `impact_coordinates` con el puntaje vectorizado,
+escribe los cambios con UPDATE por lotes y re-consolida los ejercicios y
+sesiones afectados. Los análisis anteriores a `raw_detections` toman las
+dimensiones de `target_images` o, si tampoco están, del encabezado del archivo
+(que se guarda en `target_images` para la próxima vez). Después de cada bloque guarda un checkpoint, así una
+ejecución interrumpida continúa donde quedó.
+
+Uso:
+    python -m src.application.services.scoring_backfill --dry-run
+    python -m src.application.services.scoring_backfill \
+        --scoring-method linear --chunk-size 500 --checkpoint backfill.json
+
+Con `--dry-run` no escribe nada: imprime una línea JSON por análisis que
+cambiaría, con los valores anterior y nuevo de cada campo.
+"""
+
+import argparse
+import json
+import logging
+import math
+import os
+import sys
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, TextIO, Tuple
+from uuid import UUID
+
+import numpy as np
+from sqlalchemy.orm import Session
+
+from src.application.services.analysis_scoring import (
+    annotate_detections,
+    empty_scoring_data,
+    scoring_data_from_batch,
+)
+from src.application.services.exercise_consolidation import (
+    ExerciseConsolidationService,
+)
+from src.domain.services.distance_based_scoring import DistanceBasedScoringService
+from src.infraestructure.database.repositories.practice_exercise_repo import (
+    PracticeExerciseRepository,
+)
+from src.infraestructure.database.repositories.practice_session_repo import (
+    PracticeSessionRepository,
+)
+from src.infraestructure.database.repositories.target_analysis_repo import (
+    TargetAnalysisRepository,
+)
+from src.infraestructure.database.repositories.target_images_repo import (
+    TargetImagesRepository,
+)
+from src.infraestructure.database.session import SessionLocal
+from src.infraestructure.ml_models.decoded_image import DecodedImage
+from src.infraestructure.utils.storage_client import get_storage_client
+
+logger = logging.getLogger(__name__)
+
+SCORING_METHODS = ("linear", "exponential", "zones")
+# Bytes que se descargan para leer el tamaño del encabezado de la imagen
+HEADER_PROBE_BYTES = 128 * 1024
+
+
+@dataclass
+class BackfillProgress:
+    """Estado que se guarda en el checkpoint"""
+
+    last_id: Optional[str] = None
+    scoring_method: str = "linear"
+    scanned: int = 0
+    changed: int = 0
+    skipped: int = 0
+    exercises_consolidated: int = 0
+    sessions_updated: int = 0
+
+
+class ScoringBackfill:
+    def __init__(
+        self,
+        scoring_method: str = "linear",
+        chunk_size: int = 500,
+        checkpoint_path: Optional[Path] = None,
+        dry_run: bool = False,
+        session_factory: Callable[[], Session] = SessionLocal,
+        out: TextIO = sys.stdout,
+    ):
+        self.scoring_method = scoring_method
+        self.chunk_size = chunk_size
+        self.checkpoint_path = checkpoint_path
+        self.dry_run = dry_run
+        self.out = out
+        self._session_factory = session_factory
+        self.scoring = DistanceBasedScoringService()
+        # Dimensiones leídas del archivo en el bloque actual, por imagen
+        self._probed: Dict[UUID, Tuple[int, int]] = {}
+
+    def run(self, limit: Optional[int] = None) -> BackfillProgress:
+        """
+        Procesa los análisis desde el checkpoint (o desde el inicio) hasta el
+        final, o hasta `limit` análisis revisados en esta ejecución.
+        """
+        progress = self._load_checkpoint()
+        scanned_at_start = progress.scanned
+        db = self._session_factory()
+        try:
+            while True:
+                chunk_size = self.chunk_size
+                if limit is not None:
+                    chunk_size = min(
+                        chunk_size, limit - (progress.scanned - scanned_at_start)
+                    )
+                if chunk_size <= 0:
+                    break
+
+                after_id = UUID(progress.last_id) if progress.last_id else None
+                rows = TargetAnalysisRepository.get_scoring_chunk(
+                    db, after_id, chunk_size
+                )
+                if not rows:
+                    break
+
+                self._process_chunk(db, rows, progress)
+                progress.last_id = str(rows[-1].id)
+                if not self.dry_run:
+                    self._save_checkpoint(progress)
+                logger.info(
+                    f"Re-puntaje: {progress.scanned} revisados, "
+                    f"{progress.changed} cambiados, {progress.skipped} omitidos"
+                )
+        finally:
+            db.close()
+        return progress
+
+    def _process_chunk(self, db: Session, rows: List[Any], progress: BackfillProgress):
+        updates, changed_images = [], set()
+        for row in rows:
+            progress.scanned += 1
+            values = self.rescore_row(row)
+            if values is None:
+                progress.skipped += 1
+                continue
+
+            diff = self._diff(row, values)
+            if not diff:
+                continue
+            progress.changed += 1
+            if self.dry_run:
+                self.out.write(
+                    json.dumps({"analysis_id": str(row.id), "changes": diff}) + "\n"
+                )
+            else:
+                updates.append({"id": row.id, **values})
+                changed_images.add(row.target_image_id)
+
+        if self._probed and not self.dry_run:
+            TargetImagesRepository.save_dimensions(
+                db,
+                [
+                    {"id": image_id, "image_width": w, "image_height": h}
+                    for image_id, (w, h) in self._probed.items()
+                ],
+            )
+        self._probed.clear()
+
+        if not updates:
+            return
+
+        TargetAnalysisRepository.bulk_update_scoring(db, updates)
+        self._reconsolidate(db, list(changed_images), progress)
+
+    def rescore_row(self, row: Any) -> Optional[Dict[str, Any]]:
+        """
+        Campos de puntuación recalculados para un análisis, con los impactos
+        anotados de nuevo. None si no se puede re-puntuar (no se conocen las
+        dimensiones de la imagen ni se pueden leer del archivo).
+        """
+        dimensions = self._image_dimensions(row)
+        if dimensions is None:
+            return None
+        image_width, image_height = dimensions
+
+        detections = [dict(d) for d in (row.impact_coordinates or [])]
+        fresh = [i for i, d in enumerate(detections) if d.get("es_fresco", True)]
+        if not fresh:
+            return {**empty_scoring_data(), "impact_coordinates": detections}
+
+        batch = self.scoring.score_shots(
+            np.array([detections[i]["centro_x"] for i in fresh], dtype=np.float64),
+            np.array([detections[i]["centro_y"] for i in fresh], dtype=np.float64),
+            image_width,
+            image_height,
+            scoring_method=self.scoring_method,
+            confidence=np.array(
+                [detections[i].get("confianza", 1.0) for i in fresh],
+                dtype=np.float64,
+            ),
+        )
+        annotate_detections(detections, fresh, batch)
+        return {**scoring_data_from_batch(batch), "impact_coordinates": detections}
+
+    def _image_dimensions(self, row: Any) -> Optional[Tuple[float, float]]:
+        """Ancho y alto guardados o, si faltan, leídos del encabezado"""
+        if row.image_width and row.image_height:
+            return row.image_width, row.image_height
+        if not row.image_path:
+            return None
+        if row.target_image_id not in self._probed:
+            size = self._probe_dimensions(row.image_path)
+            if size is None:
+                return None
+            self._probed[row.target_image_id] = size
+        return self._probed[row.target_image_id]
+
+    @staticmethod
+    def _probe_dimensions(image_path: str) -> Optional[Tuple[int, int]]:
+        """
+        Tamaño de la imagen leyendo solo el inicio del archivo; si el
+        encabezado no cabe (p. ej. EXIF grande) se descarga completo.
+        """
+        storage = get_storage_client()
+        try:
+            try:
+                return DecodedImage(
+                    storage.get_prefix(image_path, HEADER_PROBE_BYTES)
+                ).size
+            except Exception:
+                return DecodedImage(storage.get_bytes(image_path)).size
+        except Exception as e:
+            logger.warning(f"No se pudo leer el tamaño de {image_path}: {e}")
+            return None
+
+    @staticmethod
+    def _diff(row: Any, values: Dict[str, Any]) -> Dict[str, List[Any]]:
+        """Campos de puntuación que cambian: {campo: [anterior, nuevo]}"""
+        diff = {}
+        for key, new in values.items():
+            if key == "impact_coordinates":
+                continue
+            old = getattr(row, key)
+            if key == "score_distribution":
+                if isinstance(old, str):
+                    old = json.loads(old)
+                if old != new:
+                    diff[key] = [old, new]
+            elif old is None or not math.isclose(old, new, abs_tol=1e-6):
+                diff[key] = [old, new]
+        return diff
+
+    def _reconsolidate(
+        self, db: Session, image_ids: List[UUID], progress: BackfillProgress
+    ):
+        """Re-consolida los ejercicios afectados y una vez cada sesión"""
+        consolidation = ExerciseConsolidationService(db)
+        sessions = set()
+        pairs = PracticeExerciseRepository.get_exercise_sessions_by_image_ids(
+            db, image_ids
+        )
+        for exercise_id, session_id in pairs:
+            try:
+                consolidation.update_exercise_from_analysis(
+                    exercise_id, update_session_totals=False
+                )
+                progress.exercises_consolidated += 1
+                sessions.add(session_id)
+            except Exception as e:
+                logger.warning(f"No se pudo consolidar ejercicio {exercise_id}: {e}")
+
+        for session_id in sessions:
+            PracticeSessionRepository.update_totals_with_scoring(db, session_id)
+            progress.sessions_updated += 1
+
+    def _load_checkpoint(self) -> BackfillProgress:
+        if not self.checkpoint_path or not self.checkpoint_path.exists():
+            return BackfillProgress(scoring_method=self.scoring_method)
+
+        progress = BackfillProgress(**json.loads(self.checkpoint_path.read_text()))
+        if progress.scoring_method != self.scoring_method:
+            raise ValueError(
+                f"El checkpoint es del método '{progress.scoring_method}', "
+                f"no de '{self.scoring_method}'"
+            )
+        logger.info(f"Continuando desde el análisis {progress.last_id}")
+        return progress
+
+    def _save_checkpoint(self, progress: BackfillProgress):
+        if not self.checkpoint_path:
+            return
+        # Escritura atómica: nunca queda un checkpoint a medio escribir
+        tmp_path = self.checkpoint_path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps(asdict(progress)))
+        os.replace(tmp_path, self.checkpoint_path)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Re-puntúa los análisis guardados sin volver a detectar"
+    )
+    parser.add_argument("--scoring-method", choices=SCORING_METHODS, default="linear")
+    parser.add_argument("--chunk-size", type=int, default=500)
+    parser.add_argument("--checkpoint", type=Path, default=None)
+    parser.add_argument("--limit", type=int, default=None)
+    parser.add_argument("--dry-run", action="store_true")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    progress = ScoringBackfill(
+        scoring_method=args.scoring_method,
+        chunk_size=args.chunk_size,
+        checkpoint_path=args.checkpoint,
+        dry_run=args.dry_run,
+    ).run(limit=args.limit)
+    print(json.dumps(asdict(progress)), file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,18 +1,29 @@
 import math
 import numpy as np
-from typing import List, Tuple, Dict
+from typing import List, Optional, Tuple, Dict
 from src.domain.entities.scoring import (
     ShotCoordinate,
     ShotScore,
+    ShotScoreBatch,
     GroupStatistics,
 )
 
+from src.domain.services.group_geometry import group_statistics
 from src.domain.value_objects.target_config import TargetConfiguration
 
 
 class ScoringCalculatorService:
     def __init__(self, target_config: TargetConfiguration):
         self.config = target_config
+        # Zonas ordenadas por radio una sola vez (de mayor a menor puntuación)
+        self._sorted_zones = sorted(self.config.zones, key=lambda z: z.radius_ratio)
+        self._zone_radii = np.array([z.radius_ratio for z in self._sorted_zones])
+        # Posición len(zonas) = fuera de todas las zonas
+        self._zone_scores = np.array([z.score for z in self._sorted_zones] + [0])
+        self._zone_names = np.array(
+            [f"zone_{z.score}" for z in self._sorted_zones] + ["outside"],
+            dtype=object,
+        )
 
     def calculate_shot_score(
         self, shot_coordinate: ShotCoordinate, image_width: int, image_height: int
@@ -46,9 +57,7 @@ class ScoringCalculatorService:
         zone = "outside"
 
         # Buscar en qué zona cae el disparo (de mayor a menor puntuación)
-        sorted_zones = sorted(self.config.zones, key=lambda z: z.radius_ratio)
-
-        for zone_info in sorted_zones:
+        for zone_info in self._sorted_zones:
             if distance_ratio <= zone_info.radius_ratio:
                 score = zone_info.score
                 zone = f"zone_{score}"
@@ -62,6 +71,40 @@ class ScoringCalculatorService:
             distance_from_center_ratio=distance_ratio,
         )
 
+    def score_shots(
+        self,
+        x: np.ndarray,
+        y: np.ndarray,
+        image_width: int,
+        image_height: int,
+        confidence: Optional[np.ndarray] = None,
+    ) -> ShotScoreBatch:
+        """
+        Igual que `calculate_shot_score` para todos los disparos a la vez; la
+        zona de cada uno se busca con `np.searchsorted` sobre los radios.
+        """
+        x = np.asarray(x, dtype=np.float64)
+        y = np.asarray(y, dtype=np.float64)
+        if confidence is None:
+            confidence = np.zeros_like(x)
+
+        center_x = image_width * self.config.center_x_ratio
+        center_y = image_height * self.config.center_y_ratio
+        distances = np.sqrt((x - center_x) ** 2 + (y - center_y) ** 2)
+        ratios = distances / (min(image_width, image_height) / 2)
+
+        # Primera zona (por radio ascendente) con ratio <= radio de la zona
+        zone_index = np.searchsorted(self._zone_radii, ratios, side="left")
+        return ShotScoreBatch(
+            x=x,
+            y=y,
+            confidence=np.asarray(confidence, dtype=np.float64),
+            scores=self._zone_scores[zone_index].astype(np.int64),
+            zones=self._zone_names[zone_index],
+            distances_pixels=distances,
+            distance_ratios=ratios,
+        )
+
     def calculate_multiple_shots_score(
         self,
         shot_coordinates: List[ShotCoordinate],
@@ -79,58 +122,27 @@ class ScoringCalculatorService:
         Returns:
             Tuple[List[ShotScore], Dict[str, int]]: _description_
         """
-        shot_scores = []
-        score_distribution = {str(i): 0 for i in range(0, 11)}  # 0-10 puntos
-        for coordinate in shot_coordinates:
-            shot_score = self.calculate_shot_score(
-                coordinate, image_width, image_height
-            )
-            shot_scores.append(shot_score)
-            score_distribution[str(shot_score.score)] += 1
-
-        return shot_scores, score_distribution
+        batch = self.score_shots(
+            [c.x for c in shot_coordinates],
+            [c.y for c in shot_coordinates],
+            image_width,
+            image_height,
+            confidence=[c.confidence for c in shot_coordinates],
+        )
+        shot_scores = batch.to_shot_scores()
+        # Se conservan los ShotCoordinate originales
+        for shot_score, coordinate in zip(shot_scores, shot_coordinates):
+            shot_score.coordinates = coordinate
+        return shot_scores, batch.score_distribution()  # 0-10 puntos
 
     def calculate_group_statistics(
         self, shot_scores: List[ShotScore]
     ) -> GroupStatistics:
-        if not shot_scores:
-            return GroupStatistics(
-                center_x=0.0,
-                center_y=0.0,
-                diameter=0.0,
-                average_distance_from_center=0.0,
-                std_deviation=0.0,
-                shots_count=0,
-            )
-        # extraer coordenadas
-        x_coords = [shot.coordinates.x for shot in shot_scores]
-        y_coords = [shot.coordinates.y for shot in shot_scores]
-
-        # centro del grupo (centroide)
-        group_center_x = float(np.mean(x_coords))
-        group_center_y = float(np.mean(y_coords))
-
-        # calcular diametro del grupo (maxima distancia entre disparos)
-        max_distance = 0.0
-        for i in range(len(shot_scores)):
-            for j in range(i + 1, len(shot_scores)):
-                dist = math.sqrt(
-                    (x_coords[i] - x_coords[j]) ** 2 + (y_coords[i] - y_coords[j]) ** 2
-                )
-                max_distance = max(max_distance, dist)
-
-        # calcular dispercion desde el centro del grupo
-        distances_from_group_center = [
-            math.sqrt((x - group_center_x) ** 2 * (y - group_center_y) ** 2)
-            for x, y in zip(x_coords, y_coords)
-        ]
-        avg_distance = np.mean(distances_from_group_center)
-        std_dev = np.std(distances_from_group_center)
-        return GroupStatistics(
-            center_x=group_center_x,
-            center_y=group_center_y,
-            diameter=max_distance,
-            average_distance_from_center=avg_distance,
-            std_deviation=std_dev,
-            shots_count=len(shot_scores),
+        """
+        Centro, diámetro (envolvente convexa + calibres rotatorios, O(n log n)),
+        radio medio, CEP50 y dispersión horizontal/vertical del grupo.
+        """
+        return group_statistics(
+            [shot.coordinates.x for shot in shot_scores],
+            [shot.coordinates.y for shot in shot_scores],
         )
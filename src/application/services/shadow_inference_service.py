@@ -0,0 +1,267 @@
+import logging
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional, Union
+from uuid import UUID
+
+import numpy as np
+from sqlalchemy.orm import Session
+
+from src.infraestructure.config.settings import settings
+from src.infraestructure.database.repositories.shadow_inference_repo import (
+    ShadowInferenceRepository,
+)
+from src.infraestructure.database.session import SessionLocal
+from src.infraestructure.ml_models.decoded_image import DecodedImage
+from src.infraestructure.ml_models.detection_columns import DetectionColumns
+from src.infraestructure.ml_models.inference_executor import (
+    InferenceQueueFullError,
+    get_inference_executor,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class ShadowInferenceService:
+    """
+    Ejecuta un modelo candidato ("sombra") sobre una muestra del tráfico, en
+    segundo plano y después de que el modelo principal ya respondió.
+
+    La inferencia pasa por el executor compartido (el pool de procesos con
+    ML_INFERENCE_WORKERS > 0); un hilo propio con pocos trabajos pendientes
+    espera el resultado y lo guarda. Si está ocupado, o la cola de inferencia
+    está llena, la muestra se descarta: nunca se hace esperar a la petición
+    del usuario. El
+    resultado (detecciones, latencia y concordancia con el modelo principal)
+    se guarda en `shadow_inference_results`.
+    """
+
+    def __init__(
+        self,
+        shadow_version: str,
+        sample_rate: float,
+        max_pending: int = 2,
+        session_factory: Callable[[], Session] = SessionLocal,
+    ):
+        self.shadow_version = shadow_version
+        self.sample_rate = sample_rate
+        self._session_factory = session_factory
+        self._slots = threading.BoundedSemaphore(max_pending)
+        self._pool = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="shadow-inference"
+        )
+        self._lock = threading.Lock()
+        self.submitted = 0
+        self.dropped = 0
+        self.completed = 0
+        self.errors = 0
+
+    def maybe_submit(
+        self,
+        target_image_id: UUID,
+        image: Union[bytes, DecodedImage],
+        primary_raw_detections: Dict[str, Any],
+        confidence_threshold: float,
+        primary_latency_ms: Optional[float] = None,
+    ) -> bool:
+        """
+        Agenda la inferencia sombra si la petición cae en la muestra.
+
+        Args:
+            target_image_id: Imagen analizada
+            image: La misma imagen que procesó el modelo principal
+            primary_raw_detections: Detecciones crudas del modelo principal
+                (formato de `raw_detections`)
+            confidence_threshold: Umbral solicitado, con el que se compara
+            primary_latency_ms: Latencia del modelo principal
+
+        Returns:
+            True si se agendó
+        """
+        primary_version = primary_raw_detections["model_version"].split("/")[0]
+        if primary_version == self.shadow_version:
+            return False
+        if random.random() >= self.sample_rate:
+            return False
+
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self.dropped += 1
+            return False
+
+        with self._lock:
+            self.submitted += 1
+        try:
+            future = self._pool.submit(
+                self._run,
+                target_image_id,
+                image,
+                primary_raw_detections,
+                primary_version,
+                confidence_threshold,
+                primary_latency_ms,
+            )
+        except Exception:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+        return True
+
+    def _run(
+        self,
+        target_image_id: UUID,
+        image: Union[bytes, DecodedImage],
+        primary_raw_detections: Dict[str, Any],
+        primary_version: str,
+        confidence_threshold: float,
+        primary_latency_ms: Optional[float],
+    ):
+        result_data = {
+            "target_image_id": target_image_id,
+            "primary_model_version": primary_version,
+            "shadow_model_version": self.shadow_version,
+            "confidence_threshold": confidence_threshold,
+            "primary_latency_ms": primary_latency_ms,
+        }
+
+        started_at = time.perf_counter()
+        try:
+            # Mismo umbral mínimo que el principal para comparar igual con igual
+            analysis = (
+                get_inference_executor()
+                .submit(
+                    image,
+                    primary_raw_detections["confidence_floor"],
+                    model_version=self.shadow_version,
+                )
+                .result()
+            )
+            result_data["shadow_latency_ms"] = (time.perf_counter() - started_at) * 1000
+            result_data["shadow_raw_detections"] = analysis["detections"]
+            result_data.update(
+                self.compare_detections(
+                    DetectionColumns.from_payload(
+                        primary_raw_detections["detections"]
+                    ).filter_confidence(confidence_threshold),
+                    DetectionColumns.from_payload(
+                        analysis["detections"]
+                    ).filter_confidence(confidence_threshold),
+                )
+            )
+        except InferenceQueueFullError:
+            # El tráfico real tiene prioridad: la muestra se descarta
+            with self._lock:
+                self.dropped += 1
+            return
+        except Exception as e:
+            logger.error(f"Inferencia sombra {self.shadow_version} falló: {str(e)}")
+            result_data["error"] = str(e)
+
+        try:
+            db = self._session_factory()
+            try:
+                ShadowInferenceRepository.create(db, result_data)
+            finally:
+                db.close()
+        except Exception as e:
+            logger.error(f"No se pudo guardar la inferencia sombra: {str(e)}")
+            result_data.setdefault("error", str(e))
+
+        with self._lock:
+            if "error" in result_data:
+                self.errors += 1
+            else:
+                self.completed += 1
+
+    @staticmethod
+    def compare_detections(
+        primary: DetectionColumns, shadow: DetectionColumns, iou_threshold: float = 0.5
+    ) -> Dict[str, Any]:
+        """
+        Empareja detecciones por IoU (greedy, de mayor a menor) y mide la
+        concordancia del modelo sombra tomando al principal como referencia.
+        """
+        matched_ious = []
+        if len(primary) and len(shadow):
+            a = primary.boxes[:, None, :]
+            b = shadow.boxes[None, :, :]
+            inter_w = np.clip(
+                np.minimum(a[..., 2], b[..., 2]) - np.maximum(a[..., 0], b[..., 0]),
+                0,
+                None,
+            )
+            inter_h = np.clip(
+                np.minimum(a[..., 3], b[..., 3]) - np.maximum(a[..., 1], b[..., 1]),
+                0,
+                None,
+            )
+            inter = inter_w * inter_h
+            union = primary.areas[:, None] + shadow.areas[None, :] - inter
+            iou = inter / np.maximum(union, 1e-9)
+
+            used_primary, used_shadow = set(), set()
+            candidates = np.argwhere(iou >= iou_threshold)
+            order = np.argsort(-iou[candidates[:, 0], candidates[:, 1]])
+            for i, j in candidates[order].tolist():
+                if i in used_primary or j in used_shadow:
+                    continue
+                used_primary.add(i)
+                used_shadow.add(j)
+                matched_ious.append(float(iou[i, j]))
+
+        matched = len(matched_ious)
+        return {
+            "primary_detections": len(primary),
+            "shadow_detections": len(shadow),
+            "matched_detections": matched,
+            "precision": matched / len(shadow) if len(shadow) else None,
+            "recall": matched / len(primary) if len(primary) else None,
+            "mean_iou": float(np.mean(matched_ious)) if matched_ious else None,
+        }
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "shadow_model_version": self.shadow_version,
+                "sample_rate": self.sample_rate,
+                "submitted": self.submitted,
+                "dropped": self.dropped,
+                "completed": self.completed,
+                "errors": self.errors,
+            }
+
+    def shutdown(self, wait: bool = False):
+        self._pool.shutdown(wait=wait, cancel_futures=True)
+
+
+_shadow_service: Optional[ShadowInferenceService] = None
+_shadow_service_lock = threading.Lock()
+
+
+def get_shadow_inference_service() -> Optional[ShadowInferenceService]:
+    """Servicio compartido del proceso, o None si no hay modelo sombra"""
+    global _shadow_service
+    if not settings.ML_SHADOW_MODEL_VERSION or settings.ML_SHADOW_SAMPLE_RATE <= 0:
+        return None
+
+    with _shadow_service_lock:
+        if _shadow_service is None:
+            _shadow_service = ShadowInferenceService(
+                shadow_version=settings.ML_SHADOW_MODEL_VERSION,
+                sample_rate=settings.ML_SHADOW_SAMPLE_RATE,
+            )
+            logger.info(
+                f"Inferencia sombra con el modelo {settings.ML_SHADOW_MODEL_VERSION} "
+                f"sobre {settings.ML_SHADOW_SAMPLE_RATE:.0%} del tráfico"
+            )
+        return _shadow_service
+
+
+def shutdown_shadow_inference_service():
+    global _shadow_service
+    with _shadow_service_lock:
+        if _shadow_service is not None:
+            _shadow_service.shutdown()
+            _shadow_service = None
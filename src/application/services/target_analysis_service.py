@@ -1,4 +1,3 @@
-import requests
 from io import BytesIO
 from PIL import Image
 import numpy as np
@@ -11,6 +10,7 @@ import logging
 
 from src.infraestructure.ml_models import get_bullet_detector, BulletDetectorError
 from src.infraestructure.database.session import get_db
+from src.infraestructure.utils.storage_client import get_storage_client
 from src.infraestructure.database.repositories.practice_exercise_repo import (
     PracticeExerciseRepository,
 )
@@ -128,10 +128,7 @@ class TargetAnalysisService:
 
     def _download_image_from_s3(self, s3_path: str) -> bytes:
         """Descarga la imagen desde S3 y la devuelve como bytes."""
-        s3_url = f"{s3_path}"
-        response = requests.get(s3_url)
-        response.raise_for_status()
-        return response.content
+        return get_storage_client().get_bytes(s3_path)
 
     def _process_detections(
         self, detections: List, confidence_threshold: float
@@ -9,13 +9,19 @@ import cv2
 import numpy as np
 from PIL import Image
 from fastapi import UploadFile
+from src.application.services.duplicate_images import (
+    duplicate_info,
+    find_near_duplicate,
+    fingerprint_columns,
+    read_upload_fingerprint,
+)
 from src.infraestructure.database.repositories.target_images_repo import (
     TargetImagesRepository,
 )
 from src.infraestructure.database.repositories.practice_exercise_repo import (
     PracticeExerciseRepository,
 )
-from src.infraestructure.utils.s3_utils import upload_file_to_s3
+from src.infraestructure.utils.s3_utils import stream_upload_to_s3
 from src.infraestructure.database.session import get_db
 from src.presentation.schemas.target_images_schema import (
     TargetImageCreate,
@@ -46,9 +52,16 @@ class TargetImagesService:
             )
             if not exercise:
                 return None, "EXERCISE_NOT_FOUND"
+            # Huella perceptual: detectar re-subidas de una foto anterior
+            image_fingerprint = read_upload_fingerprint(file)
+            duplicate = find_near_duplicate(
+                self.db,
+                exercise.session.shooter_id if exercise.session else None,
+                image_fingerprint,
+            )
             folder = f"target_images/{user_id}"
 
-            file_url = upload_file_to_s3(
+            stored = stream_upload_to_s3(
                 file,
                 bucket_name="proshooterdata",
                 folder=folder,
@@ -57,9 +70,11 @@ class TargetImagesService:
 
             # guardar
             image_dict = image_data.model_dump()
-            image_dict["file_path"] = file_url
-            image_dict["file_size"] = file.size
+            image_dict["file_path"] = stored.url
+            image_dict["file_size"] = stored.size
+            image_dict["content_sha256"] = stored.sha256
             image_dict["content_type"] = file.content_type
+            image_dict.update(fingerprint_columns(image_fingerprint, duplicate))
             new_image = TargetImagesRepository.create(self.db, image_dict)
 
             response = TargetImageUploadResponse(
@@ -68,7 +83,12 @@ class TargetImagesService:
                 file_size=new_image.file_size,
                 content_type=new_image.content_type,
                 upload_status="SUCCESS",
-                message="Image uploaded successfully",
+                message=(
+                    "Image uploaded successfully; it looks like a previous upload"
+                    if duplicate
+                    else "Image uploaded successfully"
+                ),
+                duplicate_of=duplicate_info(self.db, duplicate),
             )
 
             return response, None
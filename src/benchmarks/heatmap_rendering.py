@@ -0,0 +1,122 @@
+"""
+Compara el mapa de calor a resolución reducida contra el dibujo original a
+resolución completa.
+
+Uso:
+    python -m src.benchmarks.heatmap_rendering --repeats 5 --output heatmap.json
+
+Para cada resolución genera un blanco sintético y mide el render completo
+(decodificación, mapa de calor, mezcla y JPEG) con ambos métodos: latencia
+p50/p95 y pico de memoria de los arrays (numpy/OpenCV, con tracemalloc).
+"""
+
+import argparse
+import io
+import json
+import time
+import tracemalloc
+from typing import Callable, Dict, List
+
+import cv2
+import numpy as np
+from PIL import Image
+
+from src.application.services.analysis_overlays import render_overlay
+from src.benchmarks.synthetic_targets import render_target
+
+RESOLUTIONS = [(1920, 1440), (3024, 4032), (5000, 5000)]
+
+
+def render_full_resolution_heatmap(image_bytes: bytes, impacts: List[Dict]) -> bytes:
+    """Dibujo original: disco por impacto y GaussianBlur sobre la foto completa"""
+    image_np = np.array(Image.open(io.BytesIO(image_bytes)).convert("RGB"))
+    h, w = image_np.shape[:2]
+    heatmap = np.zeros((h, w), dtype=np.float32)
+    for impact in impacts:
+        x = int(impact.get("centro_x", 0))
+        y = int(impact.get("centro_y", 0))
+        if 0 <= x < w and 0 <= y < h:
+            cv2.circle(heatmap, (x, y), 20, 1, thickness=-1)
+    heatmap = cv2.GaussianBlur(heatmap, (0, 0), sigmaX=15, sigmaY=15)
+    heatmap_norm = cv2.normalize(heatmap, None, 0, 255, cv2.NORM_MINMAX)
+    heatmap_color = cv2.applyColorMap(heatmap_norm.astype(np.uint8), cv2.COLORMAP_JET)
+    image_opaca = (image_np * 0.3).astype(np.uint8)
+    result = cv2.addWeighted(image_opaca, 1, heatmap_color, 0.7, 0)
+
+    buf = io.BytesIO()
+    Image.fromarray(result).save(buf, format="JPEG")
+    return buf.getvalue()
+
+
+def render_reduced_heatmap(image_bytes: bytes, impacts: List[Dict]) -> bytes:
+    return render_overlay(image_bytes, impacts, "heatmap")
+
+
+def _measure(render: Callable, image_bytes: bytes, impacts: List[Dict], repeats: int):
+    latencies_ms: List[float] = []
+    for _ in range(repeats):
+        started_at = time.perf_counter()
+        render(image_bytes, impacts)
+        latencies_ms.append((time.perf_counter() - started_at) * 1000)
+
+    tracemalloc.start()
+    render(image_bytes, impacts)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "latency_ms_p50": float(np.percentile(latencies_ms, 50)),
+        "latency_ms_p95": float(np.percentile(latencies_ms, 95)),
+        "peak_mb": peak / (1024 * 1024),
+    }
+
+
+def run_benchmark(repeats: int = 5, holes: int = 30) -> List[Dict]:
+    rows = []
+    for width, height in RESOLUTIONS:
+        target = render_target(width, height, holes=holes, seed=0)
+        impacts = [{"centro_x": x, "centro_y": y} for x, y, _ in target.holes]
+        full = _measure(
+            render_full_resolution_heatmap, target.image_data, impacts, repeats
+        )
+        reduced = _measure(render_reduced_heatmap, target.image_data, impacts, repeats)
+        rows.append(
+            {
+                "resolution": f"{width}x{height}",
+                "full_resolution": full,
+                "reduced": reduced,
+                "speedup_p50": full["latency_ms_p50"] / reduced["latency_ms_p50"],
+            }
+        )
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--holes", type=int, default=30)
+    parser.add_argument("--output", help="Archivo JSON con los resultados")
+    args = parser.parse_args()
+
+    rows = run_benchmark(args.repeats, args.holes)
+
+    print(
+        f"{'resolución':>11} | {'modo':>15} | {'p50 ms':>8} | {'p95 ms':>8} | "
+        f"{'pico MB':>8}"
+    )
+    for row in rows:
+        for mode in ("full_resolution", "reduced"):
+            stats = row[mode]
+            print(
+                f"{row['resolution']:>11} | {mode:>15} | "
+                f"{stats['latency_ms_p50']:8.1f} | {stats['latency_ms_p95']:8.1f} | "
+                f"{stats['peak_mb']:8.1f}"
+            )
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(rows, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,352 @@
+"""
+Suite de benchmarks del detector con blancos PRO-SHOOTER sintéticos.
+
+Uso:
+    python -m src.benchmarks.inference_suite --output bench.json
+    python -m src.benchmarks.inference_suite --baseline bench.json --output new.json
+
+Mide, con el modelo y los settings configurados:
+  - detector: `BulletDetector.analyze_with_stats` por resolución
+  - batch: imágenes/s del modelo según el tamaño de lote
+  - pipeline: `EnhancedTargetAnalysisService.analyze_exercise_image` completo
+    (decodificación, inferencia, puntuación y armado de la respuesta) con S3
+    y la BD sustituidos en memoria
+
+Reporta latencia p50/p95/p99, throughput y pico de memoria (RSS). Con
+`--baseline` compara contra un reporte anterior y termina con código 1 si
+alguna métrica empeora más que `--tolerance`.
+"""
+
+import argparse
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import time
+from datetime import datetime
+from types import SimpleNamespace
+from typing import Dict, List, Optional, Sequence, Tuple
+from unittest.mock import patch
+from uuid import uuid4
+
+import numpy as np
+
+from src.benchmarks.synthetic_targets import SyntheticTarget, render_target
+from src.infraestructure.config.settings import settings
+from src.infraestructure.ml_models.bullet_detector import (
+    BulletDetector,
+    get_bullet_detector,
+)
+from src.infraestructure.ml_models.decoded_image import DecodedImage
+
+RESOLUTIONS = [(640, 640), (1280, 1280), (1920, 1440), (3024, 4032)]
+BATCH_SIZES = [1, 2, 4, 8]
+
+# Métricas donde un valor mayor es peor / mejor, para comparar reportes
+LOWER_IS_BETTER = ("latency_ms_p50", "latency_ms_p95", "latency_ms_p99", "rss_mb")
+HIGHER_IS_BETTER = ("images_per_s",)
+
+
+def latency_summary(latencies_ms: Sequence[float]) -> Dict[str, float]:
+    """Percentiles de latencia y throughput secuencial"""
+    latencies = np.asarray(latencies_ms, dtype=float)
+    return {
+        "samples": int(latencies.size),
+        "latency_ms_p50": float(np.percentile(latencies, 50)),
+        "latency_ms_p95": float(np.percentile(latencies, 95)),
+        "latency_ms_p99": float(np.percentile(latencies, 99)),
+        "latency_ms_mean": float(latencies.mean()),
+        "images_per_s": float(latencies.size / (latencies.sum() / 1000)),
+    }
+
+
+def peak_rss_mb() -> float:
+    """Pico de memoria residente del proceso hasta ahora"""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reporta KB, macOS bytes
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def bench_detector(
+    detector: BulletDetector,
+    targets: Sequence[SyntheticTarget],
+    confidence: float,
+) -> Dict[str, float]:
+    latencies_ms = []
+    for target in targets:
+        started_at = time.perf_counter()
+        detector.analyze_with_stats(target.image_data, confidence)
+        latencies_ms.append((time.perf_counter() - started_at) * 1000)
+    return {**latency_summary(latencies_ms), "rss_mb": peak_rss_mb()}
+
+
+def bench_batch_sizes(
+    detector: BulletDetector,
+    targets: Sequence[SyntheticTarget],
+    batch_sizes: Sequence[int],
+    confidence: float,
+    rounds: int = 3,
+) -> Dict[str, Dict[str, float]]:
+    """Throughput del modelo (predict + post-proceso) por tamaño de lote"""
+    arrays = [DecodedImage(t.image_data).rgb_array()[0] for t in targets]
+
+    results = {}
+    for batch_size in batch_sizes:
+        batch = [arrays[i % len(arrays)] for i in range(batch_size)]
+        latencies_ms = []
+        for _ in range(rounds):
+            started_at = time.perf_counter()
+            for result in detector._predict_batch(batch, confidence):
+                detector._process_predictions(result)
+            latencies_ms.append((time.perf_counter() - started_at) * 1000)
+
+        latencies = np.asarray(latencies_ms)
+        results[str(batch_size)] = {
+            "batch_latency_ms_p50": float(np.percentile(latencies, 50)),
+            "images_per_s": float(batch_size * rounds / (latencies.sum() / 1000)),
+        }
+    return results
+
+
+class _NullSession:
+    """Sesión que no persiste nada; completa lo que asignaría la BD"""
+
+    def add(self, instance):
+        pass
+
+    def commit(self):
+        pass
+
+    def rollback(self):
+        pass
+
+    def refresh(self, instance):
+        instance.id = instance.id or uuid4()
+        instance.analysis_timestamp = instance.analysis_timestamp or datetime.now()
+
+
+def bench_pipeline(
+    targets: Sequence[SyntheticTarget],
+    confidence: float,
+    scoring_method: str = "linear",
+) -> Dict[str, float]:
+    """Servicio de análisis completo con S3 y BD sustituidos en memoria"""
+    from src.application.services import enhanced_target_analysis_service as module
+    from src.infraestructure.database.repositories.target_analysis_repo import (
+        TargetAnalysisRepository,
+    )
+
+    service = module.EnhancedTargetAnalysisService(db=_NullSession())
+    current = {}
+    exercise = SimpleNamespace(
+        id=uuid4(), target_image=SimpleNamespace(id=uuid4(), file_path="bench.jpg")
+    )
+
+    with patch.object(
+        module.PracticeExerciseRepository,
+        "get_by_id",
+        staticmethod(lambda db, exercise_id: exercise),
+    ), patch.object(
+        service, "_download_image_from_s3", lambda _: current["image_data"]
+    ), patch.object(
+        service, "_get_latest_analysis", lambda _: None
+    ), patch.object(
+        service, "_consolidate_exercise_after_analysis", lambda *args: None
+    ), patch.object(
+        service,
+        "_create_analysis_with_scoring",
+        lambda image_id, basic, scoring: TargetAnalysisRepository.create_with_scoring(
+            service.db, image_id, basic, scoring
+        ),
+    ):
+        latencies_ms = []
+        for target in targets:
+            current["image_data"] = target.image_data
+            started_at = time.perf_counter()
+            _, error = service.analyze_exercise_image(
+                exercise.id,
+                confidence_threshold=confidence,
+                force_reanalysis=True,
+                scoring_method=scoring_method,
+            )
+            latencies_ms.append((time.perf_counter() - started_at) * 1000)
+            if error:
+                raise RuntimeError(f"El pipeline falló: {error}")
+
+    return {**latency_summary(latencies_ms), "rss_mb": peak_rss_mb()}
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return (
+            subprocess.check_output(
+                ["git", "rev-parse", "--short", "HEAD"], stderr=subprocess.DEVNULL
+            )
+            .decode()
+            .strip()
+        )
+    except Exception:
+        return None
+
+
+def _metadata() -> Dict:
+    return {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "git_commit": _git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "model_version": settings.ML_MODEL_VERSION,
+        "model_backend": settings.ML_MODEL_BACKEND,
+        "batching_enabled": settings.ML_BATCHING_ENABLED,
+        "tiling_enabled": settings.ML_TILING_ENABLED,
+        "inference_workers": settings.ML_INFERENCE_WORKERS,
+    }
+
+
+def run_suite(
+    images_per_resolution: int = 10,
+    holes: int = 10,
+    confidence: float = 0.25,
+    resolutions: Sequence[Tuple[int, int]] = RESOLUTIONS,
+    batch_sizes: Sequence[int] = BATCH_SIZES,
+    include_pipeline: bool = True,
+) -> Dict:
+    # Sin caché: las mismas imágenes se repiten entre escenarios
+    settings.ML_CACHE_ENABLED = False
+
+    detector = get_bullet_detector()
+    detector.warm_up(iterations=2)
+
+    report = {
+        "metadata": {
+            **_metadata(),
+            "images_per_resolution": images_per_resolution,
+            "holes": holes,
+            "confidence": confidence,
+        },
+        "detector": {},
+        "batch": {},
+        "pipeline": {},
+    }
+
+    for width, height in resolutions:
+        key = f"{width}x{height}"
+        targets = [
+            render_target(width, height, holes=holes, seed=seed)
+            for seed in range(images_per_resolution)
+        ]
+        report["detector"][key] = bench_detector(detector, targets, confidence)
+        report["batch"][key] = bench_batch_sizes(
+            detector, targets, batch_sizes, confidence
+        )
+        if include_pipeline:
+            report["pipeline"][key] = bench_pipeline(targets, confidence)
+
+    report["peak_rss_mb"] = peak_rss_mb()
+    return report
+
+
+def _flatten(data: Dict, prefix: str = "") -> Dict[str, float]:
+    flat = {}
+    for key, value in data.items():
+        path = f"{prefix}.{key}" if prefix else str(key)
+        if isinstance(value, dict):
+            flat.update(_flatten(value, path))
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            flat[path] = float(value)
+    return flat
+
+
+def compare_reports(baseline: Dict, current: Dict, tolerance: float = 0.1) -> List[str]:
+    """
+    Métricas que empeoraron más que `tolerance` (fracción) respecto al
+    reporte base. Solo compara las métricas presentes en ambos.
+    """
+    base = _flatten({k: v for k, v in baseline.items() if k != "metadata"})
+    new = _flatten({k: v for k, v in current.items() if k != "metadata"})
+
+    regressions = []
+    for path in sorted(base.keys() & new.keys()):
+        old_value, new_value = base[path], new[path]
+        metric = path.rsplit(".", 1)[-1]
+        if metric in LOWER_IS_BETTER and new_value > old_value * (1 + tolerance):
+            regressions.append(f"{path}: {old_value:.1f} -> {new_value:.1f}")
+        elif metric in HIGHER_IS_BETTER and new_value < old_value * (1 - tolerance):
+            regressions.append(f"{path}: {old_value:.1f} -> {new_value:.1f}")
+    return regressions
+
+
+def _print_report(report: Dict):
+    print(
+        f"{'escenario':>9} | {'resolución':>10} | {'p50':>8} | {'p95':>8} | "
+        f"{'p99':>8} | {'img/s':>7}"
+    )
+    for scenario in ("detector", "pipeline"):
+        for resolution, stats in report[scenario].items():
+            print(
+                f"{scenario:>9} | {resolution:>10} | {stats['latency_ms_p50']:8.1f} | "
+                f"{stats['latency_ms_p95']:8.1f} | {stats['latency_ms_p99']:8.1f} | "
+                f"{stats['images_per_s']:7.2f}"
+            )
+    for resolution, by_size in report["batch"].items():
+        sizes = ", ".join(
+            f"{size}: {stats['images_per_s']:.2f}" for size, stats in by_size.items()
+        )
+        print(f"{'batch':>9} | {resolution:>10} | img/s por lote -> {sizes}")
+    print(f"Pico de RSS: {report['peak_rss_mb']:.0f} MB")
+
+
+def _parse_resolution(value: str) -> Tuple[int, int]:
+    width, height = value.lower().split("x")
+    return int(width), int(height)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--images", type=int, default=10)
+    parser.add_argument("--holes", type=int, default=10)
+    parser.add_argument("--confidence", type=float, default=0.25)
+    parser.add_argument(
+        "--resolutions",
+        default=",".join(f"{w}x{h}" for w, h in RESOLUTIONS),
+        help="Lista separada por comas, ej. 640x640,1920x1440",
+    )
+    parser.add_argument("--batch-sizes", default=",".join(str(b) for b in BATCH_SIZES))
+    parser.add_argument("--skip-pipeline", action="store_true")
+    parser.add_argument("--output", help="Archivo JSON con los resultados")
+    parser.add_argument("--baseline", help="Reporte JSON anterior para comparar")
+    parser.add_argument("--tolerance", type=float, default=0.1)
+    args = parser.parse_args()
+
+    report = run_suite(
+        images_per_resolution=args.images,
+        holes=args.holes,
+        confidence=args.confidence,
+        resolutions=[_parse_resolution(r) for r in args.resolutions.split(",")],
+        batch_sizes=[int(b) for b in args.batch_sizes.split(",")],
+        include_pipeline=not args.skip_pipeline,
+    )
+    _print_report(report)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare_reports(json.load(f), report, args.tolerance)
+        if regressions:
+            print(f"Regresiones (> {args.tolerance:.0%}):")
+            for regression in regressions:
+                print(f"  {regression}")
+            sys.exit(1)
+        print("Sin regresiones respecto al reporte base")
+
+
+if __name__ == "__main__":
+    main()
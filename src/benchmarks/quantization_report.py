@@ -0,0 +1,178 @@
+"""
+Pérdida de precisión y ganancia de velocidad del detector INT8.
+
+Uso:
+    python -m src.benchmarks.quantization_report --images 100 --output int8.json
+    python -m src.benchmarks.quantization_report --images-dir ./evaluacion
+
+Corre el modelo de referencia (por defecto el .pt) y el ONNX INT8
+(`export_model --format onnx_int8`) sobre el conjunto reservado de imágenes
+analizadas, que nunca se usa para calibrar (ver `quantization.is_holdout`).
+Tomando al modelo de referencia como verdad, reporta recall, precisión e IoU
+de las detecciones INT8 y la latencia de ambos.
+"""
+
+import argparse
+import json
+import time
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from src.application.services.shadow_inference_service import ShadowInferenceService
+from src.infraestructure.config.settings import settings
+from src.infraestructure.ml_models.bullet_detector import (
+    BulletDetector,
+    get_bullet_detector,
+)
+from src.infraestructure.ml_models.quantization import (
+    load_directory_images,
+    load_stored_images,
+)
+
+
+def _timed_detection(detector: BulletDetector, image_data: bytes, threshold: float):
+    started_at = time.perf_counter()
+    columns = detector.detect_columns(image_data, threshold)
+    return columns, (time.perf_counter() - started_at) * 1000
+
+
+def evaluate_images(
+    images: Sequence[Tuple[str, bytes]],
+    reference: BulletDetector,
+    quantized: BulletDetector,
+    confidence: float,
+) -> List[Dict]:
+    """Compara ambos modelos imagen por imagen"""
+    rows = []
+    for image_id, image_data in images:
+        reference_columns, reference_ms = _timed_detection(
+            reference, image_data, confidence
+        )
+        quantized_columns, quantized_ms = _timed_detection(
+            quantized, image_data, confidence
+        )
+        rows.append(
+            {
+                "image_id": image_id,
+                "reference_latency_ms": reference_ms,
+                "quantized_latency_ms": quantized_ms,
+                **ShadowInferenceService.compare_detections(
+                    reference_columns, quantized_columns
+                ),
+            }
+        )
+    return rows
+
+
+def summarize_delta(rows: Sequence[Dict]) -> Dict:
+    """
+    Totales del conjunto: los conteos se suman antes de dividir, así las
+    imágenes sin impactos no sesgan la precisión ni el recall.
+    """
+    reference = sum(r["primary_detections"] for r in rows)
+    quantized = sum(r["shadow_detections"] for r in rows)
+    matched = sum(r["matched_detections"] for r in rows)
+    ious = [r["mean_iou"] for r in rows if r["mean_iou"] is not None]
+    reference_ms = np.asarray([r["reference_latency_ms"] for r in rows], dtype=float)
+    quantized_ms = np.asarray([r["quantized_latency_ms"] for r in rows], dtype=float)
+
+    recall = matched / reference if reference else None
+    return {
+        "images": len(rows),
+        "reference_detections": reference,
+        "quantized_detections": quantized,
+        "matched_detections": matched,
+        "recall": recall,
+        "recall_loss": 1 - recall if recall is not None else None,
+        "precision": matched / quantized if quantized else None,
+        "mean_iou": float(np.mean(ious)) if ious else None,
+        "reference_latency_ms_p50": (
+            float(np.percentile(reference_ms, 50)) if rows else None
+        ),
+        "quantized_latency_ms_p50": (
+            float(np.percentile(quantized_ms, 50)) if rows else None
+        ),
+        "speedup": float(reference_ms.sum() / quantized_ms.sum()) if rows else None,
+    }
+
+
+def run_report(
+    images: Sequence[Tuple[str, bytes]],
+    reference_backend: str = "pytorch",
+    version: Optional[str] = None,
+    confidence: float = 0.25,
+) -> Dict:
+    reference = get_bullet_detector(version, reference_backend)
+    quantized = get_bullet_detector(version, "onnx_int8")
+    # El primer predict de cada runtime incluye su inicialización
+    reference.warm_up(iterations=1)
+    quantized.warm_up(iterations=1)
+
+    rows = evaluate_images(images, reference, quantized, confidence)
+    return {
+        "metadata": {
+            "model_version": reference.version,
+            "reference_backend": reference_backend,
+            "quantized_backend": "onnx_int8",
+            "confidence": confidence,
+        },
+        "summary": summarize_delta(rows),
+        "images": rows,
+    }
+
+
+def _format(value: Optional[float], pattern: str) -> str:
+    return "-" if value is None else pattern.format(value)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--images", type=int, default=100)
+    parser.add_argument(
+        "--images-dir", default=None, help="Imágenes locales en vez del almacenamiento"
+    )
+    parser.add_argument("--reference-backend", default="pytorch")
+    parser.add_argument("--version", default=None)
+    parser.add_argument("--confidence", type=float, default=0.25)
+    parser.add_argument("--output", help="Archivo JSON con los resultados")
+    args = parser.parse_args()
+
+    if args.images_dir:
+        images = load_directory_images(args.images_dir, args.images)
+    else:
+        images = load_stored_images(args.images, holdout=True)
+    if not images:
+        raise SystemExit("No hay imágenes de evaluación")
+
+    report = run_report(
+        images,
+        reference_backend=args.reference_backend,
+        version=args.version or settings.ML_MODEL_VERSION,
+        confidence=args.confidence,
+    )
+    summary = report["summary"]
+    print(
+        f"{summary['images']} imágenes | detecciones "
+        f"{summary['reference_detections']} -> {summary['quantized_detections']}"
+    )
+    print(
+        f"recall {_format(summary['recall'], '{:.3f}')} | "
+        f"precisión {_format(summary['precision'], '{:.3f}')} | "
+        f"IoU medio {_format(summary['mean_iou'], '{:.3f}')}"
+    )
+    print(
+        f"p50 {summary['reference_latency_ms_p50']:.1f} ms -> "
+        f"{summary['quantized_latency_ms_p50']:.1f} ms "
+        f"(x{summary['speedup']:.2f})"
+    )
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
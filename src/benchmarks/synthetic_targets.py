@@ -0,0 +1,101 @@
+"""
+Blancos PRO-SHOOTER sintéticos para pruebas y benchmarks del detector.
+
+Los anillos se dibujan con los radios de `TargetConfigurations.PRO_SHOOTER`
+(radius_ratio relativo a la mitad del lado menor, igual que en el cálculo de
+puntuación) y los impactos son círculos oscuros en posiciones conocidas, de
+modo que se puede medir recall contra la verdad de terreno.
+"""
+
+import io
+from dataclasses import dataclass
+from typing import List, Tuple
+
+import cv2
+import numpy as np
+from PIL import Image
+
+from src.domain.value_objects.target_config import (
+    TargetConfiguration,
+    TargetConfigurations,
+)
+
+
+@dataclass
+class SyntheticTarget:
+    """Imagen generada y posiciones reales de los impactos"""
+
+    image_data: bytes
+    width: int
+    height: int
+    holes: List[Tuple[float, float, float]]  # (x, y, radio) en píxeles
+
+
+def render_target(
+    width: int,
+    height: int,
+    holes: int = 10,
+    seed: int = 0,
+    hole_radius_ratio: float = 0.006,
+    config: TargetConfiguration = TargetConfigurations.PRO_SHOOTER,
+    jpeg_quality: int = 92,
+) -> SyntheticTarget:
+    """
+    Genera un blanco con anillos y perforaciones.
+
+    Args:
+        width: Ancho de la imagen
+        height: Alto de la imagen
+        holes: Número de impactos
+        seed: Semilla para que la imagen sea reproducible
+        hole_radius_ratio: Radio del impacto relativo al lado menor
+        config: Configuración de zonas del blanco
+        jpeg_quality: Calidad JPEG de la imagen resultante
+    """
+    rng = np.random.default_rng(seed)
+    image = np.full((height, width, 3), 235, dtype=np.uint8)
+
+    center_x = width * config.center_x_ratio
+    center_y = height * config.center_y_ratio
+    half_side = min(width, height) / 2
+    center = (int(center_x), int(center_y))
+    line_width = max(1, int(min(width, height) / 500))
+
+    outermost = max(zone.radius_ratio for zone in config.zones)
+    for zone in sorted(config.zones, key=lambda z: -z.radius_ratio):
+        radius = int(zone.radius_ratio * half_side)
+        fill = (40, 40, 200) if zone.score == config.get_max_score() else (90, 160, 90)
+        if zone.score == config.get_max_score() or zone.radius_ratio == outermost:
+            cv2.circle(image, center, radius, fill, -1)
+        cv2.circle(image, center, radius, (20, 20, 20), line_width)
+
+    hole_radius = max(2.0, hole_radius_ratio * min(width, height))
+    placed = []
+    for _ in range(holes):
+        angle = rng.uniform(0, 2 * np.pi)
+        distance = rng.uniform(0, outermost * half_side)
+        x = center_x + distance * np.cos(angle)
+        y = center_y + distance * np.sin(angle)
+        cv2.circle(image, (int(x), int(y)), int(hole_radius), (15, 15, 15), -1)
+        placed.append((float(x), float(y), float(hole_radius)))
+
+    buffer = io.BytesIO()
+    Image.fromarray(image).save(buffer, format="JPEG", quality=jpeg_quality)
+    return SyntheticTarget(
+        image_data=buffer.getvalue(), width=width, height=height, holes=placed
+    )
+
+
+def recall(detections: List[dict], target: SyntheticTarget) -> float:
+    """Fracción de impactos reales con una detección a menos de 2 radios"""
+    if not target.holes:
+        return 1.0
+
+    found = 0
+    for x, y, radius in target.holes:
+        if any(
+            (d["centro_x"] - x) ** 2 + (d["centro_y"] - y) ** 2 <= (2 * radius) ** 2
+            for d in detections
+        ):
+            found += 1
+    return found / len(target.holes)
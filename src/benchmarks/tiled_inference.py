@@ -0,0 +1,90 @@
+"""
+Compara la inferencia por mosaicos contra una sola pasada en fotos grandes.
+
+Uso:
+    python -m src.benchmarks.tiled_inference --images 5 --output tiling.json
+
+Para cada resolución genera blancos sintéticos con impactos pequeños y mide
+latencia (p50/p95) y recall de ambos modos con el modelo configurado.
+"""
+
+import argparse
+import json
+import time
+from typing import Dict, List
+
+import numpy as np
+
+from src.benchmarks.synthetic_targets import recall, render_target
+from src.infraestructure.ml_models.bullet_detector import get_bullet_detector
+
+RESOLUTIONS = [(2000, 2000), (3024, 4032), (4000, 3000), (5000, 5000)]
+
+
+def _run_mode(detector, targets, tiled: bool, confidence: float) -> Dict:
+    latencies_ms: List[float] = []
+    recalls: List[float] = []
+    for target in targets:
+        started_at = time.perf_counter()
+        detections = detector.detect_impacts(
+            target.image_data, confidence_threshold=confidence, tiled=tiled
+        )
+        latencies_ms.append((time.perf_counter() - started_at) * 1000)
+        recalls.append(recall(detections, target))
+
+    return {
+        "latency_ms_p50": float(np.percentile(latencies_ms, 50)),
+        "latency_ms_p95": float(np.percentile(latencies_ms, 95)),
+        "recall_mean": float(np.mean(recalls)),
+    }
+
+
+def run_benchmark(
+    images_per_resolution: int = 5, holes: int = 15, confidence: float = 0.25
+) -> List[Dict]:
+    detector = get_bullet_detector()
+    detector.warm_up(iterations=2)
+
+    rows = []
+    for width, height in RESOLUTIONS:
+        targets = [
+            render_target(width, height, holes=holes, seed=seed)
+            for seed in range(images_per_resolution)
+        ]
+        rows.append(
+            {
+                "resolution": f"{width}x{height}",
+                "single_pass": _run_mode(detector, targets, False, confidence),
+                "tiled": _run_mode(detector, targets, True, confidence),
+            }
+        )
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--images", type=int, default=5)
+    parser.add_argument("--holes", type=int, default=15)
+    parser.add_argument("--confidence", type=float, default=0.25)
+    parser.add_argument("--output", help="Archivo JSON con los resultados")
+    args = parser.parse_args()
+
+    rows = run_benchmark(args.images, args.holes, args.confidence)
+
+    print(f"{'resolución':>11} | {'modo':>11} | {'p50 ms':>8} | {'p95 ms':>8} | recall")
+    for row in rows:
+        for mode in ("single_pass", "tiled"):
+            stats = row[mode]
+            print(
+                f"{row['resolution']:>11} | {mode:>11} | "
+                f"{stats['latency_ms_p50']:8.1f} | {stats['latency_ms_p95']:8.1f} | "
+                f"{stats['recall_mean']:.3f}"
+            )
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(rows, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+"""
+Memoria por worker con y sin precarga del modelo (solo Linux).
+
+Uso:
+    python -m src.benchmarks.worker_memory --workers 4 --output memoria.json
+
+Reproduce el modelo de gunicorn: un proceso maestro hace fork de N workers y
+cada worker atiende un análisis. Sin precarga cada worker carga su modelo;
+con precarga el maestro lo carga antes del fork (`preload_models`). Cada modo
+corre en un proceso nuevo para no heredar memoria del otro.
+
+De /proc/<pid>/smaps_rollup se reporta por worker:
+  - uss_mb: memoria exclusiva del worker (Private_Clean + Private_Dirty)
+  - pss_mb: memoria proporcional (las páginas compartidas divididas entre
+    los procesos que las usan); la suma de PSS es la memoria real del grupo
+"""
+
+import argparse
+import json
+import os
+import signal
+import subprocess
+import sys
+from typing import Dict, List
+
+import numpy as np
+
+SMAPS_FIELDS = {
+    "Rss": "rss_mb",
+    "Pss": "pss_mb",
+    "Shared_Clean": "shared_mb",
+    "Shared_Dirty": "shared_mb",
+    "Private_Clean": "uss_mb",
+    "Private_Dirty": "uss_mb",
+}
+
+
+def parse_smaps_rollup(text: str) -> Dict[str, float]:
+    """Totales en MB a partir del contenido de smaps_rollup"""
+    memory = {field: 0.0 for field in dict.fromkeys(SMAPS_FIELDS.values())}
+    for line in text.splitlines():
+        parts = line.split()
+        if len(parts) == 3 and parts[0].rstrip(":") in SMAPS_FIELDS:
+            memory[SMAPS_FIELDS[parts[0].rstrip(":")]] += int(parts[1]) / 1024
+    return memory
+
+
+def read_memory(pid: int) -> Dict[str, float]:
+    with open(f"/proc/{pid}/smaps_rollup") as f:
+        return parse_smaps_rollup(f.read())
+
+
+def measure_workers(workers: int, preload: bool) -> Dict:
+    """Hace fork de los workers desde el proceso actual y mide su memoria"""
+    from src.benchmarks.synthetic_targets import render_target
+    from src.infraestructure.ml_models.bullet_detector import get_bullet_detector
+    from src.infraestructure.ml_models.preload import preload_models
+
+    image_data = render_target(1920, 1440, holes=10, seed=0).image_data
+    if preload:
+        preload_models()
+
+    children = []
+    for _ in range(workers):
+        read_fd, write_fd = os.pipe()
+        pid = os.fork()
+        if pid == 0:
+            os.close(read_fd)
+            status = b"1"
+            try:
+                get_bullet_detector().analyze_with_stats(image_data, 0.25)
+            except Exception:
+                status = b"0"
+            os.write(write_fd, status)
+            # Esperar a que el maestro mida y termine el proceso
+            signal.pause()
+            os._exit(0)
+        os.close(write_fd)
+        children.append((pid, read_fd))
+
+    try:
+        failed = [pid for pid, fd in children if os.read(fd, 1) != b"1"]
+        if failed:
+            raise RuntimeError(f"Workers sin análisis: {failed}")
+        per_worker = [read_memory(pid) for pid, _ in children]
+        master = read_memory(os.getpid())
+    finally:
+        for pid, fd in children:
+            os.close(fd)
+            os.kill(pid, signal.SIGTERM)
+            os.waitpid(pid, 0)
+
+    return {
+        "preload": preload,
+        "workers": workers,
+        "master": master,
+        "per_worker": per_worker,
+        "worker_uss_mb_mean": float(np.mean([w["uss_mb"] for w in per_worker])),
+        "worker_pss_mb_mean": float(np.mean([w["pss_mb"] for w in per_worker])),
+        "total_pss_mb": master["pss_mb"] + sum(w["pss_mb"] for w in per_worker),
+    }
+
+
+def run_report(workers: int) -> List[Dict]:
+    results = []
+    for preload in (False, True):
+        output = subprocess.run(
+            [
+                sys.executable,
+                "-m",
+                "src.benchmarks.worker_memory",
+                "--workers",
+                str(workers),
+                "--single",
+                "preload" if preload else "no-preload",
+            ],
+            check=True,
+            capture_output=True,
+            text=True,
+        ).stdout
+        results.append(json.loads(output.strip().splitlines()[-1]))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--output", help="Archivo JSON con los resultados")
+    parser.add_argument(
+        "--single", choices=("preload", "no-preload"), help=argparse.SUPPRESS
+    )
+    args = parser.parse_args()
+
+    if args.single:
+        print(json.dumps(measure_workers(args.workers, args.single == "preload")))
+        return
+
+    results = run_report(args.workers)
+    print(f"{'modo':>10} | {'USS/worker':>10} | {'PSS/worker':>10} | {'PSS total':>10}")
+    for result in results:
+        mode = "precarga" if result["preload"] else "sin"
+        print(
+            f"{mode:>10} | {result['worker_uss_mb_mean']:8.0f}MB | "
+            f"{result['worker_pss_mb_mean']:8.0f}MB | {result['total_pss_mb']:8.0f}MB"
+        )
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -2,6 +2,8 @@ from dataclasses import dataclass
 from typing import List, Dict, Optional
 from enum import Enum
 
+import numpy as np
+
 
 @dataclass
 class ShotCoordinate:
@@ -31,6 +33,58 @@ class ShotScore:
     distance_from_center_ratio: float
 
 
+@dataclass
+class ShotScoreBatch:
+    """
+    Puntuaciones de varios disparos en arrays paralelos (posición i = disparo
+    i). Mismos valores que una lista de ShotScore, sin un objeto por disparo.
+    """
+
+    x: np.ndarray
+    y: np.ndarray
+    confidence: np.ndarray
+    scores: np.ndarray
+    zones: np.ndarray
+    distances_pixels: np.ndarray
+    distance_ratios: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.scores)
+
+    @property
+    def total_score(self) -> int:
+        return int(self.scores.sum())
+
+    @property
+    def max_score(self) -> int:
+        return int(self.scores.max()) if len(self.scores) else 0
+
+    def score_distribution(self, max_score: int = 10) -> Dict[str, int]:
+        """Cantidad de disparos por puntuación, de "0" a `max_score`"""
+        counts = np.bincount(self.scores, minlength=max_score + 1)
+        return {str(score): int(counts[score]) for score in range(max_score + 1)}
+
+    def to_shot_scores(self) -> List[ShotScore]:
+        return [
+            ShotScore(
+                coordinates=ShotCoordinate(x=x, y=y, confidence=confidence),
+                score=score,
+                zone=zone,
+                distance_from_center_pixels=distance,
+                distance_from_center_ratio=ratio,
+            )
+            for x, y, confidence, score, zone, distance, ratio in zip(
+                self.x.tolist(),
+                self.y.tolist(),
+                self.confidence.tolist(),
+                self.scores.tolist(),
+                self.zones.tolist(),
+                self.distances_pixels.tolist(),
+                self.distance_ratios.tolist(),
+            )
+        ]
+
+
 @dataclass
 class GroupStatistics:
     """Estadísticas del grupo de tiro"""
@@ -41,3 +95,7 @@ class GroupStatistics:
     average_distance_from_center: float
     std_deviation: float
     shots_count: int
+    mean_radius: float = 0.0  # Distancia media al centro del grupo
+    cep50: float = 0.0  # Radio que contiene el 50% de los disparos
+    horizontal_dispersion: float = 0.0  # Desviación estándar en x
+    vertical_dispersion: float = 0.0  # Desviación estándar en y
@@ -1,6 +1,42 @@
 import math
-from typing import Tuple, Dict, Any
-from src.domain.entities.scoring import ShotCoordinate, ShotScore
+from typing import Tuple, Dict, Any, Optional
+
+import numpy as np
+
+from src.domain.entities.scoring import ShotCoordinate, ShotScore, ShotScoreBatch
+
+# Zonas discretas del método "zones": (ratio máximo, puntos), de adentro hacia afuera
+ZONE_THRESHOLDS = [
+    (0.05, 10),  # 5% del radio = 10 puntos
+    (0.15, 9),  # 15% del radio = 9 puntos
+    (0.25, 8),  # 25% del radio = 8 puntos
+    (0.35, 7),  # 35% del radio = 7 puntos
+    (0.45, 6),  # 45% del radio = 6 puntos
+    (0.55, 5),  # 55% del radio = 5 puntos
+    (0.65, 4),  # 65% del radio = 4 puntos
+    (0.75, 3),  # 75% del radio = 3 puntos
+    (0.85, 2),  # 85% del radio = 2 puntos
+    (0.95, 1),  # 95% del radio = 1 punto
+    (1.0, 0),  # Fuera = 0 puntos
+]
+_ZONE_RATIOS = np.array([ratio for ratio, _ in ZONE_THRESHOLDS])
+_ZONE_SCORES = np.array([score for _, score in ZONE_THRESHOLDS] + [0])
+
+ZONE_DESCRIPTIONS = {
+    10: "bullseye",
+    9: "inner_ring",
+    8: "zone_8",
+    7: "zone_7",
+    6: "zone_6",
+    5: "zone_5",
+    4: "zone_4",
+    3: "zone_3",
+    2: "zone_2",
+    1: "outer_ring",
+    0: "outside",
+}
+# Descripción indexada por puntuación
+_ZONE_NAMES = np.array([ZONE_DESCRIPTIONS[score] for score in range(11)], dtype=object)
 
 
 class DistanceBasedScoringService:
@@ -70,6 +106,55 @@ class DistanceBasedScoringService:
             distance_from_center_ratio=distance_ratio,
         )
 
+    def score_shots(
+        self,
+        x: np.ndarray,
+        y: np.ndarray,
+        image_width: int,
+        image_height: int,
+        scoring_method: str = "linear",
+        confidence: Optional[np.ndarray] = None,
+    ) -> ShotScoreBatch:
+        """
+        Igual que `calculate_shot_score_by_distance` para todos los disparos a
+        la vez: distancias, ratios y puntuaciones como operaciones sobre arrays.
+
+        Args:
+            x, y: Coordenadas de los disparos en píxeles
+            confidence: Confianza de cada disparo (opcional)
+        """
+        x = np.asarray(x, dtype=np.float64)
+        y = np.asarray(y, dtype=np.float64)
+        if confidence is None:
+            confidence = np.zeros_like(x)
+
+        # Mismas operaciones que la versión por disparo, elemento a elemento
+        distances = np.sqrt((x - image_width / 2) ** 2 + (y - image_height / 2) ** 2)
+        max_distance = (min(image_width, image_height) / 2) * self.max_distance_ratio
+        ratios = distances / max_distance
+
+        if scoring_method == "zones":
+            # Primera zona cuyo ratio máximo cubre el disparo
+            scores = _ZONE_SCORES[np.searchsorted(_ZONE_RATIOS, ratios, side="left")]
+        else:
+            if scoring_method == "exponential":
+                continuous = 10 * (1 - ratios**2)
+            else:
+                continuous = 10 * (1 - ratios)
+            # np.rint redondea a par, igual que round()
+            scores = np.maximum(np.rint(continuous), 0)
+        scores = np.where(ratios >= 1.0, 0, scores).astype(np.int64)
+
+        return ShotScoreBatch(
+            x=x,
+            y=y,
+            confidence=np.asarray(confidence, dtype=np.float64),
+            scores=scores,
+            zones=_ZONE_NAMES[scores],
+            distances_pixels=distances,
+            distance_ratios=ratios,
+        )
+
     def _calculate_linear_score(self, distance_ratio: float) -> int:
         """
         Cálculo lineal: 10 puntos en el centro, 0 puntos en el borde
@@ -103,22 +188,7 @@ class DistanceBasedScoringService:
         if distance_ratio >= 1.0:
             return 0
 
-        # Definir zonas de puntuación
-        zone_thresholds = [
-            (0.05, 10),  # 5% del radio = 10 puntos
-            (0.15, 9),  # 15% del radio = 9 puntos
-            (0.25, 8),  # 25% del radio = 8 puntos
-            (0.35, 7),  # 35% del radio = 7 puntos
-            (0.45, 6),  # 45% del radio = 6 puntos
-            (0.55, 5),  # 55% del radio = 5 puntos
-            (0.65, 4),  # 65% del radio = 4 puntos
-            (0.75, 3),  # 75% del radio = 3 puntos
-            (0.85, 2),  # 85% del radio = 2 puntos
-            (0.95, 1),  # 95% del radio = 1 punto
-            (1.0, 0),  # Fuera = 0 puntos
-        ]
-
-        for threshold, score in zone_thresholds:
+        for threshold, score in ZONE_THRESHOLDS:
             if distance_ratio <= threshold:
                 return score
 
@@ -126,17 +196,4 @@ class DistanceBasedScoringService:
 
     def _get_zone_description(self, score: int) -> str:
         """Devuelve descripción de la zona según la puntuación"""
-        zone_descriptions = {
-            10: "bullseye",
-            9: "inner_ring",
-            8: "zone_8",
-            7: "zone_7",
-            6: "zone_6",
-            5: "zone_5",
-            4: "zone_4",
-            3: "zone_3",
-            2: "zone_2",
-            1: "outer_ring",
-            0: "outside",
-        }
-        return zone_descriptions.get(score, "outside")
+        return ZONE_DESCRIPTIONS.get(score, "outside")
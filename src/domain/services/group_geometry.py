@@ -0,0 +1,101 @@
+import math
+
+import numpy as np
+
+from src.domain.entities.scoring import GroupStatistics
+
+
+def _cross(o, a, b) -> float:
+    return (a[0] - o[0]) * (b[1] - o[1]) - (a[1] - o[1]) * (b[0] - o[0])
+
+
+def convex_hull(points: np.ndarray) -> np.ndarray:
+    """
+    Envolvente convexa (cadena monótona de Andrew), O(n log n).
+
+    Args:
+        points: Array (n, 2) de coordenadas
+
+    Returns:
+        Vértices de la envolvente en sentido antihorario, sin puntos
+        colineales ni repetidos
+    """
+    points = np.unique(np.asarray(points, dtype=np.float64).reshape(-1, 2), axis=0)
+    if len(points) <= 2:
+        return points
+
+    # np.unique deja los puntos ordenados por x y luego por y; el recorrido
+    # usa tuplas de Python, mucho más rápidas que indexar arrays por elemento
+    ordered = [tuple(p) for p in points.tolist()]
+    lower, upper = [], []
+    for p in ordered:
+        while len(lower) >= 2 and _cross(lower[-2], lower[-1], p) <= 0:
+            lower.pop()
+        lower.append(p)
+    for p in reversed(ordered):
+        while len(upper) >= 2 and _cross(upper[-2], upper[-1], p) <= 0:
+            upper.pop()
+        upper.append(p)
+    return np.array(lower[:-1] + upper[:-1])
+
+
+def hull_diameter(hull: np.ndarray) -> float:
+    """
+    Mayor distancia entre vértices de una envolvente convexa (calibres
+    rotatorios): para cada arista se avanza el vértice más alejado, O(h).
+    """
+    h = len(hull)
+    if h < 2:
+        return 0.0
+
+    vertices = [tuple(p) for p in np.asarray(hull).tolist()]
+    if h == 2:
+        return math.dist(vertices[0], vertices[1])
+
+    best = 0.0
+    j = 1
+    for i in range(h):
+        a, b = vertices[i], vertices[(i + 1) % h]
+        # Avanzar j mientras el área del triángulo (arista ab, j) crezca
+        while _cross(a, b, vertices[(j + 1) % h]) > _cross(a, b, vertices[j]):
+            j = (j + 1) % h
+        best = max(best, math.dist(a, vertices[j]), math.dist(b, vertices[j]))
+    return best
+
+
+def group_statistics(x: np.ndarray, y: np.ndarray) -> GroupStatistics:
+    """
+    Estadísticas del grupo de tiro en una sola pasada sobre los arrays:
+    centro, diámetro (dispersión extrema), radio medio, CEP50 y dispersión
+    horizontal/vertical, todo en píxeles.
+    """
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    if len(x) == 0:
+        return GroupStatistics(
+            center_x=0.0,
+            center_y=0.0,
+            diameter=0.0,
+            average_distance_from_center=0.0,
+            std_deviation=0.0,
+            shots_count=0,
+        )
+
+    center_x = float(x.mean())
+    center_y = float(y.mean())
+    radii = np.sqrt((x - center_x) ** 2 + (y - center_y) ** 2)
+    mean_radius = float(radii.mean())
+
+    return GroupStatistics(
+        center_x=center_x,
+        center_y=center_y,
+        diameter=hull_diameter(convex_hull(np.column_stack([x, y]))),
+        average_distance_from_center=mean_radius,
+        std_deviation=float(radii.std()),
+        shots_count=len(x),
+        mean_radius=mean_radius,
+        # Radio que contiene la mitad de los disparos alrededor del centro
+        cep50=float(np.median(radii)),
+        horizontal_dispersion=float(x.std()),
+        vertical_dispersion=float(y.std()),
+    )
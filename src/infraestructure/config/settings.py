@@ -1,4 +1,5 @@
 import logging
+from typing import Dict
 
 from dotenv import load_dotenv
 from pydantic_settings import BaseSettings
@@ -29,6 +30,16 @@ class Settings(BaseSettings):
     AWS_ACCESS_KEY: str
     AWS_SECRET_ACCESS_KEY: str
     AWS_REGION: str = "us-east-2"
+    # Descarga de imágenes (cliente HTTP compartido con pool de conexiones)
+    STORAGE_POOL_SIZE: int = 16  # conexiones reutilizables por host
+    STORAGE_CONNECT_TIMEOUT_SECONDS: float = 3.0
+    STORAGE_READ_TIMEOUT_SECONDS: float = 20.0
+    STORAGE_MAX_RETRIES: int = 3  # errores de conexión y 429/5xx, con backoff
+    STORAGE_MAX_DOWNLOAD_MB: int = 25
+    # Subidas: por partes desde el archivo temporal, multipart si es grande
+    STORAGE_MULTIPART_THRESHOLD_MB: int = 8
+    STORAGE_MULTIPART_CHUNK_MB: int = 8  # mínimo de S3: 5 MB
+    STORAGE_MULTIPART_CONCURRENCY: int = 4
 
     # Servidor
     HOST: str = "0.0.0.0"
@@ -54,6 +65,58 @@ class Settings(BaseSettings):
     RESET_TOKEN_EXPIRE_MINUTES: int = 15
     FRONTEND_URL: str = "https://www.proshooter.site/"
 
+    # Detector de impactos (YOLO)
+    ML_MODEL_BACKEND: str = "pytorch"  # pytorch | onnx | onnx_int8 | openvino
+    ML_MODEL_VERSION: str = "2.0"  # versión que atiende por defecto
+    # versión -> nombre base del archivo en models_versions/ (JSON en el .env)
+    ML_MODEL_VERSIONS: Dict[str, str] = {"2.0": "BulletDetector_v2"}
+    ML_CLUB_MODEL_VERSIONS: Dict[str, str] = {}  # club_id -> versión
+    ML_SHADOW_MODEL_VERSION: str = ""  # vacío = sin inferencia sombra
+    ML_SHADOW_SAMPLE_RATE: float = 0.0  # fracción del tráfico (0.0 - 1.0)
+    ML_BATCHING_ENABLED: bool = False
+    ML_BATCH_MAX_SIZE: int = 8
+    ML_BATCH_MAX_WAIT_MS: float = 10.0
+    ML_INFERENCE_WORKERS: int = 0  # 0 = hilos dentro del proceso de la API
+    ML_INFERENCE_THREADS_PER_WORKER: int = 1
+    ML_INFERENCE_QUEUE_SIZE: int = 16
+    ML_WARMUP_ON_STARTUP: bool = False
+    ML_PRELOAD_MODELS: bool = True  # gunicorn.conf.py: cargar en el maestro antes del fork
+    ML_WARMUP_ITERATIONS: int = 3
+    ML_WARMUP_IMAGE_WIDTH: int = 1920
+    ML_WARMUP_IMAGE_HEIGHT: int = 1440
+    ML_TILING_ENABLED: bool = True
+    ML_TILING_MIN_SIDE: int = 2000  # px del lado mayor a partir del cual usar mosaicos
+    ML_TILE_SIZE: int = 1280
+    ML_TILE_OVERLAP: float = 0.2
+    ML_TILE_NMS_THRESHOLD: float = 0.5
+    ML_REDUCED_DECODE_SIDE: int = 640  # lado mínimo al decodificar JPEG reducido; 0 = completo
+    ML_CONFIDENCE_FLOOR: float = 0.1  # umbral de inferencia; el resto se filtra
+    ML_CACHE_ENABLED: bool = True
+    ML_CACHE_MAX_ENTRIES: int = 256
+    ML_CACHE_REDIS_URL: str = ""  # vacío = solo caché en memoria
+    ML_CACHE_REDIS_TTL_SECONDS: int = 7 * 24 * 3600
+
+    # Trabajos de análisis asíncronos (POST /analysis/exercise/{id}/jobs)
+    ANALYSIS_JOB_WORKERS: int = 2  # análisis simultáneos por proceso
+    ANALYSIS_JOB_MAX_PENDING: int = 32  # en cola antes de responder 503
+    ANALYSIS_JOB_WAIT_SECONDS: float = 3.0  # espera para responder el resultado inline
+    ANALYSIS_JOB_TIMEOUT_SECONDS: int = 600  # activo más tiempo = huérfano
+    # Descargas en paralelo al analizar todos los ejercicios de una sesión
+    ANALYSIS_SESSION_DOWNLOAD_CONCURRENCY: int = 8
+    # Imágenes con impactos / mapa de calor: se renderizan una vez por versión
+    # del análisis y se guardan junto a la foto original
+    OVERLAY_STORAGE_BUCKET: str = "proshooterdata"
+    OVERLAY_CACHE_MAX_ENTRIES: int = 32  # JPEG renderizados en memoria
+    OVERLAY_HEATMAP_MAX_SIDE: int = 1920  # lado mayor del mapa de calor; 0 = original
+    OVERLAY_HEATMAP_WORKING_SIDE: int = 512  # grilla de la densidad de impactos
+    # Fotos casi duplicadas al subir (dHash de 64 bits por tirador)
+    DUPLICATE_IMAGE_MAX_DISTANCE: int = 6  # bits distintos; -1 = no buscar
+    DUPLICATE_IMAGE_LOOKBACK: int = 500  # imágenes recientes del tirador a comparar
+    # Reutilizar las detecciones del duplicado (mismo tamaño) en vez de YOLO.
+    # El hash no distingue un impacto nuevo en el mismo blanco: solo activar
+    # si las re-subidas son siempre la misma foto
+    DUPLICATE_IMAGE_REUSE_ANALYSIS: bool = False
+
     # Entorno
     ENV: str = "development"
     DEBUG: bool = True
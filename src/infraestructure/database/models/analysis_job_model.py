@@ -0,0 +1,80 @@
+from uuid import uuid4
+
+from sqlalchemy import (
+    Boolean,
+    Column,
+    UUID,
+    DateTime,
+    func,
+    ForeignKey,
+    String,
+    Float,
+    Index,
+    JSON,
+    text,
+)
+from src.infraestructure.database.session import Base
+
+
+class AnalysisJobStatus:
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+
+    ACTIVE = (QUEUED, RUNNING)
+
+
+class AnalysisJobModel(Base):
+    """
+    Análisis de imagen encolado para procesarse en segundo plano. El cliente
+    consulta el estado con el id del trabajo en lugar de mantener abierta la
+    conexión durante la descarga, la inferencia y la consolidación.
+    """
+
+    __tablename__ = "analysis_jobs"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid4)
+    exercise_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("practice_exercises.id"),
+        nullable=False,
+        index=True,
+    )
+    requested_by = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=True)
+
+    # queued -> running -> succeeded | failed
+    status = Column(String, nullable=False, default=AnalysisJobStatus.QUEUED)
+
+    # Parámetros del análisis
+    confidence_threshold = Column(Float, nullable=False)
+    force_reanalysis = Column(Boolean, nullable=False, default=False)
+    enable_scoring = Column(Boolean, nullable=False, default=True)
+    scoring_method = Column(String, nullable=False, default="linear")
+    model_version = Column(String, nullable=True)
+
+    # Resultado
+    analysis_id = Column(
+        UUID(as_uuid=True), ForeignKey("target_analyses.id"), nullable=True
+    )
+    error = Column(String, nullable=True)
+
+    # Tiempos: en cola (creación -> inicio) y de ejecución (inicio -> fin)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    started_at = Column(DateTime(timezone=True), nullable=True)
+    finished_at = Column(DateTime(timezone=True), nullable=True)
+    queue_ms = Column(Float, nullable=True)
+    run_ms = Column(Float, nullable=True)
+    # Tiempos por etapa del análisis: {"analysis": {"total_ms", "stages"}}
+    timings = Column(JSON, nullable=True)
+
+    # Un solo trabajo activo por ejercicio, también entre workers distintos
+    __table_args__ = (
+        Index(
+            "uq_analysis_jobs_active_exercise",
+            "exercise_id",
+            unique=True,
+            postgresql_where=text("status IN ('queued', 'running')"),
+            sqlite_where=text("status IN ('queued', 'running')"),
+        ),
+    )
@@ -0,0 +1,51 @@
+from uuid import uuid4
+
+from sqlalchemy import (
+    Column,
+    UUID,
+    DateTime,
+    func,
+    ForeignKey,
+    Integer,
+    String,
+    JSON,
+    Float,
+)
+from src.infraestructure.database.session import Base
+
+
+class ShadowInferenceResultModel(Base):
+    """
+    Resultado de ejecutar un modelo candidato ("sombra") sobre una imagen ya
+    analizada por el modelo principal. No afecta la respuesta al usuario;
+    sirve para comparar precisión y costo antes de promover una versión.
+    """
+
+    __tablename__ = "shadow_inference_results"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid4)
+    target_image_id = Column(
+        UUID(as_uuid=True), ForeignKey("target_images.id"), nullable=False, index=True
+    )
+
+    primary_model_version = Column(String, nullable=False)
+    shadow_model_version = Column(String, nullable=False, index=True)
+    confidence_threshold = Column(Float, nullable=False)
+
+    # Latencia de inferencia de cada modelo (ms)
+    primary_latency_ms = Column(Float, nullable=True)
+    shadow_latency_ms = Column(Float, nullable=True)
+
+    # Concordancia con el modelo principal al umbral solicitado
+    primary_detections = Column(Integer, default=0)
+    shadow_detections = Column(Integer, default=0)
+    matched_detections = Column(Integer, default=0)
+    precision = Column(Float, nullable=True)
+    recall = Column(Float, nullable=True)
+    mean_iou = Column(Float, nullable=True)
+
+    # Detecciones crudas del modelo sombra (formato DetectionColumns.to_payload)
+    shadow_raw_detections = Column(JSON, nullable=True)
+    error = Column(String, nullable=True)
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -41,6 +41,16 @@ class TargetAnalysisModel(Base):
     zone_distribution = Column(JSON, nullable=True)  # Si lo usas
     confidence_stats = Column(JSON, nullable=True)
 
+    # Detecciones crudas a umbral mínimo (ML_CONFIDENCE_FLOOR) para poder
+    # re-filtrar con otro umbral sin volver a ejecutar el modelo:
+    # {"confidence_floor", "model_version", "image_width", "image_height", "detections"}
+    raw_detections = Column(JSON, nullable=True)
+
+    # Imágenes renderizadas a partir de este análisis, guardadas en S3:
+    # {"version", "impacts", "heatmap"}. `version` identifica los impactos con
+    # que se renderizaron; si el análisis cambia, las URLs dejan de valer
+    overlays = Column(JSON, nullable=True)
+
     # Metadata del análisis (AGREGAR ESTAS COLUMNAS)
     analysis_method = Column(String, nullable=False, default="YOLO_v8")
     model_version = Column(String, nullable=True, default="1.0")
@@ -58,6 +68,10 @@ class TargetAnalysisModel(Base):
     )  # Diámetro del grupo de disparos
     group_center_x = Column(Float, nullable=True)
     group_center_y = Column(Float, nullable=True)
+    group_mean_radius = Column(Float, nullable=True)  # Radio medio (px)
+    group_cep50 = Column(Float, nullable=True)  # Radio con el 50% de los disparos
+    group_horizontal_dispersion = Column(Float, nullable=True)  # Desv. estándar x
+    group_vertical_dispersion = Column(Float, nullable=True)  # Desv. estándar y
 
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
@@ -1,5 +1,15 @@
 import uuid
-from sqlalchemy import Column, UUID, DateTime, func, ForeignKey, Integer, Float, String
+from sqlalchemy import (
+    BigInteger,
+    Column,
+    UUID,
+    DateTime,
+    func,
+    ForeignKey,
+    Integer,
+    Float,
+    String,
+)
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from src.infraestructure.database.session import Base
@@ -13,6 +23,19 @@ class TargetImageModel(Base):
     content_type = Column(String, nullable=False)
     uploaded_at = Column(DateTime, default=datetime.now())
 
+    # Huella al subir: dHash de 64 bits y tamaño, para detectar re-subidas
+    perceptual_hash = Column(BigInteger, nullable=True, index=True)
+    image_width = Column(Integer, nullable=True)
+    image_height = Column(Integer, nullable=True)
+    # SHA-256 del archivo, calculado mientras se sube a S3
+    content_sha256 = Column(String(64), nullable=True)
+    # Imagen anterior del mismo tirador de la que esta es un casi-duplicado
+    duplicate_of_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("target_images.id", ondelete="SET NULL"),
+        nullable=True,
+    )
+
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
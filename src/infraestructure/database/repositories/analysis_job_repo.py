@@ -0,0 +1,82 @@
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional
+from uuid import UUID
+
+from sqlalchemy.orm import Session
+
+from src.infraestructure.database.models.analysis_job_model import (
+    AnalysisJobModel,
+    AnalysisJobStatus,
+)
+
+
+def _elapsed_ms(start: Optional[datetime], end: datetime) -> Optional[float]:
+    if start is None:
+        return None
+    if start.tzinfo is None:
+        start = start.replace(tzinfo=timezone.utc)
+    return (end - start).total_seconds() * 1000
+
+
+class AnalysisJobRepository:
+    @staticmethod
+    def create(db: Session, job_data: dict) -> AnalysisJobModel:
+        job = AnalysisJobModel(created_at=datetime.now(timezone.utc), **job_data)
+        db.add(job)
+        db.commit()
+        db.refresh(job)
+        return job
+
+    @staticmethod
+    def get_by_id(db: Session, job_id: UUID) -> Optional[AnalysisJobModel]:
+        return db.query(AnalysisJobModel).filter(AnalysisJobModel.id == job_id).first()
+
+    @staticmethod
+    def get_active_for_exercise(
+        db: Session, exercise_id: UUID
+    ) -> Optional[AnalysisJobModel]:
+        """Trabajo en cola o en ejecución del ejercicio, si existe"""
+        return (
+            db.query(AnalysisJobModel)
+            .filter(
+                AnalysisJobModel.exercise_id == exercise_id,
+                AnalysisJobModel.status.in_(AnalysisJobStatus.ACTIVE),
+            )
+            .order_by(AnalysisJobModel.created_at.desc())
+            .first()
+        )
+
+    @staticmethod
+    def mark_running(db: Session, job_id: UUID) -> Optional[AnalysisJobModel]:
+        job = AnalysisJobRepository.get_by_id(db, job_id)
+        if not job:
+            return None
+        now = datetime.now(timezone.utc)
+        job.status = AnalysisJobStatus.RUNNING
+        job.started_at = now
+        job.queue_ms = _elapsed_ms(job.created_at, now)
+        db.commit()
+        db.refresh(job)
+        return job
+
+    @staticmethod
+    def mark_finished(
+        db: Session,
+        job_id: UUID,
+        analysis_id: Optional[UUID] = None,
+        error: Optional[str] = None,
+        timings: Optional[Dict[str, Any]] = None,
+    ) -> Optional[AnalysisJobModel]:
+        job = AnalysisJobRepository.get_by_id(db, job_id)
+        if not job:
+            return None
+        now = datetime.now(timezone.utc)
+        job.status = AnalysisJobStatus.FAILED if error else AnalysisJobStatus.SUCCEEDED
+        job.analysis_id = analysis_id
+        job.error = error
+        job.timings = timings
+        job.finished_at = now
+        job.run_ms = _elapsed_ms(job.started_at, now)
+        db.commit()
+        db.refresh(job)
+        return job
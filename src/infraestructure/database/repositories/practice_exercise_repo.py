@@ -800,6 +800,42 @@ class PracticeExerciseRepository:
             logger.error(f"❌ Datos problemáticos: {metrics_data}")
             return False
 
+    @staticmethod
+    def apply_metrics(
+        db: Session, exercise_id: UUID, metrics_data: Dict[str, Any]
+    ) -> bool:
+        """
+        Escribe las métricas consolidadas con un solo UPDATE, sin leer antes
+        el ejercicio ni confirmar: queda en la transacción del análisis.
+        """
+        score_distribution = metrics_data.get("score_distribution")
+        group_diameter = metrics_data.get("group_diameter")
+        stmt = (
+            update(PracticeExerciseModel)
+            .where(PracticeExerciseModel.id == exercise_id)
+            .values(
+                ammunition_used=metrics_data["ammunition_used"],
+                hits=metrics_data["hits"],
+                accuracy_percentage=metrics_data["accuracy_percentage"],
+                reaction_time=metrics_data.get("reaction_time"),
+                total_score=int(metrics_data.get("total_score", 0)),
+                average_score_per_shot=float(
+                    metrics_data.get("average_score_per_shot", 0.0)
+                ),
+                max_score_achieved=int(metrics_data.get("max_score_achieved", 0)),
+                # Mismo formato que update_metrics: JSON serializado
+                score_distribution=(
+                    json.dumps(score_distribution)
+                    if isinstance(score_distribution, dict)
+                    else score_distribution
+                ),
+                group_diameter=(
+                    float(group_diameter) if group_diameter is not None else None
+                ),
+            )
+        )
+        return db.execute(stmt).rowcount > 0
+
     @staticmethod
     def get_exercises_with_images(
         db: Session, session_id: UUID
@@ -816,6 +852,18 @@ class PracticeExerciseRepository:
         result = db.execute(query)
         return result.scalars().all()
 
+    @staticmethod
+    def get_exercise_sessions_by_image_ids(
+        db: Session, image_ids: List[UUID]
+    ) -> List[Any]:
+        """Pares (id del ejercicio, id de la sesión) de las imágenes indicadas"""
+        if not image_ids:
+            return []
+        query = select(
+            PracticeExerciseModel.id, PracticeExerciseModel.session_id
+        ).where(PracticeExerciseModel.target_image_id.in_(image_ids))
+        return db.execute(query).all()
+
     @staticmethod
     def update_exercise(
         db: Session, exercise_id: UUID, **kwargs
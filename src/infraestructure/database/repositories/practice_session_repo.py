@@ -1,7 +1,19 @@
 from typing import List, Optional, Dict, Any
 from uuid import UUID
 from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import or_, func, between, desc, select, update, and_
+from sqlalchemy import (
+    Integer,
+    Numeric,
+    and_,
+    between,
+    case,
+    cast,
+    desc,
+    func,
+    or_,
+    select,
+    update,
+)
 from datetime import datetime, timedelta, timezone
 import logging
 
@@ -83,44 +95,79 @@ class PracticeSessionRepository:
         Actualiza totales de sesión incluyendo puntuación
         """
         try:
-            session = db.query(PracticeSessionModel).filter_by(id=session_id).first()
-            if not session:
-                return False
-
-            # Calcular totales
-            totals = PracticeSessionRepository.calculate_totals_with_scoring(
+            updated = PracticeSessionRepository.refresh_totals_with_scoring(
                 db, session_id
             )
-
-            if totals.get("error"):
-                logger.error(f"Error en cálculo de totales: {totals['error']}")
-                return False
-
-            # Actualizar campos básicos
-            session.total_shots_fired = totals["total_shots"]
-            session.total_hits = totals["total_hits"]
-            session.accuracy_percentage = totals["accuracy_percentage"]
-
-            # ✅ ACTUALIZAR campos de puntuación
-            if hasattr(session, "total_session_score"):
-                session.total_session_score = totals["total_session_score"]
-                session.average_score_per_exercise = totals[
-                    "average_score_per_exercise"
-                ]
-                session.average_score_per_shot = totals["average_score_per_shot"]
-                session.best_shot_score = totals["best_shot_score"]
-
             db.commit()
-            logger.info(
-                f"✅ Totales con puntuación actualizados para sesión {session_id}"
-            )
-            return True
+            if updated:
+                logger.info(
+                    f"✅ Totales con puntuación actualizados para sesión {session_id}"
+                )
+            return updated
 
         except Exception as e:
             db.rollback()
             logger.error(f"Error actualizando totales con puntuación: {str(e)}")
             return False
 
+    @staticmethod
+    def refresh_totals_with_scoring(db: Session, session_id: UUID) -> bool:
+        """
+        Recalcula los totales de la sesión en la base de datos con un solo
+        UPDATE ... FROM sobre los agregados de sus ejercicios (SUM, MAX y
+        COUNT FILTER), sin cargarlos. No confirma: queda en la transacción
+        abierta. Mismos criterios que `calculate_totals_with_scoring`; una
+        sesión sin ejercicios no se modifica.
+        """
+        exercise = PracticeExerciseModel
+        totals = (
+            select(
+                exercise.session_id,
+                func.coalesce(func.sum(exercise.ammunition_used), 0).label("shots"),
+                func.coalesce(func.sum(exercise.hits), 0).label("hits"),
+                func.coalesce(func.sum(exercise.total_score), 0).label("score"),
+                func.count()
+                .filter(exercise.total_score > 0)
+                .label("exercises_with_scoring"),
+                func.coalesce(func.max(exercise.max_score_achieved), 0).label(
+                    "best_shot"
+                ),
+            )
+            .where(exercise.session_id == session_id)
+            .group_by(exercise.session_id)
+            .subquery()
+        )
+
+        def ratio(numerator, denominator, factor=1):
+            # round(numeric, 2): en PostgreSQL no existe round(double, int)
+            return case(
+                (
+                    denominator > 0,
+                    func.round(
+                        cast(numerator * factor, Numeric) / denominator,
+                        2,
+                    ),
+                ),
+                else_=0,
+            )
+
+        stmt = (
+            update(PracticeSessionModel)
+            .where(PracticeSessionModel.id == totals.c.session_id)
+            .values(
+                total_shots_fired=totals.c.shots,
+                total_hits=totals.c.hits,
+                accuracy_percentage=ratio(totals.c.hits, totals.c.shots, 100),
+                total_session_score=cast(totals.c.score, Integer),
+                average_score_per_exercise=ratio(
+                    totals.c.score, totals.c.exercises_with_scoring
+                ),
+                average_score_per_shot=ratio(totals.c.score, totals.c.shots),
+                best_shot_score=totals.c.best_shot,
+            )
+        )
+        return db.execute(stmt).rowcount > 0
+
     @staticmethod
     def calculate_totals(db: Session, session_id: UUID) -> Dict:
         try:
@@ -0,0 +1,52 @@
+from typing import Any, Dict, List
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from src.infraestructure.database.models.shadow_inference_model import (
+    ShadowInferenceResultModel,
+)
+
+
+class ShadowInferenceRepository:
+    @staticmethod
+    def create(db: Session, result_data: dict) -> ShadowInferenceResultModel:
+        result = ShadowInferenceResultModel(**result_data)
+        db.add(result)
+        db.commit()
+        db.refresh(result)
+        return result
+
+    @staticmethod
+    def get_summary(db: Session) -> List[Dict[str, Any]]:
+        """Promedios por par (modelo principal, modelo sombra)"""
+        model = ShadowInferenceResultModel
+        query = (
+            select(
+                model.primary_model_version,
+                model.shadow_model_version,
+                func.count(model.id),
+                func.count(model.error),
+                func.avg(model.primary_latency_ms),
+                func.avg(model.shadow_latency_ms),
+                func.avg(model.precision),
+                func.avg(model.recall),
+                func.avg(model.mean_iou),
+            )
+            .group_by(model.primary_model_version, model.shadow_model_version)
+            .order_by(model.shadow_model_version)
+        )
+        return [
+            {
+                "primary_model_version": row[0],
+                "shadow_model_version": row[1],
+                "samples": row[2],
+                "errors": row[3],
+                "avg_primary_latency_ms": row[4],
+                "avg_shadow_latency_ms": row[5],
+                "avg_precision": row[6],
+                "avg_recall": row[7],
+                "avg_mean_iou": row[8],
+            }
+            for row in db.execute(query).all()
+        ]
@@ -1,20 +1,41 @@
 from typing import Optional, List, Dict, Any
 from uuid import UUID
-from sqlalchemy import select, desc
+from sqlalchemy import Float, cast, desc, func, select, update
 from sqlalchemy.orm import Session, joinedload
 from src.infraestructure.database.models.target_analysis_model import (
     TargetAnalysisModel,
 )
 from src.infraestructure.database.models.target_image_model import TargetImageModel
 
+# Campos de puntuación y de grupo que se escriben desde los datos de puntuación
+SCORING_COLUMNS = (
+    "total_score",
+    "average_score_per_shot",
+    "max_score_achieved",
+    "score_distribution",
+    "shooting_group_diameter",
+    "group_center_x",
+    "group_center_y",
+    "group_mean_radius",
+    "group_cep50",
+    "group_horizontal_dispersion",
+    "group_vertical_dispersion",
+)
+
 
 class TargetAnalysisRepository:
     @staticmethod
-    def create(db: Session, analysis_data: dict) -> TargetAnalysisModel:
+    def create(
+        db: Session, analysis_data: dict, commit: bool = True
+    ) -> TargetAnalysisModel:
+        """Con `commit=False` el INSERT queda en la transacción abierta"""
         analysis = TargetAnalysisModel(**analysis_data)
         db.add(analysis)
-        db.commit()
-        db.refresh(analysis)
+        if commit:
+            db.commit()
+            db.refresh(analysis)
+        else:
+            db.flush()
         return analysis
 
     @staticmethod
@@ -34,15 +55,19 @@ class TargetAnalysisRepository:
 
     @staticmethod
     def update(
-        db: Session, analysis_id: UUID, update_data: Dict[str, Any]
+        db: Session, analysis_id: UUID, update_data: Dict[str, Any], commit: bool = True
     ) -> Optional[TargetAnalysisModel]:
-        analysis = db.query(TargetAnalysisModel).filter_by(id=analysis_id).first()
+        # Si el análisis ya está en la sesión no se vuelve a consultar
+        analysis = db.get(TargetAnalysisModel, analysis_id)
         if not analysis:
             return None
         for key, value in update_data.items():
             setattr(analysis, key, value)
-        db.commit()
-        db.refresh(analysis)
+        if commit:
+            db.commit()
+            db.refresh(analysis)
+        else:
+            db.flush()
         return analysis
 
     @staticmethod
@@ -113,6 +138,7 @@ class TargetAnalysisRepository:
         target_image_id: UUID,
         analysis_data: Dict[str, Any],
         scoring_data: Optional[Dict[str, Any]] = None,
+        commit: bool = True,
     ) -> TargetAnalysisModel:
         """
         Crea un análisis de blanco con datos de puntuación opcionales.
@@ -122,6 +148,7 @@ class TargetAnalysisRepository:
             target_image_id (UUID): ID de la imagen del blanco.
             analysis_data (Dict[str, Any]): Datos del análisis.
             scoring_data (Optional[Dict[str, Any]]): Datos de puntuación.
+            commit (bool): False para dejar el INSERT en la transacción abierta.
 
         Returns:
             TargetAnalysisModel: El modelo de análisis creado.
@@ -146,13 +173,24 @@ class TargetAnalysisRepository:
                     ),
                     "group_center_x": scoring_data.get("group_center_x"),
                     "group_center_y": scoring_data.get("group_center_y"),
+                    "group_mean_radius": scoring_data.get("group_mean_radius"),
+                    "group_cep50": scoring_data.get("group_cep50"),
+                    "group_horizontal_dispersion": scoring_data.get(
+                        "group_horizontal_dispersion"
+                    ),
+                    "group_vertical_dispersion": scoring_data.get(
+                        "group_vertical_dispersion"
+                    ),
                 }
             )
-        return TargetAnalysisRepository.create(db, combined_data)
+        return TargetAnalysisRepository.create(db, combined_data, commit=commit)
 
     @staticmethod
     def update_scoring_data(
-        db: Session, analysis_id: UUID, scoring_data: Dict[str, Any]
+        db: Session,
+        analysis_id: UUID,
+        scoring_data: Dict[str, Any],
+        commit: bool = True,
     ) -> Optional[TargetAnalysisModel]:
         """
         Actualiza los datos de puntuación de un análisis existente.
@@ -161,34 +199,25 @@ class TargetAnalysisRepository:
             db (Session): Sesión de base de datos.
             analysis_id (UUID): ID del análisis a actualizar.
             scoring_data (Dict[str, Any]): Datos de puntuación a actualizar.
+            commit (bool): False para dejar el UPDATE en la transacción abierta.
 
         Returns:
             Optional[TargetAnalysisModel]: El modelo actualizado o None si no se encontró.
         """
-        # Preparar datos de actualización solo para campos de puntuación
-        update_data = {}
-
-        if "total_score" in scoring_data:
-            update_data["total_score"] = scoring_data["total_score"]
-        if "average_score_per_shot" in scoring_data:
-            update_data["average_score_per_shot"] = scoring_data[
-                "average_score_per_shot"
-            ]
-        if "max_score_achieved" in scoring_data:
-            update_data["max_score_achieved"] = scoring_data["max_score_achieved"]
-        if "score_distribution" in scoring_data:
-            update_data["score_distribution"] = scoring_data["score_distribution"]
-        if "shooting_group_diameter" in scoring_data:
-            update_data["shooting_group_diameter"] = scoring_data[
-                "shooting_group_diameter"
-            ]
-        if "group_center_x" in scoring_data:
-            update_data["group_center_x"] = scoring_data["group_center_x"]
-        if "group_center_y" in scoring_data:
-            update_data["group_center_y"] = scoring_data["group_center_y"]
-
         # Usar método update existente
-        return TargetAnalysisRepository.update(db, analysis_id, update_data)
+        return TargetAnalysisRepository.update(
+            db,
+            analysis_id,
+            TargetAnalysisRepository.scoring_columns(scoring_data),
+            commit=commit,
+        )
+
+    @staticmethod
+    def scoring_columns(scoring_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Solo los campos de puntuación presentes en `scoring_data`"""
+        return {
+            key: scoring_data[key] for key in SCORING_COLUMNS if key in scoring_data
+        }
 
     @staticmethod
     def get_analyses_with_scoring(
@@ -313,3 +342,68 @@ class TargetAnalysisRepository:
         result = db.execute(query)
         score = result.scalar_one_or_none()
         return score is not None and score > 0
+
+    @staticmethod
+    def get_scoring_chunk(
+        db: Session, after_id: Optional[UUID], limit: int
+    ) -> List[Any]:
+        """
+        Siguiente bloque de análisis ordenado por id (paginación por clave:
+        `id > after_id`), solo con las columnas que usa el re-puntaje. Las
+        dimensiones de la imagen se leen de `raw_detections` en la consulta
+        para no traer las detecciones crudas completas; los análisis
+        anteriores a `raw_detections` usan las de `target_images`, y si
+        tampoco están se incluye la ruta para leerlas del archivo.
+        """
+        query = select(
+            TargetAnalysisModel.id,
+            TargetAnalysisModel.target_image_id,
+            TargetAnalysisModel.impact_coordinates,
+            func.coalesce(
+                TargetAnalysisModel.raw_detections["image_width"].as_float(),
+                cast(TargetImageModel.image_width, Float),
+            ).label("image_width"),
+            func.coalesce(
+                TargetAnalysisModel.raw_detections["image_height"].as_float(),
+                cast(TargetImageModel.image_height, Float),
+            ).label("image_height"),
+            TargetImageModel.file_path.label("image_path"),
+            TargetAnalysisModel.total_score,
+            TargetAnalysisModel.average_score_per_shot,
+            TargetAnalysisModel.max_score_achieved,
+            TargetAnalysisModel.score_distribution,
+            TargetAnalysisModel.shooting_group_diameter,
+            TargetAnalysisModel.group_center_x,
+            TargetAnalysisModel.group_center_y,
+            TargetAnalysisModel.group_mean_radius,
+            TargetAnalysisModel.group_cep50,
+            TargetAnalysisModel.group_horizontal_dispersion,
+            TargetAnalysisModel.group_vertical_dispersion,
+        ).outerjoin(
+            TargetImageModel, TargetImageModel.id == TargetAnalysisModel.target_image_id
+        )
+        if after_id is not None:
+            query = query.where(TargetAnalysisModel.id > after_id)
+        query = query.order_by(TargetAnalysisModel.id).limit(limit)
+        return db.execute(query).all()
+
+    @staticmethod
+    def bulk_update_scoring(db: Session, rows: List[Dict[str, Any]]) -> int:
+        """
+        Actualiza varios análisis en un solo UPDATE por lotes (executemany por
+        clave primaria). Cada fila lleva `id` y los campos a escribir.
+        """
+        if not rows:
+            return 0
+        try:
+            db.execute(update(TargetAnalysisModel), rows)
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        return len(rows)
+
+    @staticmethod
+    def save_overlays(db: Session, analysis_id: UUID, overlays: Dict[str, Any]) -> None:
+        """Guarda las URLs de las imágenes renderizadas del análisis"""
+        TargetAnalysisRepository.update(db, analysis_id, {"overlays": overlays})
@@ -1,7 +1,7 @@
 from typing import List, Optional, Dict, Any
 from uuid import UUID
 from datetime import datetime, timedelta
-from sqlalchemy import func, desc, and_, or_
+from sqlalchemy import func, desc, and_, or_, update
 from sqlalchemy.orm import Session, joinedload
 import os
 
@@ -153,6 +153,20 @@ class TargetImagesRepository:
             .filter(~TargetImageModel.analyses.any())
         )
 
+    @staticmethod
+    def get_analyzed_images(db: Session, limit: int = 500) -> List[TargetImageModel]:
+        """
+        Obtiene las imagenes mas recientes que ya tienen al menos un analisis.
+        Util como conjunto de calibracion/evaluacion del modelo
+        """
+        return (
+            db.query(TargetImageModel)
+            .filter(TargetImageModel.analyses.any())
+            .order_by(desc(TargetImageModel.uploaded_at))
+            .limit(limit)
+            .all()
+        )
+
     @staticmethod
     def update(db: Session, image_id: UUID, image_data: dict) -> TargetImageModel:
         """
@@ -169,6 +183,22 @@ class TargetImagesRepository:
         db.refresh(image)
         return image
 
+    @staticmethod
+    def save_dimensions(db: Session, rows: List[Dict[str, Any]]) -> int:
+        """
+        Guarda ancho y alto de varias imágenes en un UPDATE por lotes; cada
+        fila lleva `id`, `image_width` e `image_height`.
+        """
+        if not rows:
+            return 0
+        try:
+            db.execute(update(TargetImageModel), rows)
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        return len(rows)
+
     @staticmethod
     def delete(db: Session, image_id: UUID) -> bool:
         """
@@ -253,3 +283,36 @@ class TargetImagesRepository:
         if image and image.analyses and len(image.analyses) > 0:
             return True
         return False
+
+    @staticmethod
+    def get_shooter_fingerprints(
+        db: Session, shooter_id: UUID, limit: int = 500
+    ) -> List[Any]:
+        """
+        Huellas de las imágenes más recientes del tirador (id, ejercicio,
+        hash perceptual y tamaño), para buscar casi-duplicados al subir.
+        """
+        return (
+            db.query(
+                TargetImageModel.id,
+                PracticeExerciseModel.id.label("exercise_id"),
+                TargetImageModel.perceptual_hash,
+                TargetImageModel.image_width,
+                TargetImageModel.image_height,
+            )
+            .join(
+                PracticeExerciseModel,
+                PracticeExerciseModel.target_image_id == TargetImageModel.id,
+            )
+            .join(
+                IndividualPracticeSessionModel,
+                PracticeExerciseModel.session_id == IndividualPracticeSessionModel.id,
+            )
+            .filter(
+                IndividualPracticeSessionModel.shooter_id == shooter_id,
+                TargetImageModel.perceptual_hash.isnot(None),
+            )
+            .order_by(desc(TargetImageModel.created_at))
+            .limit(limit)
+            .all()
+        )
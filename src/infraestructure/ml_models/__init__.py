@@ -1,3 +1,20 @@
 from .bullet_detector import BulletDetector, get_bullet_detector, BulletDetectorError
+from .model_registry import ModelRegistry, ModelVersionNotFoundError
+from .inference_executor import (
+    InferenceExecutor,
+    InferenceQueueFullError,
+    get_inference_executor,
+    shutdown_inference_executor,
+)
 
-__all__ = ["BulletDetector", "get_bullet_detector", "BulletDetectorError"]
+__all__ = [
+    "BulletDetector",
+    "get_bullet_detector",
+    "BulletDetectorError",
+    "ModelRegistry",
+    "ModelVersionNotFoundError",
+    "InferenceExecutor",
+    "InferenceQueueFullError",
+    "get_inference_executor",
+    "shutdown_inference_executor",
+]
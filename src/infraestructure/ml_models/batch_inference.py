@@ -0,0 +1,198 @@
+import logging
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from typing import Any, Callable, Deque, Dict, List, Optional
+
+import numpy as np
+
+from src.infraestructure.utils.stats import percentile_summary
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class _PendingInference:
+    """Imagen en espera de ser incluida en un lote"""
+
+    image_array: np.ndarray
+    confidence_threshold: float
+    future: Future
+    enqueued_at: float = field(default_factory=time.perf_counter)
+
+
+class BatchInferenceStats:
+    """
+    Métricas del batcher: tamaño de lote y tiempo de espera en cola.
+    Se guardan las últimas N muestras para calcular percentiles.
+    """
+
+    def __init__(self, window: int = 1000):
+        self._lock = threading.Lock()
+        self.batches_total = 0
+        self.images_total = 0
+        self.errors_total = 0
+        self.batch_size_histogram: Dict[int, int] = {}
+        self._queue_wait_ms: Deque[float] = deque(maxlen=window)
+        self._inference_ms: Deque[float] = deque(maxlen=window)
+
+    def record_batch(
+        self, batch_size: int, queue_waits_ms: List[float], inference_ms: float
+    ):
+        with self._lock:
+            self.batches_total += 1
+            self.images_total += batch_size
+            self.batch_size_histogram[batch_size] = (
+                self.batch_size_histogram.get(batch_size, 0) + 1
+            )
+            self._queue_wait_ms.extend(queue_waits_ms)
+            self._inference_ms.append(inference_ms)
+
+    def record_error(self):
+        with self._lock:
+            self.errors_total += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "batches_total": self.batches_total,
+                "images_total": self.images_total,
+                "errors_total": self.errors_total,
+                "average_batch_size": (
+                    self.images_total / self.batches_total
+                    if self.batches_total
+                    else 0.0
+                ),
+                "batch_size_histogram": {
+                    str(size): count
+                    for size, count in sorted(self.batch_size_histogram.items())
+                },
+                "queue_wait_ms": percentile_summary(self._queue_wait_ms),
+                "inference_ms": percentile_summary(self._inference_ms),
+            }
+
+
+class BatchInferenceQueue:
+    """
+    Agrupa imágenes que llegan casi al mismo tiempo y las envía al modelo
+    como un solo lote.
+
+    Cada llamador recibe un Future con el resultado crudo de su imagen. El lote
+    se ejecuta con el menor umbral de confianza solicitado; el filtrado por el
+    umbral de cada llamador se hace después, sobre sus propias detecciones.
+    """
+
+    def __init__(
+        self,
+        predict_batch: Callable[[List[np.ndarray], float], List[Any]],
+        max_batch_size: int = 8,
+        max_wait_ms: float = 10.0,
+    ):
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size debe ser >= 1")
+
+        self._predict_batch = predict_batch
+        self.max_batch_size = max_batch_size
+        self.max_wait_ms = max_wait_ms
+        self.stats = BatchInferenceStats()
+
+        self._queue: "queue.Queue[Optional[_PendingInference]]" = queue.Queue()
+        self._stopped = threading.Event()
+        self._worker = threading.Thread(
+            target=self._run, name="bullet-detector-batcher", daemon=True
+        )
+        self._worker.start()
+
+    def submit(self, image_array: np.ndarray, confidence_threshold: float) -> Future:
+        """Encola una imagen y retorna el Future con su resultado"""
+        if self._stopped.is_set():
+            raise RuntimeError("La cola de inferencia está detenida")
+
+        future: Future = Future()
+        self._queue.put(
+            _PendingInference(
+                image_array=image_array,
+                confidence_threshold=confidence_threshold,
+                future=future,
+            )
+        )
+        return future
+
+    def predict(
+        self,
+        image_array: np.ndarray,
+        confidence_threshold: float,
+        timeout: Optional[float] = None,
+    ) -> Any:
+        """Versión bloqueante de submit()"""
+        return self.submit(image_array, confidence_threshold).result(timeout=timeout)
+
+    def shutdown(self, timeout: Optional[float] = None):
+        """Detiene el worker después de procesar lo pendiente"""
+        self._stopped.set()
+        self._queue.put(None)
+        self._worker.join(timeout=timeout)
+
+    def _collect_batch(self) -> List[_PendingInference]:
+        first = self._queue.get()
+        if first is None:
+            return []
+
+        batch = [first]
+        deadline = time.perf_counter() + self.max_wait_ms / 1000
+
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            try:
+                item = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if item is None:
+                # Reencolar la señal de parada para salir en la siguiente vuelta
+                self._queue.put(None)
+                break
+            batch.append(item)
+
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._collect_batch()
+            if not batch:
+                return
+            self._execute(batch)
+
+    def _execute(self, batch: List[_PendingInference]):
+        started_at = time.perf_counter()
+        queue_waits_ms = [(started_at - item.enqueued_at) * 1000 for item in batch]
+        confidence = min(item.confidence_threshold for item in batch)
+
+        try:
+            results = self._predict_batch(
+                [item.image_array for item in batch], confidence
+            )
+            if len(results) != len(batch):
+                raise RuntimeError(
+                    f"El modelo retornó {len(results)} resultados para {len(batch)} imágenes"
+                )
+        except Exception as e:
+            self.stats.record_error()
+            logger.error(f"Error en lote de inferencia ({len(batch)} imágenes): {e}")
+            for item in batch:
+                item.future.set_exception(e)
+            return
+
+        inference_ms = (time.perf_counter() - started_at) * 1000
+        self.stats.record_batch(len(batch), queue_waits_ms, inference_ms)
+        logger.debug(
+            f"Lote de {len(batch)} imágenes procesado en {inference_ms:.1f} ms "
+            f"(espera máx {max(queue_waits_ms):.1f} ms)"
+        )
+
+        for item, result in zip(batch, results):
+            item.future.set_result(result)
@@ -1,17 +1,44 @@
-import io
 import logging
 import os
+import threading
+import time
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, List, Optional, Tuple, Union
 
 import cv2
 import numpy as np
-from PIL import Image
 from ultralytics import YOLO
 
+from src.infraestructure.config.settings import settings
+from src.infraestructure.ml_models.batch_inference import BatchInferenceQueue
+from src.infraestructure.ml_models.decoded_image import DecodedImage
+from src.infraestructure.ml_models.detection_columns import DetectionColumns
+
 # Configurar logging
 logger = logging.getLogger(__name__)
 
+MODELS_DIR = Path(__file__).parent / "models_versions"
+
+# Sufijo del archivo del modelo según el backend de inferencia (ML_MODEL_BACKEND).
+# El nombre base sale de ML_MODEL_VERSIONS; los formatos onnx/openvino se
+# generan con `export_model.py` desde el .pt (onnx_int8 es el ONNX cuantizado)
+MODEL_FILE_SUFFIXES = {
+    "pytorch": ".pt",
+    "onnx": ".onnx",
+    "onnx_int8": "_int8.onnx",
+    "openvino": "_openvino_model",
+}
+
+
+def get_model_version_key(
+    version: Optional[str] = None, backend: Optional[str] = None
+) -> str:
+    """Identifica el modelo que produjo unas detecciones (versión + backend)"""
+    return (
+        f"{version or settings.ML_MODEL_VERSION}/"
+        f"{backend or settings.ML_MODEL_BACKEND}"
+    )
+
 
 class BulletDetectorError(Exception):
     """Excepción personalizada para errores del detector"""
@@ -22,19 +49,33 @@ class BulletDetectorError(Exception):
 class BulletDetector:
     """
     Detector de impactos de bala usando modelo YOLO entrenado.
-    Implementa patrón Singleton para evitar cargar el modelo múltiples veces.
+    Implementa patrón Singleton por versión y backend del modelo para evitar
+    cargar el mismo modelo múltiples veces; varias versiones pueden convivir
+    cargadas.
     """
 
-    _instance = None
+    _instances: Dict[str, "BulletDetector"] = {}
+    _instances_lock = threading.Lock()
     _model = None
     _model_loaded = False
-
-    def __new__(cls):
-        if cls._instance is None:
-            cls._instance = super().__new__(cls)
-        return cls._instance
-
-    def __init__(self):
+    _warmed_up = False
+    _backend: Optional[str] = None
+    _batch_queue_lock = threading.Lock()
+
+    def __new__(cls, version: Optional[str] = None, backend: Optional[str] = None):
+        version = version or settings.ML_MODEL_VERSION
+        backend = backend or settings.ML_MODEL_BACKEND
+        key = get_model_version_key(version, backend)
+        with cls._instances_lock:
+            if key not in cls._instances:
+                instance = super().__new__(cls)
+                instance.version = version
+                instance.backend = backend
+                instance._batch_queue = None
+                cls._instances[key] = instance
+            return cls._instances[key]
+
+    def __init__(self, version: Optional[str] = None, backend: Optional[str] = None):
         # No cargar el modelo en __init__, hacerlo lazy
         pass
 
@@ -43,12 +84,30 @@ class BulletDetector:
         if not self._model_loaded:
             self._load_model()
 
+    @staticmethod
+    def get_model_path(backend: str, version: Optional[str] = None) -> Path:
+        """Ruta del modelo para el backend y la versión indicados"""
+        if backend not in MODEL_FILE_SUFFIXES:
+            raise BulletDetectorError(
+                f"Backend no soportado: {backend}. "
+                f"Opciones: {', '.join(MODEL_FILE_SUFFIXES)}"
+            )
+        version = version or settings.ML_MODEL_VERSION
+        if version not in settings.ML_MODEL_VERSIONS:
+            raise BulletDetectorError(
+                f"Versión de modelo desconocida: {version}. "
+                f"Opciones: {', '.join(settings.ML_MODEL_VERSIONS)}"
+            )
+        stem = settings.ML_MODEL_VERSIONS[version]
+        return MODELS_DIR / f"{stem}{MODEL_FILE_SUFFIXES[backend]}"
+
     def _load_model(self):
-        """Carga el modelo YOLO desde el archivo .pt"""
+        """Carga el modelo YOLO con su backend (.pt, ONNX, ONNX INT8 u OpenVINO)"""
         try:
             # Ruta relativa al modelo
             current_dir = Path(__file__).parent
-            model_path = current_dir / "models_versions" / "BulletDetector_v2.pt"
+            backend = self.backend
+            model_path = self.get_model_path(backend, self.version)
 
             # Debug: mostrar rutas para diagnóstico
             logger.info(f"Directorio actual: {current_dir}")
@@ -67,8 +126,11 @@ class BulletDetector:
             if not model_path.exists():
                 raise BulletDetectorError(f"Modelo no encontrado en: {model_path}")
 
-            logger.info(f"Cargando modelo desde: {model_path}")
-            self._model = YOLO(str(model_path))
+            logger.info(
+                f"Cargando modelo {self.version} ({backend}) desde: {model_path}"
+            )
+            self._model = YOLO(str(model_path), task="detect")
+            self._backend = backend
             self._model_loaded = True
 
             # Verificar que el modelo tiene las clases esperadas
@@ -91,63 +153,118 @@ class BulletDetector:
             print(f"DETECTION_ERROR: No se pudo cargar el modelo: {str(e)}")
             raise BulletDetectorError(f"No se pudo cargar el modelo: {str(e)}")
 
-    def _preprocess_image(self, image_data: bytes) -> np.ndarray:
+    def warm_up(
+        self, iterations: int = 3, width: int = 1920, height: int = 1440
+    ) -> float:
         """
-        Preprocesa los datos de imagen para el modelo.
+        Carga el modelo y ejecuta inferencias de prueba para que la primera
+        petición real no pague la carga ni la inicialización del runtime.
 
         Args:
-            image_data: Bytes de la imagen
+            iterations: Número de inferencias de prueba
+            width: Ancho de la imagen sintética
+            height: Alto de la imagen sintética
 
         Returns:
-            numpy array de la imagen en formato RGB
+            Tiempo total del calentamiento en segundos
         """
-        try:
-            # Convertir bytes a imagen PIL
-            image = Image.open(io.BytesIO(image_data))
+        started_at = time.perf_counter()
+        self._ensure_model_loaded()
 
-            # Convertir a RGB si es necesario
-            if image.mode != "RGB":
-                image = image.convert("RGB")
+        # Blanco liso: mismo tamaño que una foto típica, sin impactos
+        dummy_image = np.full((height, width, 3), 255, dtype=np.uint8)
+        for _ in range(max(iterations, 1)):
+            self._predict_batch([dummy_image], 0.25)
+
+        self._warmed_up = True
+        elapsed = time.perf_counter() - started_at
+        logger.info(
+            f"Modelo calentado con {iterations} inferencias de {width}x{height} "
+            f"en {elapsed:.2f}s"
+        )
+        return elapsed
+
+    @property
+    def is_warmed_up(self) -> bool:
+        return self._warmed_up
+
+    def _preprocess_image(
+        self, image_data: Union[bytes, DecodedImage], max_side: Optional[int] = None
+    ) -> Tuple[np.ndarray, float]:
+        """
+        Preprocesa los datos de imagen para el modelo.
 
-            # Convertir a numpy array
-            image_array = np.array(image)
+        Args:
+            image_data: Bytes de la imagen o imagen ya decodificada
+            max_side: Lado mínimo a conservar si se permite decodificar reducida
 
-            return image_array
+        Returns:
+            Tupla (numpy array RGB, escala respecto a la imagen original)
+        """
+        try:
+            image = DecodedImage.from_source(image_data)
+            return image.rgb_array(max_side)
 
         except Exception as e:
             raise BulletDetectorError(f"Error procesando imagen: {str(e)}")
 
     def detect_impacts(
-        self, image_data: bytes, confidence_threshold: float = 0.6
+        self,
+        image_data: Union[bytes, DecodedImage],
+        confidence_threshold: float = 0.6,
+        tiled: Optional[bool] = None,
     ) -> List[Dict]:
         """
         Detecta impactos en una imagen de blanco de tiro.
 
         Args:
-            image_data: Datos binarios de la imagen
+            image_data: Datos binarios de la imagen o imagen ya decodificada
             confidence_threshold: Umbral mínimo de confianza para detecciones
+            tiled: Forzar (True) o desactivar (False) la inferencia por mosaicos;
+                None la decide según ML_TILING_MIN_SIDE
 
         Returns:
             Lista de diccionarios con información de cada impacto detectado
         """
+        return self.detect_columns(image_data, confidence_threshold, tiled).to_dicts()
+
+    def detect_columns(
+        self,
+        image_data: Union[bytes, DecodedImage],
+        confidence_threshold: float = 0.6,
+        tiled: Optional[bool] = None,
+    ) -> DetectionColumns:
+        """
+        Igual que `detect_impacts` pero retorna las detecciones en formato
+        columnar, sin construir un dict por impacto.
+        """
 
         # Cargar modelo si no está cargado (lazy loading)
         self._ensure_model_loaded()
 
         try:
-            # Preprocesar imagen
-            image_array = self._preprocess_image(image_data)
-
-            # Ejecutar detección
-            results = self._model.predict(
-                source=image_array, conf=confidence_threshold, verbose=False
-            )
-
-            # Procesar resultados
-            detections = self._process_predictions(results[0])
+            image = DecodedImage.from_source(image_data)
+
+            if tiled is None:
+                tiled = self._should_tile(image.width, image.height)
+
+            if tiled:
+                # Los mosaicos necesitan la resolución completa
+                image_array, _ = self._preprocess_image(image)
+                detections = self._detect_tiled(image_array, confidence_threshold)
+            else:
+                # YOLO reescala a su entrada, basta decodificar reducido
+                image_array, scale = self._preprocess_image(
+                    image, settings.ML_REDUCED_DECODE_SIDE or None
+                )
+                detections = self._detect_single_pass(image_array, confidence_threshold)
+                if scale != 1.0:
+                    # Llevar a px de la imagen original
+                    detections = detections.scale(1.0 / scale)
 
             logger.info(
                 f"Detectados {len(detections)} impactos con confianza >= {confidence_threshold}"
+                f"{' (mosaicos)' if tiled else ''}"
             )
 
             return detections
@@ -158,7 +275,148 @@ class BulletDetector:
             logger.error(f"Error en detección: {str(e)}")
             raise BulletDetectorError(f"Error durante la detección: {str(e)}")
 
-    def _process_predictions(self, prediction_result) -> List[Dict]:
+    def _detect_single_pass(
+        self, image_array: np.ndarray, confidence_threshold: float
+    ) -> DetectionColumns:
+        """Inferencia sobre la imagen completa (YOLO la reescala a su entrada)"""
+        # Ejecutar detección (agrupada en lotes si está habilitado)
+        batch_queue = self._get_batch_queue()
+        if batch_queue is not None:
+            result = batch_queue.predict(image_array, confidence_threshold)
+        else:
+            result = self._predict_batch([image_array], confidence_threshold)[0]
+
+        # Procesar resultados; el lote pudo correr con un umbral menor
+        return self._process_predictions(result).filter_confidence(confidence_threshold)
+
+    def _should_tile(self, width: int, height: int) -> bool:
+        if not settings.ML_TILING_ENABLED:
+            return False
+        return max(width, height) > settings.ML_TILING_MIN_SIDE
+
+    def _detect_tiled(
+        self, image_array: np.ndarray, confidence_threshold: float
+    ) -> DetectionColumns:
+        """
+        Divide la imagen en mosaicos traslapados, los procesa en un solo lote y
+        une las detecciones. Evita que YOLO reduzca una foto grande a 640px y
+        pierda los impactos pequeños.
+        """
+        height, width = image_array.shape[:2]
+        windows = self._tile_windows(
+            width, height, settings.ML_TILE_SIZE, settings.ML_TILE_OVERLAP
+        )
+        tiles = [image_array[y1:y2, x1:x2] for x1, y1, x2, y2 in windows]
+        results = self._predict_batch(tiles, confidence_threshold)
+
+        detections = DetectionColumns.concatenate(
+            [
+                self._process_predictions(result).translate(offset_x, offset_y)
+                for (offset_x, offset_y, _, _), result in zip(windows, results)
+            ]
+        )
+
+        return self._merge_tile_detections(detections, settings.ML_TILE_NMS_THRESHOLD)
+
+    @staticmethod
+    def _tile_windows(
+        width: int, height: int, tile_size: int, overlap: float
+    ) -> List[Tuple[int, int, int, int]]:
+        """Ventanas (x1, y1, x2, y2) que cubren la imagen con el traslape dado"""
+        stride = max(1, int(tile_size * (1 - overlap)))
+
+        def starts(length: int) -> List[int]:
+            if length <= tile_size:
+                return [0]
+            positions = list(range(0, length - tile_size, stride))
+            positions.append(length - tile_size)
+            return positions
+
+        return [
+            (x, y, min(x + tile_size, width), min(y + tile_size, height))
+            for y in starts(height)
+            for x in starts(width)
+        ]
+
+    @staticmethod
+    def _merge_tile_detections(
+        detections: DetectionColumns, overlap_threshold: float = 0.5
+    ) -> DetectionColumns:
+        """
+        NMS entre mosaicos, independiente de la clase. Usa intersección sobre el
+        área menor: un impacto cortado en el borde de un mosaico se descarta a
+        favor del mismo impacto completo en el mosaico vecino.
+        """
+        if len(detections) < 2:
+            return detections
+
+        boxes = detections.boxes
+        scores = detections.confidences
+        areas = detections.areas
+
+        order = np.argsort(-scores)
+        keep = []
+        while order.size > 0:
+            best, rest = order[0], order[1:]
+            keep.append(best)
+
+            inter_w = np.clip(
+                np.minimum(boxes[best, 2], boxes[rest, 2])
+                - np.maximum(boxes[best, 0], boxes[rest, 0]),
+                0,
+                None,
+            )
+            inter_h = np.clip(
+                np.minimum(boxes[best, 3], boxes[rest, 3])
+                - np.maximum(boxes[best, 1], boxes[rest, 1]),
+                0,
+                None,
+            )
+            smaller_area = np.maximum(np.minimum(areas[best], areas[rest]), 1e-9)
+            overlap = inter_w * inter_h / smaller_area
+            order = rest[overlap <= overlap_threshold]
+
+        return detections.select(np.sort(keep))
+
+    def _predict_batch(
+        self, image_arrays: List[np.ndarray], confidence_threshold: float
+    ) -> List:
+        """Ejecuta el modelo sobre una lista de imágenes en una sola llamada"""
+        return self._model.predict(
+            source=image_arrays, conf=confidence_threshold, verbose=False
+        )
+
+    def _get_batch_queue(self) -> Optional[BatchInferenceQueue]:
+        """Crea la cola de micro-lotes la primera vez que se necesita"""
+        if not settings.ML_BATCHING_ENABLED:
+            return None
+
+        with BulletDetector._batch_queue_lock:
+            if self._batch_queue is None:
+                self._batch_queue = BatchInferenceQueue(
+                    predict_batch=self._predict_batch,
+                    max_batch_size=settings.ML_BATCH_MAX_SIZE,
+                    max_wait_ms=settings.ML_BATCH_MAX_WAIT_MS,
+                )
+                logger.info(
+                    f"Micro-batching habilitado (max_batch_size={settings.ML_BATCH_MAX_SIZE}, "
+                    f"max_wait_ms={settings.ML_BATCH_MAX_WAIT_MS})"
+                )
+        return self._batch_queue
+
+    def get_inference_stats(self) -> Dict:
+        """Métricas de la cola de micro-lotes (tamaño de lote y espera)"""
+        if self._batch_queue is None:
+            return {"batching_enabled": settings.ML_BATCHING_ENABLED}
+
+        return {
+            "batching_enabled": True,
+            "max_batch_size": self._batch_queue.max_batch_size,
+            "max_wait_ms": self._batch_queue.max_wait_ms,
+            **self._batch_queue.stats.snapshot(),
+        }
+
+    def _process_predictions(self, prediction_result) -> DetectionColumns:
         """
         Procesa los resultados de predicción del modelo YOLO.
 
@@ -166,45 +424,9 @@ class BulletDetector:
             prediction_result: Resultado de predicción de YOLO
 
         Returns:
-            Lista de detecciones procesadas
+            Detecciones en formato columnar
         """
-        detections = []
-
-        if prediction_result.boxes is None:
-            return detections
-
-        boxes = prediction_result.boxes
-
-        for i in range(len(boxes)):
-            # Información básica de la detección
-            clase_id = int(boxes.cls[i])
-            confianza = float(boxes.conf[i])
-            x1, y1, x2, y2 = boxes.xyxy[i].tolist()
-            nombre_clase = self._model.names[clase_id]
-
-            # Calcular centro del impacto
-            centro_x = (x1 + x2) / 2
-            centro_y = (y1 + y2) / 2
-
-            # Clasificar el impacto usando las etiquetas del modelo
-            es_fresco = "fresco" in nombre_clase.lower()
-            dentro_blanco = "dentro" in nombre_clase.lower()
-
-            # Crear objeto de detección
-            detection = {
-                "tipo": nombre_clase,
-                "confianza": confianza,
-                "centro_x": centro_x,
-                "centro_y": centro_y,
-                "bbox": [x1, y1, x2, y2],
-                "es_fresco": es_fresco,
-                "dentro_blanco": dentro_blanco,
-                "area": (x2 - x1) * (y2 - y1),
-            }
-
-            detections.append(detection)
-
-        return detections
+        return DetectionColumns.from_yolo(prediction_result.boxes, self._model.names)
 
     def get_model_info(self) -> Dict:
         """
@@ -222,23 +444,28 @@ class BulletDetector:
         return {
             "status": "loaded",
             "model_type": "YOLOv8",
+            "backend": self._backend,
             "classes": list(self._model.names.values()),
             "num_classes": len(self._model.names),
-            "version": "2.0",
+            "version": self.version,
+            "inference": self.get_inference_stats(),
         }
 
-    def validate_image(self, image_data: bytes) -> Tuple[bool, Optional[str]]:
+    def validate_image(
+        self, image_data: Union[bytes, DecodedImage]
+    ) -> Tuple[bool, Optional[str]]:
         """
-        Valida que la imagen sea procesable por el modelo.
+        Valida que la imagen sea procesable por el modelo. Solo lee el
+        encabezado, no decodifica los píxeles.
 
         Args:
-            image_data: Datos binarios de la imagen
+            image_data: Datos binarios de la imagen o imagen ya decodificada
 
         Returns:
             Tupla (es_valida, mensaje_error)
         """
         try:
-            image = Image.open(io.BytesIO(image_data))
+            image = DecodedImage.from_source(image_data)
 
             # Verificar formato
             if image.format not in ["JPEG", "PNG", "BMP"]:
@@ -259,43 +486,152 @@ class BulletDetector:
             return False, f"Error validando imagen: {str(e)}"
 
     def analyze_with_stats(
-        self, image_data: bytes, confidence_threshold: float = 0.25
+        self,
+        image_data: Union[bytes, DecodedImage],
+        confidence_threshold: float = 0.25,
+        columnar: bool = False,
     ) -> Dict:
         """
         Analiza imagen y retorna estadísticas detalladas.
 
         Args:
-            image_data: Datos binarios de la imagen
+            image_data: Datos binarios de la imagen o imagen ya decodificada
             confidence_threshold: Umbral de confianza
+            columnar: Retornar las detecciones en el formato compacto de
+                `DetectionColumns.to_payload` en lugar de una lista de dicts
 
         Returns:
             Diccionario con detecciones y estadísticas
         """
-        # Validar imagen
-        is_valid, error_msg = self.validate_image(image_data)
-        if not is_valid:
-            raise BulletDetectorError(f"Imagen inválida: {error_msg}")
+        # Validar imagen (la misma DecodedImage se reutiliza en la detección)
+        image = self._validated_image(image_data)
 
         # Detectar impactos
-        detections = self.detect_impacts(image_data, confidence_threshold)
+        detections = self.detect_columns(image, confidence_threshold)
+
+        return self._analysis_result(detections, confidence_threshold, columnar)
+
+    def analyze_batch_with_stats(
+        self,
+        images: List[Union[bytes, DecodedImage]],
+        confidence_threshold: float = 0.25,
+        columnar: bool = False,
+    ) -> List[Dict]:
+        """
+        Igual que `analyze_with_stats` para varias imágenes a la vez: las que
+        no requieren mosaicos se procesan juntas en lotes de hasta
+        ML_BATCH_MAX_SIZE en una sola llamada al modelo.
 
-        # Calcular estadísticas
-        stats = self._calculate_statistics(detections)
+        Returns:
+            Un resultado por imagen, en el mismo orden
+        """
+        self._ensure_model_loaded()
+        decoded = [self._validated_image(image) for image in images]
+
+        detections: List[Optional[DetectionColumns]] = [None] * len(decoded)
+        single_pass = []
+        for index, image in enumerate(decoded):
+            if self._should_tile(image.width, image.height):
+                detections[index] = self.detect_columns(
+                    image, confidence_threshold, tiled=True
+                )
+            else:
+                single_pass.append(index)
+
+        batch_size = max(settings.ML_BATCH_MAX_SIZE, 1)
+        for start in range(0, len(single_pass), batch_size):
+            indices = single_pass[start : start + batch_size]
+            try:
+                prepared = [
+                    self._preprocess_image(
+                        decoded[i], settings.ML_REDUCED_DECODE_SIDE or None
+                    )
+                    for i in indices
+                ]
+                results = self._predict_batch(
+                    [array for array, _ in prepared], confidence_threshold
+                )
+            except BulletDetectorError:
+                raise
+            except Exception as e:
+                logger.error(f"Error en detección por lotes: {str(e)}")
+                raise BulletDetectorError(f"Error durante la detección: {str(e)}")
+
+            for i, (_, scale), result in zip(indices, prepared, results):
+                columns = self._process_predictions(result)
+                detections[i] = columns.scale(1.0 / scale) if scale != 1.0 else columns
+
+        logger.info(
+            f"Lote de {len(decoded)} imágenes: "
+            f"{sum(len(d) for d in detections)} impactos con confianza >= "
+            f"{confidence_threshold}"
+        )
+        return [
+            self._analysis_result(columns, confidence_threshold, columnar)
+            for columns in detections
+        ]
+
+    def _validated_image(self, image_data: Union[bytes, DecodedImage]) -> DecodedImage:
+        try:
+            image = DecodedImage.from_source(image_data)
+        except Exception as e:
+            raise BulletDetectorError(f"Imagen inválida: Error validando imagen: {e}")
 
+        is_valid, error_msg = self.validate_image(image)
+        if not is_valid:
+            raise BulletDetectorError(f"Imagen inválida: {error_msg}")
+        return image
+
+    def _analysis_result(
+        self, detections: DetectionColumns, confidence_threshold: float, columnar: bool
+    ) -> Dict:
         return {
-            "detections": detections,
-            "statistics": stats,
+            "detections": (
+                detections.to_payload() if columnar else detections.to_dicts()
+            ),
+            "statistics": self._calculate_statistics(detections),
             "analysis_metadata": {
                 "confidence_threshold": confidence_threshold,
                 "total_detections": len(detections),
-                "model_version": "2.0",
+                "model_version": self.version,
             },
         }
 
-    def _calculate_statistics(self, detections: List[Dict]) -> Dict:
+    def refilter(
+        self,
+        detections: Union[DetectionColumns, Dict, List[Dict]],
+        confidence_threshold: float,
+    ) -> Dict:
+        """
+        Filtra detecciones obtenidas a un umbral menor y recalcula estadísticas,
+        sin volver a ejecutar el modelo.
+
+        Args:
+            detections: Detecciones crudas (umbral <= confidence_threshold), en
+                formato columnar o como lista de dicts
+            confidence_threshold: Umbral de confianza solicitado
+
+        Returns:
+            Diccionario con el formato de analyze_with_stats, con las
+            detecciones como DetectionColumns
+        """
+        filtered = DetectionColumns.from_payload(detections).filter_confidence(
+            confidence_threshold
+        )
+        return {
+            "detections": filtered,
+            "statistics": self._calculate_statistics(filtered),
+            "analysis_metadata": {
+                "confidence_threshold": confidence_threshold,
+                "total_detections": len(filtered),
+                "model_version": self.version,
+            },
+        }
+
+    def _calculate_statistics(self, detections: DetectionColumns) -> Dict:
         """Calcula estadísticas solo para impactos frescos"""
 
-        if not detections:
+        if len(detections) == 0:
             return {
                 "total_impacts": 0,
                 "fresh_impacts_inside": 0,
@@ -306,39 +642,38 @@ class BulletDetector:
             }
 
         # Solo frescos ahora (modelo v2)
-        fresh_inside = [d for d in detections if d["dentro_blanco"]]
-        fresh_outside = [d for d in detections if not d["dentro_blanco"]]
-
         total_fresh = len(detections)
-        accuracy = (len(fresh_inside) / total_fresh * 100) if total_fresh > 0 else 0.0
+        fresh_inside = int(np.count_nonzero(detections.inside_mask))
+        accuracy = fresh_inside / total_fresh * 100
 
         # Estadísticas de confianza
-        confidences = [d["confianza"] for d in detections]
-        confidence_stats = {
-            "min": min(confidences),
-            "max": max(confidences),
-            "mean": np.mean(confidences),
-            "std": np.std(confidences),
-        }
+        confidences = detections.confidences
+        mean = float(confidences.mean())
 
         return {
             "total_impacts": total_fresh,
-            "fresh_impacts_inside": len(fresh_inside),
-            "fresh_impacts_outside": len(fresh_outside),
+            "fresh_impacts_inside": fresh_inside,
+            "fresh_impacts_outside": total_fresh - fresh_inside,
             "accuracy_percentage": accuracy,
-            "average_confidence": float(confidence_stats["mean"]),
+            "average_confidence": mean,
             "confidence_stats": {
-                "min": float(confidence_stats["min"]),
-                "max": float(confidence_stats["max"]),
-                "mean": float(confidence_stats["mean"]),
-                "std": float(confidence_stats["std"]),
+                "min": float(confidences.min()),
+                "max": float(confidences.max()),
+                "mean": mean,
+                "std": float(confidences.std()),
             },
         }
 
 
-def get_bullet_detector() -> BulletDetector:
+def get_bullet_detector(
+    version: Optional[str] = None, backend: Optional[str] = None
+) -> BulletDetector:
     """
     Función helper para obtener la instancia del detector.
     Útil para dependency injection en FastAPI.
+
+    Args:
+        version: Versión del modelo; None = ML_MODEL_VERSION
+        backend: Backend de inferencia; None = ML_MODEL_BACKEND
     """
-    return BulletDetector()  # Se crea cuando se necesita
+    return BulletDetector(version, backend)  # Se crea cuando se necesita
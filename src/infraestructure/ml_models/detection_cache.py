@@ -0,0 +1,138 @@
+import copy
+import hashlib
+import json
+import logging
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional
+
+from src.infraestructure.config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+
+class DetectionCache:
+    """
+    Caché de resultados de `analyze_with_stats` direccionada por contenido.
+
+    La llave combina el SHA-256 de los bytes de la imagen, la versión/backend
+    del modelo y el umbral de confianza, así que una misma foto analizada con
+    los mismos parámetros nunca vuelve a pasar por YOLO. Primer nivel: LRU en
+    memoria del proceso; segundo nivel opcional: Redis, compartido entre
+    workers e instancias.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 256,
+        redis_url: Optional[str] = None,
+        redis_ttl_seconds: int = 7 * 24 * 3600,
+    ):
+        self.max_entries = max_entries
+        self.redis_ttl_seconds = redis_ttl_seconds
+        self._entries: "OrderedDict[str, Dict]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._redis = None
+
+        self.hits = 0
+        self.redis_hits = 0
+        self.misses = 0
+
+        if redis_url:
+            try:
+                import redis
+
+                self._redis = redis.Redis.from_url(
+                    redis_url, socket_timeout=0.5, socket_connect_timeout=0.5
+                )
+            except Exception as e:
+                logger.warning(f"Caché Redis deshabilitada: {str(e)}")
+
+    @staticmethod
+    def build_key(
+        image_data: bytes, model_version: str, confidence_threshold: float
+    ) -> str:
+        image_hash = hashlib.sha256(image_data).hexdigest()
+        return f"detections:{model_version}:{confidence_threshold:.4f}:{image_hash}"
+
+    def get(self, key: str) -> Optional[Dict]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return copy.deepcopy(entry)
+
+        entry = self._get_from_redis(key)
+        with self._lock:
+            if entry is None:
+                self.misses += 1
+                return None
+            self.redis_hits += 1
+            self._store_local(key, entry)
+        return copy.deepcopy(entry)
+
+    def set(self, key: str, value: Dict):
+        with self._lock:
+            self._store_local(key, copy.deepcopy(value))
+
+        if self._redis is not None:
+            try:
+                self._redis.setex(key, self.redis_ttl_seconds, json.dumps(value))
+            except Exception as e:
+                logger.warning(f"No se pudo guardar en Redis: {str(e)}")
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict:
+        with self._lock:
+            lookups = self.hits + self.redis_hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "redis_enabled": self._redis is not None,
+                "hits": self.hits,
+                "redis_hits": self.redis_hits,
+                "misses": self.misses,
+                "hit_ratio": (
+                    (self.hits + self.redis_hits) / lookups if lookups else 0.0
+                ),
+            }
+
+    def _store_local(self, key: str, value: Dict):
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _get_from_redis(self, key: str) -> Optional[Dict]:
+        if self._redis is None:
+            return None
+        try:
+            raw = self._redis.get(key)
+        except Exception as e:
+            logger.warning(f"No se pudo leer de Redis: {str(e)}")
+            return None
+        return json.loads(raw) if raw else None
+
+
+_cache: Optional[DetectionCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_detection_cache() -> Optional[DetectionCache]:
+    """Caché compartida del proceso, o None si está deshabilitada"""
+    global _cache
+    if not settings.ML_CACHE_ENABLED:
+        return None
+
+    with _cache_lock:
+        if _cache is None:
+            _cache = DetectionCache(
+                max_entries=settings.ML_CACHE_MAX_ENTRIES,
+                redis_url=settings.ML_CACHE_REDIS_URL,
+                redis_ttl_seconds=settings.ML_CACHE_REDIS_TTL_SECONDS,
+            )
+        return _cache
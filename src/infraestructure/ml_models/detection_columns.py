@@ -0,0 +1,199 @@
+from dataclasses import dataclass
+from typing import Any, Dict, List, Mapping, Sequence, Tuple, Union
+
+import numpy as np
+
+
+@dataclass
+class DetectionColumns:
+    """
+    Detecciones en formato columnar (un array por campo en lugar de un dict
+    por impacto).
+
+    Se obtiene del resultado de YOLO con una sola transferencia de tensores y
+    viaja así por filtrado, mosaicos, puntuación y persistencia. La lista de
+    dicts que espera la API (`to_dicts`) se construye solo al final.
+    """
+
+    class_names: Tuple[str, ...]
+    class_ids: np.ndarray  # (N,) int
+    confidences: np.ndarray  # (N,) float
+    boxes: np.ndarray  # (N, 4) float, xyxy en px
+
+    @classmethod
+    def empty(cls, class_names: Sequence[str] = ()) -> "DetectionColumns":
+        return cls(
+            class_names=tuple(class_names),
+            class_ids=np.zeros(0, dtype=np.int64),
+            confidences=np.zeros(0, dtype=np.float64),
+            boxes=np.zeros((0, 4), dtype=np.float64),
+        )
+
+    @classmethod
+    def from_yolo(cls, boxes, names: Mapping[int, str]) -> "DetectionColumns":
+        """
+        Convierte `result.boxes` de ultralytics.
+
+        Args:
+            boxes: Boxes de YOLO (puede ser None)
+            names: Diccionario id -> nombre de clase del modelo
+        """
+        class_names = tuple(
+            names.get(i, str(i)) for i in range(max(names, default=-1) + 1)
+        )
+        if boxes is None or len(boxes) == 0:
+            return cls.empty(class_names)
+
+        # Una sola copia del tensor a CPU; cls/conf/xyxy quedan como vistas
+        boxes = boxes.cpu().numpy()
+        return cls(
+            class_names=class_names,
+            class_ids=boxes.cls.astype(np.int64),
+            confidences=boxes.conf.astype(np.float64),
+            boxes=boxes.xyxy.astype(np.float64),
+        )
+
+    @classmethod
+    def from_records(cls, records: List[Dict[str, Any]]) -> "DetectionColumns":
+        """Convierte la lista de dicts del formato anterior"""
+        class_names = tuple(dict.fromkeys(r["tipo"] for r in records))
+        if not records:
+            return cls.empty()
+
+        index = {name: i for i, name in enumerate(class_names)}
+        return cls(
+            class_names=class_names,
+            class_ids=np.array([index[r["tipo"]] for r in records], dtype=np.int64),
+            confidences=np.array([r["confianza"] for r in records], dtype=np.float64),
+            boxes=np.array([r["bbox"] for r in records], dtype=np.float64),
+        )
+
+    @classmethod
+    def from_payload(
+        cls, payload: Union["DetectionColumns", Dict[str, Any], List[Dict], None]
+    ) -> "DetectionColumns":
+        """
+        Acepta el formato compacto de `to_payload`, la lista de dicts anterior
+        (análisis ya guardados o en caché) o una instancia ya construida.
+        """
+        if isinstance(payload, DetectionColumns):
+            return payload
+        if not payload:
+            return cls.empty()
+        if isinstance(payload, list):
+            return cls.from_records(payload)
+
+        return cls(
+            class_names=tuple(payload["clases"]),
+            class_ids=np.asarray(payload["clase_id"], dtype=np.int64),
+            confidences=np.asarray(payload["confianza"], dtype=np.float64),
+            boxes=np.asarray(payload["bbox"], dtype=np.float64).reshape(-1, 4),
+        )
+
+    @classmethod
+    def concatenate(
+        cls, parts: Sequence["DetectionColumns"], class_names: Sequence[str] = ()
+    ) -> "DetectionColumns":
+        """Une detecciones del mismo modelo (por ejemplo, de varios mosaicos)"""
+        if not parts:
+            return cls.empty(class_names)
+        return cls(
+            class_names=parts[0].class_names,
+            class_ids=np.concatenate([p.class_ids for p in parts]),
+            confidences=np.concatenate([p.confidences for p in parts]),
+            boxes=np.concatenate([p.boxes for p in parts]),
+        )
+
+    def __len__(self) -> int:
+        return len(self.class_ids)
+
+    @property
+    def centers_x(self) -> np.ndarray:
+        return (self.boxes[:, 0] + self.boxes[:, 2]) / 2
+
+    @property
+    def centers_y(self) -> np.ndarray:
+        return (self.boxes[:, 1] + self.boxes[:, 3]) / 2
+
+    @property
+    def areas(self) -> np.ndarray:
+        return (self.boxes[:, 2] - self.boxes[:, 0]) * (
+            self.boxes[:, 3] - self.boxes[:, 1]
+        )
+
+    @property
+    def fresh_mask(self) -> np.ndarray:
+        return self._class_flag("fresco")[self.class_ids]
+
+    @property
+    def inside_mask(self) -> np.ndarray:
+        return self._class_flag("dentro")[self.class_ids]
+
+    def _class_flag(self, keyword: str) -> np.ndarray:
+        # Las etiquetas del modelo codifican el tipo de impacto en el nombre
+        return np.array(
+            [keyword in name.lower() for name in self.class_names], dtype=bool
+        )
+
+    def select(self, selector: np.ndarray) -> "DetectionColumns":
+        """Subconjunto por máscara booleana o índices"""
+        return DetectionColumns(
+            class_names=self.class_names,
+            class_ids=self.class_ids[selector],
+            confidences=self.confidences[selector],
+            boxes=self.boxes[selector],
+        )
+
+    def filter_confidence(self, confidence_threshold: float) -> "DetectionColumns":
+        return self.select(self.confidences >= confidence_threshold)
+
+    def translate(self, offset_x: float, offset_y: float) -> "DetectionColumns":
+        return DetectionColumns(
+            class_names=self.class_names,
+            class_ids=self.class_ids,
+            confidences=self.confidences,
+            boxes=self.boxes + np.array([offset_x, offset_y, offset_x, offset_y]),
+        )
+
+    def scale(self, factor: float) -> "DetectionColumns":
+        return DetectionColumns(
+            class_names=self.class_names,
+            class_ids=self.class_ids,
+            confidences=self.confidences,
+            boxes=self.boxes * factor,
+        )
+
+    def to_payload(self) -> Dict[str, Any]:
+        """Formato compacto serializable a JSON (BD, caché, entre procesos)"""
+        return {
+            "clases": list(self.class_names),
+            "clase_id": self.class_ids.tolist(),
+            "confianza": self.confidences.tolist(),
+            "bbox": self.boxes.tolist(),
+        }
+
+    def to_dicts(self) -> List[Dict[str, Any]]:
+        """Lista de dicts por impacto, el contrato de salida de la API"""
+        names = [self.class_names[i] for i in self.class_ids.tolist()]
+        return [
+            {
+                "tipo": name,
+                "confianza": confidence,
+                "centro_x": center_x,
+                "centro_y": center_y,
+                "bbox": bbox,
+                "es_fresco": fresh,
+                "dentro_blanco": inside,
+                "area": area,
+            }
+            for name, confidence, center_x, center_y, bbox, fresh, inside, area in zip(
+                names,
+                self.confidences.tolist(),
+                self.centers_x.tolist(),
+                self.centers_y.tolist(),
+                self.boxes.tolist(),
+                self.fresh_mask.tolist(),
+                self.inside_mask.tolist(),
+                self.areas.tolist(),
+            )
+        ]
@@ -0,0 +1,146 @@
+"""
+Exporta el modelo BulletDetector (.pt) a formatos optimizados para CPU.
+
+Uso:
+    python -m src.infraestructure.ml_models.export_model --format onnx
+    python -m src.infraestructure.ml_models.export_model --format openvino
+    python -m src.infraestructure.ml_models.export_model --format onnx --version 2.1
+    python -m src.infraestructure.ml_models.export_model --format onnx_int8
+    python -m src.infraestructure.ml_models.export_model --format onnx_int8 \
+        --calibration-dir ./blancos --calibration-images 200
+
+`onnx_int8` parte del ONNX en float (lo exporta si no existe) y lo cuantiza;
+en modo static calibra con imágenes de blancos de `--calibration-dir` o, si
+no se indica, con imágenes ya analizadas del almacenamiento (ver
+`quantization.py`).
+
+El archivo generado queda en `models_versions/` con el nombre que espera
+`BulletDetector` para cada backend y versión (ver MODEL_FILE_SUFFIXES y
+ML_MODEL_VERSIONS).
+"""
+
+import argparse
+import logging
+from pathlib import Path
+from typing import Optional
+
+from ultralytics import YOLO
+
+from src.infraestructure.ml_models.bullet_detector import BulletDetector
+from src.infraestructure.ml_models.quantization import (
+    QUANTIZATION_MODES,
+    load_directory_images,
+    load_stored_images,
+    quantize_onnx,
+)
+
+logger = logging.getLogger(__name__)
+
+EXPORT_FORMATS = ("onnx", "onnx_int8", "openvino")
+
+
+def export_model(
+    export_format: str, imgsz: int = 640, version: Optional[str] = None
+) -> Path:
+    """
+    Exporta los pesos .pt al formato indicado.
+
+    Args:
+        export_format: "onnx" u "openvino"
+        imgsz: Tamaño de entrada del modelo exportado
+        version: Versión a exportar; None = ML_MODEL_VERSION
+
+    Returns:
+        Ruta del modelo exportado
+    """
+    if export_format not in ("onnx", "openvino"):
+        raise ValueError(f"Formato no soportado: {export_format}")
+
+    source_path = BulletDetector.get_model_path("pytorch", version)
+    target_path = BulletDetector.get_model_path(export_format, version)
+
+    model = YOLO(str(source_path))
+    exported = model.export(
+        format=export_format,
+        imgsz=imgsz,
+        # Batch dinámico para que funcione el micro-batching
+        dynamic=True,
+        simplify=export_format == "onnx",
+    )
+
+    exported_path = Path(exported)
+    if exported_path != target_path:
+        exported_path.rename(target_path)
+
+    logger.info(f"Modelo exportado a {target_path}")
+    return target_path
+
+
+def export_quantized_model(
+    imgsz: int = 640,
+    version: Optional[str] = None,
+    mode: str = "static",
+    calibration_dir: Optional[Path] = None,
+    calibration_images: int = 100,
+) -> Path:
+    """
+    Genera el modelo ONNX INT8 (backend onnx_int8).
+
+    Args:
+        imgsz: Tamaño de entrada del modelo exportado
+        version: Versión a exportar; None = ML_MODEL_VERSION
+        mode: "static" (calibrado) o "dynamic" (solo pesos)
+        calibration_dir: Directorio con imágenes de calibración; None = usar
+            imágenes ya analizadas del almacenamiento
+        calibration_images: Máximo de imágenes de calibración
+
+    Returns:
+        Ruta del modelo cuantizado
+    """
+    fp32_path = BulletDetector.get_model_path("onnx", version)
+    if not fp32_path.exists():
+        export_model("onnx", imgsz=imgsz, version=version)
+
+    images = None
+    if mode == "static":
+        if calibration_dir:
+            loaded = load_directory_images(calibration_dir, calibration_images)
+        else:
+            loaded = load_stored_images(calibration_images, holdout=False)
+        images = [data for _, data in loaded]
+
+    return quantize_onnx(
+        fp32_path,
+        BulletDetector.get_model_path("onnx_int8", version),
+        calibration_images=images,
+        mode=mode,
+        imgsz=imgsz,
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Exporta el detector de impactos")
+    parser.add_argument("--format", choices=EXPORT_FORMATS, default="onnx")
+    parser.add_argument("--imgsz", type=int, default=640)
+    parser.add_argument("--version", default=None, help="Versión en ML_MODEL_VERSIONS")
+    parser.add_argument("--quantization", choices=QUANTIZATION_MODES, default="static")
+    parser.add_argument("--calibration-dir", type=Path, default=None)
+    parser.add_argument("--calibration-images", type=int, default=100)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    if args.format == "onnx_int8":
+        path = export_quantized_model(
+            imgsz=args.imgsz,
+            version=args.version,
+            mode=args.quantization,
+            calibration_dir=args.calibration_dir,
+            calibration_images=args.calibration_images,
+        )
+    else:
+        path = export_model(args.format, imgsz=args.imgsz, version=args.version)
+    print(f"Modelo exportado: {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,355 @@
+import asyncio
+import logging
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import (
+    CancelledError,
+    Executor,
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+)
+from typing import Dict, List, Optional, Tuple, Union
+
+from src.infraestructure.config.settings import settings
+from src.infraestructure.ml_models.bullet_detector import (
+    BulletDetectorError,
+    get_bullet_detector,
+    get_model_version_key,
+)
+from src.infraestructure.ml_models.decoded_image import DecodedImage
+from src.infraestructure.ml_models.detection_cache import (
+    DetectionCache,
+    get_detection_cache,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class InferenceQueueFullError(BulletDetectorError):
+    """La cola de inferencia alcanzó su límite de trabajos pendientes"""
+
+    pass
+
+
+def _init_worker(threads_per_worker: int, warm_up: bool = False):
+    """
+    Inicializa un proceso del pool: limita hilos y carga el modelo una vez.
+    Con `warm_up` también lo calienta, así ningún proceso (tampoco los que
+    reemplazan a uno caído) toma trabajos con el modelo frío.
+    """
+    try:
+        import cv2
+        import torch
+
+        torch.set_num_threads(threads_per_worker)
+        cv2.setNumThreads(threads_per_worker)
+    except Exception as e:
+        logger.warning(f"No se pudo limitar hilos del worker: {str(e)}")
+
+    try:
+        detector = get_bullet_detector()
+        if warm_up:
+            detector.warm_up(
+                iterations=settings.ML_WARMUP_ITERATIONS,
+                width=settings.ML_WARMUP_IMAGE_WIDTH,
+                height=settings.ML_WARMUP_IMAGE_HEIGHT,
+            )
+        else:
+            detector._ensure_model_loaded()
+    except BulletDetectorError as e:
+        # Se reintentará (y fallará con un error claro) en cada trabajo
+        logger.error(f"Worker de inferencia sin modelo: {str(e)}")
+
+
+def _warm_up_in_worker(iterations: int, width: int, height: int) -> int:
+    """Calienta el modelo si hace falta y retorna el pid del proceso"""
+    detector = get_bullet_detector()
+    if not detector.is_warmed_up:
+        detector.warm_up(iterations=iterations, width=width, height=height)
+    return os.getpid()
+
+
+def _analyze_in_worker(
+    image_data: Union[bytes, DecodedImage],
+    confidence_threshold: float,
+    model_version: Optional[str] = None,
+) -> Dict:
+    # Formato columnar: más barato de serializar entre procesos y en la caché
+    return get_bullet_detector(model_version).analyze_with_stats(
+        image_data=image_data,
+        confidence_threshold=confidence_threshold,
+        columnar=True,
+    )
+
+
+def _analyze_batch_in_worker(
+    images: List[Union[bytes, DecodedImage]],
+    confidence_threshold: float,
+    model_version: Optional[str] = None,
+) -> List[Dict]:
+    return get_bullet_detector(model_version).analyze_batch_with_stats(
+        images, confidence_threshold=confidence_threshold, columnar=True
+    )
+
+
+class InferenceExecutor:
+    """
+    Ejecuta la inferencia YOLO fuera del event loop.
+
+    Con `workers > 0` usa un pool de procesos donde cada proceso mantiene su
+    propia instancia cargada de BulletDetector. Con `workers == 0` usa
+    `threads_per_worker` hilos dentro del proceso actual (modo desarrollo). En
+    ambos casos limita los trabajos pendientes para no acumular imágenes en
+    memoria cuando el detector no da abasto.
+    """
+
+    def __init__(
+        self,
+        workers: int = 0,
+        threads_per_worker: int = 1,
+        max_queue_size: int = 16,
+        warmup_required: bool = False,
+    ):
+        self.workers = workers
+        self.threads_per_worker = threads_per_worker
+        self.max_queue_size = max_queue_size
+        self._slots = threading.BoundedSemaphore(
+            max(workers, threads_per_worker, 1) + max_queue_size
+        )
+        self._pool: Executor
+        self._ready = threading.Event()
+        self.warmup_error: Optional[str] = None
+        if not warmup_required:
+            self._ready.set()
+
+        if workers == 0:
+            self._pool = ThreadPoolExecutor(
+                max_workers=max(threads_per_worker, 1),
+                thread_name_prefix="bullet-detector-inference",
+            )
+        else:
+            self._pool = ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(threads_per_worker, warmup_required),
+            )
+            logger.info(
+                f"Pool de inferencia iniciado (workers={workers}, "
+                f"threads_per_worker={threads_per_worker}, queue={max_queue_size})"
+            )
+
+    def submit(
+        self,
+        image_data: Union[bytes, DecodedImage],
+        confidence_threshold: float,
+        model_version: Optional[str] = None,
+    ) -> Future:
+        """
+        Envía una imagen a analizar y retorna un Future con el resultado
+        (detecciones en el formato compacto de `DetectionColumns.to_payload`).
+
+        En modo hilos la DecodedImage se comparte tal cual; al pool de procesos
+        solo viajan los bytes (serializar los píxeles cuesta más que decodificar).
+        `model_version` elige el modelo (None = ML_MODEL_VERSION); cada worker
+        carga una versión la primera vez que la recibe.
+        """
+        raw_bytes, cache_key, cached = self._lookup_cache(
+            image_data, confidence_threshold, model_version
+        )
+        if cached is not None:
+            future = Future()
+            future.set_result(cached)
+            return future
+
+        if not self._slots.acquire(blocking=False):
+            raise InferenceQueueFullError(
+                "Demasiados análisis en curso, intente de nuevo en unos segundos"
+            )
+
+        if self.workers > 0:
+            image_data = raw_bytes
+
+        try:
+            future = self._pool.submit(
+                _analyze_in_worker, image_data, confidence_threshold, model_version
+            )
+        except Exception:
+            self._slots.release()
+            raise
+
+        future.add_done_callback(lambda _: self._slots.release())
+        if cache_key is not None:
+
+            def store_in_cache(done: Future):
+                cache = get_detection_cache()
+                if cache and not done.cancelled() and done.exception() is None:
+                    cache.set(cache_key, done.result())
+
+            future.add_done_callback(store_in_cache)
+        return future
+
+    def submit_batch(
+        self,
+        images: List[Union[bytes, DecodedImage]],
+        confidence_threshold: float,
+        model_version: Optional[str] = None,
+    ) -> List[Future]:
+        """
+        Envía varias imágenes como un solo trabajo: las que no están en caché
+        se analizan juntas (`analyze_batch_with_stats`) y ocupan un solo lugar
+        de la cola. Retorna un Future por imagen, en el mismo orden.
+        """
+        futures: List[Future] = []
+        pending = []
+        for image_data in images:
+            raw_bytes, cache_key, cached = self._lookup_cache(
+                image_data, confidence_threshold, model_version
+            )
+            future = Future()
+            if cached is not None:
+                future.set_result(cached)
+            else:
+                payload = raw_bytes if self.workers > 0 else image_data
+                pending.append((future, payload, cache_key))
+            futures.append(future)
+
+        if not pending:
+            return futures
+
+        if not self._slots.acquire(blocking=False):
+            raise InferenceQueueFullError(
+                "Demasiados análisis en curso, intente de nuevo en unos segundos"
+            )
+
+        try:
+            batch_future = self._pool.submit(
+                _analyze_batch_in_worker,
+                [payload for _, payload, _ in pending],
+                confidence_threshold,
+                model_version,
+            )
+        except Exception:
+            self._slots.release()
+            raise
+
+        def distribute(done: Future):
+            self._slots.release()
+            error = CancelledError() if done.cancelled() else done.exception()
+            if error is not None:
+                for future, _, _ in pending:
+                    future.set_exception(error)
+                return
+
+            cache = get_detection_cache()
+            for (future, _, cache_key), result in zip(pending, done.result()):
+                if cache is not None and cache_key is not None:
+                    cache.set(cache_key, result)
+                future.set_result(result)
+
+        batch_future.add_done_callback(distribute)
+        return futures
+
+    def _lookup_cache(
+        self,
+        image_data: Union[bytes, DecodedImage],
+        confidence_threshold: float,
+        model_version: Optional[str],
+    ) -> Tuple[bytes, Optional[str], Optional[Dict]]:
+        """Bytes de la imagen, clave de caché y resultado en caché (si hay)"""
+        raw_bytes = (
+            image_data.data if isinstance(image_data, DecodedImage) else image_data
+        )
+        cache = get_detection_cache()
+        if cache is None:
+            return raw_bytes, None, None
+
+        cache_key = DetectionCache.build_key(
+            raw_bytes, get_model_version_key(model_version), confidence_threshold
+        )
+        return raw_bytes, cache_key, cache.get(cache_key)
+
+    def analyze_with_stats(
+        self,
+        image_data: Union[bytes, DecodedImage],
+        confidence_threshold: float = 0.25,
+        model_version: Optional[str] = None,
+    ) -> Dict:
+        """Versión bloqueante, para llamarse desde un hilo del threadpool"""
+        return self.submit(image_data, confidence_threshold, model_version).result()
+
+    async def analyze_with_stats_async(
+        self,
+        image_data: Union[bytes, DecodedImage],
+        confidence_threshold: float = 0.25,
+        model_version: Optional[str] = None,
+    ) -> Dict:
+        """Versión awaitable, no bloquea el event loop"""
+        return await asyncio.wrap_future(
+            self.submit(image_data, confidence_threshold, model_version)
+        )
+
+    @property
+    def is_ready(self) -> bool:
+        return self._ready.is_set()
+
+    def warm_up(self, iterations: int = 3, width: int = 1920, height: int = 1440):
+        """
+        Calienta el modelo en cada worker (o en el proceso actual) y marca el
+        executor como listo. Se envía una tarea por worker al mismo tiempo para
+        que el pool arranque todos sus procesos; como el pool no reparte una
+        tarea por proceso, se reenvían hasta que respondieron todos los pids.
+        """
+        expected = max(self.workers, 1)
+        warmed_pids = set()
+        try:
+            while len(warmed_pids) < expected:
+                futures = [
+                    self._pool.submit(_warm_up_in_worker, iterations, width, height)
+                    for _ in range(expected - len(warmed_pids))
+                ]
+                pids = {future.result() for future in futures}
+                if pids <= warmed_pids:
+                    # Los procesos que faltan siguen en su inicialización
+                    time.sleep(0.05)
+                warmed_pids |= pids
+        except Exception as e:
+            self.warmup_error = str(e)
+            logger.error(f"Falló el calentamiento del modelo: {str(e)}")
+            return
+
+        self.warmup_error = None
+        self._ready.set()
+
+    def shutdown(self, wait: bool = True):
+        self._pool.shutdown(wait=wait, cancel_futures=True)
+
+
+_executor: Optional[InferenceExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def get_inference_executor() -> InferenceExecutor:
+    """Retorna el executor compartido del proceso, creándolo si no existe"""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = InferenceExecutor(
+                workers=settings.ML_INFERENCE_WORKERS,
+                threads_per_worker=settings.ML_INFERENCE_THREADS_PER_WORKER,
+                max_queue_size=settings.ML_INFERENCE_QUEUE_SIZE,
+                warmup_required=settings.ML_WARMUP_ON_STARTUP,
+            )
+        return _executor
+
+
+def shutdown_inference_executor():
+    """Detiene el pool de procesos (llamado al apagar la aplicación)"""
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown()
+            _executor = None
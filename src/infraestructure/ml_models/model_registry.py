@@ -0,0 +1,67 @@
+from typing import Dict, List, Optional, Union
+from uuid import UUID
+
+from src.infraestructure.config.settings import settings
+from src.infraestructure.ml_models.bullet_detector import (
+    BulletDetector,
+    BulletDetectorError,
+    get_bullet_detector,
+)
+
+
+class ModelVersionNotFoundError(BulletDetectorError):
+    """Se pidió una versión de modelo que no está registrada"""
+
+    pass
+
+
+class ModelRegistry:
+    """
+    Versiones del detector disponibles (ML_MODEL_VERSIONS) y selección del
+    modelo que atiende cada petición. Cada versión se carga una sola vez por
+    proceso y varias pueden convivir cargadas.
+    """
+
+    @staticmethod
+    def available_versions() -> List[str]:
+        return list(settings.ML_MODEL_VERSIONS)
+
+    @staticmethod
+    def resolve_version(
+        requested: Optional[str] = None,
+        club_id: Optional[Union[UUID, str]] = None,
+    ) -> str:
+        """
+        Elige la versión del modelo. Prioridad: la pedida explícitamente, la
+        asignada al club (ML_CLUB_MODEL_VERSIONS) y por último ML_MODEL_VERSION.
+        """
+        version = requested
+        if not version and club_id is not None:
+            version = settings.ML_CLUB_MODEL_VERSIONS.get(str(club_id))
+        version = version or settings.ML_MODEL_VERSION
+
+        if version not in settings.ML_MODEL_VERSIONS:
+            raise ModelVersionNotFoundError(
+                f"Versión de modelo desconocida: {version}. "
+                f"Opciones: {', '.join(settings.ML_MODEL_VERSIONS)}"
+            )
+        return version
+
+    @staticmethod
+    def get_detector(version: Optional[str] = None) -> BulletDetector:
+        return get_bullet_detector(ModelRegistry.resolve_version(version))
+
+    @staticmethod
+    def loaded_versions() -> List[Dict]:
+        """Versiones cargadas en este proceso"""
+        return [
+            {
+                "version": detector.version,
+                "backend": detector.backend,
+                "loaded": detector._model_loaded,
+                "warmed_up": detector.is_warmed_up,
+                "default": detector.version == settings.ML_MODEL_VERSION
+                and detector.backend == settings.ML_MODEL_BACKEND,
+            }
+            for detector in list(BulletDetector._instances.values())
+        ]
@@ -0,0 +1,95 @@
+"""
+Precarga de los modelos en el proceso maestro de gunicorn.
+
+Con `preload_app` el maestro importa la app y carga los pesos antes de crear
+los workers; tras el fork los workers comparten esas páginas de memoria
+(copy-on-write) en lugar de cargar cada uno su copia. Ver `gunicorn.conf.py`.
+
+Solo aplica con ML_INFERENCE_WORKERS=0: el pool de procesos de inferencia
+usa `spawn` y cada uno de sus procesos carga su propio modelo.
+
+El calentamiento en el maestro corre con un solo hilo de torch: el pool
+OpenMP de libgomp no sobrevive al fork y los workers se colgarían en su
+primer predict. Cada worker restaura su número de hilos en `post_fork`.
+"""
+
+import gc
+import logging
+import time
+from typing import Dict, List, Optional
+
+from src.infraestructure.config.settings import settings
+from src.infraestructure.ml_models.bullet_detector import get_bullet_detector
+
+logger = logging.getLogger(__name__)
+
+# Hilos de torch del maestro antes de la precarga, para restaurarlos tras el fork
+_torch_threads: Optional[int] = None
+
+
+def preload_versions() -> List[str]:
+    """Versiones que pueden atender peticiones: default, por club y sombra"""
+    versions = [settings.ML_MODEL_VERSION, *settings.ML_CLUB_MODEL_VERSIONS.values()]
+    if settings.ML_SHADOW_MODEL_VERSION and settings.ML_SHADOW_SAMPLE_RATE > 0:
+        versions.append(settings.ML_SHADOW_MODEL_VERSION)
+    return list(dict.fromkeys(versions))
+
+
+def preload_models() -> Dict[str, float]:
+    """
+    Carga y calienta los modelos en el proceso actual antes del fork.
+
+    El calentamiento es obligatorio: el primer predict fusiona capas y arma
+    el predictor de ultralytics, y si ocurriera en cada worker escribiría
+    sobre las páginas compartidas y duplicaría los pesos.
+
+    Returns:
+        Segundos de carga por versión (vacío si la inferencia corre en el
+        pool de procesos, que carga sus propios modelos)
+    """
+    if settings.ML_INFERENCE_WORKERS > 0:
+        logger.info(
+            "Precarga omitida: la inferencia corre en el pool de procesos "
+            f"(ML_INFERENCE_WORKERS={settings.ML_INFERENCE_WORKERS})"
+        )
+        return {}
+
+    _single_threaded_torch()
+    elapsed = {}
+    for version in preload_versions():
+        started_at = time.perf_counter()
+        get_bullet_detector(version).warm_up(
+            iterations=max(settings.ML_WARMUP_ITERATIONS, 1),
+            width=settings.ML_WARMUP_IMAGE_WIDTH,
+            height=settings.ML_WARMUP_IMAGE_HEIGHT,
+        )
+        elapsed[version] = time.perf_counter() - started_at
+
+    # Fuera del GC: que el recolector no toque (y copie) los objetos heredados
+    gc.collect()
+    gc.freeze()
+
+    logger.info(
+        "Modelos precargados antes del fork: "
+        + ", ".join(f"{v} ({s:.1f}s)" for v, s in elapsed.items())
+    )
+    return elapsed
+
+
+def _single_threaded_torch():
+    """Evita que el maestro arranque el pool de hilos OpenMP antes del fork"""
+    global _torch_threads
+    import torch
+
+    if _torch_threads is None:
+        _torch_threads = torch.get_num_threads()
+    torch.set_num_threads(1)
+
+
+def restore_torch_threads():
+    """En cada worker tras el fork: vuelve a los hilos de torch originales"""
+    if _torch_threads is None:
+        return
+    import torch
+
+    torch.set_num_threads(_torch_threads)
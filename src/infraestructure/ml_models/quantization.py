@@ -0,0 +1,215 @@
+"""
+Cuantización INT8 del detector para nodos solo-CPU.
+
+El modelo ONNX exportado desde el .pt se cuantiza con onnxruntime:
+  - static: pesos y activaciones en INT8 (QDQ), calibrando los rangos de
+    activación con imágenes de blancos reales
+  - dynamic: solo pesos en INT8, sin calibración
+
+La decodificación de cajas del head (DFL, concat, sigmoid) se deja en float:
+cuantizarla degrada las coordenadas mucho más de lo que acelera.
+
+Las imágenes analizadas se reparten de forma determinista por id: una de
+cada HOLDOUT_MODULUS queda reservada para medir la pérdida de precisión
+(ver `src.benchmarks.quantization_report`) y nunca se usa para calibrar.
+"""
+
+import hashlib
+import logging
+import re
+from pathlib import Path
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+from src.infraestructure.ml_models.decoded_image import DecodedImage
+
+logger = logging.getLogger(__name__)
+
+QUANTIZATION_MODES = ("static", "dynamic")
+HOLDOUT_MODULUS = 5
+IMAGE_SUFFIXES = (".jpg", ".jpeg", ".png")
+
+
+def is_holdout(image_id) -> bool:
+    """True si la imagen pertenece al conjunto reservado para evaluación"""
+    digest = hashlib.sha1(str(image_id).encode()).digest()
+    return digest[0] % HOLDOUT_MODULUS == 0
+
+
+def load_stored_images(limit: int, holdout: bool) -> List[Tuple[str, bytes]]:
+    """
+    Descarga imágenes ya analizadas del almacenamiento.
+
+    Args:
+        limit: Máximo de imágenes
+        holdout: True = conjunto de evaluación, False = conjunto de calibración
+
+    Returns:
+        Lista de (id de la imagen, bytes)
+    """
+    from src.infraestructure.database.repositories.target_images_repo import (
+        TargetImagesRepository,
+    )
+    from src.infraestructure.database.session import SessionLocal
+    from src.infraestructure.utils.storage_client import (
+        StorageDownloadError,
+        get_storage_client,
+    )
+
+    db = SessionLocal()
+    try:
+        # Se pide de más porque el reparto descarta parte de las imágenes
+        candidates = TargetImagesRepository.get_analyzed_images(
+            db, limit=limit * HOLDOUT_MODULUS
+        )
+        selected = [
+            (str(image.id), image.file_path)
+            for image in candidates
+            if is_holdout(image.id) == holdout
+        ][:limit]
+    finally:
+        db.close()
+
+    images = []
+    for image_id, file_path in selected:
+        try:
+            images.append((image_id, get_storage_client().get_bytes(file_path)))
+        except StorageDownloadError as e:
+            logger.warning(f"No se pudo descargar {file_path}: {str(e)}")
+    return images
+
+
+def load_directory_images(directory: Path, limit: int) -> List[Tuple[str, bytes]]:
+    """Imágenes locales (jpg/png) de un directorio, en orden por nombre"""
+    paths = sorted(
+        p for p in Path(directory).iterdir() if p.suffix.lower() in IMAGE_SUFFIXES
+    )
+    return [(p.name, p.read_bytes()) for p in paths[:limit]]
+
+
+def letterbox(image: np.ndarray, size: int) -> np.ndarray:
+    """
+    Mismo preproceso que aplica ultralytics antes del modelo: escala
+    manteniendo proporción, rellena con gris 114, invierte los canales y
+    normaliza a NCHW float32.
+
+    Recibe el mismo array que el detector pasa a `predict` (el RGB de
+    `DecodedImage.rgb_array`). ultralytics trata esos arrays como BGR y los
+    invierte; aquí se invierte igual para calibrar con la entrada real.
+    """
+    height, width = image.shape[:2]
+    ratio = min(size / height, size / width)
+    new_width, new_height = round(width * ratio), round(height * ratio)
+    resized = cv2.resize(image, (new_width, new_height), interpolation=cv2.INTER_LINEAR)
+
+    pad_x, pad_y = (size - new_width) / 2, (size - new_height) / 2
+    top, bottom = round(pad_y - 0.1), round(pad_y + 0.1)
+    left, right = round(pad_x - 0.1), round(pad_x + 0.1)
+    padded = cv2.copyMakeBorder(
+        resized, top, bottom, left, right, cv2.BORDER_CONSTANT, value=(114, 114, 114)
+    )
+    return (padded[..., ::-1].transpose(2, 0, 1)[None] / 255.0).astype(np.float32)
+
+
+def head_postprocess_nodes(model) -> List[str]:
+    """
+    Nodos del head de detección que no son convoluciones (decodificación de
+    cajas). Se excluyen de la cuantización estática.
+    """
+    pattern = re.compile(r"^/model\.(\d+)/")
+    indices = [
+        int(match.group(1))
+        for node in model.graph.node
+        if (match := pattern.match(node.name))
+    ]
+    if not indices:
+        return []
+
+    head_prefix = f"/model.{max(indices)}/"
+    return [
+        node.name
+        for node in model.graph.node
+        if node.name.startswith(head_prefix) and node.op_type != "Conv"
+    ]
+
+
+def _calibration_reader_class():
+    from onnxruntime.quantization import CalibrationDataReader
+
+    class TargetCalibrationReader(CalibrationDataReader):
+        """Entrega las imágenes de calibración una por una, ya preprocesadas"""
+
+        def __init__(self, images: Iterable[bytes], input_name: str, size: int):
+            self._inputs: Iterator = (
+                {input_name: letterbox(DecodedImage(data).rgb_array()[0], size)}
+                for data in images
+            )
+
+        def get_next(self):
+            return next(self._inputs, None)
+
+    return TargetCalibrationReader
+
+
+def quantize_onnx(
+    fp32_path: Path,
+    int8_path: Path,
+    calibration_images: Optional[List[bytes]] = None,
+    mode: str = "static",
+    imgsz: int = 640,
+) -> Path:
+    """
+    Genera el modelo INT8 a partir del ONNX en float.
+
+    Args:
+        fp32_path: Modelo ONNX en float
+        int8_path: Ruta del modelo cuantizado
+        calibration_images: Bytes de imágenes de blancos (solo modo static)
+        mode: "static" o "dynamic"
+        imgsz: Tamaño de entrada con el que se exportó el modelo
+
+    Returns:
+        Ruta del modelo cuantizado
+    """
+    import onnx
+    from onnxruntime.quantization import (
+        QuantFormat,
+        QuantType,
+        quantize_dynamic,
+        quantize_static,
+    )
+
+    if mode not in QUANTIZATION_MODES:
+        raise ValueError(f"Modo de cuantización no soportado: {mode}")
+
+    if mode == "dynamic":
+        quantize_dynamic(str(fp32_path), str(int8_path), weight_type=QuantType.QUInt8)
+        logger.info(f"Modelo cuantizado (dinámico) en {int8_path}")
+        return int8_path
+
+    if not calibration_images:
+        raise ValueError("La cuantización estática necesita imágenes de calibración")
+
+    model = onnx.load(str(fp32_path))
+    input_name = model.graph.input[0].name
+    excluded = head_postprocess_nodes(model)
+    reader = _calibration_reader_class()(calibration_images, input_name, imgsz)
+
+    quantize_static(
+        str(fp32_path),
+        str(int8_path),
+        reader,
+        quant_format=QuantFormat.QDQ,
+        activation_type=QuantType.QUInt8,
+        weight_type=QuantType.QInt8,
+        per_channel=True,
+        nodes_to_exclude=excluded,
+    )
+    logger.info(
+        f"Modelo cuantizado (estático) en {int8_path}: "
+        f"{len(calibration_images)} imágenes de calibración, "
+        f"{len(excluded)} nodos del head en float"
+    )
+    return int8_path
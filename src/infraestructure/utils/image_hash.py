@@ -0,0 +1,80 @@
+from dataclasses import dataclass
+from typing import BinaryIO, Union
+
+import cv2
+import numpy as np
+from PIL import Image
+
+from src.infraestructure.ml_models.decoded_image import DecodedImage
+
+HASH_SIZE = 8  # 8x8 = 64 bits
+DECODE_SIDE = 64  # lado mínimo al decodificar para el hash
+_SIGN_BIT = 1 << 63
+_MASK = (1 << 64) - 1
+
+
+@dataclass(frozen=True)
+class ImageFingerprint:
+    """Hash perceptual y tamaño de una imagen subida"""
+
+    perceptual_hash: int  # dHash de 64 bits con signo (columna BIGINT)
+    width: int
+    height: int
+
+
+def dhash(image: Union[bytes, DecodedImage]) -> int:
+    """
+    Hash de diferencias (dHash) de 64 bits: la imagen en grises reducida a
+    9x8 y un bit por par de píxeles vecinos (1 si aumenta el brillo). Fotos
+    re-codificadas, re-escaladas o con poco ruido dan hashes a pocos bits de
+    distancia. El JPEG se decodifica reducido, sin la resolución completa.
+
+    Returns:
+        Hash con signo, para guardarlo en una columna BIGINT
+    """
+    decoded = DecodedImage.from_source(image)
+    array, _ = decoded.rgb_array(max_side=DECODE_SIDE)
+    return _dhash_array(array)
+
+
+def _dhash_array(array: np.ndarray) -> int:
+    gray = cv2.cvtColor(np.ascontiguousarray(array), cv2.COLOR_RGB2GRAY)
+    small = cv2.resize(
+        gray, (HASH_SIZE + 1, HASH_SIZE), interpolation=cv2.INTER_AREA
+    ).astype(np.int16)
+    bits = (small[:, 1:] > small[:, :-1]).flatten()
+    value = int.from_bytes(np.packbits(bits).tobytes(), "big")
+    return value - (1 << 64) if value & _SIGN_BIT else value
+
+
+def hamming_distance(a: int, b: int) -> int:
+    """Bits distintos entre dos hashes de 64 bits (con o sin signo)"""
+    return bin((a ^ b) & _MASK).count("1")
+
+
+def fingerprint(image: Union[bytes, DecodedImage]) -> ImageFingerprint:
+    decoded = DecodedImage.from_source(image)
+    return ImageFingerprint(
+        perceptual_hash=dhash(decoded), width=decoded.width, height=decoded.height
+    )
+
+
+def fingerprint_file(file: BinaryIO) -> ImageFingerprint:
+    """
+    Huella leída directamente de un archivo abierto (p. ej. el temporal de un
+    UploadFile), sin copiarlo a memoria: solo se leen el encabezado y los
+    datos del JPEG reducido. Da el mismo hash que `fingerprint(bytes)`.
+    """
+    file.seek(0)
+    with Image.open(file) as image:
+        width, height = image.size
+        if max(width, height) > DECODE_SIDE:
+            ratio = DECODE_SIDE / max(width, height)
+            image.draft(
+                "RGB", (max(1, int(width * ratio)), max(1, int(height * ratio)))
+            )
+        rgb = image if image.mode == "RGB" else image.convert("RGB")
+        array = np.asarray(rgb)
+    return ImageFingerprint(
+        perceptual_hash=_dhash_array(array), width=width, height=height
+    )
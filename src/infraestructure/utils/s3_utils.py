@@ -1,10 +1,12 @@
+import hashlib
 import logging
-import os
+import threading
+from dataclasses import dataclass
 from datetime import datetime
-from typing import List, Optional
-from uuid import uuid4
+from typing import List, Optional, Tuple
 
 import boto3
+from boto3.s3.transfer import TransferConfig
 from botocore.exceptions import ClientError
 from fastapi import HTTPException, UploadFile
 
@@ -16,17 +18,162 @@ from src.infraestructure.config.settings import settings
 # Usar solo el logger sin configurar basicConfig
 logger = logging.getLogger(__name__)
 
+STREAM_CHUNK_SIZE = 1024 * 1024
 
-def upload_file_to_s3(
+# Mapear extensiones a ContentType
+CONTENT_TYPE_MAP = {
+    "jpg": "image/jpeg",
+    "jpeg": "image/jpeg",
+    "png": "image/png",
+    "pdf": "application/pdf",
+}
+
+
+class UploadTooLargeError(ValueError):
+    """El archivo superó el tamaño máximo mientras se subía"""
+
+
+@dataclass(frozen=True)
+class StoredObject:
+    """Objeto subido: URL pública y datos calculados al transmitirlo"""
+
+    url: str
+    key: str
+    size: int
+    sha256: str
+
+
+class _HashingReader:
+    """
+    El archivo subido tal como lo lee boto3: cuenta los bytes y calcula el
+    SHA-256 a medida que se envían las partes, sin copiarlo a memoria. Las
+    relecturas (checksums, reintentos) no se vuelven a contar.
+    """
+
+    def __init__(self, fileobj, max_bytes: Optional[int] = None):
+        self._file = fileobj
+        self._max_bytes = max_bytes
+        self._sha256 = hashlib.sha256()
+        self.hashed = 0
+
+    def read(self, size: int = -1) -> bytes:
+        position = self._file.tell()
+        chunk = self._file.read(size)
+        self._consume(position, chunk)
+        return chunk
+
+    def _consume(self, position: int, chunk: bytes):
+        end = position + len(chunk)
+        if position <= self.hashed < end:
+            self._sha256.update(memoryview(chunk)[self.hashed - position :])
+            self.hashed = end
+            if self._max_bytes is not None and self.hashed > self._max_bytes:
+                raise UploadTooLargeError(
+                    f"El archivo excede el tamaño máximo de {self._max_bytes} bytes"
+                )
+
+    def seek(self, offset: int, whence: int = 0) -> int:
+        return self._file.seek(offset, whence)
+
+    def tell(self) -> int:
+        return self._file.tell()
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def close(self):
+        # s3transfer cierra el archivo al terminar un PUT simple; el temporal
+        # del UploadFile lo cierra FastAPI al terminar la petición
+        pass
+
+    def finish(self) -> Tuple[int, str]:
+        """Tamaño y SHA-256; completa lo que boto3 no haya leído en orden"""
+        self._file.seek(self.hashed)
+        while True:
+            chunk = self._file.read(STREAM_CHUNK_SIZE)
+            if not chunk:
+                break
+            self._consume(self.hashed, chunk)
+        return self.hashed, self._sha256.hexdigest()
+
+
+_s3_client = None
+_s3_client_lock = threading.Lock()
+
+
+def get_s3_client():
+    """Cliente S3 compartido del proceso (boto3 es thread-safe)"""
+    global _s3_client
+    with _s3_client_lock:
+        if _s3_client is None:
+            if not settings.AWS_ACCESS_KEY or not settings.AWS_SECRET_ACCESS_KEY:
+                logger.error("❌ AWS credentials are NOT configured in settings!")
+                raise HTTPException(
+                    status_code=500, detail="AWS credentials not configured in settings"
+                )
+            _s3_client = boto3.client(
+                "s3",
+                aws_access_key_id=settings.AWS_ACCESS_KEY,
+                aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
+                region_name=settings.AWS_REGION,
+            )
+        return _s3_client
+
+
+def _transfer_config() -> TransferConfig:
+    return TransferConfig(
+        multipart_threshold=settings.STORAGE_MULTIPART_THRESHOLD_MB * 1024 * 1024,
+        multipart_chunksize=settings.STORAGE_MULTIPART_CHUNK_MB * 1024 * 1024,
+        max_concurrency=settings.STORAGE_MULTIPART_CONCURRENCY,
+    )
+
+
+def stream_fileobj_to_s3(
+    fileobj,
+    bucket_name: str,
+    key: str,
+    content_type: str,
+    max_size_bytes: Optional[int] = None,
+) -> StoredObject:
+    """
+    Sube un archivo abierto (p. ej. el spool de un UploadFile) leyéndolo por
+    partes: PUT simple o multipart por encima de STORAGE_MULTIPART_THRESHOLD_MB.
+    En la misma pasada calcula el tamaño y el SHA-256. Es bloqueante: desde
+    un endpoint async llamarlo con `run_in_threadpool`.
+    """
+    fileobj.seek(0)
+    reader = _HashingReader(fileobj, max_size_bytes)
+    get_s3_client().upload_fileobj(
+        reader,
+        bucket_name,
+        key,
+        ExtraArgs={"ContentType": content_type},
+        Config=_transfer_config(),
+    )
+    size, sha256 = reader.finish()
+    fileobj.seek(0)
+    return StoredObject(
+        url=f"https://{bucket_name}.s3.amazonaws.com/{key}",
+        key=key,
+        size=size,
+        sha256=sha256,
+    )
+
+
+def stream_upload_to_s3(
     file: UploadFile,
     bucket_name: str,
     allowed_types: Optional[List[str]] = None,
     folder: str = "licenses",
     file_name_prefix: str = "license_file",
     max_size_mb: int = 2,  # 2 MB por defecto
-) -> str:
+) -> StoredObject:
     """
-    Sube un archivo a un bucket S3 y retorna la URL pública.
+    Valida y sube un archivo recibido a un bucket S3 sin leerlo completo a
+    memoria; retorna la URL pública con el tamaño y el SHA-256 del contenido.
     """
 
     # Validación de tipo de archivo
@@ -39,7 +186,7 @@ def upload_file_to_s3(
                 detail=f"Tipo de archivo no permitido. Tipos permitidos: {', '.join(allowed_types)}",
             )
 
-    # Validación de tamaño máximo
+    # Validación de tamaño máximo (con el spool, sin leer el archivo)
     max_size_bytes = max_size_mb * 1024 * 1024
     file.file.seek(0, 2)
     file_size = file.file.tell()
@@ -50,195 +197,37 @@ def upload_file_to_s3(
             detail=f"El archivo excede el tamaño máximo permitido de {max_size_mb} MB. Tamaño recibido: {file_size // (1024 * 1024)} MB.",
         )
 
-    # ========== DEBUG INFO ==========
-    logger.info("=" * 50)
-    logger.info("S3 Upload Debug Info")
-    logger.info("=" * 50)
-    logger.info("Bucket Name: %s", bucket_name)
-    logger.info("Folder: %s", folder)
-    logger.info("File Name: %s", file.filename)
-    logger.info("Content Type: %s", file.content_type)
-    logger.info("File Size (bytes): %d", file_size)
-
-    # Log parciales de credenciales (solo primeros caracteres)
-    access_key = settings.AWS_ACCESS_KEY or "NOT SET"
-    secret_key = settings.AWS_SECRET_ACCESS_KEY or "NOT SET"
-    logger.info(
-        "AWS_ACCESS_KEY (settings): %s***",
-        access_key[:10] if len(access_key) > 10 else (access_key if access_key != "NOT SET" else "NOT SET"),
-    )
-    logger.info("AWS_REGION (settings): %s", settings.AWS_REGION)
-
-    # Visibilidad de variables de entorno estándar (no imprimimos secretos completos)
-    env_ak = os.getenv("AWS_ACCESS_KEY_ID")
-    env_sk = os.getenv("AWS_SECRET_ACCESS_KEY")
-    env_st = os.getenv("AWS_SESSION_TOKEN")
-    logger.info(
-        "Env AWS vars present -> AWS_ACCESS_KEY_ID: %s, AWS_SECRET_ACCESS_KEY: %s, AWS_SESSION_TOKEN: %s",
-        "YES" if env_ak else "NO",
-        "YES" if env_sk else "NO",
-        "YES" if env_st else "NO",
-    )
-
-    # Verifica si las credenciales están configuradas en settings
-    if not settings.AWS_ACCESS_KEY or not settings.AWS_SECRET_ACCESS_KEY:
-        logger.error("❌ AWS credentials are NOT configured in settings!")
-        raise HTTPException(
-            status_code=500, detail="AWS credentials not configured in settings"
-        )
-
-    logger.info("=" * 50)
-    # ========== END DEBUG ==========
-
-    # Crear cliente S3 con configuración explícita
-    # En producción, es importante especificar la región correcta
-    try:
-        s3 = boto3.client(
-            "s3",
-            aws_access_key_id=settings.AWS_ACCESS_KEY,
-            aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
-            region_name=settings.AWS_REGION,
-        )
-        # Verificar que el cliente se creó correctamente
-        logger.info("✅ S3 client created successfully")
-        logger.info("✅ AWS Region configured: %s", settings.AWS_REGION)
-        logger.info(
-            "✅ AWS Access Key length: %d",
-            len(settings.AWS_ACCESS_KEY) if settings.AWS_ACCESS_KEY else 0,
-        )
-        logger.info(
-            "✅ AWS Secret Key configured: %s",
-            "Yes" if settings.AWS_SECRET_ACCESS_KEY else "No",
-        )
-
-        # Log de identidad de AWS (STS)
-        try:
-            sts = boto3.client(
-                "sts",
-                aws_access_key_id=settings.AWS_ACCESS_KEY,
-                aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
-                region_name=settings.AWS_REGION,
-            )
-            ident = sts.get_caller_identity()
-            logger.info(
-                "AWS Identity -> Account: %s, UserId: %s, Arn: %s",
-                ident.get("Account"),
-                ident.get("UserId"),
-                ident.get("Arn"),
-            )
-        except Exception as e:
-            logger.warning("⚠️ Unable to get STS caller identity: %s", str(e))
-
-        # Chequeos del bucket
-        try:
-            loc = s3.get_bucket_location(Bucket=bucket_name)
-            bucket_region = (
-                loc.get("LocationConstraint") or "us-east-1"
-            )  # None => us-east-1
-            logger.info("Bucket region: %s", bucket_region)
-            if bucket_region != settings.AWS_REGION:
-                logger.warning(
-                    "⚠️ Region mismatch: settings=%s vs bucket=%s",
-                    settings.AWS_REGION,
-                    bucket_region,
-                )
-        except ClientError as ce:
-            logger.warning(
-                "⚠️ Could not get bucket location (%s): %s",
-                ce.response.get("Error", {}).get("Code"),
-                ce.response.get("Error", {}).get("Message"),
-            )
-        except Exception as e:
-            logger.warning("⚠️ Unexpected error in get_bucket_location: %s", str(e))
-
-        try:
-            s3.head_bucket(Bucket=bucket_name)
-            logger.info("✅ Head bucket succeeded for: %s", bucket_name)
-        except ClientError as ce:
-            logger.error(
-                "❌ Head bucket failed (%s): %s",
-                ce.response.get("Error", {}).get("Code"),
-                ce.response.get("Error", {}).get("Message"),
-            )
-        except Exception as e:
-            logger.error("❌ Unexpected error in head_bucket: %s", str(e))
-    except Exception as e:
-        logger.error("❌ Error creating S3 client: %s", str(e))
-        raise HTTPException(
-            status_code=500, detail=f"Error al crear cliente S3: {str(e)}"
-        )
-
     file_extension = file.filename.rsplit(".", 1)[-1].lower()
-    base_filename = file_name_prefix
     fecha = datetime.now().strftime("%Y%m%d")
-    key = f"{folder}/{base_filename}_{fecha}.{file_extension}"
-
-    # Mapear extensiones a ContentType
-    content_type_map = {
-        "jpg": "image/jpeg",
-        "jpeg": "image/jpeg",
-        "png": "image/png",
-        "pdf": "application/pdf",
-    }
-    
+    key = f"{folder}/{file_name_prefix}_{fecha}.{file_extension}"
+
     # Determinar ContentType: usar el del archivo si está disponible, sino mapear por extensión
     content_type = file.content_type
     if not content_type or content_type == "application/octet-stream":
-        content_type = content_type_map.get(file_extension, "application/octet-stream")
-    
-    logger.info("Uploading to S3 - Key: %s", key)
-    logger.info("Content Type: %s", content_type)
-    logger.info("Environment: %s", settings.ENV)
+        content_type = CONTENT_TYPE_MAP.get(file_extension, "application/octet-stream")
 
+    logger.info(
+        "Uploading to S3 | bucket=%s key=%s content_type=%s size=%d",
+        bucket_name,
+        key,
+        content_type,
+        file_size,
+    )
     try:
-        # Asegurar que el archivo esté al inicio
-        file.file.seek(0)
-        
-        # Especificar ContentType explícitamente usando ExtraArgs
-        # Esto es importante para buckets con políticas estrictas o ACLs deshabilitadas
-        # NO especificamos ACL para evitar problemas con buckets que tienen ACLs deshabilitadas
-        extra_args = {
-            "ContentType": content_type,
-        }
-        
-        # Intentar primero con upload_fileobj (más eficiente para archivos grandes)
-        try:
-            s3.upload_fileobj(
-                file.file, 
-                bucket_name, 
-                key,
-                ExtraArgs=extra_args
-            )
-            logger.info("✅ File uploaded successfully using upload_fileobj: %s", key)
-        except Exception as upload_error:
-            # Si upload_fileobj falla, leer el archivo y usar put_object como alternativa
-            logger.warning("⚠️ upload_fileobj failed, trying put_object: %s", str(upload_error))
-            try:
-                # Leer el contenido del archivo en memoria para put_object
-                file.file.seek(0)
-                file_content = file.file.read()
-                
-                s3.put_object(
-                    Bucket=bucket_name,
-                    Key=key,
-                    Body=file_content,
-                    ContentType=content_type,
-                )
-                logger.info("✅ File uploaded successfully using put_object: %s", key)
-            except Exception as put_error:
-                # Si ambos fallan, lanzar el error original de upload_fileobj
-                logger.error("❌ Both upload methods failed")
-                logger.error("❌ put_object error: %s", str(put_error))
-                raise upload_error
-        
+        stored = stream_fileobj_to_s3(
+            file.file, bucket_name, key, content_type, max_size_bytes
+        )
+    except UploadTooLargeError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
-        logger.error("❌ S3 Upload Error: %s", str(e))
-        logger.error("❌ Error Type: %s", type(e).__name__)
-        logger.error("❌ Bucket: %s", bucket_name)
-        logger.error("❌ Key: %s", key)
-        logger.error("❌ Region: %s", settings.AWS_REGION)
-        logger.error("❌ ENV: %s", settings.ENV)
-        logger.error("❌ Content Type: %s", content_type)
+        logger.error("❌ S3 Upload Error (%s): %s", type(e).__name__, str(e))
+        logger.error(
+            "❌ Bucket: %s | Key: %s | Region: %s | ENV: %s",
+            bucket_name,
+            key,
+            settings.AWS_REGION,
+            settings.ENV,
+        )
 
         # Si es ClientError, extraer información detallada
         if isinstance(e, ClientError):
@@ -254,14 +243,34 @@ def upload_file_to_s3(
                 " | Verifica: 1) Permisos IAM (s3:PutObject,s3:PutObjectAcl si aplica),"
                 " 2) Política del bucket (Object Ownership),"
                 " 3) Región del bucket vs AWS_REGION,"
-                " 4) Credenciales usadas (ver logs de STS y env)"
+                " 4) Credenciales usadas"
             )
 
         raise HTTPException(status_code=500, detail=error_detail)
 
-    url = f"https://{bucket_name}.s3.amazonaws.com/{key}"
-    logger.info("Generated URL: %s", url)
-    return url
+    logger.info("Generated URL: %s", stored.url)
+    return stored
+
+
+def upload_file_to_s3(
+    file: UploadFile,
+    bucket_name: str,
+    allowed_types: Optional[List[str]] = None,
+    folder: str = "licenses",
+    file_name_prefix: str = "license_file",
+    max_size_mb: int = 2,  # 2 MB por defecto
+) -> str:
+    """
+    Sube un archivo a un bucket S3 y retorna la URL pública.
+    """
+    return stream_upload_to_s3(
+        file,
+        bucket_name,
+        allowed_types=allowed_types,
+        folder=folder,
+        file_name_prefix=file_name_prefix,
+        max_size_mb=max_size_mb,
+    ).url
 
 
 def delete_file_from_s3(file_url: str, bucket_name: str) -> None:
@@ -283,15 +292,35 @@ def delete_file_from_s3(file_url: str, bucket_name: str) -> None:
         )
     key = file_url[len(prefix) :]
 
-    s3 = boto3.client(
-        "s3",
-        aws_access_key_id=settings.AWS_ACCESS_KEY,
-        aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
-        region_name=settings.AWS_REGION,
-    )
     try:
-        s3.delete_object(Bucket=bucket_name, Key=key)
+        get_s3_client().delete_object(Bucket=bucket_name, Key=key)
     except Exception as e:
         raise HTTPException(
             status_code=500, detail=f"Error al eliminar el archivo de S3: {str(e)}"
         )
+
+
+def s3_key_from_url(file_url: str, bucket_name: str) -> Optional[str]:
+    """Key de un objeto a partir de su URL pública, o None si es de otro bucket"""
+    prefix = f"https://{bucket_name}.s3.amazonaws.com/"
+    if not file_url or not file_url.startswith(prefix):
+        return None
+    return file_url[len(prefix) :]
+
+
+def upload_bytes_to_s3(
+    data: bytes,
+    bucket_name: str,
+    key: str,
+    content_type: str = "image/jpeg",
+    cache_control: Optional[str] = None,
+) -> str:
+    """
+    Sube bytes generados por la API (p. ej. imágenes renderizadas) con una key
+    fija y retorna la URL pública.
+    """
+    extra_args = {"ContentType": content_type}
+    if cache_control:
+        extra_args["CacheControl"] = cache_control
+    get_s3_client().put_object(Bucket=bucket_name, Key=key, Body=data, **extra_args)
+    return f"https://{bucket_name}.s3.amazonaws.com/{key}"
@@ -0,0 +1,15 @@
+from typing import Dict, Iterable
+
+import numpy as np
+
+
+def percentile_summary(samples: Iterable[float]) -> Dict[str, float]:
+    """p50, p95 y máximo de una ventana de muestras (ceros si está vacía)"""
+    values = np.asarray(list(samples), dtype=float)
+    if values.size == 0:
+        return {"p50": 0.0, "p95": 0.0, "max": 0.0}
+    return {
+        "p50": float(np.percentile(values, 50)),
+        "p95": float(np.percentile(values, 95)),
+        "max": float(values.max()),
+    }
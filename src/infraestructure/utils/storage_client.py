@@ -0,0 +1,196 @@
+import logging
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from src.infraestructure.config.settings import settings
+from src.infraestructure.utils.stats import percentile_summary
+
+logger = logging.getLogger(__name__)
+
+# Errores transitorios de S3 que vale la pena reintentar
+RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+CHUNK_SIZE = 64 * 1024
+
+
+class StorageDownloadError(Exception):
+    """La imagen no se pudo descargar (timeout, error HTTP o demasiado grande)"""
+
+
+class StorageClient:
+    """
+    Cliente HTTP compartido para descargar imágenes del almacenamiento (S3).
+
+    Reutiliza las conexiones TCP/TLS de un pool por host en lugar de abrir una
+    nueva en cada descarga, con timeouts de conexión y lectura, reintentos
+    acotados con backoff ante errores transitorios y lectura en streaming con
+    un tamaño máximo. Lleva métricas de latencia y de reutilización de
+    conexiones.
+    """
+
+    def __init__(
+        self,
+        pool_size: int = 16,
+        connect_timeout: float = 3.0,
+        read_timeout: float = 20.0,
+        max_retries: int = 3,
+        backoff_factor: float = 0.3,
+        max_bytes: int = 25 * 1024 * 1024,
+        window: int = 1000,
+    ):
+        self.timeout = (connect_timeout, read_timeout)
+        self.max_bytes = max_bytes
+        self._adapter = HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=pool_size,
+            max_retries=Retry(
+                total=max_retries,
+                backoff_factor=backoff_factor,
+                status_forcelist=RETRY_STATUS_CODES,
+                allowed_methods=frozenset({"GET", "HEAD"}),
+                raise_on_status=False,
+            ),
+        )
+        self._session = requests.Session()
+        self._session.mount("https://", self._adapter)
+        self._session.mount("http://", self._adapter)
+
+        self._lock = threading.Lock()
+        self.downloads_total = 0
+        self.errors_total = 0
+        self.retries_total = 0
+        self.bytes_total = 0
+        self._latency_ms: Deque[float] = deque(maxlen=window)
+
+    def get_bytes(self, url: str) -> bytes:
+        """
+        Descarga el contenido completo de `url`.
+
+        Raises:
+            StorageDownloadError: si la descarga falla después de los
+                reintentos o supera `max_bytes`.
+        """
+        return self._download(url)
+
+    def get_prefix(self, url: str, size: int) -> bytes:
+        """
+        Primeros `size` bytes de `url` (petición con Range), p. ej. para leer
+        solo el encabezado de una imagen. Si el servidor ignora el Range, la
+        lectura se corta al llegar a `size`.
+        """
+        return self._download(url, prefix=size)
+
+    def _download(self, url: str, prefix: Optional[int] = None) -> bytes:
+        headers = {"Range": f"bytes=0-{prefix - 1}"} if prefix else None
+        started_at = time.perf_counter()
+        try:
+            with self._session.get(
+                url, stream=True, timeout=self.timeout, headers=headers
+            ) as response:
+                retries = self._retries_of(response)
+                response.raise_for_status()
+                content = self._read_limited(response, prefix)
+        except requests.RequestException as e:
+            self._record_error(url, e)
+            raise StorageDownloadError(str(e)) from e
+        except StorageDownloadError as e:
+            self._record_error(url, e)
+            raise
+
+        with self._lock:
+            self.downloads_total += 1
+            self.retries_total += retries
+            self.bytes_total += len(content)
+            self._latency_ms.append((time.perf_counter() - started_at) * 1000)
+        return content
+
+    def _record_error(self, url: str, error: Exception):
+        with self._lock:
+            self.errors_total += 1
+        logger.warning(f"Descarga fallida de {url}: {str(error)}")
+
+    def _read_limited(
+        self, response: requests.Response, prefix: Optional[int] = None
+    ) -> bytes:
+        declared = response.headers.get("Content-Length")
+        if (
+            prefix is None
+            and declared
+            and declared.isdigit()
+            and int(declared) > self.max_bytes
+        ):
+            raise StorageDownloadError(
+                f"Archivo demasiado grande: {int(declared)} bytes"
+            )
+
+        buffer = bytearray()
+        for chunk in response.iter_content(chunk_size=CHUNK_SIZE):
+            buffer.extend(chunk)
+            if prefix is not None and len(buffer) >= prefix:
+                return bytes(buffer[:prefix])
+            if len(buffer) > self.max_bytes:
+                raise StorageDownloadError(
+                    f"Archivo demasiado grande: más de {self.max_bytes} bytes"
+                )
+        return bytes(buffer)
+
+    @staticmethod
+    def _retries_of(response: requests.Response) -> int:
+        retries = getattr(response.raw, "retries", None)
+        return len(retries.history) if retries is not None else 0
+
+    def _connection_stats(self) -> Dict[str, int]:
+        """Conexiones abiertas vs. solicitudes servidas por los pools de urllib3"""
+        pools = self._adapter.poolmanager.pools
+        opened = served = 0
+        for key in list(pools.keys()):
+            pool = pools.get(key)
+            if pool is not None:
+                opened += pool.num_connections
+                served += pool.num_requests
+        return {"connections_opened": opened, "requests_sent": served}
+
+    def stats(self) -> Dict[str, Any]:
+        connections = self._connection_stats()
+        requests_sent = connections["requests_sent"]
+        with self._lock:
+            return {
+                "downloads_total": self.downloads_total,
+                "errors_total": self.errors_total,
+                "retries_total": self.retries_total,
+                "bytes_total": self.bytes_total,
+                **connections,
+                "connection_reuse_ratio": (
+                    1 - connections["connections_opened"] / requests_sent
+                    if requests_sent
+                    else 0.0
+                ),
+                "latency_ms": percentile_summary(self._latency_ms),
+            }
+
+    def close(self):
+        self._session.close()
+
+
+_client: Optional[StorageClient] = None
+_client_lock = threading.Lock()
+
+
+def get_storage_client() -> StorageClient:
+    """Cliente compartido del proceso"""
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = StorageClient(
+                pool_size=settings.STORAGE_POOL_SIZE,
+                connect_timeout=settings.STORAGE_CONNECT_TIMEOUT_SECONDS,
+                read_timeout=settings.STORAGE_READ_TIMEOUT_SECONDS,
+                max_retries=settings.STORAGE_MAX_RETRIES,
+                max_bytes=settings.STORAGE_MAX_DOWNLOAD_MB * 1024 * 1024,
+            )
+        return _client
@@ -0,0 +1,182 @@
+import functools
+import inspect
+import os
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, List, Optional
+
+from prometheus_client import CollectorRegistry, Histogram, make_asgi_app, multiprocess
+
+# Pedidos con este encabezado en "1" reciben los tiempos en `Server-Timing`
+DEBUG_TIMINGS_HEADER = "X-Debug-Timings"
+
+_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+STAGE_SECONDS = Histogram(
+    "pipeline_stage_seconds",
+    "Duración de cada etapa de un pipeline (análisis, reporte, finalización)",
+    ["pipeline", "stage"],
+    buckets=_BUCKETS,
+)
+PIPELINE_SECONDS = Histogram(
+    "pipeline_duration_seconds",
+    "Duración total de una ejecución de un pipeline",
+    ["pipeline", "outcome"],
+    buckets=_BUCKETS,
+)
+
+
+class PipelineTrace:
+    """
+    Tiempos por etapa de una ejecución de un pipeline. Cada etapa se observa
+    en el histograma de Prometheus al terminar; si una etapa se repite, sus
+    tiempos se suman.
+    """
+
+    def __init__(self, pipeline: str):
+        self.pipeline = pipeline
+        self.outcome = "ok"
+        self.total_ms = 0.0
+        self.stages: Dict[str, float] = {}
+        self._started_at = time.perf_counter()
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        started_at = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - started_at
+            STAGE_SECONDS.labels(self.pipeline, name).observe(elapsed)
+            with self._lock:
+                self.stages[name] = self.stages.get(name, 0.0) + elapsed * 1000
+
+    def as_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            stages = {name: round(ms, 2) for name, ms in self.stages.items()}
+        return {
+            "total_ms": round(self.total_ms, 2),
+            "outcome": self.outcome,
+            "stages": stages,
+        }
+
+
+_current_trace: ContextVar[Optional[PipelineTrace]] = ContextVar(
+    "pipeline_trace", default=None
+)
+_collected_traces: ContextVar[Optional[List[PipelineTrace]]] = ContextVar(
+    "collected_traces", default=None
+)
+
+
+@contextmanager
+def pipeline_trace(pipeline: str) -> Iterator[PipelineTrace]:
+    """
+    Abre la traza de una ejecución: las llamadas a `stage` dentro del bloque
+    (también en funciones anidadas y en `run_in_threadpool`, que copia el
+    contexto) se registran en ella. Marcar `trace.outcome = "error"` cuando
+    el pipeline retorna un error sin lanzar excepción.
+    """
+    trace = PipelineTrace(pipeline)
+    token = _current_trace.set(trace)
+    try:
+        yield trace
+    except BaseException:
+        trace.outcome = "error"
+        raise
+    finally:
+        _current_trace.reset(token)
+        trace.total_ms = (time.perf_counter() - trace._started_at) * 1000
+        PIPELINE_SECONDS.labels(pipeline, trace.outcome).observe(trace.total_ms / 1000)
+        collected = _collected_traces.get()
+        if collected is not None:
+            collected.append(trace)
+
+
+def traced_pipeline(pipeline: str):
+    """Decorador: toda la llamada (sync o async) queda en una traza"""
+
+    def decorator(func):
+        if inspect.iscoroutinefunction(func):
+
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                with pipeline_trace(pipeline):
+                    return await func(*args, **kwargs)
+
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with pipeline_trace(pipeline):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+@contextmanager
+def stage(name: str) -> Iterator[None]:
+    """Etapa de la traza activa; sin traza no mide nada"""
+    trace = _current_trace.get()
+    if trace is None:
+        yield
+        return
+    with trace.stage(name):
+        yield
+
+
+@contextmanager
+def collect_traces() -> Iterator[List[PipelineTrace]]:
+    """Junta las trazas que terminan dentro del bloque (p. ej. de un pedido)"""
+    traces: List[PipelineTrace] = []
+    token = _collected_traces.set(traces)
+    try:
+        yield traces
+    finally:
+        _collected_traces.reset(token)
+
+
+def timings_of(traces: List[PipelineTrace]) -> Optional[Dict[str, Any]]:
+    """Bloque `timings` por pipeline, para guardar o devolver"""
+    if not traces:
+        return None
+    return {trace.pipeline: trace.as_dict() for trace in traces}
+
+
+def server_timing(traces: List[PipelineTrace]) -> str:
+    """Valor del encabezado `Server-Timing` (lo muestran las devtools)"""
+    metrics = []
+    for trace in traces:
+        for name, ms in trace.as_dict()["stages"].items():
+            metrics.append(f"{trace.pipeline}-{name};dur={ms}")
+        metrics.append(f"{trace.pipeline};dur={round(trace.total_ms, 2)}")
+    return ", ".join(metrics)
+
+
+async def debug_timings_middleware(request, call_next):
+    """Agrega `Server-Timing` a la respuesta si el cliente lo pidió"""
+    if request.headers.get(DEBUG_TIMINGS_HEADER) != "1":
+        return await call_next(request)
+
+    with collect_traces() as traces:
+        response = await call_next(request)
+    if traces:
+        response.headers["Server-Timing"] = server_timing(traces)
+    return response
+
+
+def metrics_app():
+    """
+    App ASGI de `/metrics`. Con varios workers de gunicorn se define
+    PROMETHEUS_MULTIPROC_DIR y se agregan las métricas de todos los procesos.
+    """
+    if os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return make_asgi_app(registry=registry)
+    return make_asgi_app()
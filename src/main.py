@@ -1,3 +1,4 @@
+import asyncio
 import logging
 import logging.config
 import sys
@@ -5,7 +6,18 @@ import sys
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
+from src.application.services.analysis_job_service import (
+    shutdown_analysis_job_service,
+)
+from src.application.services.shadow_inference_service import (
+    shutdown_shadow_inference_service,
+)
 from src.infraestructure.config.settings import settings
+from src.infraestructure.ml_models import (
+    get_inference_executor,
+    shutdown_inference_executor,
+)
+from src.infraestructure.utils.tracing import debug_timings_middleware, metrics_app
 from src.presentation.api.v1.routers import router as router_v1
 
 # Convertir LOG_LEVEL de string a nivel de logging
@@ -66,6 +78,32 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+# Tiempos por etapa en `Server-Timing` para pedidos con `X-Debug-Timings: 1`
+app.middleware("http")(debug_timings_middleware)
+app.mount("/metrics", metrics_app())
+
+
+@app.on_event("startup")
+async def warm_up_ml_model():
+    # Calentar el modelo en segundo plano; /health/ready reporta cuándo termina
+    if not settings.ML_WARMUP_ON_STARTUP:
+        return
+
+    executor = get_inference_executor()
+    asyncio.get_running_loop().run_in_executor(
+        None,
+        executor.warm_up,
+        settings.ML_WARMUP_ITERATIONS,
+        settings.ML_WARMUP_IMAGE_WIDTH,
+        settings.ML_WARMUP_IMAGE_HEIGHT,
+    )
+
+
+@app.on_event("shutdown")
+def shutdown_ml_workers():
+    shutdown_inference_executor()
+    shutdown_shadow_inference_service()
+    shutdown_analysis_job_service()
 
 
 @app.get("/health")
@@ -2,9 +2,14 @@ from typing import List, Optional
 from uuid import UUID
 from datetime import datetime
 from sqlalchemy.orm import Session
-from fastapi import APIRouter, Depends, HTTPException, Query, Path, Body
+from fastapi import APIRouter, Depends, HTTPException, Query, Path, Body, Response
+from fastapi.concurrency import run_in_threadpool
 
 from src.application.services.target_analysis_service import TargetAnalysisService
+from src.application.services.analysis_job_service import (
+    AnalysisJobService,
+    get_analysis_job_service,
+)
 from src.infraestructure.auth.jwt_config import get_current_user
 from src.presentation.schemas.target_analysis_schema import (
     ExerciseAnalysisResponse,
@@ -15,6 +20,10 @@ from src.presentation.schemas.target_analysis_schema import (
     TargetConfigResponse,
     AnalysisErrorResponse,
     SessionScoringStats,
+    AnalysisJobRequest,
+    AnalysisJobResponse,
+    SessionAnalysisRequest,
+    SessionAnalysisResponse,
 )
 from src.infraestructure.database.session import get_db
 from src.application.services.enhanced_target_analysis_service import (
@@ -23,6 +32,12 @@ from src.application.services.enhanced_target_analysis_service import (
 from src.application.services.target_analysis_factory import (
     TargetAnalysisServiceFactory,
 )
+from src.infraestructure.config.settings import settings
+from src.infraestructure.database.models.analysis_job_model import AnalysisJobStatus
+from src.infraestructure.database.repositories.shadow_inference_repo import (
+    ShadowInferenceRepository,
+)
+from src.infraestructure.ml_models import ModelRegistry
 
 router = APIRouter(
     prefix="/analysis",
@@ -42,6 +57,9 @@ async def analyze_exercise_image(
         description="Método de puntuación a utilizar: 'linear', 'exponential', 'zones'",
         regex="^(linear|exponential|zones)$",
     ),
+    model_version: Optional[str] = Query(
+        None, description="Versión del modelo (default: la del club o la general)"
+    ),
     service: EnhancedTargetAnalysisService = Depends(
         TargetAnalysisServiceFactory.create_enhanced_service
     ),
@@ -51,15 +69,19 @@ async def analyze_exercise_image(
     Analiza la imagen de un ejercicio y devuelve los resultados del análisis.
     """
     try:
-        # Usar el método de compatibilidad total del servicio mejorado
-        result, error = service.analyze_exercise_image(
+        # El análisis es síncrono (descarga + YOLO + BD): ejecutarlo fuera del event loop
+        result, error = await run_in_threadpool(
+            service.analyze_exercise_image,
             exercise_id=exercise_id,
             confidence_threshold=request.confidence_threshold,
             force_reanalysis=request.force_reanalysis,
             scoring_method=scoring_method,
+            model_version=model_version,
         )
 
         if error:
+            if error.startswith("INFERENCE_BUSY"):
+                raise HTTPException(status_code=503, detail=error)
             # Mantener el mismo manejo de errores
             raise HTTPException(status_code=400, detail=error)
 
@@ -107,6 +129,9 @@ async def analyze_exercise_with_enhanced_options(
     request: EnhancedExerciseAnalysisRequest = Body(
         ..., description="Parámetros de análisis mejorados"
     ),
+    model_version: Optional[str] = Query(
+        None, description="Versión del modelo (default: la del club o la general)"
+    ),
     service: EnhancedTargetAnalysisService = Depends(
         TargetAnalysisServiceFactory.create_enhanced_service
     ),
@@ -127,11 +152,13 @@ async def analyze_exercise_with_enhanced_options(
     - Para desarrollo y testing de nuevas características
     """
     try:
-        result, error = service.analyze_exercise_image(
+        result, error = await run_in_threadpool(
+            service.analyze_exercise_image,
             exercise_id=exercise_id,
             confidence_threshold=request.confidence_threshold,
             force_reanalysis=request.force_reanalysis,
             enable_scoring=request.enable_scoring,  # ✅ Control explícito
+            model_version=model_version,
         )
 
         if error:
@@ -145,6 +172,14 @@ async def analyze_exercise_with_enhanced_options(
                     "status": 422,
                     "detail": "Error en la detección de impactos - revisar calidad de imagen",
                 },
+                "INFERENCE_BUSY": {
+                    "status": 503,
+                    "detail": "El detector está saturado, intente de nuevo en unos segundos",
+                },
+                "MODEL_VERSION_NOT_FOUND": {
+                    "status": 400,
+                    "detail": error,
+                },
                 "ENHANCED_ANALYSIS_ERROR": {
                     "status": 500,
                     "detail": "Error en el análisis mejorado",
@@ -209,6 +244,9 @@ async def reanalyze_exercise_with_scoring(
     confidence_threshold: float = Query(
         0.25, ge=0.1, le=0.9, description="Umbral de confianza"
     ),
+    model_version: Optional[str] = Query(
+        None, description="Versión del modelo (default: la del club o la general)"
+    ),
     service: EnhancedTargetAnalysisService = Depends(
         TargetAnalysisServiceFactory.create_enhanced_service
     ),
@@ -228,14 +266,18 @@ async def reanalyze_exercise_with_scoring(
     - Mantiene historial en análisis timestamp
     """
     try:
-        result, error = service.analyze_exercise_image(
+        result, error = await run_in_threadpool(
+            service.analyze_exercise_image,
             exercise_id=exercise_id,
             confidence_threshold=confidence_threshold,
             force_reanalysis=True,  # Forzar re-análisis
             enable_scoring=True,  # Asegurar que se calcula puntuación
+            model_version=model_version,
         )
 
         if error:
+            if error.startswith("INFERENCE_BUSY"):
+                raise HTTPException(status_code=503, detail=error)
             raise HTTPException(status_code=400, detail=error)
 
         return result
@@ -244,3 +286,159 @@ async def reanalyze_exercise_with_scoring(
         raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error en re-análisis: {str(e)}")
+
+
+@router.get("/models/shadow-summary")
+async def get_shadow_inference_summary(
+    db: Session = Depends(get_db),
+    current_user=Depends(get_current_user),
+):
+    """
+    Comparación de modelos sombra contra el modelo principal: muestras,
+    latencia promedio de cada uno y concordancia (precisión, recall, IoU).
+    """
+    return {
+        "available_versions": ModelRegistry.available_versions(),
+        "default_version": settings.ML_MODEL_VERSION,
+        "shadow": await run_in_threadpool(ShadowInferenceRepository.get_summary, db),
+    }
+
+
+JOB_ERROR_STATUS = {
+    "EXERCISE_OR_IMAGE_NOT_FOUND": 404,
+    "JOB_NOT_FOUND": 404,
+    "MODEL_VERSION_NOT_FOUND": 400,
+    "ANALYSIS_JOBS_BUSY": 503,
+}
+
+
+def _raise_job_error(error: str):
+    status_code = JOB_ERROR_STATUS.get(error.split(":")[0], 500)
+    raise HTTPException(status_code=status_code, detail=error)
+
+
+@router.post(
+    "/exercise/{exercise_id}/jobs",
+    response_model=AnalysisJobResponse,
+    status_code=202,
+)
+async def create_analysis_job(
+    response: Response,
+    exercise_id: UUID = Path(..., description="ID del ejercicio a analizar"),
+    request: AnalysisJobRequest = Body(..., description="Parámetros de análisis"),
+    model_version: Optional[str] = Query(
+        None, description="Versión del modelo (default: la del club o la general)"
+    ),
+    wait_seconds: Optional[float] = Query(
+        None,
+        ge=0,
+        le=30,
+        description="Segundos a esperar el resultado antes de responder 202",
+    ),
+    db: Session = Depends(get_db),
+    job_service: AnalysisJobService = Depends(get_analysis_job_service),
+    current_user=Depends(get_current_user),
+):
+    """
+    Encola el análisis de un ejercicio y responde 202 con el id del trabajo.
+
+    Si el análisis termina dentro de `wait_seconds` (default
+    ANALYSIS_JOB_WAIT_SECONDS) responde 200 con el resultado en `result`. Si
+    el ejercicio ya tiene un trabajo activo se retorna ese mismo, de modo que
+    reintentar el POST no duplica el análisis.
+    """
+    job, error = await run_in_threadpool(
+        job_service.submit,
+        db,
+        exercise_id,
+        request,
+        model_version=model_version,
+        requested_by=current_user.id,
+    )
+    if error:
+        _raise_job_error(error)
+
+    return await _job_response(job_service, db, job.id, wait_seconds, response)
+
+
+@router.get("/jobs/{job_id}", response_model=AnalysisJobResponse)
+async def get_analysis_job(
+    response: Response,
+    job_id: UUID = Path(..., description="ID del trabajo de análisis"),
+    wait_seconds: Optional[float] = Query(
+        0, ge=0, le=30, description="Segundos a esperar si aún no termina"
+    ),
+    db: Session = Depends(get_db),
+    job_service: AnalysisJobService = Depends(get_analysis_job_service),
+    current_user=Depends(get_current_user),
+):
+    """
+    Estado de un trabajo de análisis: 200 con el resultado cuando terminó,
+    202 mientras sigue en cola o en ejecución.
+    """
+    return await _job_response(job_service, db, job_id, wait_seconds, response)
+
+
+async def _job_response(
+    job_service: AnalysisJobService,
+    db: Session,
+    job_id: UUID,
+    wait_seconds: Optional[float],
+    response: Response,
+) -> AnalysisJobResponse:
+    if wait_seconds is None:
+        wait_seconds = settings.ANALYSIS_JOB_WAIT_SECONDS
+    await job_service.wait_async(job_id, wait_seconds)
+
+    job, error = await run_in_threadpool(job_service.get_job, db, job_id)
+    if error:
+        _raise_job_error(error)
+
+    response.status_code = 202 if job.status in AnalysisJobStatus.ACTIVE else 200
+    return job
+
+
+SESSION_ANALYSIS_ERROR_STATUS = {
+    "SESSION_NOT_FOUND": 404,
+    "MODEL_VERSION_NOT_FOUND": 400,
+    "INFERENCE_BUSY": 503,
+}
+
+
+@router.post(
+    "/session/{session_id}/analyze-all", response_model=SessionAnalysisResponse
+)
+async def analyze_session_exercises(
+    session_id: UUID = Path(..., description="ID de la sesión"),
+    request: SessionAnalysisRequest = Body(
+        default_factory=SessionAnalysisRequest, description="Parámetros de análisis"
+    ),
+    model_version: Optional[str] = Query(
+        None, description="Versión del modelo (default: la del club o la general)"
+    ),
+    service: EnhancedTargetAnalysisService = Depends(
+        TargetAnalysisServiceFactory.create_enhanced_service
+    ),
+    current_user=Depends(get_current_user),
+):
+    """
+    Analiza todos los ejercicios de la sesión con imagen y sin análisis
+    vigente, p. ej. antes de finalizar la sesión.
+
+    Descarga las imágenes en paralelo, las envía al detector en lotes y
+    recalcula los totales de la sesión una sola vez. Un ejercicio que falla
+    queda con `status="failed"` en la respuesta sin afectar a los demás.
+    """
+    result, error = await run_in_threadpool(
+        service.analyze_session_exercises,
+        session_id=session_id,
+        confidence_threshold=request.confidence_threshold,
+        force_reanalysis=request.force_reanalysis,
+        enable_scoring=request.enable_scoring,
+        scoring_method=request.scoring_method or "linear",
+        model_version=model_version,
+    )
+    if error:
+        status_code = SESSION_ANALYSIS_ERROR_STATUS.get(error.split(":")[0], 500)
+        raise HTTPException(status_code=status_code, detail=error)
+    return result
@@ -1,9 +1,65 @@
 from fastapi import APIRouter
 from fastapi.responses import JSONResponse
 
+from src.application.services.shadow_inference_service import (
+    get_shadow_inference_service,
+)
+from src.infraestructure.ml_models import (
+    ModelRegistry,
+    get_bullet_detector,
+    get_inference_executor,
+)
+from src.infraestructure.ml_models.detection_cache import get_detection_cache
+from src.infraestructure.utils.storage_client import get_storage_client
+
 router = APIRouter(prefix="/health", tags=["health"])
 
 
 @router.get("/", summary="Health check", response_description="API is healthy")
 async def health_check():
     return JSONResponse(content={"status": "ooookkk"})
+
+
+@router.get(
+    "/ready",
+    summary="Readiness check",
+    response_description="503 mientras el modelo se está calentando",
+)
+async def readiness_check():
+    executor = get_inference_executor()
+    if not executor.is_ready:
+        return JSONResponse(
+            status_code=503,
+            content={"status": "warming_up", "error": executor.warmup_error},
+        )
+    return JSONResponse(content={"status": "ready"})
+
+
+@router.get(
+    "/inference",
+    summary="Métricas de inferencia",
+    response_description="Lotes, tiempos de espera, caché y modelos del detector",
+)
+async def inference_stats():
+    cache = get_detection_cache()
+    shadow = get_shadow_inference_service()
+    return JSONResponse(
+        content={
+            **get_bullet_detector().get_inference_stats(),
+            "detection_cache": cache.stats() if cache else {"enabled": False},
+            "models": {
+                "available": ModelRegistry.available_versions(),
+                "loaded": ModelRegistry.loaded_versions(),
+            },
+            "shadow": shadow.stats() if shadow else {"enabled": False},
+        }
+    )
+
+
+@router.get(
+    "/storage",
+    summary="Métricas de descarga de imágenes",
+    response_description="Latencias, reintentos y reutilización de conexiones",
+)
+async def storage_stats():
+    return JSONResponse(content=get_storage_client().stats())
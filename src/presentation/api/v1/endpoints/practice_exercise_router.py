@@ -3,6 +3,7 @@ import logging
 from typing import List, Optional
 from uuid import UUID
 from datetime import datetime
+from fastapi.concurrency import run_in_threadpool
 from fastapi.responses import StreamingResponse
 import io
 
@@ -473,8 +474,9 @@ async def upload_exercise_image(
     user_id = current_user.id
 
     try:
-        result, error = service.upload_exercise_image(
-            exercise_id, image, user_id, replace=replace
+        # Subida bloqueante (S3 por partes): fuera del event loop
+        result, error = await run_in_threadpool(
+            service.upload_exercise_image, exercise_id, image, user_id, replace=replace
         )
     except Exception as e:
         logger.exception("Unhandled exception in service.upload_exercise_image")
@@ -200,11 +200,14 @@ async def update_shooter_license_file(
 ):
     user_id = current_user.id
 
+    from fastapi.concurrency import run_in_threadpool
+
     from src.infraestructure.utils.s3_utils import upload_file_to_s3
 
     bucket_name = "proshooter"
     try:
-        file_url = upload_file_to_s3(
+        file_url = await run_in_threadpool(
+            upload_file_to_s3,
             file,
             bucket_name=bucket_name,
             folder="licenses",
@@ -78,6 +78,18 @@ class ExerciseAnalysisResponse(BaseModel):
     centro_grupo: Optional[Dict[str, float]] = Field(
         None, description="Centro del grupo de tiro"
     )
+    radio_medio_grupo: Optional[float] = Field(
+        None, description="Distancia media al centro del grupo en píxeles"
+    )
+    cep50_grupo: Optional[float] = Field(
+        None, description="Radio que contiene el 50% de los disparos en píxeles"
+    )
+    dispersion_horizontal: Optional[float] = Field(
+        None, description="Desviación estándar horizontal del grupo en píxeles"
+    )
+    dispersion_vertical: Optional[float] = Field(
+        None, description="Desviación estándar vertical del grupo en píxeles"
+    )
     eficiencia_puntuacion: Optional[float] = Field(
         None, description="Eficiencia vs máximo posible (%)"
     )
@@ -144,6 +156,16 @@ class GroupStatisticsSchema(BaseModel):
     )
     std_deviation: float = Field(..., description="Desviación estándar")
     shots_count: int = Field(..., description="Número de disparos en el grupo")
+    mean_radius: Optional[float] = Field(None, description="Radio medio")
+    cep50: Optional[float] = Field(
+        None, description="Radio que contiene el 50% de los disparos"
+    )
+    horizontal_dispersion: Optional[float] = Field(
+        None, description="Desviación estándar horizontal"
+    )
+    vertical_dispersion: Optional[float] = Field(
+        None, description="Desviación estándar vertical"
+    )
 
 
 class ScoreDistributionSchema(BaseModel):
@@ -508,6 +530,64 @@ class ResponseFactory:
         )
 
 
+# ✅ TRABAJOS DE ANÁLISIS ASÍNCRONOS
+class AnalysisJobRequest(EnhancedExerciseAnalysisRequest):
+    """Parámetros de un análisis encolado"""
+
+    scoring_method: Optional[str] = Field(
+        "linear",
+        description="Método de puntuación: 'linear', 'exponential', 'zones'",
+        pattern="^(linear|exponential|zones)$",
+    )
+
+
+class AnalysisJobResponse(BaseModel):
+    """Estado de un trabajo de análisis; `result` solo cuando terminó bien"""
+
+    job_id: UUID
+    exercise_id: UUID
+    status: str  # queued | running | succeeded | failed
+    created_at: Optional[datetime] = None
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    queue_ms: Optional[float] = None
+    run_ms: Optional[float] = None
+    # Tiempos por etapa (descarga, inferencia, puntuación, BD, consolidación)
+    timings: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+    analysis_id: Optional[UUID] = None
+    result: Optional[ExerciseAnalysisResponse] = None
+
+
+# ✅ ANÁLISIS DE TODA LA SESIÓN
+class SessionAnalysisRequest(AnalysisJobRequest):
+    """Parámetros del análisis de todos los ejercicios de una sesión"""
+
+
+class SessionExerciseAnalysisResult(BaseModel):
+    """Resultado por ejercicio del análisis de sesión"""
+
+    exercise_id: UUID
+    status: str  # analyzed | refiltered | up_to_date | failed
+    analysis_id: Optional[UUID] = None
+    total_impactos_detectados: Optional[int] = None
+    puntuacion_total: Optional[int] = None
+    error: Optional[str] = None
+
+
+class SessionAnalysisResponse(BaseModel):
+    """Resumen del análisis de todos los ejercicios de una sesión"""
+
+    session_id: UUID
+    total_exercises: int
+    analyzed: int
+    refiltered: int
+    up_to_date: int
+    failed: int
+    elapsed_ms: float
+    exercises: List[SessionExerciseAnalysisResult]
+
+
 # ✅ BACKWARD COMPATIBILITY ALIASES
 # Mantener alias para códigothat ya usa los esquemas anteriores
 ExerciseAnalysisSchema = ExerciseAnalysisResponse  # Alias de compatibilidad
@@ -534,6 +614,11 @@ __all__ = [
     "SessionScoringStats",
     "AnalysisErrorResponse",
     "TargetConfigResponse",
+    "AnalysisJobRequest",
+    "AnalysisJobResponse",
+    "SessionAnalysisRequest",
+    "SessionExerciseAnalysisResult",
+    "SessionAnalysisResponse",
     # Utilidades
     "SchemaConverter",
     "ResponseFactory",
@@ -173,6 +173,15 @@ class TargetImageFilter(BaseModel):
         return max_size
 
 
+class DuplicateImageInfo(BaseModel):
+    """Imagen anterior del tirador de la que la subida es un casi-duplicado."""
+
+    image_id: UUID
+    exercise_id: UUID
+    hamming_distance: int = Field(description="Bits distintos del hash perceptual")
+    analysis_id: Optional[UUID] = None
+
+
 class TargetImageUploadResponse(BaseModel):
     """Esquema para la respuesta después de subir una imagen."""
 
@@ -182,6 +191,7 @@ class TargetImageUploadResponse(BaseModel):
     content_type: str
     upload_status: str
     message: str
+    duplicate_of: Optional[DuplicateImageInfo] = None
 
 
 class TargetImageAnalysisSummary(BaseModel):
@@ -0,0 +1,232 @@
+import asyncio
+import threading
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from src.application.services import analysis_job_service as job_module
+from src.application.services.analysis_job_service import AnalysisJobService
+from src.infraestructure.database.models.analysis_job_model import (
+    AnalysisJobModel,
+    AnalysisJobStatus,
+)
+from src.infraestructure.database.repositories.analysis_job_repo import (
+    AnalysisJobRepository,
+)
+from src.infraestructure.utils.tracing import pipeline_trace, stage
+from src.presentation.schemas.target_analysis_schema import AnalysisJobRequest
+
+
+class InMemoryJobs:
+    """Sustituye a AnalysisJobRepository sin base de datos"""
+
+    def __init__(self):
+        self.jobs = {}
+
+    def create(self, db, job_data):
+        job = SimpleNamespace(
+            id=uuid4(),
+            created_at=datetime.now(timezone.utc),
+            started_at=None,
+            finished_at=None,
+            queue_ms=None,
+            run_ms=None,
+            timings=None,
+            analysis_id=None,
+            error=None,
+            **job_data,
+        )
+        self.jobs[job.id] = job
+        return job
+
+    def get_by_id(self, db, job_id):
+        return self.jobs.get(job_id)
+
+    def get_active_for_exercise(self, db, exercise_id):
+        active = [
+            j
+            for j in self.jobs.values()
+            if j.exercise_id == exercise_id and j.status in AnalysisJobStatus.ACTIVE
+        ]
+        return active[-1] if active else None
+
+    def mark_running(self, db, job_id):
+        job = self.jobs[job_id]
+        job.status, job.queue_ms = AnalysisJobStatus.RUNNING, 1.0
+        job.started_at = datetime.now(timezone.utc)
+        return job
+
+    def mark_finished(self, db, job_id, analysis_id=None, error=None, timings=None):
+        job = self.jobs[job_id]
+        job.timings = timings
+        job.status = AnalysisJobStatus.FAILED if error else AnalysisJobStatus.SUCCEEDED
+        job.analysis_id, job.error, job.run_ms = analysis_id, error, 2.0
+        return job
+
+
+class FakeAnalysisService:
+    release = threading.Event()
+    calls = []
+
+    def __init__(self, db):
+        pass
+
+    def analyze_exercise_image(self, **kwargs):
+        self.calls.append(kwargs)
+        with pipeline_trace("analysis"), stage("inference"):
+            assert self.release.wait(timeout=5)
+        return SimpleNamespace(analysis_id=ANALYSIS_ID), None
+
+    def get_analysis_by_id(self, analysis_id):
+        return None, None
+
+
+ANALYSIS_ID = uuid4()
+EXERCISE_ID = uuid4()
+
+
+@pytest.fixture
+def jobs(monkeypatch):
+    jobs = InMemoryJobs()
+    for name in (
+        "create",
+        "get_by_id",
+        "get_active_for_exercise",
+        "mark_running",
+        "mark_finished",
+    ):
+        monkeypatch.setattr(
+            job_module.AnalysisJobRepository, name, staticmethod(getattr(jobs, name))
+        )
+    monkeypatch.setattr(
+        job_module.PracticeExerciseRepository,
+        "get_by_id",
+        staticmethod(lambda db, exercise_id: SimpleNamespace(target_image=object())),
+    )
+    FakeAnalysisService.release.clear()
+    FakeAnalysisService.calls.clear()
+    return jobs
+
+
+def _service(**kwargs):
+    return AnalysisJobService(
+        session_factory=MagicMock,
+        analysis_service_factory=FakeAnalysisService,
+        **kwargs,
+    )
+
+
+def test_job_runs_in_background_and_reports_result(jobs):
+    service = _service(workers=1)
+
+    job, error = service.submit(MagicMock(), EXERCISE_ID, AnalysisJobRequest())
+    assert error is None
+    assert job.status in AnalysisJobStatus.ACTIVE
+
+    # Sin terminar dentro del plazo: el cliente recibe el estado actual
+    asyncio.run(service.wait_async(job.id, timeout=0.05))
+    pending, _ = service.get_job(MagicMock(), job.id)
+    assert pending.status in AnalysisJobStatus.ACTIVE
+
+    FakeAnalysisService.release.set()
+    asyncio.run(service.wait_async(job.id, timeout=5))
+    done, _ = service.get_job(MagicMock(), job.id)
+    service.shutdown(wait=True)
+
+    assert done.status == AnalysisJobStatus.SUCCEEDED
+    assert done.analysis_id == ANALYSIS_ID
+    assert FakeAnalysisService.calls[0]["scoring_method"] == "linear"
+    assert "inference" in done.timings["analysis"]["stages"]
+
+
+def test_retry_returns_the_active_job_instead_of_duplicating(jobs):
+    service = _service(workers=1)
+
+    first, _ = service.submit(MagicMock(), EXERCISE_ID, AnalysisJobRequest())
+    retry, _ = service.submit(MagicMock(), EXERCISE_ID, AnalysisJobRequest())
+    FakeAnalysisService.release.set()
+    service.shutdown(wait=True)
+
+    assert retry.id == first.id
+    assert len(jobs.jobs) == 1
+
+
+def test_full_queue_is_rejected(jobs):
+    service = _service(workers=1, max_pending=0)
+
+    service.submit(MagicMock(), uuid4(), AnalysisJobRequest())
+    job, error = service.submit(MagicMock(), uuid4(), AnalysisJobRequest())
+    FakeAnalysisService.release.set()
+    service.shutdown(wait=True)
+
+    assert job is None
+    assert error.startswith("ANALYSIS_JOBS_BUSY")
+
+
+def test_orphaned_job_expires_after_timeout(jobs):
+    service = _service(timeout_seconds=60)
+    orphan = jobs.create(
+        None, {"exercise_id": EXERCISE_ID, "status": AnalysisJobStatus.RUNNING}
+    )
+    orphan.created_at -= timedelta(minutes=10)
+    orphan.started_at = datetime.now(timezone.utc) - timedelta(minutes=5)
+
+    status, _ = service.get_job(MagicMock(), orphan.id)
+    service.shutdown()
+
+    assert status.status == AnalysisJobStatus.FAILED
+    assert status.error.startswith("JOB_TIMEOUT")
+
+
+def test_running_job_deadline_counts_from_start_not_from_queueing(jobs):
+    service = _service(timeout_seconds=60)
+    # Esperó en cola más que el timeout, pero otro worker lo acaba de iniciar
+    job = jobs.create(
+        None, {"exercise_id": EXERCISE_ID, "status": AnalysisJobStatus.RUNNING}
+    )
+    job.created_at -= timedelta(minutes=5)
+    job.started_at = datetime.now(timezone.utc) - timedelta(seconds=10)
+
+    status, _ = service.get_job(MagicMock(), job.id)
+    service.shutdown()
+
+    assert status.status == AnalysisJobStatus.RUNNING
+
+
+def test_concurrent_submits_share_one_job_through_unique_index(monkeypatch):
+    engine = create_engine("sqlite://")
+    AnalysisJobModel.__table__.create(engine)
+    db = sessionmaker(bind=engine, expire_on_commit=False)()
+    monkeypatch.setattr(
+        job_module.PracticeExerciseRepository,
+        "get_by_id",
+        staticmethod(lambda db, exercise_id: SimpleNamespace(target_image=object())),
+    )
+    service = _service(workers=1)
+    monkeypatch.setattr(service, "_pool", MagicMock())
+
+    first, _ = service.submit(db, EXERCISE_ID, AnalysisJobRequest())
+    # La otra petición consultó antes de que se insertara el primer trabajo
+    get_active = AnalysisJobRepository.get_active_for_exercise
+    lookups = []
+
+    def stale_first_lookup(session, exercise_id):
+        lookups.append(exercise_id)
+        return get_active(session, exercise_id) if len(lookups) > 1 else None
+
+    monkeypatch.setattr(
+        job_module.AnalysisJobRepository,
+        "get_active_for_exercise",
+        staticmethod(stale_first_lookup),
+    )
+    second, error = service.submit(db, EXERCISE_ID, AnalysisJobRequest())
+
+    assert error is None
+    assert second.id == first.id
+    assert db.query(AnalysisJobModel).count() == 1
+    db.close()
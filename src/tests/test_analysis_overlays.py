@@ -0,0 +1,158 @@
+import io
+from uuid import uuid4
+
+import numpy as np
+import pytest
+from PIL import Image
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from src.application.services import analysis_overlays as overlays_module
+from src.application.services.analysis_overlays import (
+    AnalysisOverlayService,
+    OverlayCache,
+    heatmap_density,
+    overlay_version,
+    render_overlay,
+)
+from src.infraestructure.config.settings import settings
+from src.infraestructure.database.models.target_analysis_model import (
+    TargetAnalysisModel,
+)
+
+BUCKET = "https://proshooterdata.s3.amazonaws.com/"
+PHOTO_URL = BUCKET + "target_images/u1/exercise_image_20261018.jpg"
+
+
+def _jpeg():
+    buf = io.BytesIO()
+    Image.fromarray(np.full((120, 160, 3), 200, dtype=np.uint8)).save(buf, "JPEG")
+    return buf.getvalue()
+
+
+class FakeStorage:
+    def __init__(self):
+        self.objects = {PHOTO_URL: _jpeg()}
+        self.downloads = []
+        self.deleted = []
+
+    def get_bytes(self, url):
+        self.downloads.append(url)
+        return self.objects[url]
+
+    def upload(self, data, bucket_name, key, content_type="image/jpeg", **kwargs):
+        url = BUCKET + key
+        self.objects[url] = data
+        return url
+
+    def delete(self, url, bucket_name):
+        self.deleted.append(url)
+        self.objects.pop(url)
+
+
+@pytest.fixture
+def storage(monkeypatch):
+    fake = FakeStorage()
+    monkeypatch.setattr(overlays_module, "get_storage_client", lambda: fake)
+    monkeypatch.setattr(overlays_module, "upload_bytes_to_s3", fake.upload)
+    monkeypatch.setattr(overlays_module, "delete_file_from_s3", fake.delete)
+    cache = OverlayCache(max_entries=8)
+    monkeypatch.setattr(overlays_module, "get_overlay_cache", lambda: cache)
+    return fake
+
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite://")
+    TargetAnalysisModel.__table__.create(engine)
+    session = sessionmaker(bind=engine, expire_on_commit=False)()
+    yield session
+    session.close()
+
+
+def _analysis(db, impacts):
+    analysis = TargetAnalysisModel(target_image_id=uuid4(), impact_coordinates=impacts)
+    db.add(analysis)
+    db.commit()
+    return analysis
+
+
+def test_overlay_is_rendered_once_and_stored_next_to_the_photo(db, storage):
+    analysis = _analysis(db, [{"centro_x": 40, "centro_y": 50, "es_fresco": True}])
+    service = AnalysisOverlayService(db)
+
+    first, error = service.get_overlay(analysis, PHOTO_URL, "impacts")
+    assert error is None
+    assert Image.open(io.BytesIO(first)).size == (160, 120)
+
+    version = overlay_version(analysis.impact_coordinates)
+    db.expire_all()
+    stored = db.get(TargetAnalysisModel, analysis.id).overlays
+    assert stored["version"] == version
+    assert stored["impacts"] == (
+        f"{BUCKET}target_images/u1/exercise_image_20261018"
+        f".overlay-{version}-impacts.jpg"
+    )
+
+    # Segunda petición: desde la caché, sin descargar nada
+    assert service.get_overlay(analysis, PHOTO_URL, "impacts") == (first, None)
+    assert storage.downloads == [PHOTO_URL]
+
+    # Otro proceso (caché vacía) descarga la imagen ya renderizada
+    overlays_module.get_overlay_cache().clear()
+    analysis = db.get(TargetAnalysisModel, analysis.id)
+    assert service.get_overlay(analysis, PHOTO_URL, "impacts") == (first, None)
+    assert storage.downloads[-1] == stored["impacts"]
+
+
+def test_reanalysis_renders_new_version_and_deletes_stale(db, storage):
+    analysis = _analysis(db, [{"centro_x": 40, "centro_y": 50, "es_fresco": True}])
+    service = AnalysisOverlayService(db)
+    service.get_overlay(analysis, PHOTO_URL, "heatmap")
+    old_url = analysis.overlays["heatmap"]
+
+    analysis.impact_coordinates = [{"centro_x": 90, "centro_y": 60, "es_fresco": True}]
+    db.commit()
+    _, error = service.get_overlay(analysis, PHOTO_URL, "heatmap")
+
+    assert error is None
+    assert storage.downloads == [PHOTO_URL, PHOTO_URL]
+    assert analysis.overlays["version"] == overlay_version(analysis.impact_coordinates)
+    assert analysis.overlays["heatmap"] != old_url
+    assert storage.deleted == [old_url]
+
+
+def test_invalid_mode_is_rejected(db, storage):
+    analysis = _analysis(db, [])
+    data, error = AnalysisOverlayService(db).get_overlay(analysis, PHOTO_URL, "x-ray")
+    assert data is None and error.startswith("INVALID_OVERLAY_MODE")
+
+
+def test_heatmap_density_peaks_at_impacts_on_reduced_grid():
+    impacts = [
+        {"centro_x": 1000.0, "centro_y": 500.0},
+        {"centro_x": 1004.0, "centro_y": 502.0},
+        {"centro_x": 3000.0, "centro_y": 1500.0},  # fuera de la imagen
+    ]
+    density = heatmap_density(impacts, 2000, 1000, working_side=200)
+
+    assert density.shape == (100, 200)
+    assert density.max() == pytest.approx(1.0)
+    assert np.unravel_index(density.argmax(), density.shape) == (50, 100)
+    assert density[:, :50].max() < 0.01
+
+
+def test_heatmap_output_is_capped_to_configured_side(monkeypatch):
+    monkeypatch.setattr(settings, "OVERLAY_HEATMAP_MAX_SIDE", 80)
+    buf = io.BytesIO()
+    Image.fromarray(np.zeros((300, 400, 3), dtype=np.uint8)).save(buf, "JPEG")
+
+    data = render_overlay(
+        buf.getvalue(), [{"centro_x": 200, "centro_y": 150}], "heatmap"
+    )
+    heatmap = np.asarray(Image.open(io.BytesIO(data)))
+
+    assert heatmap.shape[:2] == (60, 80)
+    # Mapa JET (BGR) sobre la foto RGB: caliente en el impacto, frío lejos
+    hot, cold = heatmap[30, 40].astype(int), heatmap[0, 0].astype(int)
+    assert hot[2] > hot[0] and cold[0] > cold[2]
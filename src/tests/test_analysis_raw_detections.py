@@ -0,0 +1,159 @@
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+from uuid import uuid4
+
+import pytest
+
+from src.application.services import enhanced_target_analysis_service as service_module
+from src.application.services.enhanced_target_analysis_service import (
+    EnhancedTargetAnalysisService,
+)
+from src.benchmarks.synthetic_targets import render_target
+from src.infraestructure.ml_models.bullet_detector import get_model_version_key
+
+
+def _detection(confidence, x):
+    return {
+        "tipo": "impacto_fresco_dentro",
+        "confianza": confidence,
+        "centro_x": x,
+        "centro_y": 500.0,
+        "bbox": [x - 5, 495.0, x + 5, 505.0],
+        "es_fresco": True,
+        "dentro_blanco": True,
+        "area": 100.0,
+    }
+
+
+@pytest.fixture
+def service(monkeypatch):
+    service = EnhancedTargetAnalysisService(db=MagicMock())
+    exercise = SimpleNamespace(
+        id=uuid4(), target_image=SimpleNamespace(id=uuid4(), file_path="s3://img")
+    )
+    monkeypatch.setattr(
+        service_module.PracticeExerciseRepository,
+        "get_by_id",
+        staticmethod(lambda db, exercise_id: exercise),
+    )
+    saved = {}
+
+    def fake_update(analysis_id, basic_data, scoring_data):
+        saved["basic"], saved["scoring"] = basic_data, scoring_data
+        return SimpleNamespace(id=analysis_id)
+
+    monkeypatch.setattr(service, "_update_analysis_with_scoring", fake_update)
+    monkeypatch.setattr(
+        service, "_consolidate_exercise_after_analysis", lambda *args: None
+    )
+    monkeypatch.setattr(
+        service,
+        "_build_enhanced_response",
+        lambda exercise_id, db_analysis, detections: detections,
+    )
+    service.saved = saved
+    return service
+
+
+def test_threshold_change_refilters_stored_detections(service, monkeypatch):
+    existing = SimpleNamespace(
+        id=uuid4(),
+        confidence_threshold=0.25,
+        raw_detections={
+            "confidence_floor": 0.1,
+            "model_version": get_model_version_key(),
+            "image_width": 1000,
+            "image_height": 1000,
+            "detections": [
+                _detection(0.15, 480.0),
+                _detection(0.4, 500.0),
+                _detection(0.9, 520.0),
+            ],
+        },
+    )
+    monkeypatch.setattr(service, "_get_latest_analysis", lambda _: existing)
+
+    def no_model_call(*args, **kwargs):
+        raise AssertionError("No se debe descargar ni ejecutar el modelo")
+
+    monkeypatch.setattr(service, "_download_image_from_s3", no_model_call)
+    monkeypatch.setattr(service.inference_executor, "analyze_with_stats", no_model_call)
+
+    detections, error = service.analyze_exercise_image(
+        uuid4(), confidence_threshold=0.5
+    )
+
+    assert error is None
+    assert [d["confianza"] for d in detections] == [0.9]
+    assert service.saved["basic"]["total_impacts_detected"] == 1
+    assert service.saved["basic"]["confidence_threshold"] == 0.5
+    assert service.saved["basic"]["raw_detections"] is existing.raw_detections
+
+
+def test_analyses_without_raw_detections_run_inference_at_floor(service, monkeypatch):
+    existing = SimpleNamespace(
+        id=uuid4(), confidence_threshold=0.25, raw_detections=None
+    )
+    monkeypatch.setattr(service, "_get_latest_analysis", lambda _: existing)
+    image_data = render_target(800, 600, holes=2).image_data
+    monkeypatch.setattr(service, "_download_image_from_s3", lambda _: image_data)
+    calls = []
+
+    def fake_inference(image_data, confidence_threshold, model_version=None):
+        calls.append(confidence_threshold)
+        return {"detections": [_detection(0.12, 400.0), _detection(0.7, 410.0)]}
+
+    monkeypatch.setattr(
+        service.inference_executor, "analyze_with_stats", fake_inference
+    )
+
+    detections, error = service.analyze_exercise_image(
+        uuid4(), confidence_threshold=0.3, force_reanalysis=True
+    )
+
+    assert error is None
+    assert calls == [0.1]
+    assert len(detections) == 1
+    raw = service.saved["basic"]["raw_detections"]
+    assert raw["confidence_floor"] == 0.1
+    assert (raw["image_width"], raw["image_height"]) == (800, 600)
+    assert len(raw["detections"]) == 2
+
+
+def test_near_duplicate_upload_reuses_previous_detections(service, monkeypatch):
+    monkeypatch.setattr(service_module.settings, "DUPLICATE_IMAGE_REUSE_ANALYSIS", True)
+    image = service_module.PracticeExerciseRepository.get_by_id(None, None).target_image
+    image.duplicate_of_id = uuid4()
+    image.image_width, image.image_height = 1000, 1000
+    previous = SimpleNamespace(
+        raw_detections={
+            "confidence_floor": 0.1,
+            "model_version": get_model_version_key(),
+            "image_width": 1000,
+            "image_height": 1000,
+            "detections": [_detection(0.9, 520.0)],
+        },
+    )
+    monkeypatch.setattr(
+        service,
+        "_get_latest_analysis",
+        lambda image_id: previous if image_id == image.duplicate_of_id else None,
+    )
+    monkeypatch.setattr(
+        service,
+        "_create_analysis_with_scoring",
+        lambda image_id, basic_data, scoring_data: SimpleNamespace(id=uuid4()),
+    )
+
+    def no_model_call(*args, **kwargs):
+        raise AssertionError("No se debe descargar ni ejecutar el modelo")
+
+    monkeypatch.setattr(service, "_download_image_from_s3", no_model_call)
+
+    detections, error = service.analyze_exercise_image(uuid4())
+    assert error is None
+    assert [d["confianza"] for d in detections] == [0.9]
+
+    # Con otro tamaño las coordenadas no valen para la nueva imagen
+    image.image_width = 800
+    assert service._get_duplicate_raw_detections(image) is None
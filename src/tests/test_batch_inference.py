@@ -0,0 +1,81 @@
+import threading
+import time
+
+import numpy as np
+import pytest
+
+from src.infraestructure.ml_models.batch_inference import BatchInferenceQueue
+
+
+def _echo_predict(calls):
+    def predict(image_arrays, confidence_threshold):
+        calls.append((len(image_arrays), confidence_threshold))
+        return [int(arr[0, 0]) for arr in image_arrays]
+
+    return predict
+
+
+def test_groups_concurrent_requests_into_one_batch():
+    calls = []
+    batcher = BatchInferenceQueue(
+        _echo_predict(calls), max_batch_size=4, max_wait_ms=200
+    )
+    futures = [
+        batcher.submit(np.full((2, 2), i), confidence_threshold=0.2 + i / 10)
+        for i in range(4)
+    ]
+
+    assert [f.result(timeout=2) for f in futures] == [0, 1, 2, 3]
+    assert calls == [(4, 0.2)]
+
+    stats = batcher.stats.snapshot()
+    assert stats["batches_total"] == 1
+    assert stats["batch_size_histogram"] == {"4": 1}
+    batcher.shutdown(timeout=1)
+
+
+def test_flushes_partial_batch_after_max_wait():
+    calls = []
+    batcher = BatchInferenceQueue(_echo_predict(calls), max_batch_size=8, max_wait_ms=5)
+
+    started = time.perf_counter()
+    assert batcher.predict(np.full((2, 2), 7), 0.25, timeout=2) == 7
+    assert time.perf_counter() - started < 1
+    assert calls == [(1, 0.25)]
+    batcher.shutdown(timeout=1)
+
+
+def test_propagates_model_errors_to_every_caller():
+    def failing_predict(image_arrays, confidence_threshold):
+        raise RuntimeError("boom")
+
+    batcher = BatchInferenceQueue(failing_predict, max_batch_size=2, max_wait_ms=50)
+    futures = [batcher.submit(np.zeros((2, 2)), 0.25) for _ in range(2)]
+
+    for future in futures:
+        with pytest.raises(RuntimeError):
+            future.result(timeout=2)
+    assert batcher.stats.snapshot()["errors_total"] == 1
+    batcher.shutdown(timeout=1)
+
+
+def test_threads_share_batches():
+    calls = []
+    batcher = BatchInferenceQueue(
+        _echo_predict(calls), max_batch_size=16, max_wait_ms=100
+    )
+    results = {}
+
+    def worker(i):
+        results[i] = batcher.predict(np.full((2, 2), i), 0.25, timeout=5)
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(10)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert results == {i: i for i in range(10)}
+    assert sum(size for size, _ in calls) == 10
+    assert len(calls) < 10
+    batcher.shutdown(timeout=1)
@@ -0,0 +1,38 @@
+import pytest
+
+from src.benchmarks.inference_suite import compare_reports, latency_summary
+
+
+def _report(p95, images_per_s, rss_mb=500.0):
+    return {
+        "metadata": {"git_commit": "abc123"},
+        "detector": {
+            "640x640": {
+                "latency_ms_p95": p95,
+                "images_per_s": images_per_s,
+                "rss_mb": rss_mb,
+            }
+        },
+    }
+
+
+def test_latency_summary_percentiles_and_throughput():
+    summary = latency_summary([10.0] * 98 + [100.0, 200.0])
+
+    assert summary["samples"] == 100
+    assert summary["latency_ms_p50"] == 10.0
+    assert summary["latency_ms_p99"] > 100.0
+    assert summary["images_per_s"] == pytest.approx(100 / 1.28)
+
+
+def test_compare_reports_flags_only_regressions_beyond_tolerance():
+    baseline = _report(p95=100.0, images_per_s=10.0)
+
+    assert compare_reports(baseline, _report(p95=105.0, images_per_s=9.5)) == []
+    assert compare_reports(baseline, _report(p95=50.0, images_per_s=20.0)) == []
+
+    regressions = compare_reports(
+        baseline, _report(p95=130.0, images_per_s=8.0, rss_mb=900.0)
+    )
+    assert len(regressions) == 3
+    assert regressions[0].startswith("detector.640x640.images_per_s")
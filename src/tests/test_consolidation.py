@@ -0,0 +1,118 @@
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from src.application.services.exercise_consolidation import (
+    ExerciseConsolidationService,
+)
+from src.infraestructure.database.models.practice_exercise_model import (
+    PracticeExerciseModel,
+)
+from src.infraestructure.database.models.practice_session_model import (
+    IndividualPracticeSessionModel,
+)
+from src.infraestructure.database.models.target_analysis_model import (
+    TargetAnalysisModel,
+)
+from src.infraestructure.database.repositories.practice_session_repo import (
+    PracticeSessionRepository,
+)
+from src.infraestructure.database.repositories.target_analysis_repo import (
+    TargetAnalysisRepository,
+)
+
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite://")
+    for model in (
+        IndividualPracticeSessionModel,
+        PracticeExerciseModel,
+        TargetAnalysisModel,
+    ):
+        model.__table__.create(engine)
+    session = sessionmaker(bind=engine, expire_on_commit=False, autoflush=False)()
+    yield session
+    session.close()
+
+
+def _exercise(session_id, **fields):
+    return PracticeExerciseModel(
+        session_id=session_id,
+        exercise_type_id=uuid4(),
+        target_id=uuid4(),
+        weapon_id=uuid4(),
+        ammunition_id=uuid4(),
+        distance="25",
+        target_image_id=uuid4(),
+        **fields,
+    )
+
+
+def test_analysis_and_consolidation_share_one_transaction(db):
+    practice = IndividualPracticeSessionModel(shooter_id=uuid4())
+    db.add(practice)
+    db.flush()
+    done = _exercise(
+        practice.id, ammunition_used=5, hits=4, total_score=40, max_score_achieved=10
+    )
+    pending = _exercise(practice.id, ammunition_allocated=4)
+    db.add_all([done, pending])
+    db.commit()
+
+    statements = []
+    event.listen(
+        db.get_bind(),
+        "before_cursor_execute",
+        lambda conn, cursor, sql, *args: statements.append(sql.split()[0]),
+    )
+
+    analysis = TargetAnalysisRepository.create_with_scoring(
+        db,
+        pending.target_image_id,
+        {"total_impacts_detected": 4, "fresh_impacts_inside": 3},
+        {"total_score": 27, "max_score_achieved": 9, "average_score_per_shot": 6.75},
+        commit=False,
+    )
+    result = ExerciseConsolidationService(db).consolidate_analysis(pending, analysis)
+    db.commit()
+
+    # INSERT del análisis, UPDATE del ejercicio y UPDATE de la sesión
+    assert statements == ["INSERT", "UPDATE", "UPDATE"]
+    assert (result.ammunition_used, result.hits, result.total_score) == (4, 3, 27)
+
+    db.expire_all()
+    session = db.get(IndividualPracticeSessionModel, practice.id)
+    assert (session.total_shots_fired, session.total_hits) == (9, 7)
+    assert session.accuracy_percentage == pytest.approx(77.78)
+    assert session.total_session_score == 67
+    assert session.average_score_per_exercise == pytest.approx(33.5)
+    assert session.average_score_per_shot == pytest.approx(7.44)
+    assert session.best_shot_score == 10
+
+    # Mismos criterios que el cálculo en Python
+    totals = PracticeSessionRepository.calculate_totals_with_scoring(db, practice.id)
+    assert totals["accuracy_percentage"] == pytest.approx(session.accuracy_percentage)
+    assert totals["average_score_per_exercise"] == pytest.approx(
+        session.average_score_per_exercise
+    )
+
+
+def test_failed_consolidation_rolls_back_the_analysis(db):
+    practice = IndividualPracticeSessionModel(shooter_id=uuid4())
+    db.add(practice)
+    db.commit()
+    missing = _exercise(practice.id)
+
+    TargetAnalysisRepository.create(
+        db, {"target_image_id": missing.target_image_id}, commit=False
+    )
+    with pytest.raises(Exception):
+        ExerciseConsolidationService(db).consolidate_analysis(
+            missing, TargetAnalysisModel(total_impacts_detected=0)
+        )
+    db.rollback()
+
+    assert db.query(TargetAnalysisModel).count() == 0
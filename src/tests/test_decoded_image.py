@@ -0,0 +1,59 @@
+import io
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from src.benchmarks.synthetic_targets import render_target
+from src.infraestructure.ml_models.bullet_detector import BulletDetector
+from src.infraestructure.ml_models.decoded_image import DecodedImage
+
+
+def test_header_probe_does_not_decode_pixels():
+    image = DecodedImage(render_target(1600, 1200).image_data)
+
+    assert image.format == "JPEG"
+    assert image.size == (1600, 1200)
+    assert image._arrays == {}
+
+
+def test_full_resolution_array_is_decoded_once():
+    image = DecodedImage(render_target(800, 600).image_data)
+
+    array, scale = image.rgb_array()
+    again, _ = image.rgb_array()
+
+    assert array.shape == (600, 800, 3)
+    assert scale == 1.0
+    assert again is array
+
+
+def test_reduced_decode_keeps_requested_side():
+    image = DecodedImage(render_target(2000, 1500).image_data)
+
+    array, scale = image.rgb_array(max_side=640)
+
+    # draft() reduce en potencias de 2 sin bajar del lado pedido
+    assert array.shape == (750, 1000, 3)
+    assert scale == pytest.approx(0.5)
+
+
+def test_reduced_decode_is_noop_for_small_or_png_images():
+    small = DecodedImage(render_target(600, 600).image_data)
+    assert small.rgb_array(max_side=640)[1] == 1.0
+
+    buffer = io.BytesIO()
+    Image.fromarray(np.zeros((1200, 1200, 3), dtype=np.uint8)).save(buffer, "PNG")
+    png = DecodedImage(buffer.getvalue())
+    assert png.rgb_array(max_side=640)[0].shape == (1200, 1200, 3)
+
+
+def test_validate_image_accepts_decoded_image():
+    detector = BulletDetector.__new__(BulletDetector)
+    image = DecodedImage(render_target(6000, 200).image_data)
+
+    is_valid, error = detector.validate_image(image)
+
+    assert not is_valid
+    assert "6000x200" in error
+    assert detector.validate_image(b"no es una imagen")[0] is False
@@ -0,0 +1,63 @@
+from src.infraestructure.ml_models.detection_cache import DetectionCache
+
+
+def _result(total):
+    return {"detections": [], "statistics": {"total_impacts": total}}
+
+
+def test_key_depends_on_image_model_and_threshold():
+    key = DetectionCache.build_key(b"img", "2.0/pytorch", 0.25)
+
+    assert key == DetectionCache.build_key(b"img", "2.0/pytorch", 0.25)
+    assert key != DetectionCache.build_key(b"img2", "2.0/pytorch", 0.25)
+    assert key != DetectionCache.build_key(b"img", "2.0/onnx", 0.25)
+    assert key != DetectionCache.build_key(b"img", "2.0/pytorch", 0.3)
+
+
+def test_lru_evicts_least_recently_used():
+    cache = DetectionCache(max_entries=2)
+    cache.set("a", _result(1))
+    cache.set("b", _result(2))
+    assert cache.get("a") is not None  # "a" pasa a ser el más reciente
+    cache.set("c", _result(3))
+
+    assert cache.get("b") is None
+    assert cache.get("a")["statistics"]["total_impacts"] == 1
+    assert cache.get("c")["statistics"]["total_impacts"] == 3
+
+
+def test_returns_copies_and_counts_hits():
+    cache = DetectionCache()
+    cache.set("k", _result(5))
+
+    cached = cache.get("k")
+    cached["statistics"]["total_impacts"] = 99
+    assert cache.get("k")["statistics"]["total_impacts"] == 5
+    assert cache.get("missing") is None
+
+    stats = cache.stats()
+    assert stats["hits"] == 2
+    assert stats["misses"] == 1
+    assert stats["redis_enabled"] is False
+
+
+def test_redis_tier_fills_local_cache():
+    class FakeRedis:
+        def __init__(self):
+            self.data = {}
+
+        def get(self, key):
+            return self.data.get(key)
+
+        def setex(self, key, ttl, value):
+            self.data[key] = value
+
+    shared = FakeRedis()
+    writer, reader = DetectionCache(), DetectionCache()
+    writer._redis = reader._redis = shared
+
+    writer.set("k", _result(7))
+    assert reader.get("k")["statistics"]["total_impacts"] == 7
+    assert reader.get("k") is not None
+    assert reader.stats()["redis_hits"] == 1
+    assert reader.stats()["hits"] == 1
@@ -0,0 +1,103 @@
+import json
+
+import pytest
+import torch
+from ultralytics.engine.results import Boxes
+
+from src.application.services.detection_converter import DetectionConverter
+from src.infraestructure.ml_models.bullet_detector import BulletDetector
+from src.infraestructure.ml_models.detection_columns import DetectionColumns
+
+NAMES = {0: "impacto_fresco_dentro", 1: "impacto_fresco_fuera", 2: "parche"}
+
+
+def _boxes():
+    return Boxes(
+        torch.tensor(
+            [
+                [10.0, 20.0, 30.0, 44.0, 0.91, 0.0],
+                [100.0, 100.0, 110.0, 108.0, 0.42, 1.0],
+                [5.0, 5.0, 9.0, 9.0, 0.15, 2.0],
+            ]
+        ),
+        orig_shape=(480, 640),
+    )
+
+
+def _legacy_process(boxes):
+    # Implementación anterior, elemento por elemento
+    detections = []
+    for i in range(len(boxes)):
+        nombre = NAMES[int(boxes.cls[i])]
+        x1, y1, x2, y2 = boxes.xyxy[i].tolist()
+        detections.append(
+            {
+                "tipo": nombre,
+                "confianza": float(boxes.conf[i]),
+                "centro_x": (x1 + x2) / 2,
+                "centro_y": (y1 + y2) / 2,
+                "bbox": [x1, y1, x2, y2],
+                "es_fresco": "fresco" in nombre.lower(),
+                "dentro_blanco": "dentro" in nombre.lower(),
+                "area": (x2 - x1) * (y2 - y1),
+            }
+        )
+    return detections
+
+
+def test_from_yolo_matches_legacy_dicts():
+    columns = DetectionColumns.from_yolo(_boxes(), NAMES)
+
+    assert columns.to_dicts() == _legacy_process(_boxes())
+
+
+def test_from_yolo_without_boxes_is_empty():
+    columns = DetectionColumns.from_yolo(None, NAMES)
+
+    assert len(columns) == 0
+    assert columns.to_dicts() == []
+    assert columns.class_names == tuple(NAMES.values())
+
+
+def test_payload_round_trip_is_json_and_accepts_legacy_lists():
+    columns = DetectionColumns.from_yolo(_boxes(), NAMES)
+
+    payload = json.loads(json.dumps(columns.to_payload()))
+    assert DetectionColumns.from_payload(payload).to_dicts() == columns.to_dicts()
+
+    legacy = DetectionColumns.from_payload(columns.to_dicts())
+    assert legacy.to_dicts() == columns.to_dicts()
+    assert len(DetectionColumns.from_payload(None)) == 0
+
+
+def test_translate_scale_and_filter():
+    columns = DetectionColumns.from_yolo(_boxes(), NAMES)
+
+    moved = columns.translate(100, 50).scale(2.0).filter_confidence(0.4)
+
+    assert len(moved) == 2
+    assert moved.boxes[0].tolist() == [220.0, 140.0, 260.0, 188.0]
+    assert moved.areas[0] == pytest.approx(40 * 48)
+
+
+def test_statistics_from_columns():
+    detector = BulletDetector.__new__(BulletDetector)
+    columns = DetectionColumns.from_yolo(_boxes(), NAMES)
+
+    stats = detector._calculate_statistics(columns)
+
+    assert stats["total_impacts"] == 3
+    assert stats["fresh_impacts_inside"] == 1
+    assert stats["fresh_impacts_outside"] == 2
+    assert stats["confidence_stats"]["max"] == pytest.approx(0.91)
+    assert (
+        detector._calculate_statistics(DetectionColumns.empty())["total_impacts"] == 0
+    )
+
+
+def test_shot_coordinates_only_from_fresh_detections():
+    columns = DetectionColumns.from_yolo(_boxes(), NAMES)
+
+    shots = DetectionConverter.columns_to_shot_coordinates(columns)
+
+    assert [(s.x, s.y) for s in shots] == [(20.0, 32.0), (105.0, 104.0)]
@@ -0,0 +1,64 @@
+"""
+Paridad entre backends del detector: el modelo ONNX exportado debe producir las
+mismas detecciones que el .pt original.
+
+Requiere los dos modelos en `models_versions/` (el ONNX se genera con
+`python -m src.infraestructure.ml_models.export_model --format onnx`).
+"""
+
+import pytest
+
+from src.benchmarks.synthetic_targets import render_target
+from src.infraestructure.config.settings import settings
+from src.infraestructure.ml_models.bullet_detector import (
+    BulletDetector,
+    get_bullet_detector,
+)
+
+BACKENDS = ("pytorch", "onnx")
+
+pytestmark = pytest.mark.skipif(
+    not all(BulletDetector.get_model_path(b).exists() for b in BACKENDS),
+    reason="Se requieren los modelos .pt y .onnx en models_versions/",
+)
+
+
+FIXTURE_IMAGES = [
+    render_target(640, 480, holes=5, seed=1).image_data,
+    render_target(1280, 960, holes=10, seed=2).image_data,
+    render_target(2000, 2000, holes=20, seed=3).image_data,
+]
+
+
+def _iou(a, b) -> float:
+    x1, y1 = max(a[0], b[0]), max(a[1], b[1])
+    x2, y2 = min(a[2], b[2]), min(a[3], b[3])
+    inter = max(0.0, x2 - x1) * max(0.0, y2 - y1)
+    union = (a[2] - a[0]) * (a[3] - a[1]) + (b[2] - b[0]) * (b[3] - b[1]) - inter
+    return inter / union if union > 0 else 0.0
+
+
+def _detect_with_backend(monkeypatch, backend: str, image_data: bytes):
+    detector = get_bullet_detector()
+    monkeypatch.setattr(settings, "ML_MODEL_BACKEND", backend)
+    monkeypatch.setattr(detector, "_model_loaded", False)
+    monkeypatch.setattr(detector, "_model", None)
+    return detector.detect_impacts(image_data, confidence_threshold=0.25)
+
+
+@pytest.mark.parametrize("image_index", range(len(FIXTURE_IMAGES)))
+def test_onnx_matches_pytorch_detections(monkeypatch, image_index):
+    image_data = FIXTURE_IMAGES[image_index]
+    reference = _detect_with_backend(monkeypatch, "pytorch", image_data)
+    candidate = _detect_with_backend(monkeypatch, "onnx", image_data)
+
+    assert len(candidate) == len(reference)
+
+    reference = sorted(reference, key=lambda d: (d["centro_x"], d["centro_y"]))
+    candidate = sorted(candidate, key=lambda d: (d["centro_x"], d["centro_y"]))
+    for ref, cand in zip(reference, candidate):
+        assert cand["tipo"] == ref["tipo"]
+        assert cand["confianza"] == pytest.approx(ref["confianza"], abs=0.02)
+        assert _iou(ref["bbox"], cand["bbox"]) > 0.9
+        # El contrato de salida de _process_predictions no cambia
+        assert set(cand) == set(ref)
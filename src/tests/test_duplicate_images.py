@@ -0,0 +1,132 @@
+import io
+from types import SimpleNamespace
+from uuid import uuid4
+
+import cv2
+import numpy as np
+import pytest
+from PIL import Image
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from src.application.services.duplicate_images import (
+    find_near_duplicate,
+    fingerprint_columns,
+    read_upload_fingerprint,
+)
+from src.benchmarks.synthetic_targets import render_target
+from src.infraestructure.database.models.practice_exercise_model import (
+    PracticeExerciseModel,
+)
+from src.infraestructure.database.models.practice_session_model import (
+    IndividualPracticeSessionModel,
+)
+from src.infraestructure.database.models.target_image_model import TargetImageModel
+from src.infraestructure.utils.image_hash import (
+    dhash,
+    fingerprint,
+    fingerprint_file,
+    hamming_distance,
+)
+
+
+def _reencoded(image_data, size, quality=60):
+    buf = io.BytesIO()
+    Image.open(io.BytesIO(image_data)).resize(size).save(buf, "JPEG", quality=quality)
+    return buf.getvalue()
+
+
+def _photo(seed, size=(1600, 1200)):
+    """Foto sintética con estructura a gran escala (distinta por semilla)"""
+    rng = np.random.default_rng(seed)
+    coarse = rng.integers(0, 255, (9, 12, 3), dtype=np.uint8)
+    buf = io.BytesIO()
+    Image.fromarray(cv2.resize(coarse, size, interpolation=cv2.INTER_CUBIC)).save(
+        buf, "JPEG", quality=90
+    )
+    return buf.getvalue()
+
+
+def test_dhash_tolerates_reencoding_but_not_different_photos():
+    original = _photo(1)
+    photo_hash = dhash(original)
+
+    assert hamming_distance(photo_hash, dhash(_reencoded(original, (800, 600)))) <= 2
+    assert hamming_distance(photo_hash, dhash(_photo(2))) > 10
+    # Hash con signo para BIGINT; la distancia no depende del signo
+    assert -(2**63) <= photo_hash < 2**63
+    assert hamming_distance(-1, 0) == 64
+
+
+def test_upload_fingerprint_rewinds_the_file():
+    image_data = render_target(400, 300, holes=2).image_data
+    upload = SimpleNamespace(file=io.BytesIO(image_data))
+
+    image = read_upload_fingerprint(upload)
+
+    assert (image.width, image.height) == (400, 300)
+    assert upload.file.read() == image_data
+    assert read_upload_fingerprint(SimpleNamespace(file=io.BytesIO(b"x"))) is None
+
+
+def test_file_fingerprint_matches_bytes_fingerprint():
+    # Decodificado reducido desde el archivo: mismo hash que desde los bytes
+    photo = _photo(3, size=(3024, 4032))
+    assert fingerprint_file(io.BytesIO(photo)) == fingerprint(photo)
+
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite://")
+    for model in (IndividualPracticeSessionModel, TargetImageModel):
+        model.__table__.create(engine)
+    PracticeExerciseModel.__table__.create(engine)
+    session = sessionmaker(bind=engine, expire_on_commit=False)()
+    yield session
+    session.close()
+
+
+def _upload(db, shooter_id, image_data):
+    practice = IndividualPracticeSessionModel(shooter_id=shooter_id)
+    db.add(practice)
+    db.flush()
+    image = TargetImageModel(
+        file_path="https://bucket/x.jpg",
+        file_size=len(image_data),
+        content_type="image/jpeg",
+        **fingerprint_columns(fingerprint(image_data), None),
+    )
+    db.add(image)
+    db.flush()
+    exercise = PracticeExerciseModel(
+        session_id=practice.id,
+        exercise_type_id=uuid4(),
+        target_id=uuid4(),
+        weapon_id=uuid4(),
+        ammunition_id=uuid4(),
+        distance="25",
+        target_image_id=image.id,
+    )
+    db.add(exercise)
+    db.commit()
+    return image, exercise
+
+
+def test_near_duplicates_are_searched_within_the_shooter(db):
+    shooter_id = uuid4()
+    original = _photo(1)
+    image, exercise = _upload(db, shooter_id, original)
+    _upload(db, shooter_id, _photo(2))
+    _upload(db, uuid4(), original)  # misma foto, otro tirador
+
+    match = find_near_duplicate(
+        db, shooter_id, fingerprint(_reencoded(original, (1600, 1200)))
+    )
+    assert (match.image_id, match.exercise_id) == (image.id, exercise.id)
+    assert match.distance <= 2
+
+    columns = fingerprint_columns(fingerprint(original), match)
+    assert columns["duplicate_of_id"] == image.id
+    assert (columns["image_width"], columns["image_height"]) == (1600, 1200)
+
+    assert find_near_duplicate(db, shooter_id, fingerprint(_photo(3))) is None
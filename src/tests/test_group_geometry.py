@@ -0,0 +1,64 @@
+import numpy as np
+import pytest
+
+from src.application.services.scoring_calculator import ScoringCalculatorService
+from src.domain.entities.scoring import ShotCoordinate, ShotScore
+from src.domain.services.group_geometry import (
+    convex_hull,
+    group_statistics,
+    hull_diameter,
+)
+from src.domain.value_objects.target_config import TargetConfigurations
+
+
+def _brute_force_diameter(points):
+    diffs = points[:, None, :] - points[None, :, :]
+    return float(np.sqrt((diffs**2).sum(axis=-1)).max())
+
+
+@pytest.mark.parametrize("count", [1, 2, 3, 5, 40, 300])
+def test_diameter_matches_all_pairs(count):
+    rng = np.random.default_rng(count)
+    for _ in range(20):
+        points = rng.normal(500, 80, size=(count, 2))
+        assert hull_diameter(convex_hull(points)) == pytest.approx(
+            _brute_force_diameter(points)
+        )
+
+
+def test_degenerate_groups():
+    # Repetidos y colineales
+    points = np.array([[0, 0], [1, 1], [2, 2], [2, 2], [3, 3], [1, 1]], dtype=float)
+    assert len(convex_hull(points)) == 2
+    assert hull_diameter(convex_hull(points)) == pytest.approx(np.hypot(3, 3))
+    assert hull_diameter(convex_hull(np.array([[5.0, 5.0]] * 4))) == 0.0
+
+
+def test_group_metrics():
+    # Cuadrado de lado 2 centrado en (10, 20) más el centro
+    x = np.array([9.0, 11.0, 11.0, 9.0, 10.0])
+    y = np.array([19.0, 19.0, 21.0, 21.0, 20.0])
+
+    stats = group_statistics(x, y)
+
+    assert (stats.center_x, stats.center_y) == (10.0, 20.0)
+    assert stats.diameter == pytest.approx(2 * np.sqrt(2))
+    assert stats.mean_radius == pytest.approx(4 * np.sqrt(2) / 5)
+    assert stats.average_distance_from_center == stats.mean_radius
+    assert stats.cep50 == pytest.approx(np.sqrt(2))
+    assert stats.horizontal_dispersion == pytest.approx(np.std(x))
+    assert stats.vertical_dispersion == pytest.approx(np.std(y))
+    assert stats.shots_count == 5
+
+
+def test_calculator_uses_group_geometry():
+    service = ScoringCalculatorService(TargetConfigurations.PRO_SHOOTER)
+    shots = [
+        ShotScore(ShotCoordinate(x, y, 0.9), 10, "zone_10", 0.0, 0.0)
+        for x, y in [(0.0, 0.0), (3.0, 4.0), (1.0, 1.0)]
+    ]
+
+    stats = service.calculate_group_statistics(shots)
+
+    assert stats.diameter == pytest.approx(5.0)
+    assert service.calculate_group_statistics([]).shots_count == 0
@@ -0,0 +1,112 @@
+import threading
+
+import pytest
+
+from src.infraestructure.config.settings import settings
+from src.infraestructure.ml_models import inference_executor
+from src.infraestructure.ml_models.detection_cache import DetectionCache
+from src.infraestructure.ml_models.inference_executor import (
+    InferenceExecutor,
+    InferenceQueueFullError,
+)
+
+
+@pytest.fixture(autouse=True)
+def _without_detection_cache(monkeypatch):
+    monkeypatch.setattr(settings, "ML_CACHE_ENABLED", False)
+
+
+def test_rejects_work_when_queue_is_full(monkeypatch):
+    release = threading.Event()
+
+    def blocking_analyze(image_data, confidence_threshold, model_version=None):
+        release.wait(timeout=5)
+        return {"detections": [], "image": image_data}
+
+    monkeypatch.setattr(inference_executor, "_analyze_in_worker", blocking_analyze)
+    executor = InferenceExecutor(workers=0, threads_per_worker=1, max_queue_size=1)
+
+    first = executor.submit(b"a", 0.25)
+    second = executor.submit(b"b", 0.25)
+    with pytest.raises(InferenceQueueFullError):
+        executor.submit(b"c", 0.25)
+
+    release.set()
+    assert first.result(timeout=5)["image"] == b"a"
+    assert second.result(timeout=5)["image"] == b"b"
+
+    # Los lugares se liberan al terminar cada trabajo
+    assert executor.analyze_with_stats(b"d")["image"] == b"d"
+    executor.shutdown()
+
+
+def test_not_ready_until_warm_up_finishes(monkeypatch):
+    calls = []
+
+    def fake_warm_up(iterations, width, height):
+        calls.append((iterations, width, height))
+        return 1
+
+    monkeypatch.setattr(inference_executor, "_warm_up_in_worker", fake_warm_up)
+    executor = InferenceExecutor(workers=0, warmup_required=True)
+
+    assert not executor.is_ready
+    executor.warm_up(iterations=2, width=64, height=48)
+    assert executor.is_ready
+    assert calls == [(2, 64, 48)]
+    executor.shutdown()
+
+
+def test_warm_up_waits_until_every_worker_answered(monkeypatch):
+    # El pool no reparte una tarea por proceso: el worker 1 toma varias
+    pids = iter([1, 1, 2, 1, 1, 3])
+    lock = threading.Lock()
+
+    def fake_warm_up(iterations, width, height):
+        with lock:
+            return next(pids)
+
+    monkeypatch.setattr(inference_executor, "_warm_up_in_worker", fake_warm_up)
+    executor = InferenceExecutor(workers=0, threads_per_worker=3, warmup_required=True)
+    executor.workers = 3
+
+    executor.warm_up()
+    assert executor.is_ready
+    assert next(pids, None) is None
+    executor.shutdown()
+
+
+def test_stays_not_ready_when_warm_up_fails(monkeypatch):
+    def failing_warm_up(iterations, width, height):
+        raise RuntimeError("modelo no encontrado")
+
+    monkeypatch.setattr(inference_executor, "_warm_up_in_worker", failing_warm_up)
+    executor = InferenceExecutor(workers=0, warmup_required=True)
+
+    executor.warm_up()
+    assert not executor.is_ready
+    assert "modelo no encontrado" in executor.warmup_error
+    executor.shutdown()
+
+
+def test_cached_results_skip_inference(monkeypatch):
+    calls = []
+
+    def fake_analyze(image_data, confidence_threshold, model_version=None):
+        calls.append((image_data, confidence_threshold))
+        return {"detections": [{"confianza": 0.9}], "statistics": {}}
+
+    monkeypatch.setattr(settings, "ML_CACHE_ENABLED", True)
+    monkeypatch.setattr(inference_executor, "_analyze_in_worker", fake_analyze)
+    cache = DetectionCache()
+    monkeypatch.setattr(inference_executor, "get_detection_cache", lambda: cache)
+    executor = InferenceExecutor(workers=0)
+
+    first = executor.analyze_with_stats(b"same-photo", 0.25)
+    second = executor.analyze_with_stats(b"same-photo", 0.25)
+    executor.analyze_with_stats(b"same-photo", 0.5)
+
+    assert first == second
+    assert calls == [(b"same-photo", 0.25), (b"same-photo", 0.5)]
+    assert cache.stats()["hits"] == 1
+    executor.shutdown()
@@ -0,0 +1,79 @@
+import torch
+
+from src.benchmarks.worker_memory import parse_smaps_rollup
+from src.infraestructure.config.settings import settings
+from src.infraestructure.ml_models import preload as preload_module
+from src.infraestructure.ml_models.preload import (
+    preload_models,
+    preload_versions,
+    restore_torch_threads,
+)
+
+SMAPS_ROLLUP = """\
+55d0c0a00000-7ffd4b9f5000 ---p 00000000 00:00 0                          [rollup]
+Rss:              819200 kB
+Pss:              409600 kB
+Shared_Clean:     614400 kB
+Shared_Dirty:      10240 kB
+Private_Clean:     40960 kB
+Private_Dirty:    153600 kB
+Referenced:       819200 kB
+Swap:                  0 kB
+"""
+
+
+def test_parse_smaps_rollup_groups_private_and_shared_pages():
+    memory = parse_smaps_rollup(SMAPS_ROLLUP)
+
+    assert memory["rss_mb"] == 800
+    assert memory["pss_mb"] == 400
+    assert memory["shared_mb"] == 610
+    assert memory["uss_mb"] == 190
+
+
+def test_preload_versions_include_club_and_shadow_models(monkeypatch):
+    monkeypatch.setattr(settings, "ML_MODEL_VERSION", "2.0")
+    monkeypatch.setattr(
+        settings, "ML_CLUB_MODEL_VERSIONS", {"club-a": "2.1", "club-b": "2.0"}
+    )
+    monkeypatch.setattr(settings, "ML_SHADOW_MODEL_VERSION", "3.0")
+    monkeypatch.setattr(settings, "ML_SHADOW_SAMPLE_RATE", 0.0)
+
+    assert preload_versions() == ["2.0", "2.1"]
+
+    monkeypatch.setattr(settings, "ML_SHADOW_SAMPLE_RATE", 0.05)
+    assert preload_versions() == ["2.0", "2.1", "3.0"]
+
+
+class FakeDetector:
+    def __init__(self, warm_ups):
+        self.warm_ups = warm_ups
+
+    def warm_up(self, **kwargs):
+        self.warm_ups.append(torch.get_num_threads())
+
+
+def test_preload_warms_up_single_threaded_and_workers_restore(monkeypatch):
+    warm_ups = []
+    monkeypatch.setattr(
+        preload_module, "get_bullet_detector", lambda v: FakeDetector(warm_ups)
+    )
+    monkeypatch.setattr(preload_module.gc, "freeze", lambda: None)
+    monkeypatch.setattr(preload_module, "_torch_threads", None)
+    monkeypatch.setattr(settings, "ML_CLUB_MODEL_VERSIONS", {})
+    monkeypatch.setattr(settings, "ML_SHADOW_SAMPLE_RATE", 0.0)
+    threads = torch.get_num_threads()
+    torch.set_num_threads(2)
+    try:
+        monkeypatch.setattr(settings, "ML_INFERENCE_WORKERS", 2)
+        assert preload_models() == {}
+        assert warm_ups == []
+
+        monkeypatch.setattr(settings, "ML_INFERENCE_WORKERS", 0)
+        assert list(preload_models()) == [settings.ML_MODEL_VERSION]
+        # Sin pool OpenMP en el maestro; post_fork restaura los hilos
+        assert warm_ups == [1]
+        restore_torch_threads()
+        assert torch.get_num_threads() == 2
+    finally:
+        torch.set_num_threads(threads)
@@ -0,0 +1,160 @@
+import threading
+from concurrent.futures import Future
+from unittest.mock import MagicMock
+from uuid import uuid4
+
+import pytest
+
+from src.application.services import shadow_inference_service
+from src.application.services.shadow_inference_service import ShadowInferenceService
+from src.infraestructure.config.settings import settings
+from src.infraestructure.ml_models.bullet_detector import (
+    BulletDetector,
+    get_bullet_detector,
+    get_model_version_key,
+)
+from src.infraestructure.ml_models.detection_columns import DetectionColumns
+from src.infraestructure.ml_models.inference_executor import InferenceQueueFullError
+from src.infraestructure.ml_models.model_registry import (
+    ModelRegistry,
+    ModelVersionNotFoundError,
+)
+
+CLUB_ID = uuid4()
+
+
+@pytest.fixture(autouse=True)
+def _two_versions(monkeypatch):
+    monkeypatch.setattr(
+        settings,
+        "ML_MODEL_VERSIONS",
+        {"2.0": "BulletDetector_v2", "2.1": "BulletDetector_v2_1"},
+    )
+    monkeypatch.setattr(settings, "ML_CLUB_MODEL_VERSIONS", {str(CLUB_ID): "2.1"})
+
+
+def _columns(*boxes):
+    return DetectionColumns.from_records(
+        [
+            {"tipo": "impacto_fresco_dentro", "confianza": 0.9, "bbox": list(b)}
+            for b in boxes
+        ]
+    )
+
+
+def test_resolve_version_precedence():
+    assert ModelRegistry.resolve_version() == settings.ML_MODEL_VERSION
+    assert ModelRegistry.resolve_version(club_id=CLUB_ID) == "2.1"
+    assert ModelRegistry.resolve_version("2.0", club_id=CLUB_ID) == "2.0"
+
+    with pytest.raises(ModelVersionNotFoundError):
+        ModelRegistry.resolve_version("9.9")
+
+
+def test_one_detector_per_version_with_its_own_file():
+    assert get_bullet_detector("2.1") is get_bullet_detector("2.1")
+    assert get_bullet_detector("2.1") is not get_bullet_detector()
+    assert get_bullet_detector("2.1").version == "2.1"
+
+    path = BulletDetector.get_model_path("onnx", "2.1")
+    assert path.name == "BulletDetector_v2_1.onnx"
+    assert get_model_version_key("2.1") == f"2.1/{settings.ML_MODEL_BACKEND}"
+
+
+def test_compare_detections_matches_by_iou():
+    primary = _columns([0, 0, 10, 10], [100, 100, 110, 110], [200, 200, 210, 210])
+    shadow = _columns([1, 0, 11, 10], [100, 100, 110, 110], [400, 400, 410, 410])
+
+    agreement = ShadowInferenceService.compare_detections(primary, shadow)
+
+    assert agreement["matched_detections"] == 2
+    assert agreement["precision"] == pytest.approx(2 / 3)
+    assert agreement["recall"] == pytest.approx(2 / 3)
+    assert 0.8 < agreement["mean_iou"] <= 1.0
+
+
+def test_shadow_runs_in_background_and_stores_result(monkeypatch):
+    stored = []
+    done = threading.Event()
+
+    submitted = []
+
+    class FakeExecutor:
+        def submit(self, image, confidence_threshold, model_version=None):
+            submitted.append((image, confidence_threshold, model_version))
+            future = Future()
+            future.set_result({"detections": _columns([0, 0, 10, 10]).to_payload()})
+            return future
+
+    def fake_create(db, data):
+        stored.append(data)
+        done.set()
+
+    monkeypatch.setattr(
+        shadow_inference_service, "get_inference_executor", lambda: FakeExecutor()
+    )
+    monkeypatch.setattr(
+        shadow_inference_service.ShadowInferenceRepository,
+        "create",
+        staticmethod(fake_create),
+    )
+    service = ShadowInferenceService("2.1", sample_rate=1.0, session_factory=MagicMock)
+    raw = {
+        "model_version": get_model_version_key("2.0"),
+        "confidence_floor": 0.1,
+        "detections": _columns([0, 0, 10, 10]).to_payload(),
+    }
+
+    assert service.maybe_submit(uuid4(), b"img", raw, 0.25, primary_latency_ms=12.0)
+    assert done.wait(timeout=5)
+    service.shutdown(wait=True)
+
+    assert stored[0]["shadow_model_version"] == "2.1"
+    assert stored[0]["primary_model_version"] == "2.0"
+    assert stored[0]["matched_detections"] == 1
+    assert stored[0]["shadow_latency_ms"] >= 0
+    assert service.stats()["completed"] == 1
+    # Por el executor de inferencia, con la versión sombra
+    assert submitted == [(b"img", 0.1, "2.1")]
+
+
+def test_shadow_sample_is_dropped_when_inference_queue_is_full(monkeypatch):
+    attempted = threading.Event()
+
+    class FullExecutor:
+        def submit(self, image, confidence_threshold, model_version=None):
+            attempted.set()
+            raise InferenceQueueFullError("ocupado")
+
+    stored = []
+    monkeypatch.setattr(
+        shadow_inference_service, "get_inference_executor", lambda: FullExecutor()
+    )
+    monkeypatch.setattr(
+        shadow_inference_service.ShadowInferenceRepository,
+        "create",
+        staticmethod(lambda db, data: stored.append(data)),
+    )
+    service = ShadowInferenceService("2.1", sample_rate=1.0, session_factory=MagicMock)
+    raw = {
+        "model_version": get_model_version_key("2.0"),
+        "confidence_floor": 0.1,
+        "detections": _columns([0, 0, 10, 10]).to_payload(),
+    }
+
+    assert service.maybe_submit(uuid4(), b"img", raw, 0.25)
+    assert attempted.wait(timeout=5)
+    service.shutdown(wait=True)
+
+    assert stored == []
+    assert service.stats()["dropped"] == 1
+
+
+def test_shadow_skips_same_version_and_unsampled_requests():
+    service = ShadowInferenceService("2.0", sample_rate=1.0)
+    raw = {"model_version": get_model_version_key("2.0"), "detections": []}
+    assert not service.maybe_submit(uuid4(), b"img", raw, 0.25)
+
+    service = ShadowInferenceService("2.1", sample_rate=0.0)
+    assert not service.maybe_submit(uuid4(), b"img", raw, 0.25)
+    assert service.stats()["submitted"] == 0
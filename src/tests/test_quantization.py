@@ -0,0 +1,111 @@
+from types import SimpleNamespace
+from uuid import uuid4
+
+import numpy as np
+import pytest
+from onnx import helper
+
+from src.benchmarks.quantization_report import summarize_delta
+from src.infraestructure.config.settings import settings
+from src.infraestructure.ml_models.bullet_detector import (
+    BulletDetector,
+    get_bullet_detector,
+)
+from src.infraestructure.ml_models.quantization import (
+    HOLDOUT_MODULUS,
+    head_postprocess_nodes,
+    is_holdout,
+    letterbox,
+)
+
+
+def test_holdout_split_is_deterministic():
+    ids = [uuid4() for _ in range(2000)]
+
+    held_out = [image_id for image_id in ids if is_holdout(image_id)]
+
+    assert held_out == [image_id for image_id in ids if is_holdout(str(image_id))]
+    assert len(held_out) / len(ids) == pytest.approx(1 / HOLDOUT_MODULUS, abs=0.04)
+
+
+def test_letterbox_keeps_aspect_and_normalizes():
+    image = np.zeros((300, 600, 3), dtype=np.uint8)
+
+    tensor = letterbox(image, 640)
+
+    assert tensor.shape == (1, 3, 640, 640)
+    assert tensor.dtype == np.float32
+    # Franja superior de relleno gris, contenido negro al centro
+    assert tensor[0, 0, 0, 0] == pytest.approx(114 / 255)
+    assert tensor[0, 0, 320, 320] == 0.0
+
+
+def test_letterbox_matches_the_predictor_preprocessing():
+    from ultralytics.models.yolo.detect import DetectionPredictor
+
+    predictor = DetectionPredictor(overrides={"imgsz": 640, "verbose": False})
+    predictor.imgsz = (640, 640)
+    predictor.model = SimpleNamespace(
+        fp16=False, format="onnx", stride=32, dynamic=False
+    )
+    predictor.device = "cpu"
+    # El mismo array RGB que el detector pasa a predict
+    image = np.random.default_rng(0).integers(0, 255, (300, 500, 3), dtype=np.uint8)
+    image[..., 0] = 255
+
+    served = predictor.preprocess([image]).numpy()
+
+    np.testing.assert_allclose(letterbox(image, 640), served, atol=1e-6)
+
+
+def test_only_non_conv_nodes_of_the_head_are_excluded():
+    nodes = [
+        helper.make_node("Conv", ["x"], ["a"], name="/model.0/conv/Conv"),
+        helper.make_node("Sigmoid", ["a"], ["b"], name="/model.0/act/Sigmoid"),
+        helper.make_node("Conv", ["b"], ["c"], name="/model.22/cv2.0/Conv"),
+        helper.make_node("Softmax", ["c"], ["d"], name="/model.22/dfl/Softmax"),
+        helper.make_node("Concat", ["d"], ["y"], name="/model.22/Concat_5"),
+    ]
+    graph = helper.make_graph(nodes, "yolo", [], [])
+
+    assert head_postprocess_nodes(helper.make_model(graph)) == [
+        "/model.22/dfl/Softmax",
+        "/model.22/Concat_5",
+    ]
+
+
+def test_one_detector_per_backend():
+    int8 = get_bullet_detector(backend="onnx_int8")
+
+    assert int8 is get_bullet_detector(settings.ML_MODEL_VERSION, "onnx_int8")
+    assert int8 is not get_bullet_detector()
+    assert int8.backend == "onnx_int8"
+    assert BulletDetector.get_model_path("onnx_int8").name.endswith("_int8.onnx")
+
+
+def test_summary_pools_counts_across_images():
+    rows = [
+        {
+            "primary_detections": 10,
+            "shadow_detections": 9,
+            "matched_detections": 9,
+            "mean_iou": 0.9,
+            "reference_latency_ms": 100.0,
+            "quantized_latency_ms": 50.0,
+        },
+        {
+            "primary_detections": 0,
+            "shadow_detections": 1,
+            "matched_detections": 0,
+            "mean_iou": None,
+            "reference_latency_ms": 100.0,
+            "quantized_latency_ms": 50.0,
+        },
+    ]
+
+    summary = summarize_delta(rows)
+
+    assert summary["recall"] == pytest.approx(0.9)
+    assert summary["recall_loss"] == pytest.approx(0.1)
+    assert summary["precision"] == pytest.approx(0.9)
+    assert summary["speedup"] == pytest.approx(2.0)
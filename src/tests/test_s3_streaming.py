@@ -0,0 +1,90 @@
+import hashlib
+import io
+import os
+
+import pytest
+from fastapi import HTTPException, UploadFile
+from starlette.datastructures import Headers
+
+from src.infraestructure.utils import s3_utils
+from src.infraestructure.utils.s3_utils import (
+    UploadTooLargeError,
+    stream_fileobj_to_s3,
+    stream_upload_to_s3,
+)
+
+
+class FakeS3Client:
+    """Lee el archivo por partes como s3transfer, con una parte reintentada"""
+
+    def __init__(self, part_size=1024):
+        self.part_size = part_size
+        self.objects = {}
+        self.largest_read = 0
+
+    def upload_fileobj(self, fileobj, bucket, key, ExtraArgs=None, Config=None):
+        parts = []
+        while True:
+            start = fileobj.tell()
+            part = fileobj.read(self.part_size)
+            if not part:
+                break
+            if len(parts) == 1:
+                # Reintento de la segunda parte: no debe contarse dos veces
+                fileobj.seek(start)
+                part = fileobj.read(self.part_size)
+            self.largest_read = max(self.largest_read, len(part))
+            parts.append(part)
+        fileobj.close()
+        self.objects[(bucket, key)] = (b"".join(parts), ExtraArgs)
+
+
+@pytest.fixture
+def s3(monkeypatch):
+    fake = FakeS3Client()
+    monkeypatch.setattr(s3_utils, "get_s3_client", lambda: fake)
+    return fake
+
+
+def test_stream_computes_size_and_hash_while_uploading(s3):
+    payload = os.urandom(10_000)
+    source = io.BytesIO(payload)
+
+    stored = stream_fileobj_to_s3(source, "bucket", "a/b.jpg", "image/jpeg")
+
+    assert stored.size == len(payload)
+    assert stored.sha256 == hashlib.sha256(payload).hexdigest()
+    assert stored.url == "https://bucket.s3.amazonaws.com/a/b.jpg"
+    assert s3.objects[("bucket", "a/b.jpg")][0] == payload
+    assert s3.largest_read == s3.part_size
+    # El archivo sigue abierto y al inicio para el resto de la petición
+    assert not source.closed and source.tell() == 0
+
+
+def test_stream_enforces_max_size(s3):
+    with pytest.raises(UploadTooLargeError):
+        stream_fileobj_to_s3(io.BytesIO(b"x" * 5000), "bucket", "k", "image/jpeg", 4096)
+
+
+def test_upload_file_validates_and_returns_stored_object(s3):
+    payload = b"\xff\xd8" + os.urandom(3000)
+    upload = UploadFile(
+        io.BytesIO(payload),
+        filename="foto.JPG",
+        headers=Headers({"content-type": "image/jpeg"}),
+    )
+
+    stored = stream_upload_to_s3(
+        upload, "proshooterdata", allowed_types=["image/jpeg"], folder="target_images"
+    )
+    assert stored.key.startswith("target_images/license_file_")
+    assert stored.key.endswith(".jpg")
+    assert stored.size == len(payload)
+    assert s3.objects[("proshooterdata", stored.key)][1] == {
+        "ContentType": "image/jpeg"
+    }
+
+    upload.file.seek(0)
+    with pytest.raises(HTTPException) as error:
+        stream_upload_to_s3(upload, "proshooterdata", allowed_types=["image/png"])
+    assert error.value.status_code == 400
@@ -0,0 +1,170 @@
+import io
+import json
+from uuid import uuid4
+
+import pytest
+from PIL import Image
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import sessionmaker
+
+from src.application.services import scoring_backfill as backfill_module
+from src.application.services.scoring_backfill import ScoringBackfill
+from src.infraestructure.database.models.target_analysis_model import (
+    TargetAnalysisModel,
+)
+from src.infraestructure.database.models.target_image_model import TargetImageModel
+
+
+def _shot(x, y, fresh=True):
+    return {"centro_x": x, "centro_y": y, "confianza": 0.9, "es_fresco": fresh}
+
+
+OLD_PHOTO_URL = "https://proshooterdata.s3.amazonaws.com/target_images/old.jpg"
+
+
+class FakeStorage:
+    def __init__(self):
+        buf = io.BytesIO()
+        Image.new("RGB", (800, 800), "white").save(buf, "JPEG")
+        self.image_data = buf.getvalue()
+        self.prefix_reads = []
+
+    def get_prefix(self, url, size):
+        self.prefix_reads.append(url)
+        return self.image_data[:size]
+
+
+@pytest.fixture
+def storage(monkeypatch):
+    fake = FakeStorage()
+    monkeypatch.setattr(backfill_module, "get_storage_client", lambda: fake)
+    return fake
+
+
+@pytest.fixture
+def session_factory(storage):
+    engine = create_engine("sqlite://")
+    TargetImageModel.__table__.create(engine)
+    TargetAnalysisModel.__table__.create(engine)
+    factory = sessionmaker(bind=engine, expire_on_commit=False)
+
+    db = factory()
+    for index, analysis_id in enumerate(sorted(uuid4() for _ in range(5))):
+        image_id = uuid4()
+        # Análisis antiguos, anteriores a raw_detections: el primero sin
+        # dimensiones en ningún lado, el segundo con las de target_images
+        if index < 2:
+            db.add(
+                TargetImageModel(
+                    id=image_id,
+                    file_path=OLD_PHOTO_URL,
+                    file_size=1,
+                    content_type="image/jpeg",
+                    image_width=800 if index else None,
+                    image_height=800 if index else None,
+                )
+            )
+        db.add(
+            TargetAnalysisModel(
+                id=analysis_id,
+                target_image_id=image_id,
+                impact_coordinates=[
+                    _shot(400.0, 400.0),
+                    _shot(400.0, 300.0),
+                    _shot(100.0, 100.0, fresh=False),
+                ],
+                raw_detections=(
+                    {"image_width": 800, "image_height": 800} if index > 1 else None
+                ),
+            )
+        )
+    db.commit()
+    db.close()
+    return factory
+
+
+@pytest.fixture
+def consolidation(monkeypatch):
+    calls = {"exercises": [], "sessions": []}
+    session_id = uuid4()
+    monkeypatch.setattr(
+        backfill_module.PracticeExerciseRepository,
+        "get_exercise_sessions_by_image_ids",
+        staticmethod(lambda db, ids: [(image_id, session_id) for image_id in ids]),
+    )
+    monkeypatch.setattr(
+        backfill_module.ExerciseConsolidationService,
+        "update_exercise_from_analysis",
+        lambda self, exercise_id, update_session_totals=True: calls["exercises"].append(
+            update_session_totals
+        ),
+    )
+    monkeypatch.setattr(
+        backfill_module.PracticeSessionRepository,
+        "update_totals_with_scoring",
+        staticmethod(lambda db, session_id: calls["sessions"].append(session_id)),
+    )
+    return calls
+
+
+def _analyses(session_factory):
+    db = session_factory()
+    try:
+        return db.execute(select(TargetAnalysisModel)).scalars().all()
+    finally:
+        db.close()
+
+
+def test_backfill_rescores_in_chunks_and_resumes(
+    session_factory, consolidation, storage, tmp_path
+):
+    checkpoint = tmp_path / "backfill.json"
+
+    def backfill():
+        return ScoringBackfill(
+            chunk_size=2, checkpoint_path=checkpoint, session_factory=session_factory
+        )
+
+    first = backfill().run(limit=3)
+    assert first.scanned == 3
+    assert json.loads(checkpoint.read_text())["last_id"] == first.last_id
+
+    # Continúa desde el checkpoint sin repetir los ya revisados
+    done = backfill().run()
+    assert (done.scanned, done.changed, done.skipped) == (5, 5, 0)
+
+    rescored = sorted(_analyses(session_factory), key=lambda a: a.id)
+    assert {a.total_score for a in rescored} == {18}
+    assert all(a.score_distribution["8"] == 1 for a in rescored)
+    assert all(a.group_cep50 == pytest.approx(50.0) for a in rescored)
+    assert rescored[0].impact_coordinates[0]["scores"] == 10
+    assert "scores" not in rescored[0].impact_coordinates[2]
+
+    assert consolidation["exercises"] == [False] * 5
+    # Una actualización de totales por sesión en cada bloque con cambios
+    assert len(consolidation["sessions"]) == 3
+
+    # Una segunda pasada completa no encuentra diferencias
+    checkpoint.unlink()
+    again = backfill().run()
+    assert again.changed == 0
+
+    # El tamaño leído del encabezado quedó guardado: no se vuelve a leer
+    assert storage.prefix_reads == [OLD_PHOTO_URL]
+    db = session_factory()
+    probed = db.get(TargetImageModel, rescored[0].target_image_id)
+    assert (probed.image_width, probed.image_height) == (800, 800)
+    db.close()
+
+
+def test_dry_run_reports_diff_without_writing(session_factory, consolidation):
+    out = io.StringIO()
+    progress = ScoringBackfill(
+        dry_run=True, session_factory=session_factory, out=out
+    ).run()
+
+    lines = [json.loads(line) for line in out.getvalue().splitlines()]
+    assert progress.changed == len(lines) == 5
+    assert lines[0]["changes"]["total_score"] == [0, 18]
+    assert {a.total_score for a in _analyses(session_factory)} == {0}
+    assert consolidation["exercises"] == []
@@ -0,0 +1,181 @@
+from concurrent.futures import Future
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+from uuid import uuid4
+
+from src.application.services import enhanced_target_analysis_service as service_module
+from src.application.services.enhanced_target_analysis_service import (
+    EnhancedTargetAnalysisService,
+)
+from src.benchmarks.synthetic_targets import render_target
+from src.infraestructure.config.settings import settings
+from src.infraestructure.ml_models import inference_executor
+from src.infraestructure.ml_models.bullet_detector import get_model_version_key
+from src.infraestructure.ml_models.detection_cache import DetectionCache
+from src.infraestructure.ml_models.inference_executor import InferenceExecutor
+
+
+def _detection(confidence, x):
+    return {
+        "tipo": "impacto_fresco_dentro",
+        "confianza": confidence,
+        "centro_x": x,
+        "centro_y": 500.0,
+        "bbox": [x - 5, 495.0, x + 5, 505.0],
+        "es_fresco": True,
+        "dentro_blanco": True,
+        "area": 100.0,
+    }
+
+
+def test_submit_batch_runs_cache_misses_as_one_job(monkeypatch):
+    calls = []
+
+    def fake_batch(images, confidence_threshold, model_version=None):
+        calls.append(list(images))
+        return [{"detections": [image.decode()]} for image in images]
+
+    monkeypatch.setattr(settings, "ML_CACHE_ENABLED", True)
+    monkeypatch.setattr(inference_executor, "_analyze_batch_in_worker", fake_batch)
+    cache = DetectionCache()
+    monkeypatch.setattr(inference_executor, "get_detection_cache", lambda: cache)
+    executor = InferenceExecutor(workers=0)
+
+    cache.set(
+        DetectionCache.build_key(b"b", get_model_version_key(), 0.1),
+        {"detections": ["b"]},
+    )
+    futures = executor.submit_batch([b"a", b"b", b"c"], 0.1)
+    results = [f.result(timeout=2) for f in futures]
+    again = [f.result(timeout=2) for f in executor.submit_batch([b"a", b"c"], 0.1)]
+    executor.shutdown()
+
+    assert [r["detections"] for r in results] == [["a"], ["b"], ["c"]]
+    # "b" ya estaba en caché; el lote solo lleva a y c
+    assert calls == [[b"a", b"c"]]
+    assert again == [results[0], results[2]]
+
+
+def _exercise():
+    return SimpleNamespace(
+        id=uuid4(), target_image=SimpleNamespace(id=uuid4(), file_path=str(uuid4()))
+    )
+
+
+def test_session_analysis_batches_inference_and_updates_totals_once(monkeypatch):
+    service = EnhancedTargetAnalysisService(db=MagicMock())
+    service.shadow_inference = None
+    up_to_date, first, second, broken = (_exercise() for _ in range(4))
+    existing = SimpleNamespace(
+        id=uuid4(),
+        confidence_threshold=0.25,
+        raw_detections=None,
+        total_impacts_detected=3,
+        total_score=25,
+    )
+
+    monkeypatch.setattr(
+        service_module.PracticeSessionRepository,
+        "get_by_id",
+        staticmethod(lambda db, session_id: object()),
+    )
+    monkeypatch.setattr(
+        service_module.PracticeExerciseRepository,
+        "get_exercises_with_images",
+        staticmethod(lambda db, session_id: [up_to_date, first, second, broken]),
+    )
+    totals_updates = []
+    monkeypatch.setattr(
+        service_module.PracticeSessionRepository,
+        "update_totals_with_scoring",
+        staticmethod(lambda db, session_id: totals_updates.append(session_id)),
+    )
+    monkeypatch.setattr(
+        service,
+        "_get_latest_analysis",
+        lambda image_id: existing if image_id == up_to_date.target_image.id else None,
+    )
+
+    image_data = render_target(800, 800, holes=2).image_data
+
+    def fake_download(file_path):
+        if file_path == broken.target_image.file_path:
+            raise ConnectionError("timeout")
+        return image_data
+
+    monkeypatch.setattr(service, "_download_image_from_s3", fake_download)
+
+    batches = []
+
+    def fake_submit_batch(images, confidence_threshold, model_version=None):
+        batches.append((len(images), confidence_threshold))
+        futures = []
+        for _ in images:
+            future = Future()
+            future.set_result({"detections": [_detection(0.8, 400.0)]})
+            futures.append(future)
+        return futures
+
+    monkeypatch.setattr(service.inference_executor, "submit_batch", fake_submit_batch)
+    monkeypatch.setattr(
+        service,
+        "_create_analysis_with_scoring",
+        lambda image_id, basic, scoring: SimpleNamespace(
+            id=uuid4(),
+            total_impacts_detected=basic["total_impacts_detected"],
+            total_score=(scoring or {}).get("total_score", 0),
+        ),
+    )
+    consolidated = []
+    monkeypatch.setattr(
+        service,
+        "_consolidate_exercise_after_analysis",
+        lambda exercise, analysis, update_session_totals=True: consolidated.append(
+            update_session_totals
+        ),
+    )
+
+    session_id = uuid4()
+    result, error = service.analyze_session_exercises(
+        session_id, confidence_threshold=0.3
+    )
+
+    assert error is None
+    assert batches == [(2, 0.1)]
+    assert consolidated == [False, False]
+    assert totals_updates == [session_id]
+    assert (result.analyzed, result.up_to_date, result.failed) == (2, 1, 1)
+    statuses = {r.exercise_id: r.status for r in result.exercises}
+    assert statuses[up_to_date.id] == "up_to_date"
+    assert statuses[broken.id] == "failed"
+    assert result.exercises[1].total_impactos_detectados == 1
+
+
+def test_session_analysis_rolls_back_when_totals_fail(monkeypatch):
+    db = MagicMock()
+    service = EnhancedTargetAnalysisService(db=db)
+    monkeypatch.setattr(
+        service_module.PracticeSessionRepository,
+        "get_by_id",
+        staticmethod(lambda db, session_id: object()),
+    )
+    monkeypatch.setattr(
+        service_module.PracticeExerciseRepository,
+        "get_exercises_with_images",
+        staticmethod(lambda db, session_id: []),
+    )
+
+    def failing_totals(db, session_id):
+        raise RuntimeError("deadlock detected")
+
+    monkeypatch.setattr(
+        service_module.PracticeSessionRepository,
+        "update_totals_with_scoring",
+        staticmethod(failing_totals),
+    )
+
+    result, error = service.analyze_session_exercises(uuid4())
+
+    assert result is None
+    assert error.startswith("SESSION_ANALYSIS_ERROR")
+    db.rollback.assert_called_once()
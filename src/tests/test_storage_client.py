@@ -0,0 +1,89 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from src.infraestructure.utils.storage_client import (
+    StorageClient,
+    StorageDownloadError,
+)
+
+
+class ImageHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive
+    failures_left = 0
+
+    def do_GET(self):
+        if self.path == "/flaky" and ImageHandler.failures_left > 0:
+            ImageHandler.failures_left -= 1
+            self._reply(503, b"busy")
+        else:
+            self._reply(200, b"x" * (4096 if self.path == "/big" else 1024))
+
+    def _reply(self, status, body):
+        self.send_response(status)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server_url():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), ImageHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def test_downloads_reuse_pooled_connection(server_url):
+    client = StorageClient()
+
+    for _ in range(3):
+        assert len(client.get_bytes(f"{server_url}/image.jpg")) == 1024
+
+    stats = client.stats()
+    client.close()
+    assert stats["downloads_total"] == 3
+    assert stats["connections_opened"] == 1
+    assert stats["connection_reuse_ratio"] == pytest.approx(2 / 3)
+
+
+def test_transient_errors_are_retried(server_url):
+    ImageHandler.failures_left = 2
+    client = StorageClient(max_retries=3, backoff_factor=0)
+
+    assert client.get_bytes(f"{server_url}/flaky") == b"x" * 1024
+
+    stats = client.stats()
+    client.close()
+    assert stats["retries_total"] == 2
+    assert stats["errors_total"] == 0
+
+
+def test_errors_and_oversized_files_raise(server_url):
+    ImageHandler.failures_left = 5
+    client = StorageClient(max_retries=1, backoff_factor=0, max_bytes=2048)
+
+    with pytest.raises(StorageDownloadError):
+        client.get_bytes(f"{server_url}/flaky")
+    with pytest.raises(StorageDownloadError):
+        client.get_bytes(f"{server_url}/big")
+
+    stats = client.stats()
+    client.close()
+    assert stats["errors_total"] == 2
+    assert stats["downloads_total"] == 0
+
+
+def test_prefix_reads_only_the_first_bytes(server_url):
+    # El servidor ignora el Range: la lectura se corta igual
+    client = StorageClient(max_bytes=2048)
+
+    assert client.get_prefix(f"{server_url}/big", 100) == b"x" * 100
+
+    client.close()
@@ -0,0 +1,49 @@
+from src.infraestructure.ml_models.bullet_detector import BulletDetector
+from src.infraestructure.ml_models.detection_columns import DetectionColumns
+
+
+def _detection(bbox, confidence):
+    return {"tipo": "impacto_fresco_dentro", "bbox": bbox, "confianza": confidence}
+
+
+def _merge(detections, threshold):
+    columns = DetectionColumns.from_records(detections)
+    merged = BulletDetector._merge_tile_detections(columns, threshold)
+    return [
+        {"tipo": d["tipo"], "bbox": d["bbox"], "confianza": d["confianza"]}
+        for d in merged.to_dicts()
+    ]
+
+
+def test_tile_windows_cover_image_with_overlap():
+    windows = BulletDetector._tile_windows(3000, 2000, tile_size=1280, overlap=0.2)
+
+    xs = sorted({w[0] for w in windows})
+    ys = sorted({w[1] for w in windows})
+    assert xs[0] == 0 and ys[0] == 0
+    assert max(w[2] for w in windows) == 3000
+    assert max(w[3] for w in windows) == 2000
+    # Cada ventana traslapa con la siguiente
+    assert all(b - a < 1280 for a, b in zip(xs, xs[1:]))
+    assert all(w[2] - w[0] == 1280 and w[3] - w[1] == 1280 for w in windows)
+
+
+def test_small_image_is_a_single_window():
+    assert BulletDetector._tile_windows(800, 600, 1280, 0.2) == [(0, 0, 800, 600)]
+
+
+def test_merge_drops_hole_cut_at_tile_border():
+    full = _detection([100, 100, 120, 120], 0.9)
+    cut = _detection([110, 100, 120, 120], 0.6)  # mitad del mismo impacto
+    other = _detection([300, 300, 320, 320], 0.5)
+
+    merged = _merge([cut, full, other], 0.5)
+
+    assert merged == [full, other]
+
+
+def test_merge_keeps_nearby_distinct_holes():
+    a = _detection([100, 100, 120, 120], 0.9)
+    b = _detection([118, 100, 138, 120], 0.8)  # traslape pequeño
+
+    assert _merge([a, b], 0.5) == [a, b]
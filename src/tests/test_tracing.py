@@ -0,0 +1,66 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from prometheus_client import REGISTRY
+
+from src.infraestructure.utils.tracing import (
+    DEBUG_TIMINGS_HEADER,
+    collect_traces,
+    debug_timings_middleware,
+    pipeline_trace,
+    stage,
+    timings_of,
+    traced_pipeline,
+)
+
+
+def _stage_count(pipeline, name):
+    labels = {"pipeline": pipeline, "stage": name}
+    return REGISTRY.get_sample_value("pipeline_stage_seconds_count", labels) or 0
+
+
+def test_repeated_stages_accumulate_and_errors_mark_outcome():
+    before = _stage_count("test_pipeline", "download")
+    with collect_traces() as traces:
+        with pipeline_trace("test_pipeline"):
+            with stage("download"):
+                pass
+            with stage("download"):
+                pass
+        with pytest.raises(ValueError):
+            with pipeline_trace("test_failing"), stage("inference"):
+                raise ValueError("boom")
+
+    ok, failed = traces
+    assert list(ok.stages) == ["download"]
+    assert _stage_count("test_pipeline", "download") == before + 2
+    assert (ok.outcome, failed.outcome) == ("ok", "error")
+
+    timings = timings_of(traces)
+    assert set(timings) == {"test_pipeline", "test_failing"}
+    assert "inference" in timings["test_failing"]["stages"]
+
+
+def test_stage_without_trace_is_a_noop():
+    with collect_traces() as traces:
+        with stage("orphan"):
+            pass
+    assert traces == []
+    assert timings_of(traces) is None
+
+
+def test_debug_header_returns_server_timing():
+    app = FastAPI()
+    app.middleware("http")(debug_timings_middleware)
+
+    @app.get("/work")
+    @traced_pipeline("report")
+    def work():
+        with stage("render_pdf"):
+            return {"ok": True}
+
+    client = TestClient(app)
+    assert "server-timing" not in client.get("/work").headers
+
+    response = client.get("/work", headers={DEBUG_TIMINGS_HEADER: "1"})
+    assert response.headers["server-timing"].startswith("report-render_pdf;dur=")
@@ -0,0 +1,59 @@
+import numpy as np
+import pytest
+
+from src.application.services.scoring_calculator import ScoringCalculatorService
+from src.domain.entities.scoring import ShotCoordinate
+from src.domain.services.distance_based_scoring import DistanceBasedScoringService
+from src.domain.value_objects.target_config import TargetConfigurations
+
+
+def _shots(width, height, count=2000, seed=0):
+    rng = np.random.default_rng(seed)
+    x = rng.uniform(-0.1 * width, 1.1 * width, count)
+    y = rng.uniform(-0.1 * height, 1.1 * height, count)
+    # Disparos justo en los bordes de zona y en el centro exacto
+    x[:3], y[:3] = width / 2, height / 2 + np.array([0.0, 0.05, 0.045]) * height / 2
+    return x, y
+
+
+@pytest.mark.parametrize("method", ["linear", "exponential", "zones", "unknown"])
+def test_distance_scoring_matches_per_shot_scoring(method):
+    service = DistanceBasedScoringService()
+    x, y = _shots(1200, 900)
+
+    batch = service.score_shots(x, y, 1200, 900, scoring_method=method)
+    expected = [
+        service.calculate_shot_score_by_distance(
+            ShotCoordinate(x=xi, y=yi, confidence=0.0), 1200, 900, method
+        )
+        for xi, yi in zip(x.tolist(), y.tolist())
+    ]
+
+    assert batch.to_shot_scores() == expected
+
+
+def test_zone_scoring_matches_per_shot_scoring():
+    service = ScoringCalculatorService(TargetConfigurations.PRO_SHOOTER)
+    x, y = _shots(1000, 1000, seed=1)
+    coordinates = [
+        ShotCoordinate(x=xi, y=yi, confidence=0.5)
+        for xi, yi in zip(x.tolist(), y.tolist())
+    ]
+
+    shot_scores, distribution = service.calculate_multiple_shots_score(
+        coordinates, 1000, 1000
+    )
+
+    assert shot_scores == [
+        service.calculate_shot_score(c, 1000, 1000) for c in coordinates
+    ]
+    assert sum(distribution.values()) == len(coordinates)
+    assert distribution["10"] == sum(1 for s in shot_scores if s.score == 10)
+
+
+def test_empty_batch():
+    batch = DistanceBasedScoringService().score_shots([], [], 800, 800)
+
+    assert len(batch) == 0
+    assert batch.total_score == 0 and batch.max_score == 0
+    assert batch.score_distribution() == {str(i): 0 for i in range(11)}